@@ -0,0 +1,388 @@
+"""
+VOICE AGENT PERFORMANCE BENCHMARKS
+==================================
+
+Micro-benchmarks for hot paths in the voice agent backend. Runs offline:
+Gmail is replaced by in-process fakes and the OAuth token endpoint by a
+stub with a configurable round-trip time.
+
+Usage:
+    python benchmark_voice_agent.py [--iterations N] [--token-latency-ms MS]
+"""
+
+import argparse
+import base64
+import os
+import re
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+
+# Add project to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'healthcare_sciences_dashboard'))
+
+
+def report(name, samples_ms):
+    """Print mean / p50 / p95 for a list of millisecond samples"""
+    samples = sorted(samples_ms)
+    p95 = samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+    print(f"  {name:<40} mean {statistics.mean(samples):8.2f} ms   "
+          f"p50 {statistics.median(samples):8.2f} ms   p95 {p95:8.2f} ms")
+    return statistics.mean(samples)
+
+
+def stub_token_endpoint(latency_ms):
+    """Replace the OAuth refresh call with a stub that issues a 1h token"""
+    from google.oauth2.credentials import Credentials
+
+    def refresh(self, request):
+        time.sleep(latency_ms / 1000)
+        self.token = "benchmark-access-token"
+        self.expiry = datetime.utcnow() + timedelta(hours=1)
+
+    Credentials.refresh = refresh
+    os.environ.setdefault("GMAIL_CLIENT_ID", "benchmark-client")
+    os.environ.setdefault("GMAIL_CLIENT_SECRET", "benchmark-secret")
+    os.environ.setdefault("GMAIL_REFRESH_TOKEN", "benchmark-refresh-token")
+
+
+def benchmark_gmail_adapter_setup(iterations, token_latency_ms):
+    """Per-request Gmail adapter overhead: new adapter per request vs shared adapter"""
+    print("\n" + "="*70)
+    print("BENCHMARK: GMAIL ADAPTER PER-REQUEST OVERHEAD")
+    print("="*70)
+    print(f"  token endpoint round-trip: {token_latency_ms} ms (stubbed)")
+
+    stub_token_endpoint(token_latency_ms)
+
+    import voice_agent.graph  # noqa: F401  (import order avoids a circular import)
+    from voice_agent.adapters.email import gmail_oauth_env
+    from voice_agent.adapters.email.gmail_adapter import GmailAdapter, get_shared_gmail_adapter
+
+    # Before: every request built a GmailAdapter, reloaded .env, refreshed
+    # the token and rebuilt the discovery service
+    before = []
+    for _ in range(iterations):
+        gmail_oauth_env.clear_credentials_cache()
+        gmail_oauth_env._dotenv_loaded = False
+        started = time.perf_counter()
+        adapter = GmailAdapter()
+        assert adapter.service is not None
+        before.append((time.perf_counter() - started) * 1000)
+
+    # After: one process-wide adapter with cached credentials and service
+    gmail_oauth_env.clear_credentials_cache()
+    get_shared_gmail_adapter().service
+    after = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        adapter = get_shared_gmail_adapter()
+        assert adapter.service is not None
+        adapter.oauth_handler.ensure_fresh()
+        after.append((time.perf_counter() - started) * 1000)
+
+    before_mean = report("new GmailAdapter() per request", before)
+    after_mean = report("shared adapter", after)
+    print(f"  speedup: {before_mean / max(after_mean, 1e-6):,.0f}x")
+
+
+def legacy_get_message_body(payload):
+    """Body extraction before the MIME walk rewrite: top-level parts, regex tag strip"""
+    body = ""
+    if 'parts' in payload:
+        for part in payload['parts']:
+            if part['mimeType'] == 'text/plain':
+                if 'data' in part['body']:
+                    body = base64.urlsafe_b64decode(part['body']['data']).decode('utf-8')
+                    break
+            elif part['mimeType'] == 'text/html' and not body:
+                if 'data' in part['body']:
+                    html_body = base64.urlsafe_b64decode(part['body']['data']).decode('utf-8')
+                    body = re.sub('<[^<]+?>', '', html_body)
+    else:
+        if 'data' in payload['body']:
+            body = base64.urlsafe_b64decode(payload['body']['data']).decode('utf-8')
+    return body.strip()
+
+
+def synthetic_body_corpus():
+    """Large and nested Gmail payloads shaped like real marketing / reply mail"""
+    def part(mime_type, text, **extra):
+        return {"mimeType": mime_type, "body": {"data": base64.urlsafe_b64encode(text.encode()).decode()}, **extra}
+
+    row = ("<tr><td style='padding:8px;font-family:Arial'><a href='https://example.com/p?id=1'>"
+           "<img src='https://example.com/i.png' alt=''/>Spring sale &mdash; 40% off</a></td></tr>")
+    marketing = ("<html><head><style>" + "td{color:#333}" * 2000 + "</style></head><body><table>"
+                 + row * 12000 + "</table></body></html>")
+    plain_reply = "Thanks, see my notes inline.\n" + "> quoted earlier message line\n" * 200000
+    attachment = {"mimeType": "application/pdf", "filename": "deck.pdf", "body": {"attachmentId": "att1", "size": 8_000_000}}
+
+    return {
+        "marketing html (2 MB)": part("text/html", marketing),
+        "nested mixed/alternative": {"mimeType": "multipart/mixed", "parts": [
+            {"mimeType": "multipart/alternative", "parts": [
+                part("text/plain", "Quarterly numbers attached.\n" * 50),
+                part("text/html", "<p>Quarterly numbers attached.</p>" * 50),
+            ]},
+            attachment,
+        ]},
+        "nested related html": {"mimeType": "multipart/mixed", "parts": [
+            {"mimeType": "multipart/related", "parts": [part("text/html", marketing)]},
+            attachment,
+        ]},
+        "long plain reply (6 MB)": part("text/plain", plain_reply),
+    }
+
+
+def benchmark_body_extraction(iterations):
+    """Email body extraction: top-level regex stripping vs MIME walk with a capped streaming tokenizer"""
+    print("\n" + "="*70)
+    print("BENCHMARK: EMAIL BODY EXTRACTION")
+    print("="*70)
+
+    import voice_agent.graph  # noqa: F401  (import order avoids a circular import)
+    from voice_agent.adapters.email.gmail_adapter_helpers import MAX_BODY_CHARS, get_message_body
+
+    print(f"  body cap: {MAX_BODY_CHARS:,} chars")
+    for name, payload in synthetic_body_corpus().items():
+        before, after = [], []
+        for _ in range(max(1, iterations // 10)):
+            started = time.perf_counter()
+            legacy = legacy_get_message_body(payload)
+            before.append((time.perf_counter() - started) * 1000)
+            started = time.perf_counter()
+            body = get_message_body(payload)
+            after.append((time.perf_counter() - started) * 1000)
+        print(f"  {name}: legacy {len(legacy):,} chars, new {len(body):,} chars")
+        report("  legacy", before)
+        report("  MIME walk + streaming tokenizer", after)
+
+
+def benchmark_calendar_range_queries(iterations):
+    """Calendar day/week views: linear scan vs interval-indexed event store"""
+    print("\n" + "="*70)
+    print("BENCHMARK: CALENDAR RANGE QUERIES")
+    print("="*70)
+
+    import random
+    from datetime import timezone
+    import voice_agent.graph  # noqa: F401  (import order avoids a circular import)
+    from voice_agent.adapters.calendar.event_store import CalendarEventStore
+
+    rng = random.Random(7)
+    base = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    events = []
+    for i in range(20000):
+        start = base + timedelta(minutes=15 * rng.randrange(3 * 365 * 96))
+        end = start + timedelta(minutes=rng.choice([15, 30, 60, 240]))
+        events.append({"event_id": f"evt{i}", "title": f"Meeting {i}",
+                       "start": start.isoformat(), "end": end.isoformat()})
+    store = CalendarEventStore()
+    store.replace_all(events, sync_token="st-1")
+    store.query(base, base)  # build the index once
+
+    windows = [(base + timedelta(days=d), base + timedelta(days=d + 7)) for d in range(0, 3 * 365, 11)]
+    scan, indexed = [], []
+    for _ in range(max(1, iterations // 10)):
+        for start, end in windows:
+            started = time.perf_counter()
+            low, high = start.isoformat(), end.isoformat()
+            sorted((e for e in events if e["start"] < high and e["end"] > low), key=lambda e: e["start"])
+            scan.append((time.perf_counter() - started) * 1000)
+            started = time.perf_counter()
+            store.query(start, end)
+            indexed.append((time.perf_counter() - started) * 1000)
+    print(f"  {len(events):,} events, {len(windows)} week windows")
+    report("linear scan", scan)
+    report("interval index", indexed)
+
+
+def benchmark_recurring_expansion(iterations):
+    """Recurring series views: expanding every query vs per-bucket memoized expansion"""
+    print("\n" + "="*70)
+    print("BENCHMARK: RECURRING EVENT EXPANSION")
+    print("="*70)
+
+    from zoneinfo import ZoneInfo
+    import voice_agent.graph  # noqa: F401  (import order avoids a circular import)
+    from voice_agent.adapters.calendar.event_store import CalendarEventStore
+    from voice_agent.adapters.calendar.recurrence import RecurrenceExpander
+
+    zone = ZoneInfo("America/New_York")
+    first = datetime(2026, 1, 5, 9, tzinfo=zone)
+    rules = ["RRULE:FREQ=DAILY;BYDAY=MO,TU,WE,TH,FR", "RRULE:FREQ=WEEKLY;BYDAY=TU", "RRULE:FREQ=MONTHLY;BYMONTHDAY=15"]
+    masters = []
+    for i in range(300):
+        start = first + timedelta(minutes=30 * (i % 16))
+        masters.append({"event_id": f"series{i}", "title": f"Series {i}", "start": start.isoformat(),
+                        "end": (start + timedelta(minutes=30)).isoformat(), "recurrence": [rules[i % 3]],
+                        "time_zone": "America/New_York"})
+    store = CalendarEventStore()
+    store.replace_all(masters, sync_token="st-1")
+
+    window = (first, first + timedelta(days=182))
+    weeks = [(first + timedelta(days=d), first + timedelta(days=d + 7)) for d in range(0, 182, 7)]
+    cold, warm, week_views = [], [], []
+    for _ in range(max(1, iterations // 10)):
+        store.expander = RecurrenceExpander()
+        started = time.perf_counter()
+        instances = store.query(*window)
+        cold.append((time.perf_counter() - started) * 1000)
+        started = time.perf_counter()
+        store.query(*window)
+        warm.append((time.perf_counter() - started) * 1000)
+        for start, end in weeks:
+            started = time.perf_counter()
+            store.query(start, end)
+            week_views.append((time.perf_counter() - started) * 1000)
+    print(f"  {len(masters)} series, {len(instances):,} instances over 6 months")
+    report("6 months, cold expansion", cold)
+    report("6 months, memoized", warm)
+    report("week views, memoized", week_views)
+
+
+def benchmark_conflict_detection(iterations):
+    """Checking proposed slots: pairwise overlap tests vs one sweep-line pass"""
+    print("\n" + "="*70)
+    print("BENCHMARK: CALENDAR CONFLICT DETECTION")
+    print("="*70)
+
+    import random
+    from datetime import timezone
+    import voice_agent.graph  # noqa: F401  (import order avoids a circular import)
+    from voice_agent.adapters.calendar.conflicts import ConflictDetector
+    from voice_agent.adapters.calendar.google_calendar_helpers import to_timestamp
+
+    rng = random.Random(5)
+    base = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+    def interval(minutes):
+        start = base + timedelta(minutes=15 * rng.randrange(90 * 96))
+        return {"start": start.isoformat(), "end": (start + timedelta(minutes=minutes)).isoformat()}
+
+    events = [{"event_id": f"evt{i}", **interval(rng.choice([15, 30, 60]))} for i in range(5000)]
+    proposals = [interval(60) for _ in range(1000)]
+    detector = ConflictDetector()
+
+    pairwise, sweep = [], []
+    for _ in range(max(1, iterations // 10)):
+        started = time.perf_counter()
+        bounds = [(to_timestamp(e["start"]), to_timestamp(e["end"])) for e in events]
+        for p in proposals:
+            low, high = to_timestamp(p["start"]), to_timestamp(p["end"])
+            [i for i, (s, e) in enumerate(bounds) if s < high and e > low]
+        pairwise.append((time.perf_counter() - started) * 1000)
+        started = time.perf_counter()
+        detector.check(events, proposals)
+        sweep.append((time.perf_counter() - started) * 1000)
+    print(f"  {len(proposals):,} proposals vs {len(events):,} events")
+    report("pairwise overlap tests", pairwise)
+    report("sweep-line (with adjacency + travel)", sweep)
+
+
+def benchmark_audit_log(iterations):
+    """Writing audit entries: one transaction per entry vs batched appends"""
+    print("\n" + "="*70)
+    print("BENCHMARK: AUDIT LOG WRITES")
+    print("="*70)
+
+    import tempfile
+    import voice_agent.graph  # noqa: F401  (import order avoids a circular import)
+    from voice_agent.storage.audit_log import SQLiteAuditLog
+
+    def entries(run, count):
+        return [
+            {"log_id": f"log_{run}_{i}", "timestamp": datetime(2025, 1, 1).isoformat(),
+             "object_type": "email", "action": "drafted_reply", "user_id": f"user{i % 10}",
+             "status": {"status": "draft_only"}, "metadata": {"thread_id": f"t{i}"}}
+            for i in range(count)
+        ]
+
+    per_entry, batched = [], []
+    with tempfile.TemporaryDirectory() as tmp:
+        store = SQLiteAuditLog(os.path.join(tmp, "audit.sqlite3"))
+        for run in range(max(1, iterations // 10)):
+            batch = entries(f"a{run}", 1000)
+            started = time.perf_counter()
+            for entry in batch:
+                store.append([entry])
+            per_entry.append((time.perf_counter() - started) * 1000)
+            batch = entries(f"b{run}", 1000)
+            started = time.perf_counter()
+            for i in range(0, len(batch), 200):
+                store.append(batch[i:i + 200])
+            batched.append((time.perf_counter() - started) * 1000)
+        store.close()
+    print("  1,000 entries per run (WAL, synchronous=NORMAL)")
+    report("one transaction per entry", per_entry)
+    report("batches of 200", batched)
+
+
+def benchmark_tts(iterations):
+    """Time to first audio byte: joined clip vs streamed chunks vs audio cache hit"""
+    print("\n" + "="*70)
+    print("BENCHMARK: TTS TIME TO FIRST AUDIO")
+    print("="*70)
+
+    import asyncio
+    import tempfile
+    import voice_agent.graph  # noqa: F401  (import order avoids a circular import)
+    from voice_agent.adapters.tts import CachedTTSAdapter, FakeTTSAdapter, TTSAudioCache
+
+    # ~20 ms per chunk stands in for provider synthesis latency
+    fake = FakeTTSAdapter(chunk_size=4096, chunk_delay_seconds=0.02, bytes_per_char=256)
+    phrase = "Good morning! You have three meetings today and two emails need a reply."
+
+    async def first_byte_ms(stream):
+        started = time.perf_counter()
+        async for _ in stream:
+            elapsed = (time.perf_counter() - started) * 1000
+            await stream.aclose()
+            return elapsed
+
+    async def run(tts):
+        joined, streamed, cached = [], [], []
+        await tts.synthesize(phrase)  # warm the cache
+        for _ in range(max(1, iterations // 10)):
+            started = time.perf_counter()
+            await fake.synthesize(phrase)
+            joined.append((time.perf_counter() - started) * 1000)
+            streamed.append(await first_byte_ms(fake.stream(phrase)))
+            cached.append(await first_byte_ms(tts.stream(phrase)))
+        return joined, streamed, cached
+
+    with tempfile.TemporaryDirectory() as tmp:
+        joined, streamed, cached = asyncio.run(run(CachedTTSAdapter(fake, TTSAudioCache(tmp))))
+    print(f"  {len(fake.audio_for(phrase)):,} byte clip, 4 KB chunks at ~20 ms each")
+    report("joined before responding", joined)
+    report("streamed (first chunk)", streamed)
+    report("audio cache hit (first chunk)", cached)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--token-latency-ms", type=float, default=0.0)
+    args = parser.parse_args()
+
+    print("\n" + "="*70)
+    print("VOICE AGENT BENCHMARKS")
+    print("="*70)
+    print(f"Started: {datetime.now().isoformat()}")
+
+    benchmark_gmail_adapter_setup(args.iterations, args.token_latency_ms)
+    benchmark_body_extraction(args.iterations)
+    benchmark_calendar_range_queries(args.iterations)
+    benchmark_recurring_expansion(args.iterations)
+    benchmark_conflict_detection(args.iterations)
+    benchmark_audit_log(args.iterations)
+    benchmark_tts(args.iterations)
+
+    print("\n" + "="*70)
+    print("BENCHMARKS COMPLETE")
+    print("="*70 + "\n")
+
+
+if __name__ == '__main__':
+    main()
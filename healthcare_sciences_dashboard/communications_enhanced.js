@@ -576,7 +576,8 @@ async function approveDraft(index) {
                 to: toList,
                 subject,
                 body,
-                thread_id: draft.thread_id || draft.id || undefined
+                thread_id: draft.thread_id || draft.id || undefined,
+                draft_id: draft.draft_id || undefined
             })
         });
 
@@ -593,7 +594,8 @@ async function approveDraft(index) {
         const modal = document.getElementById(`draft-modal-${index}`) || document.querySelector('.fixed');
         modal?.remove();
 
-        alert('Email sent successfully');
+        const result = await res.json().catch(() => ({}));
+        alert(result.queued ? 'Email queued for delivery' : 'Email sent successfully');
 
     } catch (error) {
         alert(`Error sending email: ${error.message}`);
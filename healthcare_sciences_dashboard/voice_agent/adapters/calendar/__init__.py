@@ -5,5 +5,22 @@ Adapters for various calendar providers (Google Calendar, CalDAV, Outlook)
 
 from .base import BaseCalendarAdapter
 from .google_calendar_adapter import GoogleCalendarAdapter
+from .event_store import CalendarEventStore, CalendarSyncEngine, IntervalIndex
+from .cached_adapter import CachedCalendarAdapter
+from .availability import AvailabilityEngine, parse_block_rule
+from .conflicts import ConflictDetector
+from .recurrence import RecurrenceExpander, RecurringSeries
 
-__all__ = ["BaseCalendarAdapter", "GoogleCalendarAdapter"]
+__all__ = [
+    "BaseCalendarAdapter",
+    "GoogleCalendarAdapter",
+    "CachedCalendarAdapter",
+    "AvailabilityEngine",
+    "parse_block_rule",
+    "ConflictDetector",
+    "CalendarEventStore",
+    "CalendarSyncEngine",
+    "IntervalIndex",
+    "RecurrenceExpander",
+    "RecurringSeries"
+]
@@ -0,0 +1,295 @@
+"""
+Availability engine
+Finds meeting slots that suit many attendees at once. Every calendar is a
+minute-resolution busy bitmap (NumPy) over the search window; block rules
+from settings and working hours become masks, so checking every candidate
+start across a month for 20 attendees is a handful of array operations.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Iterable
+from zoneinfo import ZoneInfo
+
+import numpy as np
+
+from .google_calendar_helpers import to_timestamp
+
+
+_DAY_NAMES = ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]
+_DAY_GROUPS = {
+    "daily": range(7),
+    "weekdays": range(5),
+    "weekends": range(5, 7),
+}
+_RULE_RE = re.compile(
+    r"^\s*(?P<days>[a-z, ]+?)\s+(?P<start>\d{1,2}:\d{2})\s*-\s*(?P<end>\d{1,2}:\d{2})\s+(?P<mode>avoid|block)\s*$"
+)
+
+# Score penalties used to rank candidate slots
+AVOID_PENALTY_PER_MINUTE = 1.0
+BACK_TO_BACK_PENALTY = 5.0
+DAY_DELAY_PENALTY = 2.0
+
+
+@dataclass(frozen=True)
+class BlockRule:
+    """
+    A recurring weekly time range to keep meetings out of.
+
+    mode "block" removes the range from the search; "avoid" keeps it but
+    ranks slots touching it lower.
+    """
+    text: str
+    weekdays: frozenset[int]
+    start_minute: int
+    end_minute: int
+    mode: str
+
+
+def _parse_days(text: str) -> set[int]:
+    days: set[int] = set()
+    for token in re.split(r"[,\s]+", text.replace("every day", "daily")):
+        if not token or token == "and":
+            continue
+        if token in _DAY_GROUPS:
+            days.update(_DAY_GROUPS[token])
+            continue
+        # "fri", "fridays", "tues", "thurs"
+        stem = token[:-1] if token.endswith("s") else token
+        match = [i for i, name in enumerate(_DAY_NAMES) if len(stem) >= 3 and name.startswith(stem)]
+        if not match:
+            raise ValueError(f"Unknown day '{token}'")
+        days.update(match)
+    return days
+
+
+def _minute_of_day(value: str) -> int:
+    hours, minutes = (int(part) for part in value.split(":"))
+    if hours > 24 or minutes > 59 or (hours == 24 and minutes):
+        raise ValueError(f"Invalid time '{value}'")
+    return hours * 60 + minutes
+
+
+def parse_block_rule(text: str) -> BlockRule:
+    """
+    Parse a rule like "Friday 14:00-18:00 avoid" or "Weekdays 12:00-13:00 block".
+
+    Days may be names (full or three-letter, optionally plural), comma
+    lists, "weekdays", "weekends" or "daily".
+
+    Raises:
+        ValueError: If the rule cannot be parsed
+    """
+    match = _RULE_RE.match(text.lower())
+    if not match:
+        raise ValueError(f"Invalid calendar block rule: '{text}' (expected e.g. 'Friday 14:00-18:00 avoid')")
+    start, end = _minute_of_day(match["start"]), _minute_of_day(match["end"])
+    if end <= start:
+        raise ValueError(f"Invalid calendar block rule: '{text}' (end must be after start)")
+    try:
+        weekdays = _parse_days(match["days"])
+    except ValueError as e:
+        raise ValueError(f"Invalid calendar block rule: '{text}' ({e})") from None
+    return BlockRule(text, frozenset(weekdays), start, end, match["mode"])
+
+
+def _interval_bounds(interval: Any) -> tuple[float, float]:
+    """(start, end) epoch seconds of an event dict or a (start, end) pair"""
+    if isinstance(interval, dict):
+        return to_timestamp(interval["start"]), to_timestamp(interval["end"])
+    start, end = interval
+    return to_timestamp(start), to_timestamp(end)
+
+
+class AvailabilityEngine:
+    """
+    Multi-attendee slot finder over minute-resolution bitmaps.
+
+    Args:
+        block_rules: Rule strings (SystemSettings.calendar_block_rules)
+        time_zone: Zone that rules and working hours are expressed in
+        working_hours: ("HH:MM", "HH:MM") on working days; None allows any time
+        working_days: Weekdays (0 = Monday) meetings may be placed on
+    """
+
+    def __init__(
+        self,
+        block_rules: Iterable[str] = (),
+        time_zone: str = "UTC",
+        working_hours: tuple[str, str] | None = ("09:00", "18:00"),
+        working_days: Iterable[int] = range(5)
+    ):
+        self.rules = [parse_block_rule(rule) for rule in block_rules]
+        self.zone = ZoneInfo(time_zone)
+        self.working_hours = (
+            (_minute_of_day(working_hours[0]), _minute_of_day(working_hours[1])) if working_hours else None
+        )
+        self.working_days = frozenset(working_days)
+
+    # -- bitmaps -------------------------------------------------------------
+
+    @staticmethod
+    def busy_bitmap(intervals: Iterable[Any], window_start: datetime, minutes: int) -> np.ndarray:
+        """
+        Boolean array, one entry per minute of the window, True while busy.
+
+        Intervals are event dicts or (start, end) pairs; they are painted
+        with a difference array, so the cost is O(n + minutes).
+        """
+        bounds = np.array([_interval_bounds(i) for i in intervals], dtype=np.float64).reshape(-1, 2)
+        origin = to_timestamp(window_start)
+        starts = np.clip(np.floor((bounds[:, 0] - origin) / 60), 0, minutes).astype(np.int64)
+        ends = np.clip(np.ceil((bounds[:, 1] - origin) / 60), 0, minutes).astype(np.int64)
+        delta = np.zeros(minutes + 1, dtype=np.int32)
+        np.add.at(delta, starts, 1)
+        np.add.at(delta, ends, -1)
+        return np.cumsum(delta[:-1]) > 0
+
+    def _utc_offset_minutes(self, epoch_minute: int) -> int:
+        moment = datetime.fromtimestamp(epoch_minute * 60, tz=self.zone)
+        return int(moment.utcoffset().total_seconds() // 60)
+
+    def _local_minutes(self, window_start: datetime, minutes: int) -> tuple[np.ndarray, np.ndarray]:
+        """Weekday and wall-clock minute-of-day in the engine's zone for every minute of the window"""
+        epoch = int(to_timestamp(window_start) // 60) + np.arange(minutes, dtype=np.int64)
+        offsets = np.empty(minutes, dtype=np.int64)
+        # One UTC offset per day unless it changes within the day (DST), then
+        # per quarter hour, the granularity of every zone's transitions
+        for day_start in range(0, minutes, 1440):
+            day_end = min(minutes, day_start + 1440)
+            first = self._utc_offset_minutes(int(epoch[day_start]))
+            if first == self._utc_offset_minutes(int(epoch[day_end - 1])):
+                offsets[day_start:day_end] = first
+                continue
+            quarter = day_start
+            while quarter < day_end:
+                next_quarter = min(day_end, quarter + 15 - int(epoch[quarter]) % 15)
+                offsets[quarter:next_quarter] = self._utc_offset_minutes(int(epoch[quarter]))
+                quarter = next_quarter
+        local = epoch + offsets
+        # 1970-01-01 was a Thursday
+        weekday = ((local // 1440 + 3) % 7).astype(np.int8)
+        minute_of_day = (local % 1440).astype(np.int16)
+        return weekday, minute_of_day
+
+    def rule_masks(self, window_start: datetime, minutes: int) -> tuple[np.ndarray, np.ndarray]:
+        """(blocked, avoided) minute masks from working hours and block rules"""
+        weekday, minute_of_day = self._local_minutes(window_start, minutes)
+        blocked = np.zeros(minutes, dtype=bool)
+        avoided = np.zeros(minutes, dtype=bool)
+        if self.working_hours:
+            open_from, open_until = self.working_hours
+            blocked |= ~np.isin(weekday, list(self.working_days))
+            blocked |= (minute_of_day < open_from) | (minute_of_day >= open_until)
+        for rule in self.rules:
+            hit = np.isin(weekday, list(rule.weekdays)) & (minute_of_day >= rule.start_minute) & (minute_of_day < rule.end_minute)
+            if rule.mode == "block":
+                blocked |= hit
+            else:
+                avoided |= hit
+        return blocked, avoided
+
+    # -- slot search ---------------------------------------------------------
+
+    def find_slots(
+        self,
+        busy_by_attendee: dict[str, Iterable[Any]],
+        window_start: datetime,
+        window_end: datetime,
+        duration_minutes: int = 30,
+        step_minutes: int = 15,
+        max_results: int = 5
+    ) -> list[dict[str, Any]]:
+        """
+        Ranked slots in which every attendee is free.
+
+        Args:
+            busy_by_attendee: attendee -> busy intervals (event dicts or
+                (start, end) pairs)
+            window_start / window_end: Search window
+            duration_minutes: Meeting length
+            step_minutes: Candidate starts are aligned to this many minutes
+            max_results: Number of non-overlapping slots returned
+
+        Returns:
+            Slots ordered best first: {"start", "end", "score",
+            "back_to_back", "avoided_rules"}
+        """
+        if window_start.tzinfo is None:
+            window_start = window_start.replace(tzinfo=timezone.utc)
+        if window_end.tzinfo is None:
+            window_end = window_end.replace(tzinfo=timezone.utc)
+        # Start on a step boundary
+        window_start = window_start + timedelta(
+            minutes=-window_start.minute % step_minutes,
+            seconds=-window_start.second,
+            microseconds=-window_start.microsecond
+        )
+        minutes = int((window_end - window_start).total_seconds() // 60)
+        if minutes < duration_minutes:
+            return []
+
+        busy = np.zeros(minutes, dtype=bool)
+        for intervals in busy_by_attendee.values():
+            busy |= self.busy_bitmap(intervals, window_start, minutes)
+        blocked, avoided = self.rule_masks(window_start, minutes)
+
+        # Minutes of each kind inside every candidate [t, t + duration)
+        def window_sums(mask: np.ndarray) -> np.ndarray:
+            totals = np.concatenate(([0], np.cumsum(mask, dtype=np.int32)))
+            return totals[duration_minutes:] - totals[:-duration_minutes]
+
+        starts = np.arange(0, minutes - duration_minutes + 1)
+        feasible = (window_sums(busy | blocked) == 0) & (starts % step_minutes == 0)
+        candidates = starts[feasible]
+        if candidates.size == 0:
+            return []
+
+        avoided_minutes = window_sums(avoided)[candidates]
+        padded = np.concatenate(([False], busy, [False]))
+        back_to_back = padded[candidates] | padded[candidates + duration_minutes + 1]
+        scores = (
+            100.0
+            - AVOID_PENALTY_PER_MINUTE * avoided_minutes
+            - BACK_TO_BACK_PENALTY * back_to_back
+            - DAY_DELAY_PENALTY * (candidates // 1440)
+        )
+
+        # Best first (earlier on ties), skipping slots that overlap a pick
+        order = np.lexsort((candidates, -scores))
+        picked: list[int] = []
+        for index in order:
+            start = candidates[index]
+            if all(abs(start - candidates[p]) >= duration_minutes for p in picked):
+                picked.append(index)
+                if len(picked) == max_results:
+                    break
+
+        slots = []
+        for index in picked:
+            start = (window_start + timedelta(minutes=int(candidates[index]))).astimezone(self.zone)
+            end = start + timedelta(minutes=duration_minutes)
+            slots.append({
+                "start": start.isoformat(),
+                "end": end.isoformat(),
+                "available": True,
+                "score": round(float(scores[index]), 1),
+                "back_to_back": bool(back_to_back[index]),
+                "avoided_rules": [
+                    rule.text for rule in self.rules
+                    if rule.mode == "avoid" and avoided_minutes[index] and self._rule_hits(rule, start, end)
+                ]
+            })
+        return slots
+
+    @staticmethod
+    def _rule_hits(rule: BlockRule, start: datetime, end: datetime) -> bool:
+        minute = start.hour * 60 + start.minute
+        return start.weekday() in rule.weekdays and minute < rule.end_minute and minute + int((end - start).total_seconds() // 60) > rule.start_minute
+
+
+__all__ = ["AvailabilityEngine", "BlockRule", "parse_block_rule"]
@@ -7,6 +7,8 @@ from abc import ABC, abstractmethod
 from typing import Any
 from datetime import datetime
 
+from .google_calendar_helpers import to_timestamp
+
 
 class BaseCalendarAdapter(ABC):
     """
@@ -146,6 +148,28 @@ class BaseCalendarAdapter(ABC):
         """
         pass
 
+    async def get_free_busy(
+        self,
+        calendar_ids: list[str],
+        start_time: datetime,
+        end_time: datetime
+    ) -> dict[str, list[tuple[str, str]]]:
+        """
+        Busy intervals per calendar (an attendee's email is its calendar id).
+
+        Default implementation reads the user's own events for "primary";
+        other calendars are reported as free. Providers with a free/busy
+        API override this.
+
+        Returns:
+            {calendar_id: [(start, end), ...]} with ISO timestamps
+        """
+        busy: dict[str, list[tuple[str, str]]] = {calendar_id: [] for calendar_id in calendar_ids}
+        if "primary" in busy:
+            events = await self.get_events(start_time, end_time)
+            busy["primary"] = [(e["start"], e["end"]) for e in blocking_events(events)]
+        return busy
+
     @abstractmethod
     async def delete_event(self, event_id: str) -> bool:
         """
@@ -158,3 +182,23 @@ class BaseCalendarAdapter(ABC):
             Success status
         """
         pass
+
+
+def blocking_events(events: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Events that make the user busy (not cancelled, not declined, not all-day)"""
+    return [
+        e for e in events
+        if e.get("status") != "cancelled"
+        and e.get("response_status") != "declined"
+        and not e.get("all_day")
+    ]
+
+
+def availability_result(events: list[dict[str, Any]], start_time: datetime, end_time: datetime) -> dict[str, Any]:
+    """check_availability response from the events overlapping a slot"""
+    low, high = to_timestamp(start_time), to_timestamp(end_time)
+    conflicts = [
+        e for e in blocking_events(events)
+        if to_timestamp(e["start"]) < high and to_timestamp(e["end"]) > low
+    ]
+    return {"available": not conflicts, "conflicting_events": conflicts}
@@ -0,0 +1,167 @@
+"""
+Cache-backed calendar adapter
+Answers event range queries from a local, incrementally synced event store
+and delegates invite responses and writes to the live Google Calendar adapter.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from datetime import datetime
+from typing import Any
+
+from .base import BaseCalendarAdapter, availability_result, blocking_events
+from .event_store import CalendarEventStore, CalendarSyncEngine
+from .google_calendar_adapter import GoogleCalendarAdapter
+
+
+class CachedCalendarAdapter(BaseCalendarAdapter):
+    """
+    Calendar adapter backed by local event stores, one per calendar id.
+
+    A query arriving more than max_staleness_seconds after the calendar's
+    last sync first runs an incremental sync (one events.list call when
+    nothing changed); the range itself is an interval-index lookup. If
+    Google is unreachable the last synced state is served.
+    """
+
+    def __init__(self, calendar: GoogleCalendarAdapter, max_staleness_seconds: float = 60.0):
+        self.calendar = calendar
+        self.max_staleness_seconds = max_staleness_seconds
+        self.stores: dict[str, CalendarEventStore] = {}
+        self.engines: dict[str, CalendarSyncEngine] = {}
+        self._last_sync_at: dict[str, float] = {}
+        self._sync_locks: dict[str, asyncio.Lock] = {}
+
+    @property
+    def live(self) -> bool:
+        """True when a real (or injected) Calendar service is available"""
+        return self.calendar.service is not None
+
+    def _engine(self, calendar_id: str) -> CalendarSyncEngine:
+        if calendar_id not in self.engines:
+            self.stores[calendar_id] = CalendarEventStore()
+            self.engines[calendar_id] = CalendarSyncEngine(self.calendar, self.stores[calendar_id], calendar_id)
+            self._sync_locks[calendar_id] = asyncio.Lock()
+        return self.engines[calendar_id]
+
+    def _is_stale(self, calendar_id: str) -> bool:
+        last = self._last_sync_at.get(calendar_id)
+        return last is None or time.monotonic() - last > self.max_staleness_seconds
+
+    async def sync(self, calendar_id: str = "primary", force_full: bool = False) -> dict[str, Any]:
+        """Sync one calendar now"""
+        engine = self._engine(calendar_id)
+        async with self._sync_locks[calendar_id]:
+            summary = await engine.sync(force_full=force_full)
+            self._last_sync_at[calendar_id] = time.monotonic()
+            return summary
+
+    async def _ensure_fresh(self, calendar_id: str) -> bool:
+        """Sync if stale; True when the store can answer queries"""
+        if not self.live:
+            return False
+
+        engine = self._engine(calendar_id)
+        if self._is_stale(calendar_id):
+            async with self._sync_locks[calendar_id]:
+                # Another request may have synced while we waited
+                if self._is_stale(calendar_id):
+                    try:
+                        await engine.sync()
+                        self._last_sync_at[calendar_id] = time.monotonic()
+                    except Exception as e:
+                        print(f"Calendar sync failed, serving last synced state: {e}")
+
+        return engine.store.sync_token is not None
+
+    async def get_events(
+        self,
+        start_time: datetime,
+        end_time: datetime,
+        calendar_id: str = "primary"
+    ) -> list[dict[str, Any]]:
+        """Events overlapping the window, from the local store"""
+        if not await self._ensure_fresh(calendar_id):
+            return await self.calendar.get_events(start_time, end_time, calendar_id)
+        return self.stores[calendar_id].query(start_time, end_time)
+
+    async def get_event(self, event_id: str) -> dict[str, Any]:
+        store = self.stores.get("primary")
+        event = store.get(event_id) if store is not None else None
+        return event if event is not None else await self.calendar.get_event(event_id)
+
+    async def create_event(
+        self,
+        title: str,
+        start_time: datetime,
+        end_time: datetime,
+        attendees: list[str] | None = None,
+        description: str | None = None,
+        location: str | None = None,
+        calendar_id: str = "primary"
+    ) -> dict[str, Any]:
+        """Create through Google and write the new event into the store"""
+        result = await self.calendar.create_event(
+            title, start_time, end_time, attendees=attendees,
+            description=description, location=location, calendar_id=calendar_id
+        )
+        if result.get("event") and calendar_id in self.stores:
+            self.stores[calendar_id].upsert(result["event"])
+        return result
+
+    async def accept_event(self, event_id: str) -> dict[str, Any]:
+        return await self.calendar.accept_event(event_id)
+
+    async def decline_event(self, event_id: str, message: str | None = None) -> dict[str, Any]:
+        return await self.calendar.decline_event(event_id, message)
+
+    async def propose_alternative(
+        self,
+        event_id: str,
+        alternative_times: list[dict],
+        message: str | None = None
+    ) -> dict[str, Any]:
+        return await self.calendar.propose_alternative(event_id, alternative_times, message)
+
+    async def check_availability(
+        self,
+        start_time: datetime,
+        end_time: datetime,
+        calendar_id: str = "primary"
+    ) -> dict[str, Any]:
+        """Conflicts with the slot, from the local store"""
+        if not await self._ensure_fresh(calendar_id):
+            return await self.calendar.check_availability(start_time, end_time, calendar_id)
+        return availability_result(self.stores[calendar_id].query(start_time, end_time), start_time, end_time)
+
+    async def get_free_busy(
+        self,
+        calendar_ids: list[str],
+        start_time: datetime,
+        end_time: datetime
+    ) -> dict[str, list[tuple[str, str]]]:
+        """The user's busy time from the local store; attendees via free/busy"""
+        others = [calendar_id for calendar_id in calendar_ids if calendar_id != "primary"]
+        busy = await self.calendar.get_free_busy(others, start_time, end_time) if others else {}
+        if "primary" in calendar_ids:
+            events = await self.get_events(start_time, end_time)
+            busy["primary"] = [(e["start"], e["end"]) for e in blocking_events(events)]
+        return busy
+
+    async def delete_event(self, event_id: str) -> bool:
+        success = await self.calendar.delete_event(event_id)
+        if success and "primary" in self.stores:
+            self.stores["primary"].delete(event_id)
+        return success
+
+    def get_cache_stats(self) -> dict[str, Any]:
+        """Store size, sync position and the last sync summary per calendar"""
+        return {
+            calendar_id: {**store.stats(), "last_sync": self.engines[calendar_id].last_sync}
+            for calendar_id, store in self.stores.items()
+        }
+
+
+__all__ = ["CachedCalendarAdapter"]
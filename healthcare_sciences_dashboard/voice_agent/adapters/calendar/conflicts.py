@@ -0,0 +1,252 @@
+"""
+Calendar conflict detection
+Sweep-line over sorted event boundaries that finds overlaps, back-to-back
+chains and too-short travel gaps, both inside a calendar and for proposed
+slots. Any number of proposals is checked against the calendar in one
+O((n + m) log(n + m) + k) pass, k being the number of overlaps reported.
+"""
+
+from __future__ import annotations
+
+import re
+from bisect import bisect_left
+from typing import Any
+
+from .base import blocking_events
+from .google_calendar_helpers import to_timestamp
+
+
+# Locations that need no travel (video calls, phone)
+_VIRTUAL_LOCATION_RE = re.compile(
+    r"https?://|\b(zoom|meet\.google|google meet|teams|webex|hangouts?|phone|call|virtual|online|remote)\b",
+    re.IGNORECASE
+)
+
+# Boundary kinds; ends sort before starts so touching intervals do not overlap
+_END, _START = 0, 1
+_EVENT, _PROPOSAL = 0, 1
+
+
+def is_physical_location(location: str | None) -> bool:
+    """True for a place one has to travel to"""
+    return bool(location and location.strip() and not _VIRTUAL_LOCATION_RE.search(location))
+
+
+def _summary(event: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "event_id": event.get("event_id"),
+        "title": event.get("title", ""),
+        "start": event["start"],
+        "end": event["end"],
+        "location": event.get("location", "")
+    }
+
+
+class ConflictDetector:
+    """
+    Finds scheduling problems with a sweep-line over event boundaries.
+
+    Args:
+        travel_buffer_minutes: Minimum gap between meetings at different
+            physical locations
+        back_to_back_gap_minutes: Gaps up to this long still count as back-to-back
+        max_back_to_back: Chains of this many meetings (or more) are reported
+    """
+
+    def __init__(
+        self,
+        travel_buffer_minutes: int = 30,
+        back_to_back_gap_minutes: int = 5,
+        max_back_to_back: int = 3
+    ):
+        self.travel_buffer = travel_buffer_minutes * 60
+        self.back_to_back_gap = back_to_back_gap_minutes * 60
+        self.max_back_to_back = max_back_to_back
+
+    def _travel_violation(self, first: dict, second: dict, gap: float) -> dict[str, Any] | None:
+        """Violation when two meetings at different places are closer than the buffer"""
+        first_place, second_place = first.get("location"), second.get("location")
+        if not (0 <= gap < self.travel_buffer):
+            return None
+        if not (is_physical_location(first_place) and is_physical_location(second_place)):
+            return None
+        if first_place.strip().lower() == second_place.strip().lower():
+            return None
+        return {
+            "from_event": first.get("event_id"),
+            "to_event": second.get("event_id"),
+            "from_location": first_place,
+            "to_location": second_place,
+            "gap_minutes": round(gap / 60),
+            "required_minutes": round(self.travel_buffer / 60)
+        }
+
+    def _chains(self, events: list[dict], bounds: list[tuple[float, float]]) -> tuple[list[list[int]], list[int]]:
+        """Back-to-back chains (runs of meetings with short or no gaps) and each event's chain"""
+        chains: list[list[int]] = []
+        chain_of = [0] * len(events)
+        chain_end = None
+        for idx in sorted(range(len(events)), key=lambda i: bounds[i]):
+            start, end = bounds[idx]
+            if chain_end is None or start > chain_end + self.back_to_back_gap:
+                chains.append([])
+                chain_end = end
+            chains[-1].append(idx)
+            chain_end = max(chain_end, end)
+            chain_of[idx] = len(chains) - 1
+        return chains, chain_of
+
+    def scan(self, events: list[dict[str, Any]]) -> dict[str, Any]:
+        """
+        Problems inside a calendar: overlapping pairs, long back-to-back
+        chains and travel-buffer violations between consecutive meetings.
+        """
+        events = blocking_events(events)
+        bounds = [(to_timestamp(e["start"]), to_timestamp(e["end"])) for e in events]
+        points = sorted(
+            (t, kind, idx)
+            for idx, (start, end) in enumerate(bounds)
+            for t, kind in ((start, _START), (end, _END))
+        )
+
+        overlaps, travel = [], []
+        active: set[int] = set()
+        last_ended: int | None = None
+        for t, kind, idx in points:
+            if kind == _END:
+                active.discard(idx)
+                if last_ended is None or bounds[idx][1] >= bounds[last_ended][1]:
+                    last_ended = idx
+                continue
+            for other in active:
+                overlaps.append({
+                    "event_ids": [events[other].get("event_id"), events[idx].get("event_id")],
+                    "start": events[idx]["start"],
+                    "end": min((events[other], events[idx]), key=lambda e: to_timestamp(e["end"]))["end"]
+                })
+            if last_ended is not None:
+                violation = self._travel_violation(events[last_ended], events[idx], t - bounds[last_ended][1])
+                if violation:
+                    travel.append(violation)
+            active.add(idx)
+
+        chains, _ = self._chains(events, bounds)
+        long_chains = [
+            {
+                "event_ids": [events[i].get("event_id") for i in chain],
+                "length": len(chain),
+                "start": events[chain[0]]["start"],
+                "end": max((events[i] for i in chain), key=lambda e: to_timestamp(e["end"]))["end"]
+            }
+            for chain in chains if len(chain) >= self.max_back_to_back
+        ]
+        return {
+            "overlaps": overlaps,
+            "back_to_back_chains": long_chains,
+            "travel_violations": travel,
+            "has_conflicts": bool(overlaps or long_chains or travel)
+        }
+
+    def check(self, events: list[dict[str, Any]], proposals: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """
+        Check proposed slots against a calendar in one sweep.
+
+        Args:
+            events: Calendar events covering the proposals
+            proposals: Dicts with "start", "end" and optionally "location"
+                and "event_id" (an existing event being moved or answered;
+                it is not counted as conflicting with itself)
+
+        Returns:
+            One report per proposal, in order: overlapping events, the
+            neighbouring meetings it would run into back-to-back, travel
+            violations, and "ok" when there is nothing to flag
+        """
+        own_ids = {p.get("event_id") for p in proposals if p.get("event_id")}
+        events = [e for e in blocking_events(events) if e.get("event_id") not in own_ids]
+        bounds = [(to_timestamp(e["start"]), to_timestamp(e["end"])) for e in events]
+        slots = [(to_timestamp(p["start"]), to_timestamp(p["end"])) for p in proposals]
+
+        points = [
+            (t, kind, who, idx)
+            for who, intervals in ((_EVENT, bounds), (_PROPOSAL, slots))
+            for idx, (start, end) in enumerate(intervals)
+            for t, kind in ((start, _START), (end, _END))
+        ]
+        points.sort()
+
+        overlapping: list[list[int]] = [[] for _ in proposals]
+        before: list[int | None] = [None] * len(proposals)
+        active_events: set[int] = set()
+        active_proposals: set[int] = set()
+        last_ended: int | None = None
+        for _, kind, who, idx in points:
+            if kind == _END:
+                if who == _EVENT:
+                    active_events.discard(idx)
+                    if last_ended is None or bounds[idx][1] >= bounds[last_ended][1]:
+                        last_ended = idx
+                else:
+                    active_proposals.discard(idx)
+            elif who == _EVENT:
+                for proposal in active_proposals:
+                    overlapping[proposal].append(idx)
+                active_events.add(idx)
+            else:
+                overlapping[idx].extend(active_events)
+                before[idx] = last_ended
+                active_proposals.add(idx)
+
+        # Next meeting after each proposal: first event starting at/after its end
+        by_start = sorted(range(len(events)), key=lambda i: bounds[i][0])
+        starts = [bounds[i][0] for i in by_start]
+        chains, chain_of = self._chains(events, bounds)
+
+        reports = []
+        for idx, proposal in enumerate(proposals):
+            start, end = slots[idx]
+            position = bisect_left(starts, end)
+            after = by_start[position] if position < len(starts) else None
+
+            neighbours = {}
+            chain_length = 1
+            counted_chains = set()
+            for side, other in (("before", before[idx]), ("after", after)):
+                if other is None:
+                    continue
+                gap = start - bounds[other][1] if side == "before" else bounds[other][0] - end
+                if gap <= self.back_to_back_gap:
+                    neighbours[side] = events[other].get("event_id")
+                    if chain_of[other] not in counted_chains:
+                        counted_chains.add(chain_of[other])
+                        chain_length += len(chains[chain_of[other]])
+
+            travel = [
+                violation for violation in (
+                    self._travel_violation(events[before[idx]], proposal, start - bounds[before[idx]][1])
+                    if before[idx] is not None else None,
+                    self._travel_violation(proposal, events[after], bounds[after][0] - end)
+                    if after is not None else None
+                )
+                if violation
+            ]
+            conflicts = [_summary(events[i]) for i in sorted(overlapping[idx], key=lambda i: bounds[i])]
+            too_long = chain_length >= self.max_back_to_back
+            reports.append({
+                "start": proposal["start"],
+                "end": proposal["end"],
+                "conflict": bool(conflicts),
+                "overlapping_events": conflicts,
+                "back_to_back": {
+                    "before": neighbours.get("before"),
+                    "after": neighbours.get("after"),
+                    "chain_length": chain_length,
+                    "exceeds_limit": too_long
+                },
+                "travel_violations": travel,
+                "ok": not conflicts and not travel and not too_long
+            })
+        return reports
+
+
+__all__ = ["ConflictDetector", "is_physical_location"]
@@ -0,0 +1,299 @@
+"""
+Local calendar event store
+Keeps a synced copy of a Google Calendar in memory behind an interval index,
+so day / week / "tomorrow" views are answered locally, and brings it up to
+date incrementally with Calendar sync tokens. Recurring series are stored
+once and expanded per query window.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from datetime import datetime
+from typing import Any
+
+from .google_calendar_helpers import EVENT_LIST_FIELDS, format_event, to_timestamp
+from .recurrence import RecurrenceExpander, RecurringSeries
+
+
+class _Node:
+    __slots__ = ("center", "by_start", "by_end", "left", "right")
+
+    def __init__(self, center: float, by_start: list, by_end: list):
+        self.center = center
+        self.by_start = by_start
+        self.by_end = by_end
+        self.left: _Node | None = None
+        self.right: _Node | None = None
+
+
+class IntervalIndex:
+    """
+    Static centered interval tree over (start, end, key) triples.
+
+    Each node keeps the intervals containing its center sorted by start and
+    by end, so an overlap query visits O(log n) nodes and only scans
+    intervals it reports: O(log n + k).
+    """
+
+    def __init__(self, intervals: list[tuple[float, float, str]]):
+        self.size = len(intervals)
+        self._root = self._build(intervals)
+
+    @classmethod
+    def _build(cls, intervals: list[tuple[float, float, str]]) -> _Node | None:
+        if not intervals:
+            return None
+        endpoints = sorted(p for s, e, _ in intervals for p in (s, e))
+        # An actual endpoint, so at least one interval stays at this node
+        center = endpoints[len(endpoints) // 2]
+        left, right, here = [], [], []
+        for interval in intervals:
+            if interval[1] < center:
+                left.append(interval)
+            elif interval[0] > center:
+                right.append(interval)
+            else:
+                here.append(interval)
+        node = _Node(
+            center,
+            sorted(here, key=lambda i: i[0]),
+            sorted(here, key=lambda i: i[1], reverse=True)
+        )
+        node.left = cls._build(left)
+        node.right = cls._build(right)
+        return node
+
+    def overlapping(self, start: float, end: float) -> list[str]:
+        """Keys of intervals with interval_start < end and interval_end > start"""
+        keys: list[str] = []
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            if node is None:
+                continue
+            if end <= node.center:
+                # Every interval here ends at/after center >= end > start
+                for s, _, key in node.by_start:
+                    if s >= end:
+                        break
+                    keys.append(key)
+                stack.append(node.left)
+            elif start >= node.center:
+                # Every interval here starts at/before center <= start < end
+                for _, e, key in node.by_end:
+                    if e <= start:
+                        break
+                    keys.append(key)
+                stack.append(node.right)
+            else:
+                keys.extend(key for _, _, key in node.by_start)
+                stack.append(node.left)
+                stack.append(node.right)
+        return keys
+
+
+class CalendarEventStore:
+    """
+    In-memory copy of one calendar.
+
+    Single events are kept as adapter event dicts keyed by event_id behind
+    the interval index, which is rebuilt lazily on the first query after a
+    change, so a sync applying many changes pays for one rebuild.
+
+    Recurring series masters (events carrying "recurrence") are kept as
+    RecurringSeries and expanded by the RecurrenceExpander for each query.
+    Exceptions (events carrying "original_start") replace the instance they
+    were split from: moved or edited ones are indexed as single events,
+    cancelled ones only hide the instance.
+    """
+
+    def __init__(self, expander: RecurrenceExpander | None = None):
+        self._events: dict[str, dict[str, Any]] = {}
+        self._bounds: dict[str, tuple[float, float]] = {}
+        self._index: IntervalIndex | None = None
+        self._series: dict[str, RecurringSeries] = {}
+        # series_id -> original start timestamps replaced by exceptions
+        self._exceptions: dict[str, dict[float, str]] = {}
+        self._exception_of: dict[str, tuple[str, float]] = {}
+        self.expander = expander or RecurrenceExpander()
+        self._lock = threading.Lock()
+        self.sync_token: str | None = None
+        self.time_zone: str | None = None
+
+    def __len__(self) -> int:
+        return len(self._events) + len(self._series)
+
+    def _put(self, event: dict[str, Any]) -> None:
+        event_id = event["event_id"]
+        self._remove(event_id)
+        if event.get("recurrence"):
+            self._series[event_id] = RecurringSeries({"time_zone": self.time_zone, **event})
+            return
+        if event.get("original_start") and event.get("recurring_event_id"):
+            key = (event["recurring_event_id"], to_timestamp(event["original_start"]))
+            self._exceptions.setdefault(key[0], {})[key[1]] = event_id
+            self._exception_of[event_id] = key
+            if event.get("status") == "cancelled":
+                return
+        self._events[event_id] = event
+        self._bounds[event_id] = (to_timestamp(event["start"]), to_timestamp(event["end"]))
+
+    def _remove(self, event_id: str) -> None:
+        self._events.pop(event_id, None)
+        self._bounds.pop(event_id, None)
+        self._series.pop(event_id, None)
+        series_id, original_start = self._exception_of.pop(event_id, (None, None))
+        if series_id is not None:
+            self._exceptions[series_id].pop(original_start, None)
+
+    def replace_all(self, events: list[dict[str, Any]], sync_token: str | None, time_zone: str | None = None) -> None:
+        with self._lock:
+            self._events.clear()
+            self._bounds.clear()
+            self._series.clear()
+            self._exceptions.clear()
+            self._exception_of.clear()
+            self.time_zone = time_zone
+            for event in events:
+                self._put(event)
+            self.sync_token = sync_token
+            self._index = None
+
+    def apply_changes(self, upserts: list[dict[str, Any]], deleted_ids: list[str], sync_token: str | None) -> None:
+        with self._lock:
+            for event_id in deleted_ids:
+                self._remove(event_id)
+            for event in upserts:
+                self._put(event)
+            self.sync_token = sync_token
+            self._index = None
+
+    def upsert(self, event: dict[str, Any]) -> None:
+        """Write-through of a locally created or changed event"""
+        with self._lock:
+            self._put(event)
+            self._index = None
+
+    def delete(self, event_id: str) -> None:
+        with self._lock:
+            self._remove(event_id)
+            self._index = None
+
+    def get(self, event_id: str) -> dict[str, Any] | None:
+        event = self._events.get(event_id)
+        if event is None and event_id in self._series:
+            event = self._series[event_id].master
+        return event
+
+    def query(self, start_time: datetime, end_time: datetime) -> list[dict[str, Any]]:
+        """Events and recurring instances overlapping [start_time, end_time), ordered by start"""
+        start_ts, end_ts = to_timestamp(start_time), to_timestamp(end_time)
+        with self._lock:
+            if self._index is None:
+                self._index = IntervalIndex([(s, e, key) for key, (s, e) in self._bounds.items()])
+            timed = [(self._bounds[key][0], self._events[key]) for key in self._index.overlapping(start_ts, end_ts)]
+            for series_id, series in self._series.items():
+                timed.extend(self.expander.expand(series, start_ts, end_ts, skip=self._exceptions.get(series_id)))
+        timed.sort(key=lambda pair: (pair[0], pair[1]["event_id"]))
+        return [event for _, event in timed]
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "events": len(self._events),
+            "recurring_series": len(self._series),
+            "sync_token": self.sync_token,
+            "time_zone": self.time_zone,
+            "expansion_cache": self.expander.stats()
+        }
+
+
+def _is_gone(error: Exception) -> bool:
+    return getattr(getattr(error, "resp", None), "status", None) == 410
+
+
+class CalendarSyncEngine:
+    """
+    Keeps a CalendarEventStore in step with Google Calendar.
+
+    The first sync pages through events.list and keeps the final
+    nextSyncToken. Recurring events arrive unexpanded (a series master plus
+    its exceptions), so an endless series is one item. Later syncs pass
+    the syncToken and receive only events changed since, including
+    cancelled ones, which are removed. When the token has expired
+    (410 Gone) the engine falls back to a full resync.
+    """
+
+    def __init__(self, calendar, store: CalendarEventStore, calendar_id: str = "primary", page_size: int = 250):
+        self.calendar = calendar
+        self.store = store
+        self.calendar_id = calendar_id
+        self.page_size = page_size
+        self.last_sync: dict[str, Any] | None = None
+
+    async def sync(self, force_full: bool = False) -> dict[str, Any]:
+        """Bring the store up to date; returns a summary of what changed"""
+        if force_full or self.store.sync_token is None:
+            return await self.full_sync()
+        return await self.incremental_sync()
+
+    async def _list_pages(self, **params: Any) -> tuple[list[dict], str | None, str | None, int]:
+        """All pages of events.list -> (items, nextSyncToken, timeZone, pages)"""
+        items: list[dict] = []
+        page_token = None
+        pages = 0
+        while True:
+            results = await self.calendar.execute_request(self.calendar.service.events().list(
+                calendarId=self.calendar_id,
+                singleEvents=False,
+                maxResults=self.page_size,
+                pageToken=page_token,
+                fields=EVENT_LIST_FIELDS,
+                **params
+            ))
+            pages += 1
+            items.extend(results.get("items", []))
+            page_token = results.get("nextPageToken")
+            if not page_token:
+                return items, results.get("nextSyncToken"), results.get("timeZone"), pages
+
+    async def full_sync(self, reason: str = "initial") -> dict[str, Any]:
+        started = time.perf_counter()
+        items, sync_token, time_zone, pages = await self._list_pages(showDeleted=False)
+        # Cancelled instances of a series are still listed; they hide the instance
+        events = [
+            format_event(item, time_zone) for item in items
+            if item.get("status") != "cancelled" or item.get("recurringEventId")
+        ]
+        self.store.replace_all(events, sync_token, time_zone)
+        return self._finish(started, mode="full", reason=reason, added=len(events), pages=pages)
+
+    async def incremental_sync(self) -> dict[str, Any]:
+        started = time.perf_counter()
+        try:
+            items, sync_token, _, pages = await self._list_pages(syncToken=self.store.sync_token)
+        except Exception as e:
+            if _is_gone(e):
+                return await self.full_sync(reason="sync_token_expired")
+            raise
+
+        deleted = [
+            item["id"] for item in items
+            if item.get("status") == "cancelled" and not item.get("recurringEventId")
+        ]
+        upserts = [
+            format_event(item, self.store.time_zone)
+            for item in items if item.get("status") != "cancelled" or item.get("recurringEventId")
+        ]
+        self.store.apply_changes(upserts, deleted, sync_token)
+        return self._finish(started, mode="incremental", updated=len(upserts), deleted=len(deleted), pages=pages)
+
+    def _finish(self, started: float, **summary: Any) -> dict[str, Any]:
+        summary["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 2)
+        summary["synced_at"] = datetime.utcnow().isoformat() + 'Z'
+        self.last_sync = summary
+        return summary
+
+
+__all__ = ["IntervalIndex", "CalendarEventStore", "CalendarSyncEngine"]
@@ -0,0 +1,345 @@
+"""
+In-process fake of the Google Calendar API service
+Mimics the subset of ``googleapiclient`` resources used by
+GoogleCalendarAdapter and CalendarSyncEngine (events.list with sync tokens,
+get, insert, delete, freebusy.query) so calendar code runs without network
+or credentials. Attendee calendars are keyed by email address. Recurring
+series are stored as a master plus exceptions, as Calendar does.
+
+Usage:
+    service = FakeCalendarService()
+    service.add_event("Board meeting", start, end, attendees=["cfo@company.com"])
+    adapter = GoogleCalendarAdapter(service=service)
+"""
+
+from __future__ import annotations
+
+import itertools
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any
+
+from ..email.fake_gmail_service import FakeRequest, _Resource, _http_error, _not_found
+from .google_calendar_helpers import format_event, parse_event_time
+from .recurrence import RecurringSeries, instance_id
+
+
+def _gone() -> Exception:
+    return _http_error(410, "Sync token is no longer valid, a full sync is required.")
+
+
+class FakeCalendarService:
+    """
+    Fake Calendar service holding in-memory calendars.
+
+    Every change bumps a sequence number; sync tokens encode the sequence
+    they were issued at, so events.list(syncToken=...) returns exactly the
+    events changed since (deleted events as status "cancelled") until
+    expire_sync_tokens() is called, after which old tokens get 410 Gone.
+
+    Attributes:
+        latency: Seconds each execute() sleeps (simulates network time)
+        calls: Number of execute() calls made
+        list_calls: Number of events.list pages served
+    """
+
+    def __init__(self, latency: float = 0.0, time_zone: str = "UTC", user_email: str = "me@company.com"):
+        self.latency = latency
+        self.gate: threading.Event | None = None
+        self.time_zone = time_zone
+        self.user_email = user_email
+        self.calls = 0
+        self.list_calls = 0
+        # calendar_id -> event_id -> resource (cancelled events kept as tombstones)
+        self.calendars: dict[str, dict[str, dict]] = {"primary": {}}
+        self.sequence = 0
+        self._token_floor = 0
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    # -- calendar setup --------------------------------------------------
+
+    def _touch(self, resource: dict) -> None:
+        with self._lock:
+            self.sequence += 1
+            resource["_sequence"] = self.sequence
+            resource["updated"] = datetime.now(timezone.utc).isoformat()
+
+    def add_event(
+        self,
+        title: str,
+        start: datetime,
+        end: datetime,
+        attendees: list[str] | None = None,
+        calendar_id: str = "primary",
+        location: str | None = None,
+        all_day: bool = False
+    ) -> dict:
+        """Add an event and return its resource"""
+        if all_day:
+            times = {"start": {"date": start.date().isoformat()}, "end": {"date": end.date().isoformat()}}
+        else:
+            times = {"start": {"dateTime": start.isoformat()}, "end": {"dateTime": end.isoformat()}}
+        return self._insert(calendar_id, {
+            "summary": title,
+            **times,
+            "attendees": [{"email": email} for email in (attendees or [])],
+            **({"location": location} if location else {})
+        })
+
+    def _insert(self, calendar_id: str, body: dict) -> dict:
+        with self._lock:
+            number = next(self._ids)
+        resource = {
+            "id": f"evt{number:06d}",
+            "status": "confirmed",
+            "organizer": {"email": self.user_email},
+            **body,
+            "attendees": [
+                {"email": a["email"], "responseStatus": a.get("responseStatus", "needsAction"),
+                 **({"self": True} if a["email"] == self.user_email else {})}
+                for a in body.get("attendees", [])
+            ]
+        }
+        self.calendars.setdefault(calendar_id, {})[resource["id"]] = resource
+        self._touch(resource)
+        return resource
+
+    def add_recurring_event(
+        self,
+        title: str,
+        start: datetime,
+        end: datetime,
+        recurrence: list[str],
+        time_zone: str | None = None,
+        attendees: list[str] | None = None,
+        calendar_id: str = "primary"
+    ) -> dict:
+        """Add a series master (start/end are the first instance, recurrence RFC 5545 lines)"""
+        zone = time_zone or self.time_zone
+        return self._insert(calendar_id, {
+            "summary": title,
+            "start": {"dateTime": start.isoformat(), "timeZone": zone},
+            "end": {"dateTime": end.isoformat(), "timeZone": zone},
+            "recurrence": list(recurrence),
+            "attendees": [{"email": email} for email in (attendees or [])]
+        })
+
+    def override_instance(
+        self,
+        series_id: str,
+        original_start: datetime,
+        new_start: datetime | None = None,
+        new_end: datetime | None = None,
+        cancel: bool = False,
+        calendar_id: str = "primary"
+    ) -> dict:
+        """Move or cancel one instance of a series by creating its exception event"""
+        master = self.calendars[calendar_id][series_id]
+        event_id = instance_id(series_id, original_start)
+        resource = self.calendars[calendar_id].get(event_id) or {
+            **{k: v for k, v in master.items() if k not in ("recurrence", "id")},
+            "id": event_id,
+            "recurringEventId": series_id,
+            "originalStartTime": {"dateTime": original_start.isoformat(), "timeZone": master["start"].get("timeZone")}
+        }
+        if cancel:
+            resource = {k: resource[k] for k in ("id", "recurringEventId", "originalStartTime")}
+            resource["status"] = "cancelled"
+        else:
+            series = RecurringSeries(format_event(master, self.time_zone))
+            start = new_start or original_start
+            end = new_end or start + series.duration
+            resource["start"] = {"dateTime": start.isoformat()}
+            resource["end"] = {"dateTime": end.isoformat()}
+        self.calendars[calendar_id][event_id] = resource
+        self._touch(resource)
+        return resource
+
+    def update_event(self, event_id: str, calendar_id: str = "primary", **fields: Any) -> dict:
+        """Change fields of an event (e.g. summary=..., start={...})"""
+        resource = self.calendars[calendar_id][event_id]
+        resource.update(fields)
+        self._touch(resource)
+        return resource
+
+    def cancel_event(self, event_id: str, calendar_id: str = "primary") -> None:
+        """Delete an event (a series with its exceptions); it stays visible to sync tokens as cancelled"""
+        resource = self.calendars[calendar_id][event_id]
+        resource["status"] = "cancelled"
+        self._touch(resource)
+        for exception in self.calendars[calendar_id].values():
+            if exception.get("recurringEventId") == event_id and exception["status"] != "cancelled":
+                exception["status"] = "cancelled"
+                self._touch(exception)
+
+    def expire_sync_tokens(self) -> None:
+        """Invalidate issued sync tokens so they get 410 Gone, as Calendar does"""
+        with self._lock:
+            self._token_floor = self.sequence + 1
+
+    # -- googleapiclient surface ----------------------------------------
+
+    def events(self) -> _Resource:
+        return _Resource(
+            list=self._events_list,
+            get=self._events_get,
+            insert=self._events_insert,
+            delete=self._events_delete,
+        )
+
+    def freebusy(self) -> _Resource:
+        return _Resource(query=self._freebusy_query)
+
+    def _before_execute(self) -> None:
+        with self._lock:
+            self.calls += 1
+        if self.gate is not None:
+            self.gate.wait()
+        if self.latency:
+            time.sleep(self.latency)
+
+    def _request(self, fn) -> FakeRequest:
+        return FakeRequest(self, fn)
+
+    @staticmethod
+    def _public(resource: dict) -> dict:
+        return {k: v for k, v in resource.items() if not k.startswith("_")}
+
+    def _bounds(self, resource: dict) -> tuple[datetime, datetime]:
+        # Cancelled instances only carry their original start
+        start, _ = parse_event_time(resource.get("start") or resource["originalStartTime"], self.time_zone)
+        end, _ = parse_event_time(resource.get("end") or resource["originalStartTime"], self.time_zone)
+        return start, end
+
+    def _single_events(self, resources: list[dict], low: datetime | None, high: datetime | None) -> list[dict]:
+        """Replace series masters by their instances in [low, high) (singleEvents=True)"""
+        replaced = {
+            (r["recurringEventId"], parse_event_time(r["originalStartTime"], self.time_zone)[0].timestamp())
+            for r in resources if r.get("recurringEventId")
+        }
+        expanded = []
+        for resource in resources:
+            if not resource.get("recurrence"):
+                expanded.append(resource)
+                continue
+            if resource["status"] == "cancelled":
+                continue
+            series = RecurringSeries(format_event(resource, self.time_zone))
+            window_start = low.timestamp() - series.duration.total_seconds() if low else series.first_start
+            window_end = high.timestamp() if high else series.first_start + 366 * 86400
+            for start_ts in series.occurrences(window_start, window_end):
+                if (resource["id"], start_ts) in replaced:
+                    continue
+                instance = series.instance(start_ts)
+                expanded.append({
+                    **{k: v for k, v in resource.items() if k != "recurrence"},
+                    "id": instance["event_id"],
+                    "start": {"dateTime": instance["start"]},
+                    "end": {"dateTime": instance["end"]},
+                    "recurringEventId": resource["id"],
+                    "originalStartTime": {"dateTime": instance["start"]}
+                })
+        return expanded
+
+    # -- events ------------------------------------------------------------
+
+    def _events_list(
+        self,
+        calendarId: str = "primary",
+        syncToken: str | None = None,
+        timeMin: str | None = None,
+        timeMax: str | None = None,
+        showDeleted: bool = False,
+        maxResults: int = 250,
+        pageToken: str | None = None,
+        orderBy: str | None = None,
+        singleEvents: bool = False,
+        **kwargs
+    ) -> FakeRequest:
+        def run():
+            self.list_calls += 1
+            resources = list(self.calendars.get(calendarId, {}).values())
+            if syncToken is not None:
+                since = int(syncToken.split("-")[1])
+                if since < self._token_floor:
+                    raise _gone()
+                matches = [r for r in resources if r["_sequence"] > since]
+            else:
+                low = datetime.fromisoformat(timeMin) if timeMin else None
+                high = datetime.fromisoformat(timeMax) if timeMax else None
+                matches = self._single_events(resources, low, high) if singleEvents else resources
+                # Cancelled instances of a series are listed unless expanding
+                matches = [
+                    r for r in matches
+                    if showDeleted or r["status"] != "cancelled" or (r.get("recurringEventId") and not singleEvents)
+                ]
+                if timeMin or timeMax:
+                    matches = [
+                        r for r in matches
+                        if (low is None or self._bounds(r)[1] > low) and (high is None or self._bounds(r)[0] < high)
+                    ]
+            if orderBy == "startTime":
+                matches.sort(key=lambda r: self._bounds(r)[0])
+
+            offset = int(pageToken or 0)
+            result: dict[str, Any] = {
+                "items": [self._public(r) for r in matches[offset:offset + maxResults]],
+                "timeZone": self.time_zone
+            }
+            if offset + maxResults < len(matches):
+                result["nextPageToken"] = str(offset + maxResults)
+            else:
+                result["nextSyncToken"] = f"st-{self.sequence}"
+            return result
+        return self._request(run)
+
+    def _freebusy_query(self, body: dict | None = None, **kwargs) -> FakeRequest:
+        def run():
+            body_ = body or {}
+            if len(body_.get("items", [])) > 50:
+                raise _http_error(400, "Too many calendars requested")
+            low = datetime.fromisoformat(body_["timeMin"])
+            high = datetime.fromisoformat(body_["timeMax"])
+            calendars = {}
+            for item in body_.get("items", []):
+                events = self.calendars.get(item["id"])
+                if events is None:
+                    calendars[item["id"]] = {"errors": [{"domain": "global", "reason": "notFound"}], "busy": []}
+                    continue
+                resources = [r for r in events.values() if r["status"] != "cancelled" or r.get("recurringEventId")]
+                busy = sorted(
+                    (max(s, low), min(e, high))
+                    for s, e in (
+                        self._bounds(r) for r in self._single_events(resources, low, high)
+                        if r["status"] != "cancelled"
+                    )
+                    if s < high and e > low
+                )
+                calendars[item["id"]] = {"busy": [{"start": s.isoformat(), "end": e.isoformat()} for s, e in busy]}
+            return {"timeMin": body_["timeMin"], "timeMax": body_["timeMax"], "calendars": calendars}
+        return self._request(run)
+
+    def _events_get(self, calendarId: str = "primary", eventId: str = "", **kwargs) -> FakeRequest:
+        def run():
+            resource = self.calendars.get(calendarId, {}).get(eventId)
+            if resource is None or resource["status"] == "cancelled":
+                raise _not_found()
+            return self._public(resource)
+        return self._request(run)
+
+    def _events_insert(self, calendarId: str = "primary", body: dict | None = None, **kwargs) -> FakeRequest:
+        return self._request(lambda: self._public(self._insert(calendarId, dict(body or {}))))
+
+    def _events_delete(self, calendarId: str = "primary", eventId: str = "", **kwargs) -> FakeRequest:
+        def run():
+            resource = self.calendars.get(calendarId, {}).get(eventId)
+            if resource is None or resource["status"] == "cancelled":
+                raise _not_found()
+            self.cancel_event(eventId, calendarId)
+            return ""
+        return self._request(run)
+
+
+__all__ = ["FakeCalendarService"]
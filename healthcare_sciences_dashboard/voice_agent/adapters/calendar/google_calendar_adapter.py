@@ -3,25 +3,57 @@ Google Calendar API Adapter
 Implementation for Google Calendar using Google's Calendar API
 """
 
-from .base import BaseCalendarAdapter
+import asyncio
+import os
+from .base import BaseCalendarAdapter, availability_result
+from .google_calendar_helpers import EVENT_FIELDS, EVENT_LIST_FIELDS, event_body, format_event, rfc3339
+from ...utils.blocking_executor import BlockingCallExecutor
 from typing import Any
 from datetime import datetime, timedelta
 
 
+# Process-wide pool for blocking Calendar API calls, sized by CALENDAR_MAX_WORKERS
+CALENDAR_EXECUTOR = BlockingCallExecutor(
+    max_workers=int(os.getenv("CALENDAR_MAX_WORKERS", "4")),
+    default_timeout=float(os.getenv("CALENDAR_CALL_TIMEOUT", "30")),
+    name="calendar"
+)
+
+
 class GoogleCalendarAdapter(BaseCalendarAdapter):
     """
     Google Calendar adapter using Google Calendar API.
     Requires: google-auth, google-auth-oauthlib, google-auth-httplib2, google-api-python-client
+
+    Without a service (credentials not wired up yet) events are generated
+    mock data. Blocking API calls run on CALENDAR_EXECUTOR.
     """
 
-    def __init__(self, credentials_path: str | None = None):
+    # freebusy.query accepts at most 50 calendars per request
+    freebusy_batch_size = 50
+
+    def __init__(
+        self,
+        credentials_path: str | None = None,
+        service: Any = None,
+        executor: BlockingCallExecutor | None = None
+    ):
         self.credentials_path = credentials_path
-        self.service = None
-        # TODO: Initialize Google Calendar API service
+        self.service = service
+        self.executor = executor or CALENDAR_EXECUTOR
+        # TODO: Initialize Google Calendar API service from credentials
         # from googleapiclient.discovery import build
         # from google.oauth2.credentials import Credentials
         # self.service = build('calendar', 'v3', credentials=creds)
 
+    async def execute_request(self, request, timeout: float | None = None):
+        """Run a googleapiclient request on the calendar executor"""
+        try:
+            return await self.executor.run(request.execute, timeout=timeout)
+        except asyncio.TimeoutError:
+            limit = timeout if timeout is not None else self.executor.default_timeout
+            raise TimeoutError(f"Calendar API call timed out after {limit}s") from None
+
     async def get_events(
         self,
         start_time: datetime,
@@ -33,9 +65,29 @@ class GoogleCalendarAdapter(BaseCalendarAdapter):
         In mock mode (no API configured), generate a reasonable list of events
         within the requested time window so the UI can display a full schedule.
         """
-        # TODO: Implement actual Google Calendar API fetching when creds exist
-        # For now return deterministic mock events across the window
+        if self.service is None:
+            return self._get_mock_events(start_time, end_time)
 
+        events: list[dict[str, Any]] = []
+        page_token = None
+        while True:
+            results = await self.execute_request(self.service.events().list(
+                calendarId=calendar_id,
+                timeMin=rfc3339(start_time),
+                timeMax=rfc3339(end_time),
+                singleEvents=True,
+                orderBy="startTime",
+                maxResults=250,
+                pageToken=page_token,
+                fields=EVENT_LIST_FIELDS
+            ))
+            events.extend(format_event(item, results.get("timeZone")) for item in results.get("items", []))
+            page_token = results.get("nextPageToken")
+            if not page_token:
+                return events
+
+    def _get_mock_events(self, start_time: datetime, end_time: datetime) -> list[dict[str, Any]]:
+        """Deterministic mock events across the window"""
         events: list[dict[str, Any]] = []
         cur = start_time
         index = 0
@@ -70,8 +122,13 @@ class GoogleCalendarAdapter(BaseCalendarAdapter):
 
     async def get_event(self, event_id: str) -> dict[str, Any]:
         """Get event details from Google Calendar"""
-        # TODO: Implement actual Google Calendar API fetching
-        # service.events().get(calendarId='primary', eventId=event_id).execute()
+        if self.service is not None:
+            resource = await self.execute_request(self.service.events().get(
+                calendarId="primary",
+                eventId=event_id,
+                fields=EVENT_FIELDS
+            ))
+            return format_event(resource)
 
         return {
             "event_id": event_id,
@@ -95,15 +152,18 @@ class GoogleCalendarAdapter(BaseCalendarAdapter):
         calendar_id: str = "primary"
     ) -> dict[str, Any]:
         """Create event in Google Calendar"""
-        # TODO: Implement actual Google Calendar API creation
-        # event = {
-        #     'summary': title,
-        #     'description': description,
-        #     'start': {'dateTime': start_time.isoformat(), 'timeZone': 'UTC'},
-        #     'end': {'dateTime': end_time.isoformat(), 'timeZone': 'UTC'},
-        #     'attendees': [{'email': email} for email in (attendees or [])],
-        # }
-        # result = service.events().insert(calendarId=calendar_id, body=event).execute()
+        if self.service is not None:
+            resource = await self.execute_request(self.service.events().insert(
+                calendarId=calendar_id,
+                body=event_body(title, start_time, end_time, attendees, description, location),
+                sendUpdates="all" if attendees else "none"
+            ))
+            return {
+                "success": True,
+                "event_id": resource["id"],
+                "event": format_event(resource),
+                "details": "Event created"
+            }
 
         return {
             "success": True,
@@ -156,16 +216,42 @@ class GoogleCalendarAdapter(BaseCalendarAdapter):
         calendar_id: str = "primary"
     ) -> dict[str, Any]:
         """Check availability in Google Calendar"""
-        # TODO: Implement actual availability check
-        # service.freebusy().query(body={...}).execute()
+        if self.service is None:
+            return {
+                "available": True,
+                "conflicting_events": []
+            }
+        events = await self.get_events(start_time, end_time, calendar_id)
+        return availability_result(events, start_time, end_time)
 
-        return {
-            "available": True,
-            "conflicting_events": []
-        }
+    async def get_free_busy(
+        self,
+        calendar_ids: list[str],
+        start_time: datetime,
+        end_time: datetime
+    ) -> dict[str, list[tuple[str, str]]]:
+        """Busy intervals from freebusy.query, 50 calendars per request"""
+        if self.service is None:
+            return await super().get_free_busy(calendar_ids, start_time, end_time)
+
+        busy: dict[str, list[tuple[str, str]]] = {}
+        for offset in range(0, len(calendar_ids), self.freebusy_batch_size):
+            chunk = calendar_ids[offset:offset + self.freebusy_batch_size]
+            results = await self.execute_request(self.service.freebusy().query(body={
+                "timeMin": rfc3339(start_time),
+                "timeMax": rfc3339(end_time),
+                "items": [{"id": calendar_id} for calendar_id in chunk]
+            }))
+            for calendar_id in chunk:
+                entry = results.get("calendars", {}).get(calendar_id, {})
+                if entry.get("errors"):
+                    # Calendar not shared with us: treat the attendee as free
+                    print(f"Free/busy unavailable for {calendar_id}: {entry['errors']}")
+                busy[calendar_id] = [(b["start"], b["end"]) for b in entry.get("busy", [])]
+        return busy
 
     async def delete_event(self, event_id: str) -> bool:
         """Delete event from Google Calendar"""
-        # TODO: Implement actual Google Calendar API deletion
-        # service.events().delete(calendarId='primary', eventId=event_id).execute()
+        if self.service is not None:
+            await self.execute_request(self.service.events().delete(calendarId="primary", eventId=event_id))
         return True
@@ -0,0 +1,131 @@
+"""
+Google Calendar helper functions
+Conversion between Calendar API event resources and the adapter's event dicts
+"""
+
+from __future__ import annotations
+
+from datetime import date, datetime, time, timezone
+from typing import Any
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+
+# Fields requested from events.list / events.get
+EVENT_FIELDS = (
+    "id,status,summary,description,location,start,end,attendees(email,responseStatus,self),"
+    "organizer(email),recurrence,recurringEventId,originalStartTime,updated"
+)
+EVENT_LIST_FIELDS = f"items({EVENT_FIELDS}),nextPageToken,nextSyncToken,timeZone"
+
+
+def _zone(name: str | None) -> ZoneInfo | timezone:
+    if not name:
+        return timezone.utc
+    try:
+        return ZoneInfo(name)
+    except ZoneInfoNotFoundError:
+        return timezone.utc
+
+
+def parse_event_time(value: dict[str, Any], calendar_time_zone: str | None = None) -> tuple[datetime, bool]:
+    """
+    Parse an event start/end ({"dateTime"} or {"date"}) to an aware datetime.
+
+    All-day dates start at midnight in the calendar's time zone.
+
+    Returns:
+        (datetime, all_day)
+    """
+    if value.get("dateTime"):
+        parsed = datetime.fromisoformat(value["dateTime"].replace("Z", "+00:00"))
+        if parsed.tzinfo is None:
+            parsed = parsed.replace(tzinfo=_zone(value.get("timeZone") or calendar_time_zone))
+        return parsed, False
+    day = date.fromisoformat(value["date"])
+    return datetime.combine(day, time.min, tzinfo=_zone(value.get("timeZone") or calendar_time_zone)), True
+
+
+def format_event(resource: dict[str, Any], calendar_time_zone: str | None = None) -> dict[str, Any]:
+    """
+    Calendar API event resource -> adapter event dict.
+
+    Series masters also carry "recurrence", "time_zone" and "updated";
+    exceptions carry "original_start". A cancelled exception may have no
+    times at all and is returned with its identifying fields only.
+    """
+    original_start = None
+    if resource.get("originalStartTime"):
+        original_start = parse_event_time(resource["originalStartTime"], calendar_time_zone)[0].isoformat()
+    if "start" not in resource:
+        return {
+            "event_id": resource["id"],
+            "status": resource.get("status", "cancelled"),
+            "recurring_event_id": resource.get("recurringEventId"),
+            "original_start": original_start
+        }
+
+    start, all_day = parse_event_time(resource["start"], calendar_time_zone)
+    end, _ = parse_event_time(resource["end"], calendar_time_zone)
+    attendees = resource.get("attendees", [])
+    own_response = next((a.get("responseStatus") for a in attendees if a.get("self")), None)
+    event = {
+        "event_id": resource["id"],
+        "title": resource.get("summary", "(No title)"),
+        "description": resource.get("description", ""),
+        "start": start.isoformat(),
+        "end": end.isoformat(),
+        "all_day": all_day,
+        "attendees": [a["email"] for a in attendees if a.get("email")],
+        "organizer": resource.get("organizer", {}).get("email", ""),
+        "status": resource.get("status", "confirmed"),
+        "response_status": own_response,
+        "location": resource.get("location", ""),
+        "recurring_event_id": resource.get("recurringEventId")
+    }
+    if original_start:
+        event["original_start"] = original_start
+    if resource.get("recurrence"):
+        event["recurrence"] = list(resource["recurrence"])
+        event["time_zone"] = resource["start"].get("timeZone") or calendar_time_zone
+        event["updated"] = resource.get("updated")
+    return event
+
+
+def event_body(
+    title: str,
+    start_time: datetime,
+    end_time: datetime,
+    attendees: list[str] | None = None,
+    description: str | None = None,
+    location: str | None = None
+) -> dict[str, Any]:
+    """Request body for events.insert"""
+    body: dict[str, Any] = {
+        "summary": title,
+        "start": {"dateTime": start_time.isoformat()},
+        "end": {"dateTime": end_time.isoformat()},
+        "attendees": [{"email": email} for email in (attendees or [])]
+    }
+    if start_time.tzinfo is None:
+        body["start"]["timeZone"] = body["end"]["timeZone"] = "UTC"
+    if description:
+        body["description"] = description
+    if location:
+        body["location"] = location
+    return body
+
+
+def to_timestamp(value: datetime | str) -> float:
+    """Epoch seconds for an aware datetime or ISO string (naive values are UTC)"""
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+def rfc3339(value: datetime) -> str:
+    """RFC 3339 timestamp accepted by timeMin / timeMax (naive values are UTC)"""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.isoformat()
@@ -0,0 +1,210 @@
+"""
+Recurring event expansion
+Expands RRULE series (with EXDATE / RDATE) into instances for a query
+window. Rules are evaluated in the series' own time zone on wall-clock
+time, so a 09:00 meeting stays at 09:00 across DST changes. Expansions
+are memoized per (series, version, window bucket), so repeated and
+overlapping views of the same months cost a cache lookup.
+"""
+
+from __future__ import annotations
+
+import math
+import re
+from collections.abc import Container
+from datetime import datetime, time, timedelta, timezone
+from typing import Any
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from dateutil.rrule import rrulestr
+
+from ...utils.ttl_cache import TTLCache
+
+
+# Expansions are cached in buckets of this many days
+BUCKET_DAYS = 28
+_BUCKET_SECONDS = BUCKET_DAYS * 86400
+
+_UNTIL_RE = re.compile(r"UNTIL=(\d{8})(?:T(\d{6})(Z?))?", re.IGNORECASE)
+
+
+def _zone(name: str | None) -> ZoneInfo | timezone:
+    if not name:
+        return timezone.utc
+    try:
+        return ZoneInfo(name)
+    except ZoneInfoNotFoundError:
+        return timezone.utc
+
+
+def instance_id(series_id: str, original_start: datetime) -> str:
+    """Google's id for one instance of a series: <series>_<UTC start>"""
+    return f"{series_id}_{original_start.astimezone(timezone.utc).strftime('%Y%m%dT%H%M%SZ')}"
+
+
+def _parse_date_values(line: str, zone: ZoneInfo | timezone) -> list[datetime]:
+    """Values of an EXDATE / RDATE line as aware datetimes"""
+    params, _, values = line.partition(":")
+    tzid = re.search(r"TZID=([^;:]+)", params, re.IGNORECASE)
+    value_zone = _zone(tzid.group(1)) if tzid else zone
+    parsed = []
+    for value in values.split(","):
+        value = value.strip()
+        if not value:
+            continue
+        if len(value) == 8:
+            parsed.append(datetime.combine(datetime.strptime(value, "%Y%m%d").date(), time.min, tzinfo=value_zone))
+        elif value.endswith("Z"):
+            parsed.append(datetime.strptime(value, "%Y%m%dT%H%M%SZ").replace(tzinfo=timezone.utc))
+        else:
+            parsed.append(datetime.strptime(value, "%Y%m%dT%H%M%S").replace(tzinfo=value_zone))
+    return parsed
+
+
+class RecurringSeries:
+    """
+    One recurring event: its rules, exceptions and instance template.
+
+    Args:
+        master: Adapter event dict of the series master, carrying
+            "recurrence" (RFC 5545 lines) and "time_zone"
+    """
+
+    def __init__(self, master: dict[str, Any]):
+        self.master = master
+        self.series_id = master["event_id"]
+        self.zone = _zone(master.get("time_zone"))
+        self.all_day = bool(master.get("all_day"))
+        start = datetime.fromisoformat(master["start"]).astimezone(self.zone)
+        end = datetime.fromisoformat(master["end"]).astimezone(self.zone)
+        self.duration = end - start
+        # Rules run on naive wall-clock time in the series zone
+        self.dtstart = start.replace(tzinfo=None)
+        self.version = (master.get("updated"), tuple(master["recurrence"]), master["start"], master["end"])
+
+        self.rules = []
+        self.exdates: set[float] = set()
+        self.rdates: list[datetime] = []
+        bounded = True
+        for line in master["recurrence"]:
+            kind = line.split(":", 1)[0].split(";", 1)[0].upper()
+            if kind == "RRULE":
+                self.rules.append(rrulestr(self._naive_until(line), dtstart=self.dtstart))
+                bounded = bounded and bool(re.search(r"\b(COUNT|UNTIL)=", line, re.IGNORECASE))
+            elif kind == "EXDATE":
+                self.exdates.update(d.timestamp() for d in _parse_date_values(line, self.zone))
+            elif kind == "RDATE":
+                self.rdates.extend(_parse_date_values(line, self.zone))
+
+        # Last possible instance start, for skipping series outside a window
+        self.first_start = self._localize(self.dtstart).timestamp()
+        self.last_start = math.inf
+        if bounded:
+            last = [self._localize(rule[-1]).timestamp() for rule in self.rules if rule.count()]
+            self.last_start = max([self.first_start, *last, *(d.timestamp() for d in self.rdates)])
+
+    def _naive_until(self, line: str) -> str:
+        """Rewrite UNTIL as wall-clock time in the series zone (dtstart is naive)"""
+        def convert(match: re.Match) -> str:
+            day, clock, utc = match.groups()
+            if not clock:
+                until = datetime.combine(datetime.strptime(day, "%Y%m%d").date(), time(23, 59, 59))
+            elif utc:
+                until = datetime.strptime(day + clock, "%Y%m%d%H%M%S").replace(tzinfo=timezone.utc)
+                until = until.astimezone(self.zone).replace(tzinfo=None)
+            else:
+                until = datetime.strptime(day + clock, "%Y%m%d%H%M%S")
+            return f"UNTIL={until.strftime('%Y%m%dT%H%M%S')}"
+        return _UNTIL_RE.sub(convert, line[line.index(":") + 1:] if line.upper().startswith("RRULE:") else line)
+
+    def _localize(self, wall_clock: datetime) -> datetime:
+        return wall_clock.replace(tzinfo=self.zone)
+
+    def occurrences(self, start_ts: float, end_ts: float) -> list[float]:
+        """Start timestamps of rule/RDATE instances starting in [start_ts, end_ts), EXDATEs removed"""
+        # Pad by a day: wall-clock bounds shift with the zone's UTC offset
+        low = datetime.fromtimestamp(start_ts, self.zone).replace(tzinfo=None) - timedelta(days=1)
+        high = datetime.fromtimestamp(end_ts, self.zone).replace(tzinfo=None) + timedelta(days=1)
+        starts = {
+            self._localize(d).timestamp()
+            for rule in self.rules
+            for d in rule.between(low, high, inc=True)
+        }
+        starts.update(d.timestamp() for d in self.rdates)
+        if not self.rules:
+            starts.add(self.first_start)
+        return sorted(s for s in starts if start_ts <= s < end_ts and s not in self.exdates)
+
+    def instance(self, start_ts: float) -> dict[str, Any]:
+        """Adapter event dict for the instance starting at start_ts"""
+        start = datetime.fromtimestamp(start_ts, self.zone)
+        # Wall-clock duration, as Calendar does across DST changes
+        end = self._localize(start.replace(tzinfo=None) + self.duration)
+        event = {k: v for k, v in self.master.items() if k not in ("recurrence", "time_zone", "updated")}
+        event.update({
+            "event_id": instance_id(self.series_id, start),
+            "start": start.isoformat(),
+            "end": end.isoformat(),
+            "recurring_event_id": self.series_id,
+        })
+        return event
+
+
+def _copy_instance(event: dict[str, Any]) -> dict[str, Any]:
+    """Copy of a cached instance, including its list fields (attendees)"""
+    return {k: list(v) if isinstance(v, list) else v for k, v in event.items()}
+
+
+class RecurrenceExpander:
+    """
+    Memoized expansion of recurring series into instances.
+
+    Instances are computed per fixed BUCKET_DAYS bucket and cached under
+    (series id, series version, bucket), so a changed series never reuses
+    stale instances and repeated day/week/month views reuse buckets.
+    """
+
+    def __init__(self, max_cached_buckets: int = 8192):
+        self.cache = TTLCache(ttl_seconds=math.inf, max_entries=max_cached_buckets)
+
+    def _bucket(self, series: RecurringSeries, bucket: int) -> list[tuple[float, float, dict[str, Any]]]:
+        key = (series.series_id, series.version, bucket)
+        instances = self.cache.get(key)
+        if instances is None:
+            instances = []
+            for start in series.occurrences(bucket * _BUCKET_SECONDS, (bucket + 1) * _BUCKET_SECONDS):
+                event = series.instance(start)
+                instances.append((start, datetime.fromisoformat(event["end"]).timestamp(), event))
+            self.cache.set(key, instances)
+        return instances
+
+    def expand(
+        self,
+        series: RecurringSeries,
+        start_ts: float,
+        end_ts: float,
+        skip: Container[float] | None = None
+    ) -> list[tuple[float, dict[str, Any]]]:
+        """
+        (start timestamp, instance) pairs overlapping [start_ts, end_ts).
+
+        skip holds original start timestamps replaced by exception events
+        (moved or cancelled instances). Instances are copies, so callers
+        may modify them without touching the cache.
+        """
+        # Instances that started before the window may still overlap it
+        earliest = max(start_ts - series.duration.total_seconds(), series.first_start)
+        if earliest >= end_ts or series.last_start < earliest:
+            return []
+        instances = []
+        for bucket in range(int(earliest // _BUCKET_SECONDS), int((end_ts - 1) // _BUCKET_SECONDS) + 1):
+            for start, end, event in self._bucket(series, bucket):
+                if start < end_ts and end > start_ts and not (skip and start in skip):
+                    instances.append((start, _copy_instance(event)))
+        return instances
+
+    def stats(self) -> dict[str, Any]:
+        return self.cache.stats()
+
+
+__all__ = ["RecurringSeries", "RecurrenceExpander", "instance_id", "BUCKET_DAYS"]
@@ -4,7 +4,16 @@ Adapters for various email providers (Gmail API, IMAP/SMTP, Outlook Graph)
 """
 
 from .base import BaseEmailAdapter
-from .gmail_adapter import GmailAdapter
+from .gmail_adapter import GmailAdapter, get_shared_gmail_adapter
+from .mirrored_adapter import MirroredEmailAdapter
+from .outbound_queue import OutboundEmailQueue
 from .factory import EmailAdapterFactory
 
-__all__ = ["BaseEmailAdapter", "GmailAdapter", "EmailAdapterFactory"]
+__all__ = [
+    "BaseEmailAdapter",
+    "GmailAdapter",
+    "MirroredEmailAdapter",
+    "OutboundEmailQueue",
+    "EmailAdapterFactory",
+    "get_shared_gmail_adapter"
+]
@@ -3,8 +3,10 @@ Base Email Adapter
 Abstract interface that all email adapters must implement
 """
 
+import asyncio
 from abc import ABC, abstractmethod
 from typing import Any
+from ...utils.ttl_cache import TTLCache
 
 
 class BaseEmailAdapter(ABC):
@@ -13,6 +15,16 @@ class BaseEmailAdapter(ABC):
     Implementations: Gmail API, IMAP/SMTP, Microsoft Graph (Outlook)
     """
 
+    # Maximum sender-history lookups in flight at once for batched requests
+    sender_history_concurrency: int = 8
+
+    # Single-thread calls in flight at once for the default bulk fallback
+    bulk_concurrency: int = 8
+
+    def __init__(self, sender_history_ttl_seconds: float = 900.0):
+        # Per-sender stats change slowly; cache them across requests
+        self.sender_history_cache = TTLCache(ttl_seconds=sender_history_ttl_seconds)
+
     @abstractmethod
     async def fetch_threads(
         self,
@@ -67,7 +79,10 @@ class BaseEmailAdapter(ABC):
             cc: CC recipients
             bcc: BCC recipients
             thread_id: If replying, the thread ID to reply to
-            attachments: List of attachment dictionaries
+            attachments: List of attachment dictionaries, each with one of
+                "path" (file on disk), "stream" (binary file object) or
+                "content" (bytes), plus optional "filename" and "mime_type".
+                Paths and streams are read in chunks, never fully loaded.
 
         Returns:
             Result dictionary with message_id and status
@@ -130,3 +145,114 @@ class BaseEmailAdapter(ABC):
             List of matching email threads
         """
         pass
+
+    async def get_sender_histories(self, email_addresses: list[str]) -> dict[str, dict[str, Any]]:
+        """
+        Get historical context for many senders at once.
+
+        Cached stats are served from the TTL cache; the remaining senders are
+        resolved concurrently (bounded by ``sender_history_concurrency``).
+        Adapters with a native batch API may override this.
+
+        Args:
+            email_addresses: Sender email addresses (duplicates are ignored)
+
+        Returns:
+            Mapping of email address to sender history. Senders whose lookup
+            failed or returned nothing are omitted.
+        """
+        histories: dict[str, dict[str, Any]] = {}
+        missing: list[str] = []
+
+        for address in dict.fromkeys(a for a in email_addresses if a):
+            cached = self.sender_history_cache.get(address)
+            if cached is not None:
+                histories[address] = cached
+            else:
+                missing.append(address)
+
+        if not missing:
+            return histories
+
+        semaphore = asyncio.Semaphore(self.sender_history_concurrency)
+
+        async def lookup(address: str) -> dict[str, Any] | None:
+            async with semaphore:
+                return await self.get_sender_history(address)
+
+        results = await asyncio.gather(*(lookup(a) for a in missing), return_exceptions=True)
+
+        for address, history in zip(missing, results):
+            if isinstance(history, Exception) or not history:
+                continue
+            histories[address] = history
+            # Don't cache failed lookups so they are retried next time
+            if "error" not in history:
+                self.sender_history_cache.set(address, history)
+
+        return histories
+
+    async def bulk_modify_threads(
+        self,
+        thread_ids: list[str],
+        add_label_ids: list[str] | None = None,
+        remove_label_ids: list[str] | None = None
+    ) -> dict[str, Any]:
+        """
+        Add/remove labels on many threads at once.
+
+        The default implementation only supports the changes expressible
+        with single-thread calls (removing UNREAD and/or INBOX) and issues
+        them concurrently; adapters with a native bulk API should override.
+
+        Args:
+            thread_ids: Threads to modify (duplicates are ignored)
+            add_label_ids: Labels to add
+            remove_label_ids: Labels to remove
+
+        Returns:
+            Dictionary with success, modified_threads, failed_thread_ids,
+            api_calls and details
+        """
+        remove = set(remove_label_ids or [])
+        if add_label_ids or not remove or not remove <= {"UNREAD", "INBOX"}:
+            raise NotImplementedError(f"{type(self).__name__} does not support bulk label changes")
+
+        thread_ids = list(dict.fromkeys(thread_ids))
+        semaphore = asyncio.Semaphore(self.bulk_concurrency)
+
+        async def modify(thread_id: str) -> bool:
+            async with semaphore:
+                ok = True
+                if "UNREAD" in remove:
+                    ok = await self.mark_read(thread_id) and ok
+                if "INBOX" in remove:
+                    ok = await self.archive_thread(thread_id) and ok
+                return ok
+
+        results = await asyncio.gather(*(modify(t) for t in thread_ids))
+        failed = [t for t, ok in zip(thread_ids, results) if not ok]
+        return {
+            "success": not failed,
+            "modified_threads": len(thread_ids) - len(failed),
+            "failed_thread_ids": failed,
+            "api_calls": len(thread_ids) * len(remove),
+            "details": f"Modified {len(thread_ids) - len(failed)} of {len(thread_ids)} threads"
+        }
+
+    async def bulk_mark_read(self, thread_ids: list[str]) -> dict[str, Any]:
+        """Mark many threads as read"""
+        return await self.bulk_modify_threads(thread_ids, remove_label_ids=["UNREAD"])
+
+    async def bulk_archive(self, thread_ids: list[str]) -> dict[str, Any]:
+        """Archive many threads (remove from inbox)"""
+        return await self.bulk_modify_threads(thread_ids, remove_label_ids=["INBOX"])
+
+    async def bulk_label(
+        self,
+        thread_ids: list[str],
+        add_label_ids: list[str] | None = None,
+        remove_label_ids: list[str] | None = None
+    ) -> dict[str, Any]:
+        """Apply arbitrary label changes to many threads"""
+        return await self.bulk_modify_threads(thread_ids, add_label_ids, remove_label_ids)
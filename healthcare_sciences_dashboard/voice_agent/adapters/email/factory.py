@@ -4,7 +4,8 @@ Creates the appropriate email adapter based on configuration
 """
 
 from .base import BaseEmailAdapter
-from .gmail_adapter import GmailAdapter
+from .gmail_adapter import GmailAdapter, get_shared_gmail_adapter
+from .mirrored_adapter import MirroredEmailAdapter
 from typing import Literal
 
 
@@ -28,7 +29,8 @@ class EmailAdapterFactory:
 
         Args:
             provider: Email provider type
-            **kwargs: Provider-specific configuration
+            **kwargs: Provider-specific configuration (mirror_path enables
+                the local mailbox mirror for gmail_api)
 
         Returns:
             BaseEmailAdapter instance
@@ -38,11 +40,20 @@ class EmailAdapterFactory:
         """
 
         if provider == "gmail_api":
-            return GmailAdapter(
-                credentials_path=kwargs.get("credentials_path"),
-                token_path=kwargs.get("token_path"),
-                use_mock=kwargs.get("use_mock", False)
-            )
+            if kwargs.get("use_mock", False):
+                adapter = GmailAdapter(
+                    credentials_path=kwargs.get("credentials_path"),
+                    token_path=kwargs.get("token_path"),
+                    use_mock=True
+                )
+            else:
+                # Credentials come from the environment; share one adapter
+                # (and its OAuth session) with the API routes
+                adapter = get_shared_gmail_adapter()
+            if kwargs.get("mirror_path"):
+                # Serve listings and search from a local mailbox mirror
+                return MirroredEmailAdapter(adapter, db_path=kwargs["mirror_path"])
+            return adapter
 
         elif provider == "imap_smtp":
             # TODO: Implement IMAP/SMTP adapter
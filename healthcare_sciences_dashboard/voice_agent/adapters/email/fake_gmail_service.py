@@ -0,0 +1,451 @@
+"""
+In-process fake of the Gmail API service
+Mimics the subset of ``googleapiclient`` resources used by GmailAdapter so the
+adapter can be exercised without network access or credentials.
+
+Usage:
+    service = FakeGmailService()
+    service.add_message(sender="jane@partner.com", subject="Q4 review", body="...")
+    adapter = GmailAdapter(service=service)
+"""
+
+from __future__ import annotations
+
+import base64
+import email
+import hashlib
+import itertools
+import threading
+import time
+from typing import Any, Callable
+
+import httplib2
+from googleapiclient.errors import HttpError
+from googleapiclient.http import MediaUploadProgress
+
+
+def _http_error(status: int, message: str) -> HttpError:
+    return HttpError(
+        httplib2.Response({"status": status}),
+        f'{{"error": {{"code": {status}, "message": "{message}"}}}}'.encode()
+    )
+
+
+def _not_found() -> HttpError:
+    return _http_error(404, "Requested entity was not found.")
+
+
+class FakeResumableUpload:
+    """
+    Resumable media upload with the googleapiclient ``next_chunk`` signature.
+
+    Reads the media one chunk per call, so a test can upload files far
+    larger than memory; only a SHA-256 and (for small uploads) the raw
+    bytes are kept.
+    """
+
+    # Uploads up to this size keep their raw bytes for inspection
+    KEEP_RAW_BYTES = 16 * 1024 * 1024
+
+    def __init__(self, service: "FakeGmailService", media: Any, on_complete: Callable[[dict], Any]):
+        self._service = service
+        self._media = media
+        self._on_complete = on_complete
+        self.progress = 0
+        self.chunks = 0
+        self._sha256 = hashlib.sha256()
+        self._head = b""
+        self._raw = bytearray()
+
+    def next_chunk(self, http: Any = None, num_retries: int = 0) -> tuple[Any, Any]:
+        self._service._before_execute()
+        if self._service.upload_failures:
+            raise _http_error(self._service.upload_failures.pop(0), "Upload chunk failed")
+
+        total = self._media.size()
+        data = self._media.getbytes(self.progress, self._media.chunksize())
+        self.progress += len(data)
+        self.chunks += 1
+        self._sha256.update(data)
+        if len(self._head) < 64 * 1024:
+            self._head += data[:64 * 1024]
+        if total <= self.KEEP_RAW_BYTES:
+            self._raw += data
+
+        if self.progress < total:
+            return MediaUploadProgress(self.progress, total), None
+        upload = {
+            "bytes": total,
+            "chunks": self.chunks,
+            "sha256": self._sha256.hexdigest(),
+            "headers": email.message_from_bytes(self._head.split(b"\n\n", 1)[0]),
+            "raw": bytes(self._raw) if total <= self.KEEP_RAW_BYTES else None,
+        }
+        self._service.uploads.append(upload)
+        return None, self._on_complete(upload)
+
+
+class FakeRequest:
+    """Deferred call with the googleapiclient ``HttpRequest.execute`` signature"""
+
+    def __init__(self, service: "FakeGmailService", fn: Callable[[], Any]):
+        self._service = service
+        self._fn = fn
+
+    def execute(self, http: Any = None, num_retries: int = 0) -> Any:
+        self._service._before_execute()
+        return self._fn()
+
+
+class FakeBatchHttpRequest:
+    """Batch of fake requests executed in one round-trip, like BatchHttpRequest"""
+
+    max_requests = 100
+
+    def __init__(self, service: "FakeGmailService", callback: Callable[..., None] | None = None):
+        self._service = service
+        self._callback = callback
+        self._requests: list[tuple[str, FakeRequest, Callable[..., None] | None]] = []
+
+    def add(self, request: FakeRequest, callback: Callable[..., None] | None = None, request_id: str | None = None) -> None:
+        if len(self._requests) >= self.max_requests:
+            raise ValueError(f"Batch exceeds {self.max_requests} requests")
+        request_id = request_id or str(len(self._requests))
+        self._requests.append((request_id, request, callback))
+
+    def execute(self, http: Any = None) -> None:
+        self._service._before_execute()
+        self._service.batch_calls += 1
+        for request_id, request, callback in self._requests:
+            try:
+                response, exception = request._fn(), None
+            except Exception as e:
+                response, exception = None, e
+            for cb in (callback, self._callback):
+                if cb is not None:
+                    cb(request_id, response, exception)
+
+
+class _Resource:
+    """Collection resource; methods are attached per instance"""
+
+    def __init__(self, **methods: Callable[..., Any]):
+        for name, method in methods.items():
+            setattr(self, name, method)
+
+
+class FakeGmailService:
+    """
+    Fake Gmail service holding an in-memory mailbox.
+
+    Attributes:
+        latency: Seconds each execute() sleeps (simulates network time)
+        gate: When set to an unset threading.Event, every execute() blocks
+            until the event is set (simulates a stalled Gmail call)
+        calls: Number of execute() calls made (a batch counts once)
+        batch_calls: Number of batch requests executed
+        history_id: Current mailbox historyId; every change bumps it and is
+            recorded for users.history.list until expire_history() is called
+        send_failures: HTTP statuses the next messages.send calls raise
+            HttpError with, consumed in order (e.g. [503, 429])
+        upload_failures: Same for chunks of resumable uploads
+        get_failures: Same for messages.get calls (also inside batches)
+        uploads: Completed media uploads (size, chunk count, sha256, headers)
+    """
+
+    def __init__(self, latency: float = 0.0, user_email: str = "me@company.com"):
+        self.latency = latency
+        self.gate: threading.Event | None = None
+        self.user_email = user_email
+        self.calls = 0
+        self.batch_calls = 0
+        self.messages: dict[str, dict] = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self.history_id = 1000
+        self.history: list[dict] = []
+        # Oldest startHistoryId history.list still accepts
+        self._history_floor = self.history_id
+        self.send_failures: list[int] = []
+        self.upload_failures: list[int] = []
+        self.get_failures: list[int] = []
+        self.uploads: list[dict] = []
+
+    # -- mailbox setup -------------------------------------------------
+
+    def add_message(
+        self,
+        sender: str,
+        subject: str,
+        body: str = "",
+        to: str | None = None,
+        thread_id: str | None = None,
+        labels: list[str] | None = None,
+        internal_date_ms: int | None = None
+    ) -> dict:
+        """Add a message to the mailbox and return its resource"""
+        with self._lock:
+            number = next(self._ids)
+        message_id = f"msg{number:06d}"
+        message = {
+            "id": message_id,
+            "threadId": thread_id or f"thr{number:06d}",
+            "historyId": "",
+            "labelIds": list(labels if labels is not None else ["INBOX", "UNREAD"]),
+            "internalDate": str(internal_date_ms or int(time.time() * 1000) + number),
+            "snippet": body[:100],
+            "payload": {
+                "mimeType": "text/plain",
+                "headers": [
+                    {"name": "From", "value": sender},
+                    {"name": "To", "value": to or self.user_email},
+                    {"name": "Subject", "value": subject},
+                ],
+                "body": {"data": base64.urlsafe_b64encode(body.encode("utf-8")).decode("ascii")},
+            },
+        }
+        self.messages[message_id] = message
+        self._record_history(message, "messagesAdded")
+        return message
+
+    def delete_message(self, message_id: str) -> None:
+        """Permanently delete a message"""
+        message = self.messages.pop(message_id)
+        self._record_history(message, "messagesDeleted")
+
+    def expire_history(self) -> None:
+        """Drop recorded history so older startHistoryIds get a 404, as Gmail does"""
+        with self._lock:
+            self.history.clear()
+            self._history_floor = self.history_id
+
+    def _record_history(self, message: dict, kind: str, label_ids: list[str] | None = None) -> None:
+        with self._lock:
+            self.history_id += 1
+            message["historyId"] = str(self.history_id)
+            item = {"message": {k: message[k] for k in ("id", "threadId", "labelIds")}}
+            if label_ids is not None:
+                item["labelIds"] = label_ids
+            self.history.append({"id": str(self.history_id), kind: [item]})
+
+    # -- googleapiclient surface ----------------------------------------
+
+    def users(self) -> _Resource:
+        return _Resource(
+            getProfile=self._get_profile,
+            history=lambda: _Resource(list=self._history_list),
+            threads=lambda: _Resource(
+                list=self._threads_list,
+                get=self._threads_get,
+                modify=self._threads_modify,
+            ),
+            messages=lambda: _Resource(
+                list=self._messages_list,
+                get=self._messages_get,
+                send=self._messages_send,
+                batchModify=self._messages_batch_modify,
+            ),
+        )
+
+    def new_batch_http_request(self, callback: Callable[..., None] | None = None) -> FakeBatchHttpRequest:
+        return FakeBatchHttpRequest(self, callback=callback)
+
+    def _before_execute(self) -> None:
+        with self._lock:
+            self.calls += 1
+        if self.gate is not None:
+            self.gate.wait()
+        if self.latency:
+            time.sleep(self.latency)
+
+    def _request(self, fn: Callable[[], Any]) -> FakeRequest:
+        return FakeRequest(self, fn)
+
+    # -- helpers ----------------------------------------------------------
+
+    @staticmethod
+    def _header(message: dict, name: str) -> str:
+        for header in message["payload"]["headers"]:
+            if header["name"].lower() == name.lower():
+                return header["value"]
+        return ""
+
+    def _matches(self, message: dict, query: str | None) -> bool:
+        """Tiny subset of Gmail search: in:inbox, is:unread, from:, subject:, free words"""
+        for term in (query or "").split():
+            term = term.lower()
+            if term == "in:inbox":
+                ok = "INBOX" in message["labelIds"]
+            elif term == "is:unread":
+                ok = "UNREAD" in message["labelIds"]
+            elif term.startswith("from:"):
+                ok = term[5:].strip("()") in self._header(message, "From").lower()
+            elif term.startswith("subject:"):
+                ok = term[8:] in self._header(message, "Subject").lower()
+            else:
+                haystack = f"{self._header(message, 'Subject')} {message['snippet']}".lower()
+                ok = term in haystack
+            if not ok:
+                return False
+        return True
+
+    def _newest_first(self, messages: list[dict]) -> list[dict]:
+        return sorted(messages, key=lambda m: int(m["internalDate"]), reverse=True)
+
+    def _thread_messages(self, thread_id: str) -> list[dict]:
+        return sorted(
+            (m for m in self.messages.values() if m["threadId"] == thread_id),
+            key=lambda m: int(m["internalDate"])
+        )
+
+    @staticmethod
+    def _format(message: dict, fmt: str, metadata_headers: list[str] | None) -> dict:
+        if fmt == "minimal":
+            return {k: message[k] for k in ("id", "threadId", "labelIds", "internalDate", "snippet", "historyId")}
+        if fmt == "metadata":
+            wanted = {h.lower() for h in (metadata_headers or [])}
+            headers = [
+                h for h in message["payload"]["headers"]
+                if not wanted or h["name"].lower() in wanted
+            ]
+            result = {k: message[k] for k in ("id", "threadId", "labelIds", "internalDate", "snippet", "historyId")}
+            result["payload"] = {"mimeType": message["payload"]["mimeType"], "headers": headers}
+            return result
+        return message
+
+    # -- threads ----------------------------------------------------------
+
+    def _threads_list(self, userId: str = "me", q: str | None = None, maxResults: int = 100, **kwargs) -> FakeRequest:
+        def run():
+            seen: dict[str, dict] = {}
+            for message in self._newest_first(list(self.messages.values())):
+                if message["threadId"] not in seen and self._matches(message, q):
+                    seen[message["threadId"]] = {"id": message["threadId"], "snippet": message["snippet"]}
+            return {"threads": list(seen.values())[:maxResults]}
+        return self._request(run)
+
+    def _threads_get(self, userId: str = "me", id: str = "", format: str = "full", metadataHeaders: list[str] | None = None, **kwargs) -> FakeRequest:
+        def run():
+            messages = self._thread_messages(id)
+            if not messages:
+                raise KeyError(f"Thread not found: {id}")
+            return {"id": id, "messages": [self._format(m, format, metadataHeaders) for m in messages]}
+        return self._request(run)
+
+    def _threads_modify(self, userId: str = "me", id: str = "", body: dict | None = None) -> FakeRequest:
+        def run():
+            for message in self._thread_messages(id):
+                self._apply_labels(message, body or {})
+            return {"id": id}
+        return self._request(run)
+
+    def _apply_labels(self, message: dict, body: dict) -> None:
+        removed = [l for l in body.get("removeLabelIds", []) if l in message["labelIds"]]
+        added = [l for l in body.get("addLabelIds", []) if l not in message["labelIds"]]
+        message["labelIds"] = [l for l in message["labelIds"] if l not in removed] + added
+        if removed:
+            self._record_history(message, "labelsRemoved", removed)
+        if added:
+            self._record_history(message, "labelsAdded", added)
+
+    # -- profile and history ---------------------------------------------
+
+    def _get_profile(self, userId: str = "me", **kwargs) -> FakeRequest:
+        return self._request(lambda: {
+            "emailAddress": self.user_email,
+            "messagesTotal": len(self.messages),
+            "historyId": str(self.history_id),
+        })
+
+    def _history_list(
+        self,
+        userId: str = "me",
+        startHistoryId: str = "0",
+        historyTypes: list[str] | None = None,
+        maxResults: int = 100,
+        pageToken: str | None = None,
+        **kwargs
+    ) -> FakeRequest:
+        def run():
+            if int(startHistoryId) < self._history_floor:
+                raise _not_found()
+            records = [r for r in self.history if int(r["id"]) > int(startHistoryId)]
+            offset = int(pageToken or 0)
+            result = {"history": records[offset:offset + maxResults], "historyId": str(self.history_id)}
+            if offset + maxResults < len(records):
+                result["nextPageToken"] = str(offset + maxResults)
+            return result
+        return self._request(run)
+
+    # -- messages ---------------------------------------------------------
+
+    def _messages_list(
+        self,
+        userId: str = "me",
+        q: str | None = None,
+        maxResults: int = 100,
+        pageToken: str | None = None,
+        **kwargs
+    ) -> FakeRequest:
+        def run():
+            matches = [m for m in self._newest_first(list(self.messages.values())) if self._matches(m, q)]
+            offset = int(pageToken or 0)
+            page = matches[offset:offset + maxResults]
+            result = {"messages": [{"id": m["id"], "threadId": m["threadId"]} for m in page]}
+            if offset + maxResults < len(matches):
+                result["nextPageToken"] = str(offset + maxResults)
+            return result
+        return self._request(run)
+
+    def _messages_get(self, userId: str = "me", id: str = "", format: str = "full", metadataHeaders: list[str] | None = None, **kwargs) -> FakeRequest:
+        def run():
+            if self.get_failures:
+                raise _http_error(self.get_failures.pop(0), "messages.get failed")
+            if id not in self.messages:
+                raise _not_found()
+            return self._format(self.messages[id], format, metadataHeaders)
+        return self._request(run)
+
+    def _messages_batch_modify(self, userId: str = "me", body: dict | None = None, **kwargs) -> FakeRequest:
+        def run():
+            ids = (body or {}).get("ids", [])
+            if len(ids) > 1000:
+                raise ValueError("batchModify accepts at most 1000 ids")
+            for message_id in ids:
+                if message_id in self.messages:
+                    self._apply_labels(self.messages[message_id], body)
+            return {}
+        return self._request(run)
+
+    def _messages_send(
+        self,
+        userId: str = "me",
+        body: dict | None = None,
+        media_body: Any = None,
+        **kwargs
+    ) -> FakeRequest | FakeResumableUpload:
+        if media_body is not None:
+            def complete(upload: dict) -> dict:
+                message = self.add_message(
+                    sender=self.user_email,
+                    subject=upload["headers"].get("subject", ""),
+                    thread_id=(body or {}).get("threadId"),
+                    labels=["SENT"]
+                )
+                return {"id": message["id"], "threadId": message["threadId"], "labelIds": ["SENT"]}
+            return FakeResumableUpload(self, media_body, complete)
+
+        def run():
+            if self.send_failures:
+                raise _http_error(self.send_failures.pop(0), "Send failed")
+            message = self.add_message(
+                sender=self.user_email,
+                subject="(sent)",
+                thread_id=(body or {}).get("threadId"),
+                labels=["SENT"]
+            )
+            return {"id": message["id"], "threadId": message["threadId"], "labelIds": ["SENT"]}
+        return self._request(run)
+
+
+__all__ = ["FakeGmailService"]
@@ -3,29 +3,80 @@ Complete Gmail API Adapter Implementation
 Full implementation with all email operations
 """
 
+import asyncio
+import os
+import tempfile
+import threading
+import httplib2
+from google_auth_httplib2 import AuthorizedHttp
+from googleapiclient.http import MediaFileUpload
 from .base import BaseEmailAdapter
 from .gmail_oauth_env import GmailOAuthEnvHandler
+from ...utils.blocking_executor import BlockingCallExecutor
 from .gmail_adapter_helpers import (
-    get_message_body,
-    format_message,
-    format_timestamp,
+    format_thread,
+    LISTING_HEADERS,
+    LISTING_LIST_FIELDS,
+    LISTING_THREAD_FIELDS,
     create_message,
-    create_reply_message
+    create_reply_message,
+    write_mime_message,
+    compute_sender_stats,
+    extract_email_address,
+    is_transient_error
 )
 from typing import Any
 
 
+# Process-wide pool for blocking googleapiclient calls. Bounded so a Gmail
+# outage can't exhaust threads; sized by GMAIL_MAX_WORKERS.
+GMAIL_EXECUTOR = BlockingCallExecutor(
+    max_workers=int(os.getenv("GMAIL_MAX_WORKERS", "8")),
+    default_timeout=float(os.getenv("GMAIL_CALL_TIMEOUT", "30")),
+    name="gmail"
+)
+
+_shared_adapter: "GmailAdapter | None" = None
+_shared_adapter_lock = threading.Lock()
+
+
 class GmailAdapter(BaseEmailAdapter):
     """
     Complete Gmail adapter using Google Gmail API.
+
+    googleapiclient is synchronous, so every request's execute() runs on a
+    bounded thread pool (GMAIL_EXECUTOR by default) with a per-call timeout,
+    keeping the event loop free for other requests while Gmail is slow.
     """
 
+    # Threads inspected per sender when computing response-time stats
+    sender_history_thread_limit = 10
+
+    # Gmail accepts at most 100 calls in one batch HTTP request
+    batch_size = 100
+
+    # messages.batchModify accepts at most 1000 message ids per call
+    batch_modify_limit = 1000
+
+    # Messages with attachments go through resumable media upload in
+    # chunks of this size (a multiple of 256 KiB)
+    upload_chunk_size = 8 * 1024 * 1024
+    # Gmail rejects uploaded messages above 35 MB; None disables the check
+    max_upload_bytes: int | None = 35 * 1024 * 1024
+    # Per-chunk (and spooling) timeout, and retries of a failed chunk
+    upload_timeout = 300.0
+    upload_chunk_retries = 5
+    upload_retry_backoff = 1.0
+
     def __init__(
         self,
         credentials_path: str | None = None,
         token_path: str | None = None,
-        use_mock: bool = False
+        use_mock: bool = False,
+        service: Any = None,
+        executor: BlockingCallExecutor | None = None
     ):
+        super().__init__()
         self.credentials_path = credentials_path or "./config/gmail_credentials.json"
         self.token_path = token_path or "./config/gmail_token.pickle"
         self.use_mock = use_mock  # For testing without real Gmail
@@ -33,8 +84,14 @@ class GmailAdapter(BaseEmailAdapter):
         # Initialize OAuth handler (using environment variables)
         self.oauth_handler = GmailOAuthEnvHandler()
 
-        # Gmail API service (lazy initialization)
-        self._service = None
+        # Gmail API service (lazy initialization unless one is injected)
+        self._service = service
+
+        # Blocking API calls run here instead of on the event loop
+        self.executor = executor or GMAIL_EXECUTOR
+
+        # httplib2.Http is not thread-safe; each worker thread gets its own
+        self._thread_local = threading.local()
 
     @property
     def service(self):
@@ -57,13 +114,44 @@ class GmailAdapter(BaseEmailAdapter):
 
         return self._service
 
+    def _thread_http(self):
+        """Per-thread authorized HTTP client (None when no OAuth credentials are loaded)"""
+        creds = self.oauth_handler.creds
+        if creds is None:
+            return None
+        http = getattr(self._thread_local, "http", None)
+        if http is None:
+            http = AuthorizedHttp(creds, http=httplib2.Http())
+            self._thread_local.http = http
+        return http
+
+    def _execute_blocking(self, request):
+        # Refresh ahead of expiry rather than paying for a 401 and retry
+        self.oauth_handler.ensure_fresh()
+        http = self._thread_http()
+        return request.execute(http=http) if http is not None else request.execute()
+
+    async def execute_request(self, request, timeout: float | None = None):
+        """Run a googleapiclient request on the Gmail executor"""
+        try:
+            return await self.executor.run(self._execute_blocking, request, timeout=timeout)
+        except asyncio.TimeoutError:
+            limit = timeout if timeout is not None else self.executor.default_timeout
+            raise TimeoutError(f"Gmail API call timed out after {limit}s") from None
+
     async def fetch_threads(
         self,
         max_results: int = 50,
         unread_only: bool = False,
-        query: str | None = None
+        query: str | None = None,
+        include_bodies: bool = False
     ) -> list[dict[str, Any]]:
-        """Fetch email threads from Gmail"""
+        """
+        Fetch email threads from Gmail.
+
+        Listing mode (the default) loads headers and snippets only; pass
+        include_bodies=True, or use get_thread(), when full bodies are needed.
+        """
         if self.use_mock or not self.service:
             return self._get_mock_threads()
 
@@ -76,27 +164,72 @@ class GmailAdapter(BaseEmailAdapter):
                 gmail_query = "in:inbox"
 
             # Fetch threads
-            results = self.service.users().threads().list(
+            results = await self.execute_request(self.service.users().threads().list(
                 userId='me',
                 maxResults=max_results,
-                q=gmail_query.strip()
-            ).execute()
+                q=gmail_query.strip(),
+                fields=LISTING_LIST_FIELDS
+            ))
 
-            threads = results.get('threads', [])
-
-            # Convert to our format
-            thread_list = []
-            for thread in threads[:min(5, len(threads))]:  # Limit to 5 for performance
-                thread_data = await self.get_thread(thread['id'])
-                if thread_data:
-                    thread_list.append(thread_data)
-
-            return thread_list
+            thread_ids = [t['id'] for t in results.get('threads', [])]
+            return await self._hydrate_threads(thread_ids, include_bodies=include_bodies)
 
         except Exception as e:
             print(f"Error fetching Gmail threads: {e}")
             return self._get_mock_threads()
 
+    async def batch_execute(self, requests: list, return_exceptions: bool = False) -> list[Any | None]:
+        """
+        Execute API requests through Gmail batch HTTP requests.
+
+        Up to ``batch_size`` calls share one round-trip, and batches run
+        concurrently on the executor. Responses are returned in request
+        order; a call that failed yields None, or its exception when
+        return_exceptions is True.
+        """
+        results: list[Any | None] = [None] * len(requests)
+
+        async def run_batch(offset: int, chunk: list) -> None:
+            def on_response(request_id, response, exception):
+                if exception is not None:
+                    if return_exceptions:
+                        results[offset + int(request_id)] = exception
+                    else:
+                        print(f"Error in Gmail batch request {offset + int(request_id)}: {exception}")
+                    return
+                results[offset + int(request_id)] = response
+
+            batch = self.service.new_batch_http_request(callback=on_response)
+            for i, request in enumerate(chunk):
+                batch.add(request, request_id=str(i))
+            await self.execute_request(batch)
+
+        await asyncio.gather(*(
+            run_batch(offset, requests[offset:offset + self.batch_size])
+            for offset in range(0, len(requests), self.batch_size)
+        ))
+        return results
+
+    async def _hydrate_threads(self, thread_ids: list[str], include_bodies: bool = False) -> list[dict[str, Any]]:
+        """Load and format threads in list order, skipping any that failed"""
+        if include_bodies:
+            get_kwargs = {'format': 'full'}
+        else:
+            get_kwargs = {
+                'format': 'metadata',
+                'metadataHeaders': LISTING_HEADERS,
+                'fields': LISTING_THREAD_FIELDS
+            }
+        raw_threads = await self.batch_execute([
+            self.service.users().threads().get(userId='me', id=thread_id, **get_kwargs)
+            for thread_id in thread_ids
+        ])
+        return [
+            format_thread(thread_id, raw, include_bodies=include_bodies)
+            for thread_id, raw in zip(thread_ids, raw_threads)
+            if raw and raw.get('messages')
+        ]
+
     async def get_thread(self, thread_id: str) -> dict[str, Any]:
         """Get full thread details from Gmail"""
         if self.use_mock or not self.service:
@@ -104,34 +237,13 @@ class GmailAdapter(BaseEmailAdapter):
 
         try:
             # Get thread
-            thread = self.service.users().threads().get(
+            thread = await self.execute_request(self.service.users().threads().get(
                 userId='me',
                 id=thread_id,
                 format='full'
-            ).execute()
-
-            messages = thread.get('messages', [])
-            if not messages:
-                return {}
-
-            # Get the latest message for preview
-            latest_msg = messages[-1]
-            headers = {h['name']: h['value'] for h in latest_msg['payload']['headers']}
+            ))
 
-            # Extract body
-            body = get_message_body(latest_msg['payload'])
-
-            return {
-                "thread_id": thread_id,
-                "subject": headers.get('Subject', 'No Subject'),
-                "from": headers.get('From', 'Unknown'),
-                "to": headers.get('To', '').split(','),
-                "preview": body[:200] if body else "No content",
-                "unread": 'UNREAD' in latest_msg.get('labelIds', []),
-                "timestamp": format_timestamp(latest_msg['internalDate']),
-                "labels": latest_msg.get('labelIds', []),
-                "messages": [format_message(msg) for msg in messages]
-            }
+            return format_thread(thread_id, thread)
 
         except Exception as e:
             print(f"Error fetching Gmail thread {thread_id}: {e}")
@@ -147,7 +259,13 @@ class GmailAdapter(BaseEmailAdapter):
         thread_id: str | None = None,
         attachments: list[dict] | None = None
     ) -> dict[str, Any]:
-        """Send email via Gmail API"""
+        """
+        Send email via Gmail API.
+
+        Messages with attachments are assembled on disk with attachments
+        streamed in chunks, then sent with a resumable media upload, so
+        memory stays bounded whatever the attachment sizes.
+        """
         if self.use_mock or not self.service:
             return {
                 "success": True,
@@ -156,6 +274,9 @@ class GmailAdapter(BaseEmailAdapter):
             }
 
         try:
+            if attachments:
+                return await self._send_with_attachments(to, subject, body, cc, bcc, thread_id, attachments)
+
             # Create message
             if thread_id:
                 # Get original message ID for reply
@@ -179,10 +300,10 @@ class GmailAdapter(BaseEmailAdapter):
                 )
 
             # Send message
-            result = self.service.users().messages().send(
+            result = await self.execute_request(self.service.users().messages().send(
                 userId='me',
                 body=message
-            ).execute()
+            ))
 
             return {
                 "success": True,
@@ -195,20 +316,119 @@ class GmailAdapter(BaseEmailAdapter):
             return {
                 "success": False,
                 "error": str(e),
+                "retryable": is_transient_error(e),
                 "details": "Failed to send email"
             }
 
+    async def _send_with_attachments(
+        self,
+        to: list[str],
+        subject: str,
+        body: str,
+        cc: list[str] | None,
+        bcc: list[str] | None,
+        thread_id: str | None,
+        attachments: list[dict]
+    ) -> dict[str, Any]:
+        """Spool the MIME message to a temp file and upload it resumably"""
+        on_disk = sum(os.path.getsize(a["path"]) for a in attachments if a.get("path"))
+        if self.max_upload_bytes is not None and on_disk > self.max_upload_bytes:
+            return self._too_large(on_disk)
+
+        in_reply_to = None
+        if thread_id:
+            thread = await self.get_thread(thread_id)
+            in_reply_to = thread['messages'][0]['id'] if thread.get('messages') else None
+            subject = subject if subject.startswith('Re:') else f'Re: {subject}'
+
+        spool = tempfile.NamedTemporaryFile(prefix="gmail_send_", suffix=".eml", delete=False)
+        try:
+            with spool:
+                size = await self.executor.run(
+                    write_mime_message, spool, to, subject, body, cc, bcc, attachments, in_reply_to,
+                    timeout=self.upload_timeout
+                )
+            if self.max_upload_bytes is not None and size > self.max_upload_bytes:
+                return self._too_large(size)
+
+            media = MediaFileUpload(
+                spool.name,
+                mimetype='message/rfc822',
+                chunksize=self.upload_chunk_size,
+                resumable=True
+            )
+            request = self.service.users().messages().send(
+                userId='me',
+                body={'threadId': thread_id} if thread_id else {},
+                media_body=media
+            )
+            result = await self._upload_resumable(request)
+            return {
+                "success": True,
+                "message_id": result['id'],
+                "thread_id": result.get('threadId'),
+                "uploaded_bytes": size,
+                "details": "Email sent successfully"
+            }
+        finally:
+            os.unlink(spool.name)
+
+    def _too_large(self, size: int) -> dict[str, Any]:
+        return {
+            "success": False,
+            "error": f"Message is {size / 1048576:.1f} MB; Gmail accepts at most "
+                     f"{self.max_upload_bytes / 1048576:.0f} MB",
+            "retryable": False,
+            "details": "Failed to send email"
+        }
+
+    async def _upload_resumable(self, request) -> dict:
+        """
+        Drive a resumable upload chunk by chunk on the Gmail executor.
+
+        A chunk that fails transiently is retried; the upload resumes from
+        the last byte Gmail acknowledged rather than starting over. A chunk
+        the executor gives up on may still be uploading, so that ends the
+        upload instead of driving the same request from a second thread.
+        """
+        chunk_finished = threading.Event()
+
+        def next_chunk():
+            try:
+                self.oauth_handler.ensure_fresh()
+                http = self._thread_http()
+                return request.next_chunk(http=http) if http is not None else request.next_chunk()
+            finally:
+                chunk_finished.set()
+
+        failures = 0
+        while True:
+            chunk_finished.clear()
+            try:
+                _, response = await self.executor.run(next_chunk, timeout=self.upload_timeout)
+            except Exception as e:
+                if not chunk_finished.is_set():
+                    raise TimeoutError(f"Gmail upload chunk timed out after {self.upload_timeout}s") from None
+                failures += 1
+                if failures > self.upload_chunk_retries or not is_transient_error(e):
+                    raise
+                await asyncio.sleep(min(self.upload_retry_backoff * 2 ** (failures - 1), 30))
+                continue
+            failures = 0
+            if response is not None:
+                return response
+
     async def mark_read(self, thread_id: str) -> bool:
         """Mark thread as read in Gmail"""
         if self.use_mock or not self.service:
             return True
 
         try:
-            self.service.users().threads().modify(
+            await self.execute_request(self.service.users().threads().modify(
                 userId='me',
                 id=thread_id,
                 body={'removeLabelIds': ['UNREAD']}
-            ).execute()
+            ))
             return True
         except Exception as e:
             print(f"Error marking thread as read: {e}")
@@ -220,16 +440,120 @@ class GmailAdapter(BaseEmailAdapter):
             return True
 
         try:
-            self.service.users().threads().modify(
+            await self.execute_request(self.service.users().threads().modify(
                 userId='me',
                 id=thread_id,
                 body={'removeLabelIds': ['INBOX']}
-            ).execute()
+            ))
             return True
         except Exception as e:
             print(f"Error archiving thread: {e}")
             return False
 
+    async def thread_message_ids(self, thread_ids: list[str]) -> dict[str, list[str]]:
+        """Message ids per thread, resolved with batched minimal threads.get calls"""
+        resources = await self.batch_execute([
+            self.service.users().threads().get(
+                userId='me',
+                id=thread_id,
+                format='minimal',
+                fields='id,messages(id)'
+            )
+            for thread_id in thread_ids
+        ])
+        return {
+            thread_id: [m['id'] for m in resource.get('messages', [])]
+            for thread_id, resource in zip(thread_ids, resources)
+            if resource
+        }
+
+    async def batch_modify_messages(
+        self,
+        message_ids: list[str],
+        add_label_ids: list[str] | None = None,
+        remove_label_ids: list[str] | None = None
+    ) -> int:
+        """
+        Change labels on messages with messages.batchModify, chunked at
+        ``batch_modify_limit`` ids per call.
+
+        Returns:
+            Number of batchModify calls made
+        """
+        body = {}
+        if add_label_ids:
+            body['addLabelIds'] = add_label_ids
+        if remove_label_ids:
+            body['removeLabelIds'] = remove_label_ids
+
+        chunks = [
+            message_ids[i:i + self.batch_modify_limit]
+            for i in range(0, len(message_ids), self.batch_modify_limit)
+        ]
+        await asyncio.gather(*(
+            self.execute_request(self.service.users().messages().batchModify(
+                userId='me',
+                body={'ids': chunk, **body}
+            ))
+            for chunk in chunks
+        ))
+        return len(chunks)
+
+    async def bulk_modify_threads(
+        self,
+        thread_ids: list[str],
+        add_label_ids: list[str] | None = None,
+        remove_label_ids: list[str] | None = None,
+        message_ids_by_thread: dict[str, list[str]] | None = None
+    ) -> dict[str, Any]:
+        """
+        Add/remove labels on many threads with messages.batchModify.
+
+        Thread message ids are resolved in batch requests (skipped when the
+        caller passes message_ids_by_thread), then every message is modified
+        in one batchModify call per 1000 messages.
+        """
+        thread_ids = list(dict.fromkeys(thread_ids))
+        if self.use_mock or not self.service:
+            return {
+                "success": True,
+                "modified_threads": len(thread_ids),
+                "modified_messages": len(thread_ids),
+                "failed_thread_ids": [],
+                "api_calls": 0,
+                "details": "Threads modified (mock mode)"
+            }
+
+        try:
+            api_calls = 0
+            if message_ids_by_thread is None:
+                message_ids_by_thread = await self.thread_message_ids(thread_ids)
+                api_calls += -(-len(thread_ids) // self.batch_size)
+
+            message_ids = [m for t in thread_ids for m in message_ids_by_thread.get(t, [])]
+            if message_ids:
+                api_calls += await self.batch_modify_messages(message_ids, add_label_ids, remove_label_ids)
+
+            failed = [t for t in thread_ids if not message_ids_by_thread.get(t)]
+            return {
+                "success": not failed,
+                "modified_threads": len(thread_ids) - len(failed),
+                "modified_messages": len(message_ids),
+                "failed_thread_ids": failed,
+                "api_calls": api_calls,
+                "details": f"Modified {len(thread_ids) - len(failed)} of {len(thread_ids)} threads"
+            }
+        except Exception as e:
+            print(f"Error in bulk thread modify: {e}")
+            return {
+                "success": False,
+                "modified_threads": 0,
+                "modified_messages": 0,
+                "failed_thread_ids": thread_ids,
+                "error": str(e),
+                "details": "Failed to modify threads"
+            }
+
     async def get_sender_history(self, email_address: str) -> dict[str, Any]:
         """Get sender history from Gmail"""
         if self.use_mock or not self.service:
@@ -243,32 +567,37 @@ class GmailAdapter(BaseEmailAdapter):
 
         try:
             # Search for emails from this sender
-            query = f"from:{email_address}"
-            results = self.service.users().messages().list(
+            query = f"from:{extract_email_address(email_address)}"
+            results = await self.execute_request(self.service.users().messages().list(
                 userId='me',
                 q=query,
                 maxResults=100
-            ).execute()
+            ))
 
             messages = results.get('messages', [])
             interaction_count = len(messages)
 
-            # Get latest message
-            last_interaction = None
-            if messages:
-                latest = self.service.users().messages().get(
+            # Load the most recent threads (headers only) in one batch
+            # request to measure how quickly the user replies to this sender
+            thread_ids = list(dict.fromkeys(m['threadId'] for m in messages))
+            threads = await self.batch_execute([
+                self.service.users().threads().get(
                     userId='me',
-                    id=messages[0]['id'],
-                    format='minimal'
-                ).execute()
-                last_interaction = format_timestamp(latest['internalDate'])
+                    id=thread_id,
+                    format='metadata',
+                    metadataHeaders=['From']
+                )
+                for thread_id in thread_ids[:self.sender_history_thread_limit]
+            ])
+            stats = compute_sender_stats([t for t in threads if t], email_address)
 
             return {
                 "email": email_address,
                 "interaction_count": interaction_count,
-                "avg_response_time_hours": 2.5,  # TODO: Calculate from actual data
+                "avg_response_time_hours": stats["avg_response_time_hours"],
+                "replied_count": stats["replied_count"],
                 "relationship": "contact",
-                "last_interaction": last_interaction
+                "last_interaction": stats["last_interaction"]
             }
 
         except Exception as e:
@@ -278,21 +607,23 @@ class GmailAdapter(BaseEmailAdapter):
     async def search_emails(
         self,
         query: str,
-        max_results: int = 50
+        max_results: int = 50,
+        include_bodies: bool = False
     ) -> list[dict[str, Any]]:
-        """Search emails in Gmail"""
+        """Search emails in Gmail (headers and snippets unless include_bodies)"""
         if self.use_mock or not self.service:
             return []
 
         try:
-            results = self.service.users().threads().list(
+            results = await self.execute_request(self.service.users().threads().list(
                 userId='me',
                 q=query,
-                maxResults=max_results
-            ).execute()
+                maxResults=max_results,
+                fields=LISTING_LIST_FIELDS
+            ))
 
-            threads = results.get('threads', [])
-            return [await self.get_thread(t['id']) for t in threads[:5]]
+            thread_ids = [t['id'] for t in results.get('threads', [])]
+            return await self._hydrate_threads(thread_ids, include_bodies=include_bodies)
 
         except Exception as e:
             print(f"Error searching emails: {e}")
@@ -341,3 +672,18 @@ class GmailAdapter(BaseEmailAdapter):
             if thread['thread_id'] == thread_id:
                 return thread
         return threads[0] if threads else {}
+
+
+def get_shared_gmail_adapter() -> GmailAdapter:
+    """
+    Process-wide GmailAdapter.
+
+    API routes and the orchestrator share one instance, so the OAuth handler,
+    Gmail service, sender-history cache and per-thread HTTP connections are
+    created once instead of on every request.
+    """
+    global _shared_adapter
+    with _shared_adapter_lock:
+        if _shared_adapter is None:
+            _shared_adapter = GmailAdapter()
+        return _shared_adapter
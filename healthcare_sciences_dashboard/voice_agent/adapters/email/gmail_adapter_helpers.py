@@ -4,51 +4,166 @@ Utility functions for Gmail API data processing
 """
 
 import base64
+import codecs
+import html
+import io
+import mimetypes
+import os
+import uuid
 from datetime import datetime
-from typing import Any
+from typing import Any, BinaryIO
+from email.mime.base import MIMEBase
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
+from email.utils import parseaddr
 import re
+from ...utils.html_text import html_to_text
 
 
-def get_message_body(payload: dict) -> str:
-    """Extract message body from Gmail API payload"""
-    body = ""
+# Default cap on decoded body text; huge messages stop decoding here
+MAX_BODY_CHARS = 100_000
 
-    if 'parts' in payload:
-        # Multipart message
-        for part in payload['parts']:
-            if part['mimeType'] == 'text/plain':
-                if 'data' in part['body']:
-                    body = base64.urlsafe_b64decode(part['body']['data']).decode('utf-8')
-                    break
-            elif part['mimeType'] == 'text/html' and not body:
-                if 'data' in part['body']:
-                    html_body = base64.urlsafe_b64decode(part['body']['data']).decode('utf-8')
-                    # Strip HTML tags (basic)
-                    body = re.sub('<[^<]+?>', '', html_body)
-    else:
-        # Simple message
-        if 'data' in payload['body']:
-            body = base64.urlsafe_b64decode(payload['body']['data']).decode('utf-8')
+# base64url characters decoded per step (a multiple of 4)
+BODY_DECODE_CHUNK = 64 * 1024
 
-    return body.strip()
 
+def find_body_part(payload: dict) -> dict | None:
+    """
+    First text/plain part of a MIME tree, else the first text/html one.
 
-def format_message(message: dict) -> dict[str, Any]:
-    """Format a Gmail message into our standard format"""
-    headers = {h['name']: h['value'] for h in message['payload']['headers']}
-    body = get_message_body(message['payload'])
+    Walks nested multiparts (e.g. multipart/alternative inside
+    multipart/mixed) iteratively in document order, skipping attachments
+    and parts whose data is not inline. Nothing is decoded here.
+    """
+    html_part = None
+    stack = [payload]
+    while stack:
+        part = stack.pop()
+        if part.get('parts'):
+            stack.extend(reversed(part['parts']))
+            continue
+        if part.get('filename') or not part.get('body', {}).get('data'):
+            continue
+        mime_type = part.get('mimeType', '')
+        if mime_type == 'text/plain':
+            return part
+        if mime_type == 'text/html' and html_part is None:
+            html_part = part
+    # A single-part message of any text type is its own body
+    if html_part is None and 'parts' not in payload and payload.get('body', {}).get('data'):
+        return payload
+    return html_part
 
-    return {
+
+def _part_charset(part: dict) -> str:
+    for header in part.get('headers', []):
+        if header['name'].lower() == 'content-type':
+            match = re.search(r'charset="?([\w.:-]+)', header['value'], re.IGNORECASE)
+            if match:
+                return match.group(1)
+    return 'utf-8'
+
+
+def iter_part_text(part: dict, chunk_size: int = BODY_DECODE_CHUNK):
+    """Yield a part's decoded text chunk by chunk (base64url + charset, incrementally)"""
+    data = part['body']['data']
+    try:
+        decoder = codecs.getincrementaldecoder(_part_charset(part))(errors='replace')
+    except LookupError:
+        decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+    for start in range(0, len(data), chunk_size):
+        chunk = data[start:start + chunk_size]
+        yield decoder.decode(base64.urlsafe_b64decode(chunk + '=' * (-len(chunk) % 4)))
+    yield decoder.decode(b'', final=True)
+
+
+def get_message_body(payload: dict, max_chars: int | None = MAX_BODY_CHARS) -> str:
+    """
+    Extract the plain-text body from a Gmail API payload.
+
+    Only the chosen part is decoded, incrementally, and decoding stops once
+    max_chars characters of text are produced (None for no cap). HTML-only
+    messages are converted with a streaming tokenizer.
+    """
+    part = find_body_part(payload)
+    if part is None:
+        return ""
+
+    if part.get('mimeType') == 'text/html':
+        return html_to_text(iter_part_text(part), max_chars=max_chars)
+
+    pieces, length = [], 0
+    for text in iter_part_text(part):
+        pieces.append(text)
+        length += len(text)
+        if max_chars is not None and length >= max_chars:
+            break
+    body = "".join(pieces)
+    return (body[:max_chars] if max_chars is not None else body).strip()
+
+
+# Headers requested for listing views (format='metadata')
+LISTING_HEADERS = ['From', 'To', 'Subject']
+
+# Partial-response masks for listing views; bodies are never transferred
+LISTING_LIST_FIELDS = 'threads(id),nextPageToken'
+LISTING_THREAD_FIELDS = 'id,messages(id,threadId,labelIds,internalDate,snippet,payload/headers)'
+
+
+def format_message(message: dict, include_body: bool = True) -> dict[str, Any]:
+    """
+    Format a Gmail message into our standard format.
+
+    With include_body=False (metadata listings) the body is not decoded and
+    the "body" key is omitted.
+    """
+    headers = {h['name']: h['value'] for h in message['payload'].get('headers', [])}
+
+    formatted = {
         "id": message['id'],
         "from": headers.get('From', 'Unknown'),
         "to": headers.get('To', '').split(','),
         "subject": headers.get('Subject', 'No Subject'),
         "date": format_timestamp(message['internalDate']),
-        "body": body,
         "snippet": message.get('snippet', '')
     }
+    if include_body:
+        formatted["body"] = get_message_body(message['payload'])
+    return formatted
+
+
+def format_thread(thread_id: str, thread: dict, include_bodies: bool = True) -> dict[str, Any]:
+    """
+    Format a Gmail thread resource into our standard thread format.
+
+    Listing views pass include_bodies=False with a format='metadata' thread;
+    the preview then comes from Gmail's snippet instead of a decoded body.
+    """
+    messages = thread.get('messages', [])
+    if not messages:
+        return {}
+
+    # Get the latest message for preview
+    latest_msg = messages[-1]
+    headers = {h['name']: h['value'] for h in latest_msg['payload'].get('headers', [])}
+
+    if include_bodies:
+        body = get_message_body(latest_msg['payload'])
+        preview = body[:200]
+    else:
+        preview = html.unescape(latest_msg.get('snippet', ''))[:200]
+
+    return {
+        "thread_id": thread_id,
+        "subject": headers.get('Subject', 'No Subject'),
+        "from": headers.get('From', 'Unknown'),
+        "to": headers.get('To', '').split(','),
+        "preview": preview or "No content",
+        "unread": 'UNREAD' in latest_msg.get('labelIds', []),
+        "timestamp": format_timestamp(latest_msg['internalDate']),
+        "labels": latest_msg.get('labelIds', []),
+        "messages": [format_message(msg, include_body=include_bodies) for msg in messages]
+    }
 
 
 def format_timestamp(internal_date: str) -> str:
@@ -59,6 +174,68 @@ def format_timestamp(internal_date: str) -> str:
     return dt.isoformat() + 'Z'
 
 
+def extract_email_address(value: str) -> str:
+    """Return the bare address from a header value like 'Jane <jane@x.com>'"""
+    address = parseaddr(value or '')[1]
+    return (address or value or '').strip().lower()
+
+
+# HTTP statuses worth retrying: timeouts, rate limits and server errors
+TRANSIENT_HTTP_STATUSES = {408, 429, 500, 502, 503, 504}
+
+
+def is_transient_error(error: Exception) -> bool:
+    """True for failures a retry can fix (network errors, 429, 5xx, 403 rate limits)"""
+    status = getattr(getattr(error, 'resp', None), 'status', None)
+    if status is not None:
+        status = int(status)
+        return status in TRANSIENT_HTTP_STATUSES or (status == 403 and 'RateLimitExceeded' in str(error))
+    return isinstance(error, OSError)
+
+
+def compute_sender_stats(threads: list[dict], email_address: str) -> dict[str, Any]:
+    """
+    Derive interaction stats for a sender from Gmail threads.
+
+    Threads are Gmail API thread resources (format 'metadata' with at least the
+    From header). Response time is measured from each message the sender wrote
+    to the next message in the same thread carrying the SENT label.
+
+    Returns:
+        Dictionary with avg_response_time_hours (None if the user never
+        replied), replied_count and last_interaction (ISO timestamp or None)
+    """
+    sender = extract_email_address(email_address)
+    response_hours = []
+    last_internal_date = None
+
+    for thread in threads:
+        messages = sorted(thread.get('messages', []), key=lambda m: int(m.get('internalDate', 0)))
+        awaiting_reply_since = None
+
+        for msg in messages:
+            headers = {h['name']: h['value'] for h in msg.get('payload', {}).get('headers', [])}
+            internal_date = int(msg.get('internalDate', 0))
+
+            if extract_email_address(headers.get('From', '')) == sender:
+                if last_internal_date is None or internal_date > last_internal_date:
+                    last_internal_date = internal_date
+                # Measure from the first unanswered message in a run
+                if awaiting_reply_since is None:
+                    awaiting_reply_since = internal_date
+            elif 'SENT' in msg.get('labelIds', []) and awaiting_reply_since is not None:
+                response_hours.append((internal_date - awaiting_reply_since) / 3_600_000)
+                awaiting_reply_since = None
+
+    avg_hours = round(sum(response_hours) / len(response_hours), 2) if response_hours else None
+
+    return {
+        "avg_response_time_hours": avg_hours,
+        "replied_count": len(response_hours),
+        "last_interaction": format_timestamp(str(last_internal_date)) if last_internal_date else None
+    }
+
+
 def create_message(to: list[str], subject: str, body: str, cc: list[str] = None, bcc: list[str] = None) -> dict:
     """Create a Gmail API message"""
     message = MIMEMultipart()
@@ -104,3 +281,114 @@ def create_reply_message(
     raw_message = base64.urlsafe_b64encode(message.as_bytes()).decode('utf-8')
 
     return {'raw': raw_message, 'threadId': thread_id}
+
+
+# Attachment bytes read per step when streaming MIME; a multiple of 57 so
+# every chunk base64-encodes to whole 76-character lines
+ATTACHMENT_READ_CHUNK = 57 * 16 * 1024
+
+
+def open_attachment(attachment: dict) -> tuple[str, str, BinaryIO, bool]:
+    """
+    Resolve an attachment dict to (filename, mime_type, binary stream, owns_stream).
+
+    Accepted keys: "path" (file on disk), "stream" (readable binary file
+    object, read in chunks) or "content" (bytes/str, small files), plus
+    optional "filename" and "mime_type" (guessed from the filename).
+    """
+    if attachment.get("path"):
+        stream, owned = open(attachment["path"], "rb"), True
+        default_name = os.path.basename(attachment["path"])
+    elif attachment.get("stream") is not None:
+        stream, owned = attachment["stream"], False
+        default_name = os.path.basename(getattr(stream, "name", "") or "attachment")
+    elif attachment.get("content") is not None:
+        content = attachment["content"]
+        stream, owned = io.BytesIO(content.encode("utf-8") if isinstance(content, str) else content), True
+        default_name = "attachment"
+    else:
+        raise ValueError("Attachment needs one of 'path', 'stream' or 'content'")
+
+    filename = attachment.get("filename") or default_name
+    mime_type = attachment.get("mime_type") or mimetypes.guess_type(filename)[0] or "application/octet-stream"
+    return filename, mime_type, stream, owned
+
+
+def _header_block(message) -> bytes:
+    """Serialized headers of a message object, ending with the blank line"""
+    return b"".join(message.policy.fold_binary(name, value) for name, value in message.items()) + b"\n"
+
+
+def write_mime_message(
+    fp: BinaryIO,
+    to: list[str],
+    subject: str,
+    body: str,
+    cc: list[str] | None = None,
+    bcc: list[str] | None = None,
+    attachments: list[dict] | None = None,
+    in_reply_to: str | None = None,
+    chunk_size: int = ATTACHMENT_READ_CHUNK
+) -> int:
+    """
+    Write a multipart/mixed RFC 822 message to fp, streaming attachments.
+
+    Attachments are read and base64-encoded chunk by chunk, so memory use
+    is bounded by chunk_size whatever the attachment sizes.
+
+    Returns:
+        Number of bytes written
+    """
+    boundary = f"==============={uuid.uuid4().hex}=="
+    root = MIMEMultipart(boundary=boundary)
+    root['to'] = ', '.join(to)
+    root['subject'] = subject
+    if cc:
+        root['cc'] = ', '.join(cc)
+    if bcc:
+        root['bcc'] = ', '.join(bcc)
+    if in_reply_to:
+        root['In-Reply-To'] = in_reply_to
+        root['References'] = in_reply_to
+
+    delimiter = f"--{boundary}\n".encode("ascii")
+    written = 0
+
+    def write(data: bytes) -> None:
+        nonlocal written
+        fp.write(data)
+        written += len(data)
+
+    write(_header_block(root))
+    write(delimiter)
+    write(MIMEText(body, 'plain').as_bytes() + b"\n")
+
+    for attachment in attachments or []:
+        filename, mime_type, stream, owned = open_attachment(attachment)
+        maintype, _, subtype = mime_type.partition("/")
+        part = MIMEBase(maintype, subtype or "octet-stream")
+        part.add_header('Content-Disposition', 'attachment', filename=filename)
+        part['Content-Transfer-Encoding'] = 'base64'
+        try:
+            write(delimiter)
+            write(_header_block(part))
+            # Encode whole 57-byte groups only (streams may return short
+            # reads), so padding can appear only at the very end
+            pending = b""
+            while True:
+                chunk = stream.read(chunk_size)
+                if not chunk:
+                    break
+                pending += chunk
+                whole = len(pending) - len(pending) % 57
+                if whole:
+                    write(base64.encodebytes(pending[:whole]))
+                    pending = pending[whole:]
+            if pending:
+                write(base64.encodebytes(pending))
+        finally:
+            if owned:
+                stream.close()
+
+    write(f"--{boundary}--\n".encode("ascii"))
+    return written
@@ -1,9 +1,15 @@
 """
 Gmail OAuth2 Handler that uses credentials from environment variables
 Works with refresh tokens without requiring interactive browser flow
+
+Credentials and the built Gmail service are cached per process, so creating
+another handler (or adapter) does not reload .env, refresh the token or
+rebuild the discovery service.
 """
 
 import os
+import threading
+from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Optional
 from google.auth.transport.requests import Request
@@ -19,6 +25,31 @@ SCOPES = [
     'https://www.googleapis.com/auth/gmail.modify'
 ]
 
+# Access tokens are refreshed this long before they expire, so requests
+# never go out with a token about to lapse
+REFRESH_MARGIN = timedelta(minutes=5)
+
+_dotenv_loaded = False
+_cache_lock = threading.Lock()
+_refresh_lock = threading.Lock()
+# (client_id, refresh_token) -> Credentials / Gmail service
+_credentials_cache: dict[tuple, Credentials] = {}
+_service_cache: dict[tuple, object] = {}
+
+
+def _load_env_once() -> None:
+    global _dotenv_loaded
+    if not _dotenv_loaded:
+        load_dotenv()
+        _dotenv_loaded = True
+
+
+def clear_credentials_cache() -> None:
+    """Forget cached credentials and services (e.g. after rotating the refresh token)"""
+    with _cache_lock:
+        _credentials_cache.clear()
+        _service_cache.clear()
+
 
 class GmailOAuthEnvHandler:
     """
@@ -27,8 +58,8 @@ class GmailOAuthEnvHandler:
     """
 
     def __init__(self):
-        # Load environment variables
-        load_dotenv()
+        # Load environment variables (once per process)
+        _load_env_once()
 
         self.client_id = os.getenv("GMAIL_CLIENT_ID")
         self.client_secret = os.getenv("GMAIL_CLIENT_SECRET")
@@ -65,38 +96,80 @@ class GmailOAuthEnvHandler:
                 "GMAIL_REFRESH_TOKEN=your_refresh_token\n"
             )
 
-        # Create credentials from refresh token
-        self.creds = Credentials(
-            token=None,  # Access token will be auto-generated from refresh token
-            refresh_token=self.refresh_token,
-            token_uri="https://oauth2.googleapis.com/token",
-            client_id=self.client_id,
-            client_secret=self.client_secret,
-            scopes=SCOPES
-        )
-
-        # Refresh the credentials to get a valid access token
-        print("Refreshing Gmail access token from refresh token...")
-        try:
-            self.creds.refresh(Request())
-            print("SUCCESS: Gmail credentials refreshed successfully")
-        except Exception as e:
-            print(f"ERROR refreshing credentials: {e}")
-            raise Exception(
-                f"Failed to refresh Gmail credentials: {e}\n\n"
-                "Your refresh token might be expired or invalid. "
-                "Please check your GMAIL_REFRESH_TOKEN in .env"
-            )
+        # Reuse credentials created by an earlier handler in this process
+        with _cache_lock:
+            self.creds = _credentials_cache.get(self._cache_key)
+            if self.creds is None:
+                self.creds = Credentials(
+                    token=None,  # Access token will be auto-generated from refresh token
+                    refresh_token=self.refresh_token,
+                    token_uri="https://oauth2.googleapis.com/token",
+                    client_id=self.client_id,
+                    client_secret=self.client_secret,
+                    scopes=SCOPES
+                )
+                _credentials_cache[self._cache_key] = self.creds
+
+        # Make sure the access token is valid (refreshes only when needed)
+        self.ensure_fresh()
 
         return self.creds
 
+    @property
+    def _cache_key(self) -> tuple:
+        return (self.client_id, self.refresh_token)
+
+    @staticmethod
+    def _needs_refresh(creds: Credentials, margin: timedelta) -> bool:
+        if not creds.token:
+            return True
+        if creds.expiry is None:
+            return False
+        # google-auth keeps expiry as naive UTC
+        return creds.expiry - datetime.utcnow() <= margin
+
+    def ensure_fresh(self, margin: timedelta = REFRESH_MARGIN) -> None:
+        """
+        Refresh the access token if it is missing or expires within margin.
+
+        Cheap when the token is fresh; safe to call before every request.
+        Concurrent callers share a single refresh.
+        """
+        if self.creds is None or not self._needs_refresh(self.creds, margin):
+            return
+
+        with _refresh_lock:
+            # Another thread may have refreshed while we waited
+            if not self._needs_refresh(self.creds, margin):
+                return
+
+            print("Refreshing Gmail access token from refresh token...")
+            try:
+                self.creds.refresh(Request())
+                print("SUCCESS: Gmail credentials refreshed successfully")
+            except Exception as e:
+                print(f"ERROR refreshing credentials: {e}")
+                raise Exception(
+                    f"Failed to refresh Gmail credentials: {e}\n\n"
+                    "Your refresh token might be expired or invalid. "
+                    "Please check your GMAIL_REFRESH_TOKEN in .env"
+                )
+
     def get_gmail_service(self):
         """
         Get authenticated Gmail API service.
 
+        The service is built once per credentials from the discovery document
+        bundled with google-api-python-client (no discovery fetch) and then
+        reused.
+
         Returns:
             Gmail API service object
         """
         creds = self.get_credentials()
-        service = build('gmail', 'v1', credentials=creds)
+        with _cache_lock:
+            service = _service_cache.get(self._cache_key)
+            if service is None:
+                service = build('gmail', 'v1', credentials=creds, cache_discovery=False, static_discovery=True)
+                _service_cache[self._cache_key] = service
         return service
@@ -0,0 +1,619 @@
+"""
+Local Gmail mailbox mirror
+SQLite copy of message metadata (headers, labels, snippet) kept current with
+Gmail's history API, plus an FTS5 full-text index over subjects, senders,
+snippets and bodies, so listing, search and sender-history queries are
+answered locally instead of with live API calls.
+
+Usage:
+    mirror = MailboxMirror("./data/mailbox_mirror.sqlite3")
+    engine = MailboxSyncEngine(gmail_adapter, mirror)
+    await engine.sync()            # full sync first time, incremental after
+    threads, has_more = mirror.search_threads(compile_gmail_query("in:inbox"), limit=20)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from .gmail_adapter_helpers import (
+    LISTING_HEADERS,
+    compute_sender_stats,
+    extract_email_address,
+    format_thread,
+    get_message_body,
+    is_transient_error
+)
+from ...utils.email_query import EmailIndexQuery
+
+
+# Bump when the schema changes; the mirror is a cache, so an outdated file
+# is dropped and rebuilt by the next full sync
+SCHEMA_VERSION = 2
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS messages (
+    seq INTEGER PRIMARY KEY,
+    id TEXT NOT NULL UNIQUE,
+    thread_id TEXT NOT NULL,
+    history_id INTEGER,
+    internal_date INTEGER NOT NULL,
+    sender TEXT NOT NULL DEFAULT '',
+    sender_email TEXT NOT NULL DEFAULT '',
+    recipients TEXT NOT NULL DEFAULT '',
+    subject TEXT NOT NULL DEFAULT '',
+    snippet TEXT NOT NULL DEFAULT '',
+    label_ids TEXT NOT NULL DEFAULT '[]'
+);
+CREATE INDEX IF NOT EXISTS idx_messages_thread ON messages(thread_id, internal_date);
+CREATE INDEX IF NOT EXISTS idx_messages_date ON messages(internal_date);
+CREATE INDEX IF NOT EXISTS idx_messages_sender ON messages(sender_email, internal_date);
+
+CREATE TABLE IF NOT EXISTS message_labels (
+    message_id TEXT NOT NULL,
+    label TEXT NOT NULL,
+    PRIMARY KEY (label, message_id)
+);
+CREATE INDEX IF NOT EXISTS idx_message_labels_message ON message_labels(message_id);
+
+CREATE TABLE IF NOT EXISTS sync_state (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS messages_fts USING fts5(
+    subject, sender, snippet, body,
+    tokenize = 'porter unicode61'
+);
+"""
+
+# bm25 column weights for (subject, sender, snippet, body)
+FTS_WEIGHTS = (5.0, 3.0, 1.5, 1.0)
+
+# Body text kept in the index per message
+MAX_INDEXED_BODY_CHARS = 20_000
+
+# Partial responses for mirrored messages; the full variant carries the body
+# parts so they can be indexed
+MIRROR_MESSAGE_FIELDS = 'id,threadId,labelIds,internalDate,snippet,historyId,payload/headers'
+MIRROR_FULL_MESSAGE_FIELDS = 'id,threadId,labelIds,internalDate,snippet,historyId,payload'
+
+HISTORY_TYPES = ['messageAdded', 'messageDeleted', 'labelAdded', 'labelRemoved']
+
+# Messages listed, fetched and written per step of a full sync, so memory
+# stays bounded by one page of full-format resources
+FULL_SYNC_PAGE_SIZE = 250
+
+
+class MailboxMirror:
+    """
+    SQLite store of mirrored Gmail messages.
+
+    One connection is shared behind a lock; every query touches indexed
+    columns or the FTS index only, so calls return in milliseconds and are
+    made directly from the event loop. Sync writes (body extraction, FTS
+    inserts, commits) are run on a worker thread by MailboxSyncEngine.
+    """
+
+    def __init__(self, db_path: str = ":memory:"):
+        self.db_path = db_path
+        if db_path != ":memory:":
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock:
+            if self._conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+                self._conn.executescript(
+                    "DROP TABLE IF EXISTS messages; DROP TABLE IF EXISTS message_labels; "
+                    "DROP TABLE IF EXISTS messages_fts; DROP TABLE IF EXISTS sync_state;"
+                )
+                self._conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+            self._conn.executescript(SCHEMA)
+            self._conn.executescript(FTS_SCHEMA)
+            if db_path != ":memory:":
+                self._conn.execute("PRAGMA journal_mode=WAL")
+
+    # -- sync state ---------------------------------------------------------
+
+    def get_state(self, key: str) -> str | None:
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM sync_state WHERE key = ?", (key,)).fetchone()
+        return row["value"] if row else None
+
+    @property
+    def history_id(self) -> int | None:
+        """historyId the mirror is consistent with (None before the first sync)"""
+        value = self.get_state("history_id")
+        return int(value) if value else None
+
+    # -- writes ---------------------------------------------------------------
+
+    @staticmethod
+    def _message_row(message: dict) -> tuple:
+        headers = {h['name'].lower(): h['value'] for h in message.get('payload', {}).get('headers', [])}
+        sender = headers.get('from', '')
+        return (
+            message['id'],
+            message['threadId'],
+            int(message.get('historyId') or 0),
+            int(message.get('internalDate') or 0),
+            sender,
+            extract_email_address(sender),
+            headers.get('to', ''),
+            headers.get('subject', ''),
+            message.get('snippet', ''),
+            json.dumps(message.get('labelIds', [])),
+        )
+
+    def _upsert(self, messages: list[dict]) -> None:
+        # FTS rows use the messages.seq of their message as rowid; drop the
+        # old ones before INSERT OR REPLACE assigns a new seq
+        ids = [(m['id'],) for m in messages]
+        self._conn.executemany(
+            "DELETE FROM messages_fts WHERE rowid = (SELECT seq FROM messages WHERE id = ?)", ids
+        )
+        rows = [self._message_row(m) for m in messages]
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO messages (id, thread_id, history_id, internal_date, sender, "
+            "sender_email, recipients, subject, snippet, label_ids) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            rows
+        )
+        self._conn.executemany("DELETE FROM message_labels WHERE message_id = ?", ids)
+        self._conn.executemany(
+            "INSERT INTO message_labels (message_id, label) VALUES (?, ?)",
+            [(m['id'], label) for m in messages for label in m.get('labelIds', [])]
+        )
+        self._conn.executemany(
+            "INSERT INTO messages_fts (rowid, subject, sender, snippet, body) "
+            "VALUES ((SELECT seq FROM messages WHERE id = ?), ?, ?, ?, ?)",
+            [(row[0], row[7], row[4], row[8], self._index_body(m)) for row, m in zip(rows, messages)]
+        )
+
+    @staticmethod
+    def _index_body(message: dict) -> str:
+        """Plain-text body for the index ('' for metadata-only resources)"""
+        payload = message.get('payload', {})
+        if 'body' not in payload and 'parts' not in payload:
+            return ''
+        try:
+            return get_message_body(payload, max_chars=MAX_INDEXED_BODY_CHARS)
+        except Exception:
+            return ''
+
+    def _delete(self, message_ids: list[str]) -> None:
+        ids = [(i,) for i in message_ids]
+        self._conn.executemany(
+            "DELETE FROM messages_fts WHERE rowid = (SELECT seq FROM messages WHERE id = ?)", ids
+        )
+        self._conn.executemany("DELETE FROM messages WHERE id = ?", ids)
+        self._conn.executemany("DELETE FROM message_labels WHERE message_id = ?", ids)
+
+    def _set_state(self, key: str, value: str) -> None:
+        self._conn.execute("INSERT OR REPLACE INTO sync_state (key, value) VALUES (?, ?)", (key, value))
+
+    def upsert_messages(self, messages: list[dict]) -> None:
+        """Write one page of a full sync (the historyId is left unchanged)"""
+        with self._lock, self._conn:
+            self._upsert(messages)
+
+    def finish_full_sync(self, synced_ids: set[str], history_id: int) -> int:
+        """
+        Complete a full sync whose pages were written with upsert_messages.
+
+        Messages the sync did not see are dropped, then the historyId is
+        stored, so an interrupted full sync never looks complete.
+
+        Returns:
+            Number of messages removed
+        """
+        with self._lock, self._conn:
+            stale = [
+                row["id"] for row in self._conn.execute("SELECT id FROM messages")
+                if row["id"] not in synced_ids
+            ]
+            self._delete(stale)
+            self._set_state("history_id", str(history_id))
+            self._set_state("last_full_sync", datetime.utcnow().isoformat() + 'Z')
+        return len(stale)
+
+    def apply_changes(
+        self,
+        upserts: list[dict],
+        deleted_ids: list[str],
+        label_changes: list[tuple[str, list[str], list[str]]],
+        history_id: int
+    ) -> None:
+        """
+        Apply one incremental sync atomically.
+
+        Label changes are applied first so freshly fetched messages in
+        upserts (which carry current labels) always win.
+        """
+        with self._lock, self._conn:
+            for message_id, added, removed in label_changes:
+                self._change_labels(message_id, added, removed)
+            self._upsert(upserts)
+            self._delete(deleted_ids)
+            self._set_state("history_id", str(history_id))
+
+    def _change_labels(self, message_id: str, added: list[str], removed: list[str]) -> bool:
+        row = self._conn.execute("SELECT label_ids FROM messages WHERE id = ?", (message_id,)).fetchone()
+        if row is None:
+            return False
+        labels = [l for l in json.loads(row["label_ids"]) if l not in removed]
+        labels += [l for l in added if l not in labels]
+        self._conn.execute("UPDATE messages SET label_ids = ? WHERE id = ?", (json.dumps(labels), message_id))
+        self._conn.execute("DELETE FROM message_labels WHERE message_id = ?", (message_id,))
+        self._conn.executemany(
+            "INSERT INTO message_labels (message_id, label) VALUES (?, ?)",
+            [(message_id, label) for label in labels]
+        )
+        return True
+
+    def has_message(self, message_id: str) -> bool:
+        with self._lock:
+            return self._conn.execute("SELECT 1 FROM messages WHERE id = ?", (message_id,)).fetchone() is not None
+
+    def thread_message_ids(self, thread_ids: list[str]) -> dict[str, list[str]]:
+        """Mirrored message ids per thread (threads not in the mirror are omitted)"""
+        if not thread_ids:
+            return {}
+        placeholders = ",".join("?" * len(thread_ids))
+        result: dict[str, list[str]] = {}
+        with self._lock:
+            for row in self._conn.execute(
+                f"SELECT thread_id, id FROM messages WHERE thread_id IN ({placeholders})", thread_ids
+            ):
+                result.setdefault(row["thread_id"], []).append(row["id"])
+        return result
+
+    def update_thread_labels(self, thread_id: str, added: list[str] | None = None, removed: list[str] | None = None) -> None:
+        """Apply a label change made through the live API without waiting for the next sync"""
+        with self._lock, self._conn:
+            ids = [r["id"] for r in self._conn.execute("SELECT id FROM messages WHERE thread_id = ?", (thread_id,))]
+            for message_id in ids:
+                self._change_labels(message_id, added or [], removed or [])
+
+    # -- reads ----------------------------------------------------------------
+
+    @staticmethod
+    def _row_to_resource(row: sqlite3.Row) -> dict:
+        """Rebuild a Gmail metadata-format message resource from a row"""
+        return {
+            "id": row["id"],
+            "threadId": row["thread_id"],
+            "labelIds": json.loads(row["label_ids"]),
+            "internalDate": str(row["internal_date"]),
+            "snippet": row["snippet"],
+            "payload": {"headers": [
+                {"name": "From", "value": row["sender"]},
+                {"name": "To", "value": row["recipients"]},
+                {"name": "Subject", "value": row["subject"]},
+            ]},
+        }
+
+    def _load_threads(self, thread_ids: list[str]) -> dict[str, dict]:
+        """Thread resources (messages oldest first) for the given ids"""
+        if not thread_ids:
+            return {}
+        placeholders = ",".join("?" * len(thread_ids))
+        threads: dict[str, dict] = {thread_id: {"id": thread_id, "messages": []} for thread_id in thread_ids}
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT * FROM messages WHERE thread_id IN ({placeholders}) ORDER BY internal_date",
+                thread_ids
+            ).fetchall()
+        for row in rows:
+            threads[row["thread_id"]]["messages"].append(self._row_to_resource(row))
+        return threads
+
+    def search_threads(
+        self,
+        query: EmailIndexQuery,
+        limit: int = 50,
+        offset: int = 0
+    ) -> tuple[list[dict[str, Any]], bool]:
+        """
+        Threads with at least one message matching the query, in the same
+        shape as GmailAdapter.fetch_threads listings.
+
+        Full-text matches are ranked by their best message's bm25 score
+        (subject and sender weigh most), then by recency; filter-only
+        queries are ordered newest first.
+
+        Returns:
+            (threads, has_more) - has_more is True when another page exists
+        """
+        where, params = [], []
+        for label in query.labels:
+            where.append("EXISTS (SELECT 1 FROM message_labels l WHERE l.message_id = m.id AND l.label = ?)")
+            params.append(label)
+        if query.unread_only:
+            where.append("EXISTS (SELECT 1 FROM message_labels l WHERE l.message_id = m.id AND l.label = 'UNREAD')")
+        if query.sender_email:
+            where.append("m.sender_email = ?")
+            params.append(query.sender_email)
+
+        if query.match:
+            # bm25() can't be aggregated directly; materialize the hits first
+            weights = ", ".join(str(w) for w in FTS_WEIGHTS)
+            sql = (
+                "WITH hits AS MATERIALIZED ("
+                f"SELECT rowid, bm25(messages_fts, {weights}) AS score "
+                "FROM messages_fts WHERE messages_fts MATCH ?) "
+                "SELECT m.thread_id, MIN(hits.score) AS score, MAX(m.internal_date) AS latest "
+                "FROM hits JOIN messages m ON m.seq = hits.rowid"
+            )
+            params.insert(0, query.match)
+            order = "score, latest DESC"
+        else:
+            sql = "SELECT m.thread_id, MAX(m.internal_date) AS latest FROM messages m"
+            order = "latest DESC"
+
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += f" GROUP BY m.thread_id ORDER BY {order} LIMIT ? OFFSET ?"
+
+        with self._lock:
+            thread_ids = [r["thread_id"] for r in self._conn.execute(sql, params + [limit + 1, offset])]
+        has_more = len(thread_ids) > limit
+        return self.format_threads(thread_ids[:limit]), has_more
+
+    def format_threads(self, thread_ids: list[str]) -> list[dict[str, Any]]:
+        """Listing-format threads for the given ids, keeping their order"""
+        threads = self._load_threads(thread_ids)
+        return [
+            format_thread(thread_id, threads[thread_id], include_bodies=False)
+            for thread_id in thread_ids
+            if threads[thread_id]["messages"]
+        ]
+
+    def sender_history(self, email_address: str, thread_limit: int = 10) -> dict[str, Any]:
+        """Same result shape as GmailAdapter.get_sender_history, computed locally"""
+        sender = extract_email_address(email_address)
+        with self._lock:
+            interaction_count = self._conn.execute(
+                "SELECT COUNT(*) FROM messages WHERE sender_email = ?", (sender,)
+            ).fetchone()[0]
+            thread_ids = [r["thread_id"] for r in self._conn.execute(
+                "SELECT thread_id, MAX(internal_date) AS latest FROM messages WHERE sender_email = ? "
+                "GROUP BY thread_id ORDER BY latest DESC LIMIT ?",
+                (sender, thread_limit)
+            )]
+        stats = compute_sender_stats(list(self._load_threads(thread_ids).values()), email_address)
+
+        return {
+            "email": email_address,
+            "interaction_count": interaction_count,
+            "avg_response_time_hours": stats["avg_response_time_hours"],
+            "replied_count": stats["replied_count"],
+            "relationship": "contact",
+            "last_interaction": stats["last_interaction"]
+        }
+
+    def stats(self) -> dict[str, Any]:
+        """Message/thread counts and sync position"""
+        with self._lock:
+            messages, threads = self._conn.execute(
+                "SELECT COUNT(*), COUNT(DISTINCT thread_id) FROM messages"
+            ).fetchone()
+        return {
+            "messages": messages,
+            "threads": threads,
+            "history_id": self.history_id,
+            "last_full_sync": self.get_state("last_full_sync"),
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def _is_not_found(error: Exception) -> bool:
+    return getattr(getattr(error, "resp", None), "status", None) == 404
+
+
+class MailboxSyncEngine:
+    """
+    Keeps a MailboxMirror in step with Gmail.
+
+    The first sync lists messages (optionally limited by full_sync_query)
+    and loads their metadata in batch requests. Later syncs replay
+    users.history.list from the stored historyId and fetch only new
+    messages. Gmail keeps history for about a week; when the stored
+    historyId has expired (404) the engine falls back to a full resync.
+    """
+
+    def __init__(
+        self,
+        gmail,
+        mirror: MailboxMirror,
+        full_sync_query: str | None = None,
+        max_full_sync_messages: int = 5000,
+        index_bodies: bool = True,
+        fetch_retries: int = 3,
+        fetch_retry_backoff: float = 1.0
+    ):
+        self.gmail = gmail
+        self.mirror = mirror
+        self.full_sync_query = full_sync_query
+        self.max_full_sync_messages = max_full_sync_messages
+        # Transient sub-request failures (429, 5xx) are retried this many
+        # times with exponential backoff before the sync is abandoned
+        self.fetch_retries = fetch_retries
+        self.fetch_retry_backoff = fetch_retry_backoff
+        # Bodies are fetched once per message at sync time for the search
+        # index; listings never decode them
+        self.index_bodies = index_bodies
+        self.last_sync: dict[str, Any] | None = None
+
+    @property
+    def _users(self):
+        return self.gmail.service.users()
+
+    async def sync(self, force_full: bool = False) -> dict[str, Any]:
+        """Bring the mirror up to date; returns a summary of what changed"""
+        if force_full or self.mirror.history_id is None:
+            return await self.full_sync()
+        return await self.incremental_sync()
+
+    async def _fetch_messages(self, message_ids: list[str]) -> list[dict]:
+        """
+        Message resources via batch requests.
+
+        Messages deleted meanwhile (404) are dropped, and transient
+        failures are fetched again with backoff. A failure that persists is
+        raised, so the sync is abandoned before the stored historyId moves
+        past messages that were never mirrored; the next sync replays the
+        same range.
+        """
+        if self.index_bodies:
+            get_kwargs = {'format': 'full', 'fields': MIRROR_FULL_MESSAGE_FIELDS}
+        else:
+            get_kwargs = {'format': 'metadata', 'metadataHeaders': LISTING_HEADERS, 'fields': MIRROR_MESSAGE_FIELDS}
+
+        fetched: dict[str, dict] = {}
+        pending = list(message_ids)
+        attempt = 0
+        while pending:
+            resources = await self.gmail.batch_execute([
+                self._users.messages().get(userId='me', id=message_id, **get_kwargs)
+                for message_id in pending
+            ], return_exceptions=True)
+
+            failed: list[str] = []
+            for message_id, resource in zip(pending, resources):
+                if not isinstance(resource, Exception):
+                    if resource:
+                        fetched[message_id] = resource
+                elif not _is_not_found(resource):
+                    if attempt >= self.fetch_retries or not is_transient_error(resource):
+                        print(f"Mailbox sync: fetching message {message_id} failed: {resource}")
+                        raise resource
+                    failed.append(message_id)
+
+            pending = failed
+            if pending:
+                attempt += 1
+                print(f"Mailbox sync: retrying {len(pending)} of {len(message_ids)} message fetches")
+                await asyncio.sleep(min(self.fetch_retry_backoff * 2 ** (attempt - 1), 30))
+        return [fetched[message_id] for message_id in message_ids if message_id in fetched]
+
+    async def full_sync(self, reason: str = "initial") -> dict[str, Any]:
+        started = time.perf_counter()
+
+        # Take the historyId first so changes made during the listing are
+        # replayed by the next incremental sync rather than lost
+        profile = await self.gmail.execute_request(self._users.getProfile(userId='me'))
+        history_id = int(profile['historyId'])
+
+        # Each listed page is fetched and written before the next is
+        # listed; the historyId is only stored once every page is written
+        synced_ids: set[str] = set()
+        listed = 0
+        page_token = None
+        while listed < self.max_full_sync_messages:
+            results = await self.gmail.execute_request(self._users.messages().list(
+                userId='me',
+                q=self.full_sync_query,
+                maxResults=min(FULL_SYNC_PAGE_SIZE, self.max_full_sync_messages - listed),
+                pageToken=page_token,
+                fields='messages(id),nextPageToken'
+            ))
+            message_ids = [m['id'] for m in results.get('messages', [])]
+            listed += len(message_ids)
+            messages = await self._fetch_messages(message_ids)
+            await asyncio.to_thread(self.mirror.upsert_messages, messages)
+            synced_ids.update(m['id'] for m in messages)
+            page_token = results.get('nextPageToken')
+            if not page_token:
+                break
+
+        removed = await asyncio.to_thread(self.mirror.finish_full_sync, synced_ids, history_id)
+
+        return self._finish(
+            started,
+            mode="full",
+            reason=reason,
+            added=len(synced_ids),
+            deleted=removed,
+            history_id=history_id
+        )
+
+    async def incremental_sync(self) -> dict[str, Any]:
+        started = time.perf_counter()
+        start_history_id = self.mirror.history_id
+
+        added: dict[str, None] = {}
+        deleted: set[str] = set()
+        label_changes: list[tuple[str, list[str], list[str]]] = []
+        latest_history_id = start_history_id
+        page_token = None
+
+        while True:
+            try:
+                results = await self.gmail.execute_request(self._users.history().list(
+                    userId='me',
+                    startHistoryId=str(start_history_id),
+                    historyTypes=HISTORY_TYPES,
+                    maxResults=500,
+                    pageToken=page_token
+                ))
+            except Exception as e:
+                if _is_not_found(e):
+                    return await self.full_sync(reason="history_expired")
+                raise
+
+            for record in results.get('history', []):
+                for item in record.get('messagesAdded', []):
+                    added[item['message']['id']] = None
+                    deleted.discard(item['message']['id'])
+                for item in record.get('messagesDeleted', []):
+                    added.pop(item['message']['id'], None)
+                    deleted.add(item['message']['id'])
+                for item in record.get('labelsAdded', []):
+                    label_changes.append((item['message']['id'], item.get('labelIds', []), []))
+                for item in record.get('labelsRemoved', []):
+                    label_changes.append((item['message']['id'], [], item.get('labelIds', [])))
+
+            latest_history_id = int(results.get('historyId', latest_history_id))
+            page_token = results.get('nextPageToken')
+            if not page_token:
+                break
+
+        # Label changes on messages we never mirrored (e.g. outside the
+        # full-sync window) are resolved by fetching the message itself
+        for message_id, _, _ in label_changes:
+            if message_id not in deleted and message_id not in added and not self.mirror.has_message(message_id):
+                added[message_id] = None
+
+        upserts = await self._fetch_messages(list(added))
+        await asyncio.to_thread(self.mirror.apply_changes, upserts, sorted(deleted), label_changes, latest_history_id)
+
+        return self._finish(
+            started,
+            mode="incremental",
+            added=len(upserts),
+            deleted=len(deleted),
+            label_changes=len(label_changes),
+            history_id=latest_history_id
+        )
+
+    def _finish(self, started: float, **summary: Any) -> dict[str, Any]:
+        summary["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 2)
+        summary["synced_at"] = datetime.utcnow().isoformat() + 'Z'
+        self.last_sync = summary
+        return summary
+
+
+__all__ = ["MailboxMirror", "MailboxSyncEngine"]
@@ -0,0 +1,228 @@
+"""
+Mirror-backed email adapter
+Serves listings, searches and sender history from the local mailbox mirror
+and its full-text index, and delegates reads of full threads and all writes
+to the live Gmail adapter.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Any
+
+from .base import BaseEmailAdapter
+from .gmail_adapter import GmailAdapter
+from .mailbox_mirror import MailboxMirror, MailboxSyncEngine
+from ...utils.email_query import compile_gmail_query
+
+
+class MirroredEmailAdapter(BaseEmailAdapter):
+    """
+    Email adapter backed by a local Gmail mirror.
+
+    The mirror is brought up to date lazily: a query arriving more than
+    max_staleness_seconds after the last sync first runs an incremental
+    sync (one history.list call when nothing changed). If Gmail is
+    unreachable the last synced state is served. The first full sync
+    (up to thousands of messages) runs as a background task; queries are
+    answered by Gmail until it has finished.
+    """
+
+    def __init__(
+        self,
+        gmail: GmailAdapter,
+        mirror: MailboxMirror | None = None,
+        db_path: str = ":memory:",
+        max_staleness_seconds: float = 60.0,
+        full_sync_query: str | None = None
+    ):
+        super().__init__()
+        self.gmail = gmail
+        self.mirror = mirror or MailboxMirror(db_path)
+        self.engine = MailboxSyncEngine(gmail, self.mirror, full_sync_query=full_sync_query)
+        self.max_staleness_seconds = max_staleness_seconds
+        self._last_sync_at: float | None = None
+        self._sync_lock = asyncio.Lock()
+        self._initial_sync_task: asyncio.Task | None = None
+
+    @property
+    def live(self) -> bool:
+        """True when a real (or injected) Gmail service is available"""
+        return not self.gmail.use_mock and self.gmail.service is not None
+
+    async def sync(self, force_full: bool = False) -> dict[str, Any]:
+        """Sync the mirror now"""
+        async with self._sync_lock:
+            summary = await self.engine.sync(force_full=force_full)
+            self._last_sync_at = time.monotonic()
+            return summary
+
+    def _start_initial_sync(self) -> None:
+        """Run the first full sync in the background (at most one at a time)"""
+        if self._initial_sync_task is None or self._initial_sync_task.done():
+            self._initial_sync_task = asyncio.create_task(self._initial_sync())
+
+    async def _initial_sync(self) -> None:
+        try:
+            await self.sync()
+        except Exception as e:
+            print(f"Initial mailbox mirror sync failed, retrying on the next query: {e}")
+
+    async def _ensure_fresh(self) -> bool:
+        """Sync if stale; True when the mirror can answer queries"""
+        if not self.live:
+            return False
+
+        if self.mirror.history_id is None:
+            # Never synced: don't hold this request for a full sync
+            self._start_initial_sync()
+            return False
+
+        stale = (
+            self._last_sync_at is None
+            or time.monotonic() - self._last_sync_at > self.max_staleness_seconds
+        )
+        if stale:
+            async with self._sync_lock:
+                # Another request may have synced while we waited
+                if self._last_sync_at is None or time.monotonic() - self._last_sync_at > self.max_staleness_seconds:
+                    try:
+                        await self.engine.sync()
+                        self._last_sync_at = time.monotonic()
+                    except Exception as e:
+                        print(f"Mailbox mirror sync failed, serving last synced state: {e}")
+
+        return self.mirror.history_id is not None
+
+    async def fetch_threads(
+        self,
+        max_results: int = 50,
+        unread_only: bool = False,
+        query: str | None = None,
+        include_bodies: bool = False
+    ) -> list[dict[str, Any]]:
+        """Fetch threads from the mirror (bodies still come from Gmail)"""
+        gmail_query = query or ("" if unread_only else "in:inbox")
+        index_query = compile_gmail_query(gmail_query)
+        if include_bodies or index_query is None or not await self._ensure_fresh():
+            return await self.gmail.fetch_threads(max_results, unread_only, query, include_bodies=include_bodies)
+
+        index_query.unread_only = index_query.unread_only or unread_only
+        threads, _ = self.mirror.search_threads(index_query, limit=max_results)
+        return threads
+
+    async def get_thread(self, thread_id: str) -> dict[str, Any]:
+        """Full thread with bodies, always from Gmail"""
+        return await self.gmail.get_thread(thread_id)
+
+    async def send_email(
+        self,
+        to: list[str],
+        subject: str,
+        body: str,
+        cc: list[str] | None = None,
+        bcc: list[str] | None = None,
+        thread_id: str | None = None,
+        attachments: list[dict] | None = None
+    ) -> dict[str, Any]:
+        """Send through Gmail; the sent message arrives with the next sync"""
+        return await self.gmail.send_email(to, subject, body, cc=cc, bcc=bcc, thread_id=thread_id, attachments=attachments)
+
+    async def mark_read(self, thread_id: str) -> bool:
+        success = await self.gmail.mark_read(thread_id)
+        if success:
+            self.mirror.update_thread_labels(thread_id, removed=["UNREAD"])
+        return success
+
+    async def archive_thread(self, thread_id: str) -> bool:
+        success = await self.gmail.archive_thread(thread_id)
+        if success:
+            self.mirror.update_thread_labels(thread_id, removed=["INBOX"])
+        return success
+
+    async def bulk_modify_threads(
+        self,
+        thread_ids: list[str],
+        add_label_ids: list[str] | None = None,
+        remove_label_ids: list[str] | None = None
+    ) -> dict[str, Any]:
+        """
+        Bulk label change through Gmail batchModify.
+
+        When every thread is mirrored its message ids come from the mirror,
+        so the whole operation is a single batchModify call per 1000 messages.
+        """
+        thread_ids = list(dict.fromkeys(thread_ids))
+        known = self.mirror.thread_message_ids(thread_ids) if await self._ensure_fresh() else {}
+        result = await self.gmail.bulk_modify_threads(
+            thread_ids,
+            add_label_ids,
+            remove_label_ids,
+            message_ids_by_thread=known if len(known) == len(thread_ids) else None
+        )
+
+        failed = set(result.get("failed_thread_ids", []))
+        for thread_id in thread_ids:
+            if thread_id not in failed:
+                self.mirror.update_thread_labels(thread_id, added=add_label_ids, removed=remove_label_ids)
+        return result
+
+    async def get_sender_history(self, email_address: str) -> dict[str, Any]:
+        if not await self._ensure_fresh():
+            return await self.gmail.get_sender_history(email_address)
+        return self.mirror.sender_history(email_address, thread_limit=self.gmail.sender_history_thread_limit)
+
+    async def search_emails(
+        self,
+        query: str,
+        max_results: int = 50,
+        include_bodies: bool = False
+    ) -> list[dict[str, Any]]:
+        if include_bodies:
+            return await self.gmail.search_emails(query, max_results, include_bodies=True)
+        page = await self.search_page(query, limit=max_results)
+        return page["threads"]
+
+    async def search_page(
+        self,
+        query: str,
+        limit: int = 25,
+        offset: int = 0,
+        unread_only: bool = False
+    ) -> dict[str, Any]:
+        """
+        One page of ranked search results.
+
+        Answered from the full-text index when the query compiles and the
+        mirror is usable (also while Gmail is unreachable); otherwise falls
+        back to a live Gmail search.
+
+        Returns:
+            {"threads", "next_offset" (None on the last page), "source": "index" | "gmail"}
+        """
+        index_query = compile_gmail_query(query)
+        if index_query is not None and await self._ensure_fresh():
+            index_query.unread_only = index_query.unread_only or unread_only
+            threads, has_more = self.mirror.search_threads(index_query, limit=limit, offset=offset)
+            return {
+                "threads": threads,
+                "next_offset": offset + limit if has_more else None,
+                "source": "index"
+            }
+
+        if unread_only:
+            query = f"is:unread {query}".strip()
+        threads = await self.gmail.search_emails(query, max_results=offset + limit)
+        return {"threads": threads[offset:], "next_offset": None, "source": "gmail"}
+
+    def get_mirror_stats(self) -> dict[str, Any]:
+        """Mirror size, sync position and the last sync summary"""
+        return {
+            **self.mirror.stats(),
+            "last_sync": self.engine.last_sync,
+            "initial_sync_running": self._initial_sync_task is not None and not self._initial_sync_task.done()
+        }
+
+
+__all__ = ["MirroredEmailAdapter"]
@@ -0,0 +1,413 @@
+"""
+Durable outbound email queue
+Sends are written to SQLite and acknowledged immediately; worker tasks
+deliver them through the email adapter with exponential-backoff retries
+and a send rate kept under Gmail's per-user quotas.
+
+Usage:
+    queue = OutboundEmailQueue(gmail_adapter, db_path="./data/outbound_queue.sqlite3")
+    record = await queue.enqueue(to=["a@b.com"], subject="Hi", body="...", idempotency_key=draft_id)
+    queue.get_status(record["outbox_id"])   # queued / sending / retrying / sent / failed
+
+Delivery is at-least-once: a send interrupted by a crash after Gmail
+accepted it is retried on restart.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import random
+import sqlite3
+import threading
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from .base import BaseEmailAdapter
+from .gmail_adapter_helpers import is_transient_error
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS outbound_emails (
+    seq INTEGER PRIMARY KEY,
+    id TEXT NOT NULL UNIQUE,
+    idempotency_key TEXT NOT NULL UNIQUE,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at REAL NOT NULL,
+    last_error TEXT,
+    message_id TEXT,
+    thread_id TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    sent_at REAL
+);
+CREATE INDEX IF NOT EXISTS idx_outbound_due ON outbound_emails(status, next_attempt_at);
+CREATE INDEX IF NOT EXISTS idx_outbound_sent ON outbound_emails(sent_at);
+"""
+
+# Statuses a worker may still pick up
+PENDING_STATUSES = ("queued", "retrying")
+TERMINAL_STATUSES = ("sent", "failed")
+
+# Gmail allows 250 quota units per user per second and messages.send costs
+# 100, i.e. 2.5 sends/s; daily caps are 2000 (Workspace) / 500 (consumer)
+DEFAULT_SENDS_PER_SECOND = 2.0
+DEFAULT_DAILY_SEND_LIMIT = 2000
+
+# Longest a sleeping worker waits before re-checking the queue
+IDLE_POLL_SECONDS = 30.0
+
+
+class SendRateLimiter:
+    """Token bucket: ``rate`` sends per second with bursts of up to ``burst``"""
+
+    def __init__(self, rate: float = DEFAULT_SENDS_PER_SECOND, burst: int = 5):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock: asyncio.Lock | None = None
+
+    async def acquire(self) -> None:
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class OutboundEmailQueue:
+    """
+    SQLite-backed queue of outgoing emails.
+
+    enqueue() commits the message and returns; ``workers`` asyncio tasks
+    (started on first use) claim due messages, wait for the rate limiter
+    and send them. Writes are fsynced (synchronous=FULL), so every SQLite
+    call made from async code runs on a worker thread via asyncio.to_thread. Transient failures (timeouts, 429, 5xx) are retried
+    with jittered exponential backoff up to ``max_attempts``; permanent
+    ones fail immediately. Each message carries an idempotency key
+    (the draft id for agent sends) so a repeated enqueue returns the
+    existing record instead of sending twice.
+    """
+
+    def __init__(
+        self,
+        adapter: BaseEmailAdapter,
+        db_path: str = ":memory:",
+        workers: int = 2,
+        max_attempts: int = 6,
+        base_backoff_seconds: float = 2.0,
+        max_backoff_seconds: float = 600.0,
+        sends_per_second: float = DEFAULT_SENDS_PER_SECOND,
+        burst: int = 5,
+        daily_send_limit: int = DEFAULT_DAILY_SEND_LIMIT
+    ):
+        self.adapter = adapter
+        self.db_path = db_path
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.base_backoff_seconds = base_backoff_seconds
+        self.max_backoff_seconds = max_backoff_seconds
+        self.daily_send_limit = daily_send_limit
+        self.rate_limiter = SendRateLimiter(sends_per_second, burst)
+
+        if db_path != ":memory:":
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            if db_path != ":memory:":
+                self._conn.execute("PRAGMA journal_mode=WAL")
+                # An acknowledged enqueue must survive a power loss
+                self._conn.execute("PRAGMA synchronous=FULL")
+            self._conn.executescript(SCHEMA)
+            # Sends interrupted by a restart are attempted again
+            self._conn.execute(
+                "UPDATE outbound_emails SET status = 'retrying' WHERE status = 'sending'"
+            )
+
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._tasks: list[asyncio.Task] = []
+        self._wakeup: asyncio.Event | None = None
+        self._changed: asyncio.Condition | None = None
+
+    # -- public API -------------------------------------------------------
+
+    async def enqueue(
+        self,
+        to: list[str],
+        subject: str,
+        body: str,
+        cc: list[str] | None = None,
+        bcc: list[str] | None = None,
+        thread_id: str | None = None,
+        idempotency_key: str | None = None
+    ) -> dict[str, Any]:
+        """
+        Durably queue an email and return its status record.
+
+        A second enqueue with the same idempotency_key returns the first
+        record (with ``duplicate: True``) and sends nothing.
+        """
+        now = time.time()
+        outbox_id = f"out_{uuid.uuid4().hex[:12]}"
+        payload = {
+            "to": to,
+            "subject": subject,
+            "body": body,
+            "cc": cc or [],
+            "bcc": bcc or [],
+            "thread_id": thread_id
+        }
+        inserted, row = await asyncio.to_thread(
+            self._insert, outbox_id, idempotency_key or outbox_id, payload, now
+        )
+
+        self.ensure_started()
+        if inserted:
+            self._wakeup.set()
+        return {**self._record(row), "duplicate": not inserted}
+
+    def get_status(self, outbox_id: str) -> dict[str, Any] | None:
+        """Status record by outbox id or idempotency key"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM outbound_emails WHERE id = ? OR idempotency_key = ?",
+                (outbox_id, outbox_id)
+            ).fetchone()
+        return self._record(row) if row else None
+
+    async def wait_for(self, outbox_id: str, timeout: float | None = None) -> dict[str, Any] | None:
+        """Wait until a message is sent or has failed for good"""
+        self.ensure_started()
+
+        def done():
+            record = self.get_status(outbox_id)
+            return record is None or record["status"] in TERMINAL_STATUSES
+
+        async with self._changed:
+            await asyncio.wait_for(self._changed.wait_for(done), timeout)
+        return self.get_status(outbox_id)
+
+    def stats(self) -> dict[str, Any]:
+        """Queue depth by status, sends in the last 24h and worker state"""
+        with self._lock:
+            counts = dict(self._conn.execute(
+                "SELECT status, COUNT(*) FROM outbound_emails GROUP BY status"
+            ).fetchall())
+            oldest = self._conn.execute(
+                "SELECT MIN(created_at) FROM outbound_emails WHERE status IN ('queued', 'retrying')"
+            ).fetchone()[0]
+        return {
+            "by_status": counts,
+            "sent_last_24h": self._sent_in_window(),
+            "daily_send_limit": self.daily_send_limit,
+            "oldest_pending_age_seconds": round(time.time() - oldest, 1) if oldest else None,
+            "workers_running": sum(not t.done() for t in self._tasks)
+        }
+
+    def ensure_started(self) -> None:
+        """Start the worker tasks on the running event loop (idempotent)"""
+        loop = asyncio.get_running_loop()
+        if loop is self._loop and any(not t.done() for t in self._tasks):
+            return
+        self._loop = loop
+        self._wakeup = asyncio.Event()
+        self._changed = asyncio.Condition()
+        self._tasks = [loop.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self) -> None:
+        """Cancel the workers; messages being sent are retried on the next start"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def close(self) -> None:
+        self._conn.close()
+
+    # -- workers ----------------------------------------------------------
+
+    async def _worker(self) -> None:
+        while True:
+            self._wakeup.clear()
+            quota_wait = await asyncio.to_thread(self._daily_quota_wait)
+            job = await asyncio.to_thread(self._claim_next) if quota_wait == 0 else None
+            if job is None:
+                if quota_wait:
+                    wait = quota_wait
+                else:
+                    next_due = await asyncio.to_thread(self._seconds_until_next_due)
+                    wait = IDLE_POLL_SECONDS if next_due is None else next_due
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), min(wait, IDLE_POLL_SECONDS))
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            try:
+                await self.rate_limiter.acquire()
+                await self._deliver(job)
+            except asyncio.CancelledError:
+                # Synchronous so the release is written before the task ends
+                self._release(job["id"])
+                raise
+            except Exception as e:
+                # A failure outside send_email (storage, notification) must not
+                # kill the worker or leave the job stuck in 'sending'
+                print(f"Outbound queue worker error for {job['id']}: {e}")
+                await asyncio.to_thread(
+                    self._update,
+                    job["id"],
+                    status="retrying",
+                    next_attempt_at=time.time() + self._backoff(job["attempts"]),
+                    last_error=str(e)
+                )
+
+    async def _deliver(self, job: sqlite3.Row) -> None:
+        payload = json.loads(job["payload"])
+        try:
+            result = await self.adapter.send_email(**payload)
+        except Exception as e:
+            result = {"success": False, "error": str(e), "retryable": is_transient_error(e)}
+
+        if result.get("success"):
+            await asyncio.to_thread(
+                self._update,
+                job["id"],
+                status="sent",
+                message_id=result.get("message_id"),
+                thread_id=result.get("thread_id"),
+                sent_at=time.time(),
+                last_error=None
+            )
+        elif result.get("retryable", True) and job["attempts"] < self.max_attempts:
+            await asyncio.to_thread(
+                self._update,
+                job["id"],
+                status="retrying",
+                next_attempt_at=time.time() + self._backoff(job["attempts"]),
+                last_error=result.get("error", "send failed")
+            )
+        else:
+            await asyncio.to_thread(
+                self._update, job["id"], status="failed", last_error=result.get("error", "send failed")
+            )
+
+        async with self._changed:
+            self._changed.notify_all()
+
+    def _backoff(self, attempts: int) -> float:
+        """Exponential backoff with jitter: half fixed, half random"""
+        delay = min(self.max_backoff_seconds, self.base_backoff_seconds * 2 ** (attempts - 1))
+        return delay / 2 + random.uniform(0, delay / 2)
+
+    def _insert(self, outbox_id: str, idempotency_key: str, payload: dict, now: float) -> tuple[bool, sqlite3.Row]:
+        """Insert unless the idempotency key exists; returns (inserted, stored row)"""
+        with self._lock, self._conn:
+            inserted = self._conn.execute(
+                "INSERT INTO outbound_emails (id, idempotency_key, payload, status, next_attempt_at, "
+                "created_at, updated_at) VALUES (?, ?, ?, 'queued', ?, ?, ?) "
+                "ON CONFLICT(idempotency_key) DO NOTHING",
+                (outbox_id, idempotency_key, json.dumps(payload), now, now, now)
+            ).rowcount
+            row = self._conn.execute(
+                "SELECT * FROM outbound_emails WHERE idempotency_key = ?", (idempotency_key,)
+            ).fetchone()
+        return bool(inserted), row
+
+    def _claim_next(self) -> sqlite3.Row | None:
+        now = time.time()
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT * FROM outbound_emails WHERE status IN ('queued', 'retrying') "
+                "AND next_attempt_at <= ? ORDER BY next_attempt_at, seq LIMIT 1",
+                (now,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute(
+                "UPDATE outbound_emails SET status = 'sending', attempts = attempts + 1, updated_at = ? "
+                "WHERE id = ?",
+                (now, row["id"])
+            )
+            return self._conn.execute("SELECT * FROM outbound_emails WHERE id = ?", (row["id"],)).fetchone()
+
+    def _update(self, outbox_id: str, **fields: Any) -> None:
+        fields["updated_at"] = time.time()
+        assignments = ", ".join(f"{name} = ?" for name in fields)
+        with self._lock, self._conn:
+            self._conn.execute(
+                f"UPDATE outbound_emails SET {assignments} WHERE id = ?",
+                (*fields.values(), outbox_id)
+            )
+
+    def _release(self, outbox_id: str) -> None:
+        """Hand a claimed job back; a result already written (e.g. 'sent') is kept"""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE outbound_emails SET status = 'retrying', updated_at = ? WHERE id = ? AND status = 'sending'",
+                (time.time(), outbox_id)
+            )
+
+    def _seconds_until_next_due(self) -> float | None:
+        with self._lock:
+            next_at = self._conn.execute(
+                "SELECT MIN(next_attempt_at) FROM outbound_emails WHERE status IN ('queued', 'retrying')"
+            ).fetchone()[0]
+        return max(0.0, next_at - time.time()) if next_at is not None else None
+
+    def _sent_in_window(self) -> int:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM outbound_emails WHERE sent_at > ?", (time.time() - 86400,)
+            ).fetchone()[0]
+
+    def _daily_quota_wait(self) -> float:
+        """Seconds until the rolling 24h send count drops below the daily limit"""
+        if self._sent_in_window() < self.daily_send_limit:
+            return 0.0
+        with self._lock:
+            # The send that has to age out of the window for one more to fit
+            oldest = self._conn.execute(
+                "SELECT sent_at FROM outbound_emails WHERE sent_at > ? ORDER BY sent_at LIMIT 1",
+                (time.time() - 86400,)
+            ).fetchone()[0]
+        return max(1.0, oldest + 86400 - time.time())
+
+    @staticmethod
+    def _record(row: sqlite3.Row) -> dict[str, Any]:
+        payload = json.loads(row["payload"])
+
+        def iso(value: float | None) -> str | None:
+            return datetime.fromtimestamp(value).isoformat() if value else None
+
+        return {
+            "outbox_id": row["id"],
+            "idempotency_key": row["idempotency_key"],
+            "status": row["status"],
+            "attempts": row["attempts"],
+            "to": payload["to"],
+            "subject": payload["subject"],
+            "message_id": row["message_id"],
+            "thread_id": row["thread_id"] or payload.get("thread_id"),
+            "last_error": row["last_error"],
+            "next_attempt_at": iso(row["next_attempt_at"]) if row["status"] in PENDING_STATUSES else None,
+            "created_at": iso(row["created_at"]),
+            "sent_at": iso(row["sent_at"])
+        }
+
+
+__all__ = ["OutboundEmailQueue", "SendRateLimiter"]
@@ -0,0 +1,22 @@
+"""
+TTS Adapters Package
+Adapters for text-to-speech providers (ElevenLabs, local fake) and the
+on-disk audio cache in front of them
+"""
+
+from .base import BaseTTSAdapter
+from .audio_cache import TTSAudioCache
+from .cached_adapter import CachedTTSAdapter
+from .fake_tts import FakeTTSAdapter
+from .elevenlabs_adapter import ElevenLabsTTSAdapter
+from .factory import create_tts_adapter, get_shared_tts_adapter
+
+__all__ = [
+    "BaseTTSAdapter",
+    "TTSAudioCache",
+    "CachedTTSAdapter",
+    "FakeTTSAdapter",
+    "ElevenLabsTTSAdapter",
+    "create_tts_adapter",
+    "get_shared_tts_adapter"
+]
@@ -0,0 +1,145 @@
+"""
+On-disk TTS audio cache
+Content-addressed store of synthesized clips keyed by (text, voice_id,
+model_id), bounded by total size with least-recently-used eviction.
+
+Usage:
+    cache = TTSAudioCache("./data/tts_cache", max_bytes=256 * 1024 * 1024)
+    key = cache.key("Good morning", voice_id, model_id)
+    path = cache.lookup(key)            # Path of the cached clip, or None
+    writer = cache.writer(key)          # fill while streaming, then commit()
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import uuid
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any
+
+
+class CacheWriter:
+    """
+    Writes one clip to a private temporary file as chunks arrive.
+
+    commit() moves it into place atomically; abort() (or a stream that
+    never finished) leaves the cache untouched.
+    """
+
+    def __init__(self, cache: "TTSAudioCache", key: str):
+        self.cache = cache
+        self.key = key
+        self.size = 0
+        self.done = False
+        self._path = cache.path_for(key)
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        self._partial = self._path.with_name(f"{self._path.name}.{uuid.uuid4().hex[:8]}.partial")
+        self._file = open(self._partial, "wb")
+
+    def write(self, chunk: bytes) -> None:
+        self._file.write(chunk)
+        self.size += len(chunk)
+
+    def commit(self) -> None:
+        self._file.close()
+        self.done = True
+        if self.size == 0 or self.size > self.cache.max_bytes:
+            self._partial.unlink(missing_ok=True)
+            return
+        os.replace(self._partial, self._path)
+        self.cache._added(self.key, self.size)
+
+    def abort(self) -> None:
+        if self.done:
+            return
+        self._file.close()
+        self.done = True
+        self._partial.unlink(missing_ok=True)
+
+
+class TTSAudioCache:
+    """
+    Size-bounded, content-addressed audio cache on disk.
+
+    Clips live at <cache_dir>/<key[:2]>/<key>.audio, where key is the
+    SHA-256 of (model_id, voice_id, text); identical requests share one
+    file. Recency is kept in memory (seeded from file mtimes on startup)
+    and once the cache exceeds max_bytes the least recently used clips are
+    deleted. Not thread-safe - use from the event loop.
+    """
+
+    def __init__(self, cache_dir: str, max_bytes: int = 256 * 1024 * 1024):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.total_bytes = 0
+
+        # key -> size, least recently used first
+        self._entries: OrderedDict[str, int] = OrderedDict()
+        clips = sorted(self.cache_dir.glob("*/*.audio"), key=lambda path: path.stat().st_mtime)
+        for path in clips:
+            self._entries[path.stem] = path.stat().st_size
+            self.total_bytes += self._entries[path.stem]
+        # Leftovers from writes interrupted by a crash
+        for partial in self.cache_dir.glob("*/*.partial"):
+            partial.unlink(missing_ok=True)
+        self._evict()
+
+    @staticmethod
+    def key(text: str, voice_id: str, model_id: str) -> str:
+        return hashlib.sha256(json.dumps([model_id, voice_id, text]).encode()).hexdigest()
+
+    def path_for(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.audio"
+
+    def lookup(self, key: str) -> Path | None:
+        """Path of the cached clip (marking it recently used), or None"""
+        if key not in self._entries:
+            self.misses += 1
+            return None
+        path = self.path_for(key)
+        if not path.exists():
+            self.total_bytes -= self._entries.pop(key)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        # Persist recency across restarts
+        os.utime(path)
+        self.hits += 1
+        return path
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    def writer(self, key: str) -> CacheWriter:
+        return CacheWriter(self, key)
+
+    def stats(self) -> dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self.total_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else None,
+            "evictions": self.evictions
+        }
+
+    def _added(self, key: str, size: int) -> None:
+        self.total_bytes += size - self._entries.pop(key, 0)
+        self._entries[key] = size
+        self._evict()
+
+    def _evict(self) -> None:
+        while self.total_bytes > self.max_bytes and self._entries:
+            key, size = self._entries.popitem(last=False)
+            self.path_for(key).unlink(missing_ok=True)
+            self.total_bytes -= size
+            self.evictions += 1
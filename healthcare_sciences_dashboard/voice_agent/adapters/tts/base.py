@@ -0,0 +1,40 @@
+"""
+Base TTS Adapter
+Abstract interface that all text-to-speech providers must implement
+"""
+
+from abc import ABC, abstractmethod
+from typing import AsyncIterator
+
+
+class BaseTTSAdapter(ABC):
+    """
+    Abstract base class for text-to-speech providers.
+    Implementations: ElevenLabs, local fake (tests and offline development)
+    """
+
+    # MIME type of the audio stream()
+    media_type: str = "audio/mpeg"
+    default_voice_id: str = ""
+    default_model_id: str = ""
+
+    @abstractmethod
+    def stream(
+        self,
+        text: str,
+        voice_id: str | None = None,
+        model_id: str | None = None
+    ) -> AsyncIterator[bytes]:
+        """
+        Synthesize speech, yielding audio chunks as the provider produces them.
+
+        Args:
+            text: Text to speak
+            voice_id: Provider voice (default_voice_id when not given)
+            model_id: Provider model (default_model_id when not given)
+        """
+        pass
+
+    async def synthesize(self, text: str, voice_id: str | None = None, model_id: str | None = None) -> bytes:
+        """Whole clip as bytes (for callers that cannot stream)"""
+        return b"".join([chunk async for chunk in self.stream(text, voice_id, model_id)])
@@ -0,0 +1,67 @@
+"""
+Cache-backed TTS adapter
+Serves repeated phrases (greetings, standard confirmations) from the
+on-disk audio cache and tees everything else into it while streaming it
+from the live provider.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from typing import AsyncIterator
+
+from .audio_cache import TTSAudioCache
+from .base import BaseTTSAdapter
+
+
+class CachedTTSAdapter(BaseTTSAdapter):
+    """
+    TTS adapter in front of a provider adapter and a TTSAudioCache.
+
+    A hit streams the cached file in chunk_size pieces without calling
+    the provider. A miss streams provider chunks to the caller as they
+    arrive, writing them to the cache alongside; the clip is only cached
+    once the provider finished, so a failed or abandoned stream is never
+    served later.
+    """
+
+    def __init__(self, adapter: BaseTTSAdapter, cache: TTSAudioCache, chunk_size: int = 16384):
+        self.adapter = adapter
+        self.cache = cache
+        self.chunk_size = chunk_size
+        self.media_type = adapter.media_type
+        self.default_voice_id = adapter.default_voice_id
+        self.default_model_id = adapter.default_model_id
+
+    def cache_key(self, text: str, voice_id: str | None = None, model_id: str | None = None) -> str:
+        return self.cache.key(text, voice_id or self.default_voice_id, model_id or self.default_model_id)
+
+    def is_cached(self, text: str, voice_id: str | None = None, model_id: str | None = None) -> bool:
+        return self.cache_key(text, voice_id, model_id) in self.cache
+
+    async def stream(
+        self,
+        text: str,
+        voice_id: str | None = None,
+        model_id: str | None = None
+    ) -> AsyncIterator[bytes]:
+        key = self.cache_key(text, voice_id, model_id)
+        path = self.cache.lookup(key)
+        if path is not None:
+            # File reads run off the event loop; a cold disk must not stall other requests
+            clip = await asyncio.to_thread(open, path, "rb")
+            try:
+                while chunk := await asyncio.to_thread(clip.read, self.chunk_size):
+                    yield chunk
+            finally:
+                clip.close()
+            return
+
+        writer = self.cache.writer(key)
+        try:
+            async for chunk in self.adapter.stream(text, voice_id, model_id):
+                writer.write(chunk)
+                yield chunk
+            writer.commit()
+        finally:
+            writer.abort()
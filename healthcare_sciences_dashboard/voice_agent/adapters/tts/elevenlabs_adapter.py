@@ -0,0 +1,66 @@
+"""
+ElevenLabs TTS adapter
+Streams synthesized speech from the ElevenLabs API. The SDK returns a
+blocking generator, so each chunk is pulled on a bounded thread pool and
+handed to the event loop as soon as it arrives.
+"""
+
+from __future__ import annotations
+
+import os
+from typing import AsyncIterator
+
+from .base import BaseTTSAdapter
+from ...utils.blocking_executor import BlockingCallExecutor
+
+
+# Process-wide pool for blocking ElevenLabs SDK calls, sized by TTS_MAX_WORKERS
+TTS_EXECUTOR = BlockingCallExecutor(
+    max_workers=int(os.getenv("TTS_MAX_WORKERS", "4")),
+    default_timeout=float(os.getenv("TTS_CALL_TIMEOUT", "30")),
+    name="tts"
+)
+
+_END = object()
+
+
+class ElevenLabsTTSAdapter(BaseTTSAdapter):
+    """
+    ElevenLabs text-to-speech, streamed chunk by chunk.
+
+    The SDK client (and its HTTP connection pool) is created once and
+    reused across requests. Requires the optional ``elevenlabs`` package.
+    """
+
+    media_type = "audio/mpeg"
+
+    def __init__(
+        self,
+        api_key: str,
+        voice_id: str = "21m00Tcm4TlvDq8ikWAM",
+        model_id: str = "eleven_monolingual_v1",
+        executor: BlockingCallExecutor = TTS_EXECUTOR
+    ):
+        from elevenlabs.client import ElevenLabs
+
+        self.client = ElevenLabs(api_key=api_key)
+        self.default_voice_id = voice_id
+        self.default_model_id = model_id
+        self.executor = executor
+
+    async def stream(
+        self,
+        text: str,
+        voice_id: str | None = None,
+        model_id: str | None = None
+    ) -> AsyncIterator[bytes]:
+        audio = await self.executor.run(
+            lambda: iter(self.client.text_to_speech.convert(
+                text=text,
+                voice_id=voice_id or self.default_voice_id,
+                model_id=model_id or self.default_model_id
+            ))
+        )
+        while (chunk := await self.executor.run(next, audio, _END)) is not _END:
+            if chunk:
+                yield chunk
@@ -0,0 +1,69 @@
+"""
+TTS Adapter Factory
+Builds the configured TTS provider behind the on-disk audio cache
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+
+from .audio_cache import TTSAudioCache
+from .base import BaseTTSAdapter
+from .cached_adapter import CachedTTSAdapter
+from .elevenlabs_adapter import ElevenLabsTTSAdapter
+from .fake_tts import FakeTTSAdapter
+from ...models.settings import SystemSettings
+
+
+_shared_adapter: BaseTTSAdapter | None = None
+_shared_adapter_lock = threading.Lock()
+
+
+def create_tts_adapter(settings: SystemSettings) -> BaseTTSAdapter | None:
+    """TTS provider from settings, wrapped in the audio cache (None when not configured)"""
+    provider = settings.tts_provider
+    try:
+        if provider == "fake":
+            adapter = FakeTTSAdapter()
+        elif provider == "elevenlabs":
+            api_key = settings.elevenlabs_api_key or os.getenv("ELEVENLABS_API_KEY")
+            if not api_key:
+                return None
+            adapter = ElevenLabsTTSAdapter(
+                api_key,
+                voice_id=os.getenv("ELEVENLABS_VOICE_ID", settings.elevenlabs_voice_id),
+                model_id=settings.elevenlabs_model_id
+            )
+        else:
+            print(f"⚠️  TTS provider {provider} is not implemented")
+            return None
+    except Exception as e:
+        print(f"⚠️  Failed to create TTS adapter: {e}")
+        return None
+
+    if not settings.tts_cache_enabled:
+        return adapter
+    try:
+        cache = TTSAudioCache(settings.tts_cache_dir, max_bytes=settings.tts_cache_max_mb * 1024 * 1024)
+    except Exception as e:
+        print(f"⚠️  Failed to open TTS audio cache, synthesizing every request: {e}")
+        return adapter
+    return CachedTTSAdapter(adapter, cache)
+
+
+def get_shared_tts_adapter() -> BaseTTSAdapter | None:
+    """
+    Process-wide TTS adapter built from default settings on first use.
+
+    Used by the API routes when no orchestrator is available, so /tts works
+    with only ELEVENLABS_API_KEY set; None when TTS is not configured.
+    """
+    global _shared_adapter
+    with _shared_adapter_lock:
+        if _shared_adapter is None:
+            _shared_adapter = create_tts_adapter(SystemSettings())
+        return _shared_adapter
+
+
+__all__ = ["create_tts_adapter", "get_shared_tts_adapter"]
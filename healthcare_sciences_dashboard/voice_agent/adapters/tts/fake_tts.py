@@ -0,0 +1,65 @@
+"""
+In-process fake TTS provider
+Produces deterministic pseudo-audio in chunks, with an optional per-chunk
+delay standing in for provider latency, so TTS streaming and caching can be
+exercised without network access or credentials.
+
+Usage:
+    adapter = FakeTTSAdapter(chunk_delay_seconds=0.05)
+    async for chunk in adapter.stream("Good morning"):
+        ...
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+from typing import AsyncIterator
+
+from .base import BaseTTSAdapter
+
+
+class FakeTTSAdapter(BaseTTSAdapter):
+    """
+    Deterministic fake: the same (text, voice, model) always yields the same
+    bytes, bytes_per_char per character of text, in chunk_size pieces.
+    Records each synthesis request in ``requests``.
+    """
+
+    media_type = "audio/mpeg"
+
+    def __init__(
+        self,
+        chunk_size: int = 4096,
+        chunk_delay_seconds: float = 0.0,
+        bytes_per_char: int = 256,
+        voice_id: str = "fake-voice",
+        model_id: str = "fake-model"
+    ):
+        self.chunk_size = chunk_size
+        self.chunk_delay_seconds = chunk_delay_seconds
+        self.bytes_per_char = bytes_per_char
+        self.default_voice_id = voice_id
+        self.default_model_id = model_id
+        self.requests: list[tuple[str, str, str]] = []
+
+    def audio_for(self, text: str, voice_id: str | None = None, model_id: str | None = None) -> bytes:
+        """The full clip stream() produces for these arguments"""
+        seed = hashlib.sha256(
+            f"{model_id or self.default_model_id}|{voice_id or self.default_voice_id}|{text}".encode()
+        ).digest()
+        size = max(1, len(text)) * self.bytes_per_char
+        return (b"FAKEAUDIO" + seed * (size // len(seed) + 1))[:size]
+
+    async def stream(
+        self,
+        text: str,
+        voice_id: str | None = None,
+        model_id: str | None = None
+    ) -> AsyncIterator[bytes]:
+        self.requests.append((text, voice_id or self.default_voice_id, model_id or self.default_model_id))
+        audio = self.audio_for(text, voice_id, model_id)
+        for offset in range(0, len(audio), self.chunk_size):
+            if self.chunk_delay_seconds:
+                await asyncio.sleep(self.chunk_delay_seconds)
+            yield audio[offset:offset + self.chunk_size]
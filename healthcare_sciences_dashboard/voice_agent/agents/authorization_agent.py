@@ -4,26 +4,28 @@ Manages authorization codes and user confirmation
 """
 
 from ..graph.state import VoiceAgentState
-from ..models.auth_models import AuthorizationCode
-import uuid
+from ..storage.auth_code_store import AuthCodeStore, InMemoryAuthCodeStore
 
 
 class AuthorizationAgent:
     """
     Handles authorization for actions that require user confirmation.
     Generates auth codes and validates them before execution.
+
+    Codes live in an AuthCodeStore indexed by action id and session; a code
+    is consumed when it authorizes its action and dropped once it expires.
     """
 
-    def __init__(self, code_length: int = 4, expiry_minutes: int = 10):
+    def __init__(self, code_length: int = 4, expiry_minutes: int = 10, code_store: AuthCodeStore | None = None):
         self.code_length = code_length
         self.expiry_minutes = expiry_minutes
-        # In production, this would be a persistent session store
-        self.active_codes: dict[str, AuthorizationCode] = {}
+        self.code_store = code_store or InMemoryAuthCodeStore(code_length=code_length, expiry_minutes=expiry_minutes)
 
     async def run(self, state: VoiceAgentState) -> VoiceAgentState:
         """Check authorization status and generate codes if needed"""
         requires_auth = state.get("requires_authorization", False)
         auth_code_input = state.get("authorization_code")
+        session_id = state.get("session_id")
 
         # Initialize pending actions list
         state.setdefault("pending_actions", [])
@@ -34,36 +36,21 @@ class AuthorizationAgent:
 
         # Collect all actions that need authorization
         pending_actions = []
-
-        for draft in state.get("email_drafts", []):
-            if draft.get("requires_authorization", True):
-                action_id = draft["draft_id"]
-                pending_actions.append(action_id)
-
-                # Generate auth code if not already exists
-                if action_id not in self.active_codes and not auth_code_input:
-                    code = AuthorizationCode.generate(
-                        action_id=action_id,
-                        action_type="send_email",
-                        code_length=self.code_length,
-                        expiry_minutes=self.expiry_minutes
-                    )
-                    self.active_codes[action_id] = code
-
-        for cal_action in state.get("calendar_actions", []):
-            if cal_action.get("requires_authorization", True):
-                action_id = cal_action["action_id"]
+        proposals = [
+            (state.get("email_drafts", []), "draft_id", "send_email"),
+            (state.get("calendar_actions", []), "action_id", "calendar_action"),
+            (state.get("bulk_actions", []), "action_id", "bulk_action"),
+        ]
+        for items, id_key, action_type in proposals:
+            for item in items:
+                if not item.get("requires_authorization", True):
+                    continue
+                action_id = item[id_key]
                 pending_actions.append(action_id)
 
                 # Generate auth code if not already exists
-                if action_id not in self.active_codes and not auth_code_input:
-                    code = AuthorizationCode.generate(
-                        action_id=action_id,
-                        action_type="calendar_action",
-                        code_length=self.code_length,
-                        expiry_minutes=self.expiry_minutes
-                    )
-                    self.active_codes[action_id] = code
+                if not auth_code_input:
+                    self.code_store.issue(action_id, action_type, session_id=session_id)
 
         state["pending_actions"] = pending_actions
 
@@ -78,17 +65,14 @@ class AuthorizationAgent:
         return state
 
     def _validate_code(self, input_code: str, pending_actions: list[str]) -> dict:
-        """Validate an authorization code"""
-        # Try to validate against any pending action
-        for action_id in pending_actions:
-            if action_id in self.active_codes:
-                code_obj = self.active_codes[action_id]
-                if code_obj.verify(input_code):
-                    return {
-                        "valid": True,
-                        "action_id": action_id,
-                        "message": "Authorization successful"
-                    }
+        """Validate an authorization code against the pending actions' codes"""
+        action_id = self.code_store.verify(input_code, pending_actions)
+        if action_id is not None:
+            return {
+                "valid": True,
+                "action_id": action_id,
+                "message": "Authorization successful"
+            }
 
         return {
             "valid": False,
@@ -97,6 +81,5 @@ class AuthorizationAgent:
 
     def get_code_for_action(self, action_id: str) -> str | None:
         """Get the authorization code for a specific action"""
-        if action_id in self.active_codes:
-            return self.active_codes[action_id].code
-        return None
+        code = self.code_store.get(action_id)
+        return code.code if code else None
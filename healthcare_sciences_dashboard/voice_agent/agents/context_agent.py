@@ -3,25 +3,126 @@ Context Retrieval Agent
 Fetches relevant emails, calendar events, and historical context
 """
 
-from typing import Dict, Any
+import asyncio
+import re
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Any, Awaitable, Callable
 from ..graph.state import VoiceAgentState
 from ..adapters.email.base import BaseEmailAdapter
 from ..adapters.calendar.base import BaseCalendarAdapter
+from ..adapters.calendar.availability import AvailabilityEngine
+from ..adapters.calendar.conflicts import ConflictDetector
+from ..utils.calendar_windows import duration_from_query, timeframe_from_query, timeframe_window
+
+
+# Intents that need each group of context sources
+EMAIL_INTENTS = ("triage_inbox", "draft_reply", "summarize")
+CALENDAR_INTENTS = ("schedule_meeting", "check_calendar", "summarize")
+FOLLOW_UP_INTENTS = ("follow_up", "summarize")
+
+# Per-source timeouts in seconds. A slow source is recorded as timed out
+# and the pipeline continues with whatever the other sources returned.
+DEFAULT_SOURCE_TIMEOUTS = {
+    "email_threads": 10.0,
+    "sender_history": 5.0,
+    "calendar_events": 5.0,
+    "availability_slots": 5.0,
+    "follow_up_tasks": 3.0,
+}
+
+# Sources that may be fetched speculatively before the intent is known
+PREFETCHABLE_SOURCES = ("email_threads", "calendar_events")
+
+# Days searched for free slots when the query names no timeframe
+AVAILABILITY_SEARCH_DAYS = 7
+
+_EMAIL_ADDRESS_RE = re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+")
 
 
 class ContextRetrievalAgent:
     """
     Retrieves context needed for reasoning and action generation.
     Fetches email threads, calendar events, sender history, and availability.
+
+    Independent sources are fetched concurrently, each under its own timeout.
+    Sender history is chained onto the email fetch so it starts as soon as
+    thread senders are known, without waiting for the calendar sources.
+    The outcome of every source is recorded in state["context_status"].
+    Fetched calendar events are swept for conflicts (state["calendar_conflicts"])
+    so the reasoning step sees overlaps and tight schedules.
+
+    Sources can also be prefetched speculatively (see start_prefetch) while
+    intent classification is still running; run() then consumes the
+    in-flight results and cancels whatever the intent did not need.
     """
 
     def __init__(
         self,
         email_adapter: BaseEmailAdapter | None = None,
-        calendar_adapter: BaseCalendarAdapter | None = None
+        calendar_adapter: BaseCalendarAdapter | None = None,
+        source_timeouts: dict[str, float] | None = None,
+        availability_engine: AvailabilityEngine | None = None,
+        conflict_detector: ConflictDetector | None = None
     ):
         self.email_adapter = email_adapter
         self.calendar_adapter = calendar_adapter
+        self.availability_engine = availability_engine or AvailabilityEngine()
+        self.conflict_detector = conflict_detector or ConflictDetector()
+        self.source_timeouts = {**DEFAULT_SOURCE_TIMEOUTS, **(source_timeouts or {})}
+
+        # prefetch_key -> {source: in-flight task}
+        self._prefetches: dict[str, dict[str, asyncio.Task]] = {}
+        self.prefetch_stats = {
+            source: {"started": 0, "hits": 0, "wasted": 0}
+            for source in PREFETCHABLE_SOURCES
+        }
+
+    def _fetcher_for(self, source: str) -> Callable[[VoiceAgentState], Awaitable[Any]]:
+        return {
+            "email_threads": self._fetch_email_context,
+            "calendar_events": self._fetch_calendar_events,
+        }[source]
+
+    def start_prefetch(self, prefetch_key: str, query: str, sources: list[str]) -> None:
+        """
+        Start fetching context sources before the intent is known.
+
+        Args:
+            prefetch_key: Key the pipeline run carries in state["prefetch_key"]
+            query: The user's query (fetchers may derive time windows from it)
+            sources: Sources to fetch, a subset of PREFETCHABLE_SOURCES
+        """
+        tasks = {}
+        for source in sources:
+            if source == "email_threads" and not self.email_adapter:
+                continue
+            if source == "calendar_events" and not self.calendar_adapter:
+                continue
+            fetcher = self._fetcher_for(source)
+            task = asyncio.create_task(fetcher({"user_query": query}))
+            # Unused prefetches may fail unobserved; don't log them as unhandled
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+            tasks[source] = task
+            self.prefetch_stats[source]["started"] += 1
+        if tasks:
+            self._prefetches[prefetch_key] = tasks
+
+    def discard_prefetch(self, prefetch_key: str | None) -> None:
+        """Cancel any prefetched sources that were not consumed"""
+        for source, task in self._prefetches.pop(prefetch_key, {}).items():
+            task.cancel()
+            self.prefetch_stats[source]["wasted"] += 1
+
+    def get_prefetch_stats(self) -> dict[str, dict[str, Any]]:
+        """Per-source prefetch counters and hit rates"""
+        return {
+            source: {
+                **counts,
+                "hit_rate": round(counts["hits"] / counts["started"], 3) if counts["started"] else None
+            }
+            for source, counts in self.prefetch_stats.items()
+        }
 
     async def run(self, state: VoiceAgentState) -> VoiceAgentState:
         """Retrieve relevant context based on intent"""
@@ -32,89 +133,139 @@ class ContextRetrievalAgent:
         state.setdefault("calendar_events", [])
         state.setdefault("sender_history", {})
         state.setdefault("availability_slots", [])
+        state.setdefault("calendar_conflicts", {})
         state.setdefault("follow_up_tasks", [])
+        state["context_status"] = {}
+        prefetched = self._prefetches.pop(state.get("prefetch_key"), {})
 
-        try:
-            # Fetch email context for relevant intents
-            if intent in ["triage_inbox", "draft_reply", "summarize"]:
-                if self.email_adapter:
-                    state["email_threads"] = await self._fetch_email_context(state)
-                    state["sender_history"] = await self._fetch_sender_history(state)
-
-            # Fetch calendar context for relevant intents
-            if intent in ["schedule_meeting", "check_calendar", "summarize"]:
-                if self.calendar_adapter:
-                    state["calendar_events"] = await self._fetch_calendar_events(state)
-                    state["availability_slots"] = await self._fetch_availability(state)
-
-            # Fetch follow-up tasks for relevant intents
-            if intent in ["follow_up", "summarize"]:
-                state["follow_up_tasks"] = await self._fetch_follow_ups(state)
+        fetches: list[Awaitable[None]] = []
 
-        except Exception as e:
-            state["error"] = f"Context retrieval error: {str(e)}"
+        # Email threads, then sender history as soon as senders are known
+        if intent in EMAIL_INTENTS and self.email_adapter:
+            fetches.append(self._fetch_email_pipeline(state, prefetched.pop("email_threads", None)))
+
+        # Calendar sources are independent of email and of each other
+        if intent in CALENDAR_INTENTS and self.calendar_adapter:
+            fetches.append(self._fetch_source(
+                state, "calendar_events", self._fetch_calendar_events,
+                prefetched=prefetched.pop("calendar_events", None)
+            ))
+            fetches.append(self._fetch_source(state, "availability_slots", self._fetch_availability))
+
+        if intent in FOLLOW_UP_INTENTS:
+            fetches.append(self._fetch_source(state, "follow_up_tasks", self._fetch_follow_ups))
+
+        # Speculative work the intent turned out not to need
+        for source, task in prefetched.items():
+            task.cancel()
+            self.prefetch_stats[source]["wasted"] += 1
+
+        if fetches:
+            await asyncio.gather(*fetches)
+
+        if state["context_status"].get("calendar_events", {}).get("status") == "ok":
+            state["calendar_conflicts"] = self.conflict_detector.scan(state["calendar_events"])
+
+        failed = [
+            source for source, status in state["context_status"].items()
+            if status["status"] != "ok"
+        ]
+        if failed and len(failed) == len(state["context_status"]):
+            state["error"] = f"Context retrieval error: all sources failed ({', '.join(failed)})"
 
         return state
 
+    async def _fetch_email_pipeline(
+        self,
+        state: VoiceAgentState,
+        prefetched: asyncio.Task | None = None
+    ) -> None:
+        """Fetch email threads, then sender history for the thread senders"""
+        await self._fetch_source(state, "email_threads", self._fetch_email_context, prefetched=prefetched)
+        if state["context_status"]["email_threads"]["status"] == "ok":
+            await self._fetch_source(state, "sender_history", self._fetch_sender_history)
+
+    async def _fetch_source(
+        self,
+        state: VoiceAgentState,
+        source: str,
+        fetcher: Callable[[VoiceAgentState], Awaitable[Any]],
+        prefetched: asyncio.Task | None = None
+    ) -> None:
+        """
+        Run one source fetcher under its timeout and record the outcome.
+
+        On success the result is written to state[source]; on timeout or
+        error the existing default is kept so downstream agents still see
+        a well-formed (possibly empty) value. If a prefetched task for the
+        source is given it is awaited instead of starting a new fetch.
+        """
+        started = time.perf_counter()
+        timeout = self.source_timeouts.get(source)
+
+        if prefetched is not None:
+            self.prefetch_stats[source]["hits"] += 1
+            pending = prefetched
+        else:
+            pending = fetcher(state)
+
+        try:
+            state[source] = await asyncio.wait_for(pending, timeout=timeout)
+            status = {"status": "ok", "prefetched": prefetched is not None}
+        except asyncio.TimeoutError:
+            print(f"Context source '{source}' timed out after {timeout}s")
+            status = {"status": "timeout", "error": f"Timed out after {timeout}s"}
+        except Exception as e:
+            print(f"Error fetching context source '{source}': {e}")
+            status = {"status": "error", "error": str(e)}
+
+        status["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 1)
+        state["context_status"][source] = status
+
     async def _fetch_email_context(self, state: VoiceAgentState) -> list[dict]:
         """Fetch relevant email threads from Gmail"""
         if not self.email_adapter:
             return []
 
-        try:
-            # Fetch recent email threads (last 20)
-            email_threads = await self.email_adapter.fetch_threads(max_results=20)
-            return email_threads
-        except Exception as e:
-            print(f"Error fetching emails: {e}")
-            # Return empty list instead of failing
-            return []
+        # Fetch recent email threads (last 20)
+        return await self.email_adapter.fetch_threads(max_results=20)
 
     async def _fetch_sender_history(self, state: VoiceAgentState) -> Dict[str, Any]:
         """Fetch historical context about senders from Gmail"""
         if not self.email_adapter:
             return {}
 
-        try:
-            # Get sender history from email adapter
-            email_threads = state.get("email_threads", [])
-            sender_history = {}
-
-            for thread in email_threads[:10]:  # Analyze top 10 senders
-                sender = thread.get("from", "")
-                if sender and sender not in sender_history:
-                    history = await self.email_adapter.get_sender_history(sender)
-                    if history:
-                        sender_history[sender] = history
-
-            return sender_history
-        except Exception as e:
-            print(f"Error fetching sender history: {e}")
-            return {}
+        # Analyze top 10 senders in one batched, cached lookup
+        senders = [thread.get("from", "") for thread in state.get("email_threads", [])[:10]]
+        return await self.email_adapter.get_sender_histories(senders)
 
     async def _fetch_calendar_events(self, state: VoiceAgentState) -> list[dict]:
-        """Fetch upcoming calendar events"""
-        # TODO: Implement actual calendar fetching
-        return [
-            {
-                "event_id": "event_1",
-                "title": "Executive Team Meeting",
-                "start": "2025-10-27T09:00:00Z",
-                "end": "2025-10-27T10:00:00Z",
-                "attendees": ["team@company.com"]
-            }
-        ]
+        """Fetch calendar events for the view the query refers to (today by default)"""
+        if not self.calendar_adapter:
+            return []
+
+        start, end = timeframe_window(timeframe_from_query(state.get("user_query", "")))
+        return await self.calendar_adapter.get_events(start_time=start, end_time=end)
 
     async def _fetch_availability(self, state: VoiceAgentState) -> list[dict]:
-        """Fetch availability slots"""
-        # TODO: Implement actual availability checking
-        return [
-            {
-                "start": "2025-10-28T14:00:00Z",
-                "end": "2025-10-28T15:00:00Z",
-                "available": True
-            }
-        ]
+        """Ranked free slots for the user and any attendees named in the query"""
+        if not self.calendar_adapter:
+            return []
+
+        query = state.get("user_query", "")
+        attendees = list(dict.fromkeys(_EMAIL_ADDRESS_RE.findall(query)))
+        timeframe = timeframe_from_query(query)
+        start, end = timeframe_window(timeframe)
+        now = datetime.now(timezone.utc)
+        if timeframe == "today":
+            # No explicit view: search the coming working week
+            start, end = now, now + timedelta(days=AVAILABILITY_SEARCH_DAYS)
+        start = max(start, now)
+
+        busy = await self.calendar_adapter.get_free_busy(["primary", *attendees], start, end)
+        return self.availability_engine.find_slots(
+            busy, start, end, duration_minutes=duration_from_query(query)
+        )
 
     async def _fetch_follow_ups(self, state: VoiceAgentState) -> list[dict]:
         """Fetch pending follow-up tasks"""
@@ -8,9 +8,20 @@ from langchain_core.prompts import ChatPromptTemplate
 from ..graph.state import VoiceAgentState
 from ..models.email_models import EmailDraft
 from ..models.calendar_models import CalendarAction
+from ..adapters.calendar.conflicts import ConflictDetector
+from ..utils.email_query import parse_email_nl_to_gmail_query
 import json
+import re
 import uuid
-from datetime import datetime
+from datetime import datetime, timedelta
+
+
+# Wording that asks for many threads at once
+_BULK_SCOPE_RE = re.compile(r"\b(all|every|everything|bulk)\b")
+# Verbs, scope words and fillers stripped from a bulk request to leave its filter
+_BULK_FILLER_RE = re.compile(
+    r"\b(please|archive|mark|as|read|unread|all|every|everything|bulk|in|my|the|inbox|e-?mails?|mail|messages?|threads?)\b"
+)
 
 
 class DraftGenerationAgent:
@@ -19,8 +30,23 @@ class DraftGenerationAgent:
     Drafts are prepared for user review before sending.
     """
 
-    def __init__(self, model_name: str = "gpt-4"):
-        self.llm = ChatOpenAI(model=model_name, temperature=0.8)
+    def __init__(
+        self,
+        model_name: str = "gpt-4",
+        email_adapter=None,
+        calendar_adapter=None,
+        conflict_detector: ConflictDetector | None = None,
+        llm=None
+    ):
+        self.llm = llm or ChatOpenAI(model=model_name, temperature=0.8)
+        # Used to load the full body of the thread being replied to;
+        # listings only carry a snippet preview
+        self.email_adapter = email_adapter
+        # Used to load the events around a proposed slot and its alternatives
+        self.calendar_adapter = calendar_adapter
+        self.conflict_detector = conflict_detector or ConflictDetector()
+        # Upper bound on threads swept into one bulk archive / mark-read proposal
+        self.bulk_max_threads = 500
 
         self.email_prompt = ChatPromptTemplate.from_messages([
             ("system", """You are {agent_name}, an executive assistant AI.
@@ -63,6 +89,7 @@ The response should:
 Event: {event_title}
 Organizer: {organizer}
 Proposed Time: {proposed_time}
+Conflicts at Proposed Time: {conflicts}
 User's Availability: {availability}
 
 Generate a response:""")
@@ -91,6 +118,12 @@ Generate a response:""")
                     state["calendar_actions"].append(action)
                     state["requires_authorization"] = True
 
+            elif self._bulk_operation(state):
+                action = await self._generate_bulk_action(state)
+                if action:
+                    state.setdefault("bulk_actions", []).append(action)
+                    state["requires_authorization"] = True
+
         except Exception as e:
             state["error"] = f"Draft generation error: {str(e)}"
 
@@ -118,7 +151,7 @@ Generate a response:""")
             sender_history=json.dumps(sender_history.get(thread["from"], {})),
             from_email=thread["from"],
             subject=thread["subject"],
-            message=thread["preview"],
+            message=await self._load_message_text(thread),
             action=state.get("recommended_action", "reply")
         )
 
@@ -144,6 +177,85 @@ Generate a response:""")
 
         return draft
 
+    async def _load_message_text(self, thread: dict) -> str:
+        """Full body of the latest message, falling back to the listing preview"""
+        messages = thread.get("messages") or []
+        if messages and messages[-1].get("body"):
+            return messages[-1]["body"]
+
+        if self.email_adapter and thread.get("thread_id"):
+            try:
+                full_thread = await self.email_adapter.get_thread(thread["thread_id"])
+                full_messages = full_thread.get("messages") or []
+                if full_messages and full_messages[-1].get("body"):
+                    return full_messages[-1]["body"]
+            except Exception as e:
+                print(f"Could not load thread {thread['thread_id']} for drafting: {e}")
+
+        return thread.get("preview", "")
+
+    def _bulk_operation(self, state: VoiceAgentState) -> str | None:
+        """
+        "archive" or "mark_read" when the request explicitly asks for many
+        threads ("archive all newsletters", "mark every ... as read").
+        An archive_email intent alone is not enough.
+        """
+        text = state.get("user_query", "").lower()
+        if not _BULK_SCOPE_RE.search(text):
+            return None
+        if re.search(r"\bmark\b.*\bread\b", text):
+            return "mark_read"
+        if "archive" in text:
+            return "archive"
+        return None
+
+    async def _generate_bulk_action(self, state: VoiceAgentState) -> dict | None:
+        """
+        Propose archiving / marking read every thread matching the request.
+
+        The request ("archive all newsletters from acme.com") is turned into a
+        Gmail query with the action verb stripped; matching threads are
+        applied later in one bulk call once the user authorizes.
+        """
+        if not self.email_adapter:
+            return None
+
+        operation = self._bulk_operation(state)
+        if operation is None:
+            return None
+        user_query = state.get("user_query", "").lower()
+        filter_text = re.sub(r"\s+", " ", _BULK_FILLER_RE.sub(" ", user_query)).strip(" .,!?")
+        if not filter_text:
+            # Nothing left to select by ("archive all my email"): never
+            # propose sweeping the whole inbox
+            return None
+
+        gmail_query = parse_email_nl_to_gmail_query(filter_text)
+        # Keep "unread" as a filter: "archive all unread newsletters"
+        if (operation == "mark_read" or re.search(r"\bunread\b", user_query)) and "is:unread" not in gmail_query:
+            gmail_query = f"is:unread {gmail_query}"
+        if operation == "archive":
+            gmail_query = f"in:inbox {gmail_query}"
+
+        threads = await self.email_adapter.search_emails(gmail_query, max_results=self.bulk_max_threads)
+        if not threads:
+            return None
+
+        verb = "Archive" if operation == "archive" else "Mark as read"
+        return {
+            "action_id": f"bulk_{uuid.uuid4().hex[:8]}",
+            "action_type": "bulk_action",
+            "operation": operation,
+            "thread_ids": [t["thread_id"] for t in threads],
+            "add_label_ids": [],
+            "remove_label_ids": ["INBOX"] if operation == "archive" else ["UNREAD"],
+            "query": gmail_query,
+            "description": f"{verb} {len(threads)} thread(s) matching '{gmail_query}'",
+            "preview": [t.get("subject", "") for t in threads[:5]],
+            "requires_authorization": True,
+            "created_at": datetime.utcnow().isoformat()
+        }
+
     async def _generate_calendar_action(self, state: VoiceAgentState) -> dict | None:
         """Generate a calendar action proposal"""
         calendar_events = state.get("calendar_events", [])
@@ -155,6 +267,20 @@ Generate a response:""")
         event = calendar_events[0]
         availability = state.get("availability_slots", [])
 
+        # Check the event's slot and every candidate alternative in one sweep
+        proposals = [
+            {"event_id": event.get("event_id"), "start": event["start"], "end": event["end"],
+             "location": event.get("location", "")},
+            *({"start": slot["start"], "end": slot["end"], "location": event.get("location", "")}
+              for slot in availability)
+        ]
+        reports = self.conflict_detector.check(await self._events_around(state, proposals), proposals)
+        conflicts, alternative_reports = reports[0], reports[1:]
+        alternatives = [
+            {**slot, "conflicts": report}
+            for slot, report in zip(availability, alternative_reports) if report["ok"]
+        ]
+
         # Get settings
         agent_name = "Vinegar"
         action = state.get("recommended_action", "review")
@@ -166,7 +292,8 @@ Generate a response:""")
             event_title=event["title"],
             organizer=event.get("attendees", ["Unknown"])[0],
             proposed_time=event["start"],
-            availability=json.dumps(availability, indent=2)
+            conflicts=json.dumps(conflicts, indent=2),
+            availability=json.dumps(alternatives, indent=2)
         )
 
         # Generate response
@@ -178,9 +305,10 @@ Generate a response:""")
             "action_id": f"cal_action_{uuid.uuid4().hex[:8]}",
             "action_type": self._map_action_to_type(action),
             "event": event,
-            "availability_conflict": False,  # TODO: Check actual availability
+            "availability_conflict": conflicts["conflict"],
+            "conflicts": conflicts,
             "proposed_status": self._map_action_to_status(action),
-            "alternative_times": availability[:3] if availability else [],
+            "alternative_times": alternatives[:3],
             "reasoning": state.get("reasoning", ""),
             "requires_authorization": True,
             "draft_response": draft_response
@@ -188,6 +316,23 @@ Generate a response:""")
 
         return action_obj
 
+    async def _events_around(self, state: VoiceAgentState, proposals: list[dict]) -> list[dict]:
+        """
+        Events spanning all proposals (padded by the travel buffer), fetched
+        in one call; falls back to the events already in context.
+        """
+        if not self.calendar_adapter:
+            return state.get("calendar_events", [])
+
+        padding = timedelta(seconds=self.conflict_detector.travel_buffer + self.conflict_detector.back_to_back_gap)
+        start = min(datetime.fromisoformat(p["start"]) for p in proposals) - padding
+        end = max(datetime.fromisoformat(p["end"]) for p in proposals) + padding
+        try:
+            return await self.calendar_adapter.get_events(start_time=start, end_time=end)
+        except Exception as e:
+            print(f"Could not load calendar events for conflict check: {e}")
+            return state.get("calendar_events", [])
+
     def _propose_new_event(self, state: VoiceAgentState) -> dict:
         """Propose a new calendar event"""
         # TODO: Implement new event creation
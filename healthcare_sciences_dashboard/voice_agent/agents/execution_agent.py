@@ -5,6 +5,7 @@ Executes authorized actions (send emails, update calendar)
 
 from ..graph.state import VoiceAgentState
 from ..adapters.email.base import BaseEmailAdapter
+from ..adapters.email.outbound_queue import OutboundEmailQueue
 from ..adapters.calendar.base import BaseCalendarAdapter
 from typing import Any
 
@@ -18,10 +19,13 @@ class ExecutionAgent:
     def __init__(
         self,
         email_adapter: BaseEmailAdapter | None = None,
-        calendar_adapter: BaseCalendarAdapter | None = None
+        calendar_adapter: BaseCalendarAdapter | None = None,
+        outbound_queue: OutboundEmailQueue | None = None
     ):
         self.email_adapter = email_adapter
         self.calendar_adapter = calendar_adapter
+        # When set, emails are queued for background delivery
+        self.outbound_queue = outbound_queue
 
     async def run(self, state: VoiceAgentState) -> VoiceAgentState:
         """Execute all authorized actions"""
@@ -60,6 +64,16 @@ class ExecutionAgent:
                         "result": result
                     })
 
+            # Execute bulk mailbox actions
+            for bulk_action in state.get("bulk_actions", []):
+                if bulk_action["action_id"] in state.get("pending_actions", []):
+                    result = await self._execute_bulk_action(bulk_action)
+                    state["executed_actions"].append({
+                        "action_id": bulk_action["action_id"],
+                        "action_type": "bulk_action",
+                        "result": result
+                    })
+
             state["execution_status"] = {
                 "status": "completed",
                 "message": f"Successfully executed {len(state['executed_actions'])} action(s)"
@@ -75,8 +89,31 @@ class ExecutionAgent:
         return state
 
     async def _send_email(self, draft: dict) -> dict[str, Any]:
-        """Send an email"""
-        if self.email_adapter:
+        """Send an email (or queue it, keyed by draft_id so it is sent once)"""
+        if self.outbound_queue:
+            try:
+                record = await self.outbound_queue.enqueue(
+                    to=draft["to"],
+                    cc=draft.get("cc", []),
+                    subject=draft["subject"],
+                    body=draft["body"],
+                    thread_id=draft.get("thread_id"),
+                    idempotency_key=draft["draft_id"]
+                )
+                return {
+                    "success": True,
+                    "queued": True,
+                    "outbox_id": record["outbox_id"],
+                    "status": record["status"],
+                    "details": "Email queued for delivery"
+                }
+            except Exception as e:
+                return {
+                    "success": False,
+                    "error": str(e),
+                    "details": "Failed to queue email"
+                }
+        elif self.email_adapter:
             try:
                 # Call the actual email adapter to send
                 result = await self.email_adapter.send_email(
@@ -105,6 +142,31 @@ class ExecutionAgent:
                 "details": "Email sent (mock)"
             }
 
+    async def _execute_bulk_action(self, action: dict) -> dict[str, Any]:
+        """Apply a label change to many threads in one bulk call"""
+        if self.email_adapter:
+            try:
+                result = await self.email_adapter.bulk_modify_threads(
+                    thread_ids=action["thread_ids"],
+                    add_label_ids=action.get("add_label_ids"),
+                    remove_label_ids=action.get("remove_label_ids")
+                )
+                result.setdefault("details", f"Bulk {action['operation']} completed")
+                return result
+            except Exception as e:
+                return {
+                    "success": False,
+                    "error": str(e),
+                    "details": f"Failed to {action['operation']} threads"
+                }
+        else:
+            # Mock execution for testing
+            return {
+                "success": True,
+                "modified_threads": len(action["thread_ids"]),
+                "details": f"Bulk {action['operation']} executed (mock)"
+            }
+
     async def _execute_calendar_action(self, action: dict) -> dict[str, Any]:
         """Execute a calendar action"""
         if self.calendar_adapter:
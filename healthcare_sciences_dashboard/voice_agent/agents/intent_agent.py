@@ -9,6 +9,8 @@ from langchain_core.output_parsers import PydanticOutputParser
 from pydantic import BaseModel, Field
 from typing import Literal
 from ..graph.state import VoiceAgentState
+from ..utils.intent_classifier import LocalIntentClassifier
+import os
 
 
 class IntentClassification(BaseModel):
@@ -35,9 +37,23 @@ class IntentClassificationAgent:
     """
     Classifies user intent from voice or text input.
     This is the first node in the LangGraph pipeline.
+
+    A local classifier (cache, rules, TF-IDF model) answers common commands
+    directly; only queries it is unsure about go to the LLM. LLM decisions
+    are fed back to the local classifier's cache and training log.
     """
 
-    def __init__(self, model_name: str = "gpt-4"):
+    # LLM classifications at or above this confidence are used as training data
+    record_confidence_threshold = 0.7
+
+    def __init__(
+        self,
+        model_name: str = "gpt-4",
+        local_classifier: LocalIntentClassifier | None = None
+    ):
+        self.local_classifier = local_classifier or LocalIntentClassifier(
+            training_log_path=os.getenv("INTENT_TRAINING_LOG")
+        )
         self.llm = ChatOpenAI(model=model_name, temperature=0.3)
         self.parser = PydanticOutputParser(pydantic_object=IntentClassification)
 
@@ -69,6 +85,15 @@ Available intents:
         """Run intent classification"""
         query = state["user_query"]
 
+        # Fast path: skip the LLM round-trip for confidently classified queries
+        local = self.local_classifier.classify(query)
+        if local is not None:
+            state["intent"] = local.intent
+            state["confidence"] = local.confidence
+            state["intent_source"] = local.source
+            state["reasoning"] = f"Classified locally ({local.source})"
+            return state
+
         # Prepare prompt
         prompt_value = self.prompt.format_messages(
             query=query,
@@ -84,10 +109,15 @@ Available intents:
             state["intent"] = classification.intent
             state["confidence"] = classification.confidence
             state["reasoning"] = classification.reasoning
+            state["intent_source"] = "llm"
+
+            if classification.confidence >= self.record_confidence_threshold:
+                self.local_classifier.record(query, classification.intent)
         except Exception as e:
             # Fallback if parsing fails
             state["intent"] = "unknown"
             state["confidence"] = 0.0
+            state["intent_source"] = "llm"
             state["reasoning"] = f"Failed to classify: {str(e)}"
             state["error"] = str(e)
 
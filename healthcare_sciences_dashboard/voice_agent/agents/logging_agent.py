@@ -5,11 +5,22 @@ Records all actions to audit trail and dashboard
 
 from ..graph.state import VoiceAgentState
 from ..models.action_models import ActionLog, ActionStatus
+from ..storage.audit_log import AuditLogWriter
+from ..utils.log_broker import LogBroker
+from collections import deque
 from datetime import datetime
 import uuid
 import json
 
 
+# executed_actions action_type -> ActionLog object_type
+EXECUTED_OBJECT_TYPES = {
+    "send_email": "email",
+    "calendar_action": "calendar",
+    "bulk_action": "email",
+}
+
+
 class LoggingAgent:
     """
     Final node in the pipeline.
@@ -19,9 +30,18 @@ class LoggingAgent:
     - Historical context
     """
 
-    def __init__(self, log_storage=None):
-        self.log_storage = log_storage  # Could be database, file, or API
-        self.logs_buffer = []
+    def __init__(
+        self,
+        log_storage: AuditLogWriter | None = None,
+        buffer_size: int = 1000,
+        log_broker: LogBroker | None = None
+    ):
+        # Batched, append-only audit log; entries are queued, never awaited
+        self.log_storage = log_storage
+        # Live stream to dashboard WebSocket subscribers
+        self.log_broker = log_broker
+        # Most recent entries, kept when no audit log is configured
+        self.logs_buffer = deque(maxlen=buffer_size)
 
     async def run(self, state: VoiceAgentState) -> VoiceAgentState:
         """Generate and store action logs"""
@@ -88,12 +108,31 @@ class LoggingAgent:
             )
             state["action_logs"].append(log)
 
+        # Log bulk mailbox actions
+        for bulk_action in state.get("bulk_actions", []):
+            log = self._create_log(
+                actor=agent_name,
+                mode=mode,
+                object_type="email",
+                object_ref=bulk_action.get("description", "Bulk email action"),
+                action=f"bulk_{bulk_action.get('operation', 'modify')}",
+                reason=f"User asked to {bulk_action.get('operation', 'modify')} matching threads",
+                status=self._determine_status(bulk_action, state),
+                user_id=user_id,
+                metadata={
+                    "action_id": bulk_action.get("action_id"),
+                    "query": bulk_action.get("query"),
+                    "thread_count": len(bulk_action.get("thread_ids", []))
+                }
+            )
+            state["action_logs"].append(log)
+
         # Log execution results
         for executed in state.get("executed_actions", []):
             log = self._create_log(
                 actor=agent_name,
                 mode=mode,
-                object_type=executed["action_type"].split("_")[0],  # "send_email" -> "email"
+                object_type=EXECUTED_OBJECT_TYPES.get(executed["action_type"], "email"),
                 object_ref=f"Action {executed['action_id']}",
                 action="executed",
                 reason="Action executed after authorization",
@@ -180,22 +219,27 @@ class LoggingAgent:
         )
 
     async def _persist_logs(self, logs: list[dict]):
-        """Persist logs to storage"""
+        """Queue logs for the audit log writer and live subscribers without waiting on either"""
+        if self.log_broker:
+            self.log_broker.publish(logs)
         if self.log_storage:
-            try:
-                await self.log_storage.save_logs(logs)
-            except Exception as e:
-                # Log storage failed, buffer locally
-                self.logs_buffer.extend(logs)
+            self.log_storage.enqueue(logs)
         else:
             # No storage configured, just buffer
             self.logs_buffer.extend(logs)
 
     def _generate_final_response(self, state: VoiceAgentState) -> VoiceAgentState:
         """Generate user-facing final response"""
+        # A response already written upstream (single-pass reasoning or the
+        # response agent) is kept; only this run's logs are attached
+        if state.get("final_response"):
+            state["final_response"] = {**(state.get("final_response") or {}), "logs": state["action_logs"]}
+            return state
+
         intent = state.get("intent", "unknown")
         email_drafts = state.get("email_drafts", [])
         calendar_actions = state.get("calendar_actions", [])
+        bulk_actions = state.get("bulk_actions", [])
         executed_actions = state.get("executed_actions", [])
         error = state.get("error")
 
@@ -206,12 +250,14 @@ class LoggingAgent:
             response_text = f"I've successfully completed {len(executed_actions)} action(s). "
             if any(not ex["result"].get("success") for ex in executed_actions):
                 response_text += "However, some actions failed. Please check the details."
-        elif email_drafts or calendar_actions:
+        elif email_drafts or calendar_actions or bulk_actions:
             response_text = "I've prepared the following for your review:\n\n"
             for draft in email_drafts:
                 response_text += f"- Email draft: '{draft['subject']}' (to {', '.join(draft['to'])})\n"
             for action in calendar_actions:
                 response_text += f"- Calendar action: {action['action_type']} for '{action['event']['title']}'\n"
+            for action in bulk_actions:
+                response_text += f"- {action['description']}\n"
             response_text += "\nWould you like me to proceed? I'll need your authorization code."
         else:
             response_text = f"I've analyzed your request (intent: {intent}). No actions were required."
@@ -223,6 +269,7 @@ class LoggingAgent:
             "intent": intent,
             "drafts": email_drafts,
             "calendar_actions": calendar_actions,
+            "bulk_actions": bulk_actions,
             "executed": executed_actions,
             "logs": state["action_logs"]
         }
@@ -7,11 +7,36 @@ from langchain_openai import ChatOpenAI
 from langchain_anthropic import ChatAnthropic
 from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.output_parsers import PydanticOutputParser
+from pydantic import BaseModel, Field
+from typing import Literal
 from ..graph.state import VoiceAgentState
+from .response_agent import build_final_response
 import json
 import os
 
 
+# Intents that never produce drafts or side effects; for these the analysis
+# and the user-facing response are generated in a single LLM call
+READ_ONLY_INTENTS = ("triage_inbox", "check_calendar", "summarize")
+
+
+class CombinedAssessment(BaseModel):
+    """Structured output for single-pass reasoning + response"""
+    priority_level: Literal["urgent", "high", "medium", "low"] = Field(description="Overall priority")
+    priority_reason: str = Field(description="Why this priority was assigned")
+    recommended_action: Literal[
+        "review",
+        "draft_reply",
+        "accept_meeting",
+        "decline_meeting",
+        "propose_meeting",
+        "archive"
+    ] = Field(description="Single most useful next action")
+    reasoning: str = Field(description="Strategic reasoning behind the assessment")
+    response: str = Field(description="Warm, conversational reply to the CEO, ready to be spoken")
+
+
 class ReasoningAgent:
     """
     Reasons about emails, calendar, and context to determine:
@@ -21,17 +46,23 @@ class ReasoningAgent:
     - Tone and approach for communications
 
     Supports cascading fallback through multiple models when token limits are exceeded.
+
+    For read-only intents (combined mode) a single structured-output call
+    returns priority, recommended action and the final response, so the
+    graph can skip the separate response generation step.
     """
 
-    def __init__(self, model_name: str = "gpt-4", fallback_models: list = None):
+    def __init__(self, model_name: str = "gpt-4", fallback_models: list = None, combined_mode: bool = True):
         """
         Initialize ReasoningAgent with cascading fallback models.
 
         Args:
             model_name: Primary model to use
             fallback_models: List of model names to try in order if token limit exceeded
+            combined_mode: Answer read-only intents in a single reasoning+response call
         """
         self.model_name = model_name
+        self.combined_mode = combined_mode
         self.primary_llm = self._create_llm_client(model_name)
 
         # Parse fallback models from environment or use provided list
@@ -71,7 +102,7 @@ Analyze emails, calendar events, and context to determine:
 **Context to Consider:**
 - Sender relationship and history
 - Urgency indicators and deadlines
-- CEO's current calendar and availability
+- CEO's current calendar and availability, including any flagged conflicts (overlaps, long back-to-back runs, too little travel time)
 - Previous interactions and context
 - VIP senders and partners: {vip_domains}
 - Business priorities and strategic goals
@@ -104,6 +135,36 @@ Provide a strategic analysis with:
 3. Strategic considerations and next steps""")
         ])
 
+        self.combined_parser = PydanticOutputParser(pydantic_object=CombinedAssessment)
+        self.combined_prompt = ChatPromptTemplate.from_messages([
+            ("system", """You are {agent_name}, a highly capable and personable executive assistant to the CEO of HealthCare Sciences.
+
+Analyze the CEO's emails and calendar, then answer them directly.
+
+**Analysis:**
+- Assess overall priority (urgent/high/medium/low) considering business impact, time sensitivity and sender importance
+- VIP senders and partners: {vip_domains}
+- Pick the single most useful next action
+
+**Response:**
+- Warm, professional and concise - it will be read aloud
+- Lead with what needs attention, explain your reasoning briefly
+- End with an offer to help further ("Would you like me to...")
+
+{format_instructions}"""),
+            ("human", """Intent: {intent}
+CEO's Request: "{query}"
+
+**Email Context:**
+{email_context}
+
+**Calendar Context:**
+{calendar_context}
+
+**Sender History:**
+{sender_history}""")
+        ])
+
     def _create_llm_client(self, model_name: str):
         """
         Create appropriate LLM client based on model name.
@@ -169,11 +230,17 @@ Provide a strategic analysis with:
     async def run(self, state: VoiceAgentState) -> VoiceAgentState:
         """Run reasoning analysis with cascading fallback"""
         intent = state["intent"]
+
+        if self.combined_mode and intent in READ_ONLY_INTENTS:
+            if await self._run_combined(state):
+                return state
+            print("[WARNING] Combined reasoning failed, falling back to two-pass mode")
+
         query = state["user_query"]
 
         # Prepare context
         email_context = json.dumps(state.get("email_threads", []), indent=2)
-        calendar_context = json.dumps(state.get("calendar_events", []), indent=2)
+        calendar_context = self._calendar_context(state)
         sender_history = json.dumps(state.get("sender_history", {}), indent=2)
 
         # Get settings (in real implementation, load from config)
@@ -191,6 +258,76 @@ Provide a strategic analysis with:
             sender_history=sender_history
         )
 
+        try:
+            response, model_name = await self._invoke_with_fallback(prompt_value)
+        except Exception as e:
+            print(f"[ERROR] All models failed. Last error: {str(e)}")
+            state["error"] = f"All models failed. Last error: {str(e)}"
+            state["reasoning"] = "Unable to analyze context - all models exhausted"
+            state["recommended_action"] = "manual_review"
+            return state
+
+        reasoning_text = response.content
+
+        # Parse the reasoning (in production, use structured output)
+        state["reasoning"] = reasoning_text
+        state["priority_assessment"] = self._extract_priority(reasoning_text)
+        state["recommended_action"] = self._extract_action(reasoning_text)
+        state["model_used"] = model_name
+
+        return state
+
+    async def _run_combined(self, state: VoiceAgentState) -> bool:
+        """
+        Single-pass reasoning + response for read-only intents.
+
+        Returns:
+            True if the state now holds the final response, False if the
+            caller should fall back to the two-pass pipeline
+        """
+        prompt_value = self.combined_prompt.format_messages(
+            agent_name=os.getenv("VOICE_AGENT_NAME", "Vinegar"),
+            vip_domains=", ".join(["partner.com", "investor.org"]),
+            intent=state["intent"],
+            query=state["user_query"],
+            email_context=json.dumps(state.get("email_threads", []), indent=2),
+            calendar_context=self._calendar_context(state),
+            sender_history=json.dumps(state.get("sender_history", {}), indent=2),
+            format_instructions=self.combined_parser.get_format_instructions()
+        )
+
+        try:
+            response, model_name = await self._invoke_with_fallback(prompt_value)
+            assessment = self.combined_parser.parse(response.content)
+        except Exception as e:
+            print(f"[WARNING] Combined reasoning error: {e}")
+            return False
+
+        state["reasoning"] = assessment.reasoning
+        state["priority_assessment"] = {
+            "level": "high" if assessment.priority_level == "urgent" else assessment.priority_level,
+            "reason": assessment.priority_reason
+        }
+        state["recommended_action"] = assessment.recommended_action
+        state["model_used"] = model_name
+
+        state["voice_response"] = assessment.response
+        state["text_response"] = assessment.response
+        state["final_response"] = build_final_response(state, assessment.response)
+        state["response_ready"] = True
+
+        return True
+
+    async def _invoke_with_fallback(self, prompt_value):
+        """
+        Invoke the primary model, cascading through fallbacks on failure.
+
+        Returns:
+            Tuple of (LLM response, model name that produced it)
+
+        Raises:
+            The last error if every model fails
+        """
         # Try primary model first, then cascade through fallbacks
         models_to_try = [(self.model_name, self.primary_llm)] + list(zip(self.fallback_models, self.fallback_llms))
 
@@ -199,16 +336,8 @@ Provide a strategic analysis with:
             try:
                 print(f"[LLM] Attempting reasoning with model: {model_name}")
                 response = await llm_client.ainvoke(prompt_value)
-                reasoning_text = response.content
-
-                # Parse the reasoning (in production, use structured output)
-                state["reasoning"] = reasoning_text
-                state["priority_assessment"] = self._extract_priority(reasoning_text)
-                state["recommended_action"] = self._extract_action(reasoning_text)
-                state["model_used"] = model_name
-
                 print(f"[SUCCESS] Completed reasoning with model: {model_name}")
-                return state
+                return response, model_name
 
             except Exception as e:
                 error_str = str(e)
@@ -230,13 +359,18 @@ Provide a strategic analysis with:
                     print(f"[WARNING] Error with {model_name}: {error_str}")
                     continue  # Try next model anyway
 
-        # If we get here, all models failed
-        print(f"[ERROR] All models failed. Last error: {str(last_error)}")
-        state["error"] = f"All models failed. Last error: {str(last_error)}"
-        state["reasoning"] = "Unable to analyze context - all models exhausted"
-        state["recommended_action"] = "manual_review"
-
-        return state
+        raise last_error
+
+    def _calendar_context(self, state: VoiceAgentState) -> str:
+        """Calendar events for the prompt, with detected conflicts when there are any"""
+        events = state.get("calendar_events", [])
+        conflicts = state.get("calendar_conflicts") or {}
+        if not conflicts.get("has_conflicts"):
+            return json.dumps(events, indent=2)
+        return json.dumps({
+            "events": events,
+            "conflicts": {k: v for k, v in conflicts.items() if k != "has_conflicts" and v}
+        }, indent=2)
 
     def _extract_priority(self, reasoning: str) -> dict:
         """Extract priority assessment from reasoning text"""
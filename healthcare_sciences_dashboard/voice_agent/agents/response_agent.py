@@ -10,6 +10,24 @@ from ..graph.state import VoiceAgentState
 import os
 
 
+def build_final_response(state: VoiceAgentState, response_text: str) -> dict:
+    """Build the user-facing response object from pipeline state"""
+    return {
+        "text": response_text,
+        "intent": state.get("intent"),
+        "confidence": state.get("confidence", 0.0),
+        "reasoning": state.get("reasoning", ""),
+        "drafts": state.get("email_drafts", []),
+        "calendar_actions": state.get("calendar_actions", []),
+        "bulk_actions": state.get("bulk_actions", []),
+        "executed": state.get("executed_actions", []),
+        "pending": state.get("pending_actions", []),
+        "logs": state.get("action_logs", []),
+        "requires_authorization": state.get("requires_authorization", False),
+        "session_id": state.get("session_id")
+    }
+
+
 class ResponseGenerationAgent:
     """
     Generates natural, conversational responses with personality.
@@ -200,21 +218,7 @@ Generate a natural, conversational response that:
             state["text_response"] = response_text
 
             # Build final response object
-            final_response = {
-                "text": response_text,
-                "intent": state.get("intent"),
-                "confidence": state.get("confidence", 0.0),
-                "reasoning": state.get("reasoning", ""),
-                "drafts": state.get("email_drafts", []),
-                "calendar_actions": state.get("calendar_actions", []),
-                "executed": state.get("executed_actions", []),
-                "pending": state.get("pending_actions", []),
-                "logs": state.get("action_logs", []),
-                "requires_authorization": state.get("requires_authorization", False),
-                "session_id": state.get("session_id")
-            }
-
-            state["final_response"] = final_response
+            state["final_response"] = build_final_response(state, response_text)
 
             return state
 
@@ -3,7 +3,8 @@ Voice Agent API Routes
 FastAPI endpoints for the voice-enabled email & calendar automation system
 """
 
-from fastapi import APIRouter, HTTPException, WebSocket, WebSocketDisconnect
+from fastapi import APIRouter, HTTPException, Query, WebSocket, WebSocketDisconnect
+from starlette.websockets import WebSocketState
 from pydantic import BaseModel
 from typing import Literal
 try:
@@ -12,8 +13,14 @@ try:
 except Exception:
     VoiceAgentOrchestrator = None  # type: ignore
     SystemSettings = None  # type: ignore
+import asyncio
 import json
+import uuid
+from ..adapters.email.gmail_adapter import GMAIL_EXECUTOR, get_shared_gmail_adapter
+from ..adapters.tts import get_shared_tts_adapter
+from ..storage.audit_log import MAX_QUERY_LIMIT
 from ..utils.email_query import parse_email_nl_to_gmail_query
+from ..utils.calendar_windows import timeframe_window
 
 # Initialize router
 router = APIRouter(prefix="/voice-agent", tags=["voice-agent"])
@@ -23,6 +30,9 @@ class _StubOrchestrator:
     async def process_query(self, *args, **kwargs):
         return {"text": "stub", "intent": "unknown", "drafts": [], "calendar_actions": [], "executed": [], "logs": []}
 
+    async def stream_query(self, *args, **kwargs):
+        yield {"type": "final", "response": await self.process_query()}
+
 try:
     settings = SystemSettings() if SystemSettings else None
     orchestrator = VoiceAgentOrchestrator(settings=settings) if VoiceAgentOrchestrator else _StubOrchestrator()
@@ -30,6 +40,32 @@ except Exception:
     orchestrator = _StubOrchestrator()
 
 
+async def _shutdown_orchestrator():
+    """Flush the audit log and stop background workers when the app stops"""
+    shutdown = getattr(orchestrator, "shutdown", None)
+    if shutdown is not None:
+        await shutdown()
+
+
+router.add_event_handler("shutdown", _shutdown_orchestrator)
+
+
+def _email_adapter():
+    """Orchestrator's email adapter, or the shared Gmail adapter when the orchestrator is stubbed"""
+    adapter = getattr(orchestrator, "email_adapter", None)
+    if adapter is None:
+        adapter = get_shared_gmail_adapter()
+    return adapter
+
+
+def _tts_adapter():
+    """Orchestrator's TTS adapter, or one built from settings when the orchestrator is stubbed"""
+    adapter = getattr(orchestrator, "tts_adapter", None)
+    if adapter is None:
+        adapter = get_shared_tts_adapter()
+    return adapter
+
+
 # Request/Response Models
 class QueryRequest(BaseModel):
     """Request model for processing queries"""
@@ -46,6 +82,7 @@ class QueryResponse(BaseModel):
     intent: str
     drafts: list[dict] = []
     calendar_actions: list[dict] = []
+    bulk_actions: list[dict] = []
     executed: list[dict] = []
     logs: list[dict] = []
     session_id: str | None = None
@@ -98,6 +135,7 @@ async def process_query(request: QueryRequest):
             intent=result.get("intent", "unknown"),
             drafts=result.get("drafts", []),
             calendar_actions=result.get("calendar_actions", []),
+            bulk_actions=result.get("bulk_actions", []),
             executed=result.get("executed", []),
             logs=result.get("logs", []),
             session_id=request.session_id,
@@ -130,24 +168,47 @@ class EmailSendRequest(BaseModel):
     cc: list[str] | None = None
     bcc: list[str] | None = None
     thread_id: str | None = None
+    draft_id: str | None = None  # idempotency key: a draft is sent at most once
+    idempotency_key: str | None = None
 
 
 @router.post("/email/send")
 async def send_email_direct(request: EmailSendRequest):
     """
-    Send an email directly via the configured email adapter.
+    Send an email via the configured email adapter.
 
     This endpoint is intended for UI flows like "Approve & Send" and does
-    not require an authorization code. If Gmail credentials are not present,
-    the Gmail adapter falls back to mock mode and still returns success.
+    not require an authorization code. With the outbound queue enabled the
+    email is committed to the queue and the call returns immediately with
+    an outbox_id (poll /email/outbox/{outbox_id} for delivery status);
+    retrying with the same draft_id / idempotency_key does not send twice.
+    If Gmail credentials are not present, the Gmail adapter falls back to
+    mock mode and still returns success.
     """
     try:
-        # Lazy import to avoid circulars when running minimal routes
-        from voice_agent.adapters.email.gmail_adapter import GmailAdapter
-
-        adapter = GmailAdapter()
         to_list = request.to if isinstance(request.to, list) else [request.to]
 
+        queue = getattr(orchestrator, "outbound_queue", None)
+        if queue is not None:
+            record = await queue.enqueue(
+                to=to_list,
+                subject=request.subject,
+                body=request.body,
+                cc=request.cc or [],
+                bcc=request.bcc or [],
+                thread_id=request.thread_id,
+                idempotency_key=request.idempotency_key or request.draft_id
+            )
+            return {
+                "success": True,
+                "queued": True,
+                "outbox_id": record["outbox_id"],
+                "status": record["status"],
+                "duplicate": record["duplicate"],
+                "thread_id": record["thread_id"]
+            }
+
+        adapter = _email_adapter()
         result = await adapter.send_email(
             to=to_list,
             subject=request.subject,
@@ -176,10 +237,9 @@ async def send_email_direct(request: EmailSendRequest):
 async def get_calendar_events(timeframe: str = "week"):
     """
     Return calendar events for a timeframe: "today", "tomorrow", "week".
-    Uses the orchestrator's calendar adapter (mock if not configured).
+    Uses the orchestrator's calendar adapter (mock if not configured);
+    with the calendar cache enabled the range is a local lookup.
     """
-    from datetime import datetime, timedelta, timezone
-
     try:
         adapter = orchestrator.calendar_adapter
         if adapter is None:
@@ -187,42 +247,77 @@ async def get_calendar_events(timeframe: str = "week"):
             from voice_agent.adapters.calendar.google_calendar_adapter import GoogleCalendarAdapter
             adapter = GoogleCalendarAdapter()
 
-        now = datetime.now(timezone.utc)
-        if timeframe in ("today", "day"):
-            start = now.replace(hour=0, minute=0, second=0, microsecond=0)
-            end = start + timedelta(days=1)
-        elif timeframe in ("tomorrow",):
-            start = (now + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
-            end = start + timedelta(days=1)
-        else:  # week (default)
-            start = now - timedelta(days=now.weekday())  # Monday
-            start = start.replace(hour=0, minute=0, second=0, microsecond=0)
-            end = start + timedelta(days=7)
-
+        start, end = timeframe_window(timeframe)
         events = await adapter.get_events(start_time=start, end_time=end)
         return {"events": events}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/calendar/availability")
+async def get_calendar_availability(
+    attendees: str = "",
+    duration_minutes: int = 30,
+    days: int = 7,
+    max_results: int = 5
+):
+    """
+    Ranked meeting slots in which the user and every attendee are free.
+
+    attendees is a comma-separated list of email addresses. Working hours
+    and calendar_block_rules ("Friday 14:00-18:00 avoid") are applied;
+    slots touching an "avoid" rule rank lower.
+    """
+    from datetime import datetime, timedelta, timezone
+
+    adapter = getattr(orchestrator, "calendar_adapter", None)
+    engine = getattr(orchestrator, "availability_engine", None)
+    if adapter is None or engine is None:
+        raise HTTPException(status_code=503, detail="Calendar is not configured")
+    if not 5 <= duration_minutes <= 480 or not 1 <= days <= 62:
+        raise HTTPException(status_code=400, detail="duration_minutes must be 5-480 and days 1-62")
+
+    calendar_ids = ["primary", *dict.fromkeys(a.strip() for a in attendees.split(",") if a.strip())]
+    start = datetime.now(timezone.utc)
+    end = start + timedelta(days=days)
+    try:
+        busy = await adapter.get_free_busy(calendar_ids, start, end)
+        slots = engine.find_slots(busy, start, end, duration_minutes=duration_minutes, max_results=max_results)
+        return {"attendees": calendar_ids[1:], "duration_minutes": duration_minutes, "slots": slots}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.get("/emails/search")
-async def search_emails(nl: str, max_results: int = 25, unread_only: bool = False):
+async def search_emails(nl: str, max_results: int = 25, unread_only: bool = False, offset: int = 0):
     """
     Search emails using a simple natural-language filter.
 
     Example: nl="show me emails from recruiters" → Gmail query with recruiter terms.
+
+    With the mailbox mirror enabled the query is answered from the local
+    full-text index (ranked, paginated with offset/next_offset, works
+    offline); otherwise Gmail is queried live.
     """
     try:
-        from voice_agent.adapters.email.gmail_adapter import GmailAdapter
-
         gmail_query = parse_email_nl_to_gmail_query(nl)
 
-        gmail = GmailAdapter()
-        threads = await gmail.fetch_threads(
-            max_results=max_results,
-            unread_only=unread_only,
-            query=gmail_query
-        )
+        adapter = _email_adapter()
+        if hasattr(adapter, "search_page"):
+            page = await adapter.search_page(
+                gmail_query,
+                limit=max_results,
+                offset=offset,
+                unread_only=unread_only
+            )
+            threads, next_offset, source = page["threads"], page["next_offset"], page["source"]
+        else:
+            threads = await adapter.fetch_threads(
+                max_results=max_results,
+                unread_only=unread_only,
+                query=gmail_query
+            )
+            next_offset, source = None, "gmail"
 
         emails = []
         for thread in threads:
@@ -235,7 +330,64 @@ async def search_emails(nl: str, max_results: int = 25, unread_only: bool = Fals
                 "unread": thread.get("unread", False)
             })
 
-        return {"emails": emails, "count": len(emails), "query": gmail_query}
+        return {
+            "emails": emails,
+            "count": len(emails),
+            "query": gmail_query,
+            "next_offset": next_offset,
+            "source": source
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+class BulkEmailRequest(BaseModel):
+    """Archive, mark read or relabel many threads at once"""
+    operation: Literal["mark_read", "archive", "label"]
+    thread_ids: list[str] | None = None
+    nl: str | None = None  # natural-language filter used when thread_ids is omitted
+    add_label_ids: list[str] = []
+    remove_label_ids: list[str] = []
+    max_threads: int = 500
+
+
+@router.post("/emails/bulk")
+async def bulk_modify_emails(request: BulkEmailRequest):
+    """
+    Apply one label change to many threads.
+
+    Threads are given explicitly or selected with a natural-language filter
+    (e.g. nl="newsletters from acme.com"). Gmail is updated with
+    messages.batchModify (up to 1000 messages per call) instead of one
+    modify call per thread.
+    """
+    try:
+        adapter = _email_adapter()
+
+        gmail_query = None
+        thread_ids = request.thread_ids
+        if thread_ids is None:
+            if not request.nl:
+                raise HTTPException(status_code=400, detail="Provide thread_ids or nl")
+            gmail_query = parse_email_nl_to_gmail_query(request.nl)
+            threads = await adapter.search_emails(gmail_query, max_results=request.max_threads)
+            thread_ids = [t["thread_id"] for t in threads]
+        thread_ids = thread_ids[:request.max_threads]
+
+        if request.operation == "mark_read":
+            result = await adapter.bulk_mark_read(thread_ids)
+        elif request.operation == "archive":
+            result = await adapter.bulk_archive(thread_ids)
+        else:
+            if not request.add_label_ids and not request.remove_label_ids:
+                raise HTTPException(status_code=400, detail="label requires add_label_ids or remove_label_ids")
+            result = await adapter.bulk_label(thread_ids, request.add_label_ids, request.remove_label_ids)
+
+        return {**result, "query": gmail_query, "thread_count": len(thread_ids)}
+    except HTTPException:
+        raise
+    except NotImplementedError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -248,19 +400,8 @@ async def get_emails(max_results: int = 10, query: str | None = None, unread_onl
     Returns a clean list of email threads for display in the dashboard.
     """
     try:
-        import sys
-        import os
-        from pathlib import Path
-
-        # Add parent directory to path for imports
-        current_dir = Path(__file__).parent.parent.parent
-        if str(current_dir) not in sys.path:
-            sys.path.insert(0, str(current_dir))
-
-        from voice_agent.adapters.email.gmail_adapter import GmailAdapter
-
-        # Initialize Gmail adapter (uses environment variables internally)
-        gmail = GmailAdapter()
+        # Shared adapter: OAuth session and Gmail service are reused across requests
+        gmail = _email_adapter()
 
         # Get recent email threads (optionally filtered by Gmail query)
         threads = await gmail.fetch_threads(
@@ -327,6 +468,169 @@ async def get_session(session_id: str):
     return session
 
 
+@router.get("/activity")
+async def get_activity(
+    user_id: str | None = None,
+    object_type: str | None = None,
+    since: str | None = None,
+    until: str | None = None,
+    before_seq: int | None = None,
+    limit: int = Query(50, ge=1, le=MAX_QUERY_LIMIT)
+):
+    """
+    Activity feed from the audit log, newest first.
+
+    Filter by user, object type (email, calendar, summary, ...) and an ISO
+    time range; pass next_cursor back as before_seq for the next page.
+    Entries still queued for the audit log writer appear after its next flush.
+    """
+    query_activity = getattr(orchestrator, "query_activity", None)
+    if query_activity is None:
+        return {"entries": [], "next_cursor": None}
+    try:
+        entries = query_activity(
+            user_id=user_id,
+            object_type=object_type,
+            since=since,
+            until=until,
+            before_seq=before_seq,
+            limit=limit
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid time range: {e}")
+    return {"entries": entries, "next_cursor": entries[-1]["seq"] if len(entries) == limit else None}
+
+
+@router.get("/metrics/sessions")
+async def get_session_metrics():
+    """
+    Session store metrics.
+
+    Reports the backend, how many sessions are held and their serialized
+    size, and how many were evicted (LRU bound) or expired (idle timeout).
+    """
+    get_session_stats = getattr(orchestrator, "get_session_stats", None)
+    if get_session_stats is None:
+        return {"enabled": False}
+    return {"enabled": True, **get_session_stats()}
+
+
+@router.get("/metrics/auth-codes")
+async def get_auth_code_metrics():
+    """
+    Authorization code store metrics.
+
+    Reports live codes and how many were issued, used to authorize an
+    action, rejected, revoked after too many attempts or swept on expiry.
+    """
+    get_auth_code_stats = getattr(orchestrator, "get_auth_code_stats", None)
+    if get_auth_code_stats is None:
+        return {"enabled": False}
+    return {"enabled": True, **get_auth_code_stats()}
+
+
+@router.get("/metrics/audit-log")
+async def get_audit_log_metrics():
+    """
+    Audit log metrics.
+
+    Reports entries queued for the writer, written and dropped counts,
+    flush failures, live rows and how many were rotated into archives.
+    """
+    get_audit_log_stats = getattr(orchestrator, "get_audit_log_stats", None)
+    if get_audit_log_stats is None:
+        return {"enabled": False}
+    return get_audit_log_stats()
+
+
+@router.get("/metrics/prefetch")
+async def get_prefetch_metrics():
+    """
+    Speculative context prefetch statistics.
+
+    Reports, per context source, how many prefetches were started, how many
+    were consumed by the pipeline (hits) and how many were cancelled unused.
+    """
+    get_prefetch_stats = getattr(orchestrator, "get_prefetch_stats", None)
+    if get_prefetch_stats is None:
+        return {"enabled": False}
+    return {"enabled": True, "sources": get_prefetch_stats()}
+
+
+@router.get("/metrics/email-executor")
+async def get_email_executor_metrics():
+    """
+    Gmail thread-pool metrics.
+
+    Blocking Gmail API calls run on a bounded executor; this reports its
+    queue depth, running calls and completed/failed/timed-out counters.
+    """
+    return GMAIL_EXECUTOR.stats()
+
+
+@router.get("/email/outbox/{outbox_id}")
+async def get_outbox_status(outbox_id: str):
+    """
+    Delivery status of a queued email, by outbox_id or idempotency key.
+
+    status is one of queued, sending, retrying (with next_attempt_at and
+    last_error), sent (with message_id) or failed.
+    """
+    queue = getattr(orchestrator, "outbound_queue", None)
+    if queue is None:
+        raise HTTPException(status_code=404, detail="Outbound queue is not enabled")
+    record = await asyncio.to_thread(queue.get_status, outbox_id)
+    if record is None:
+        raise HTTPException(status_code=404, detail=f"Unknown outbox id: {outbox_id}")
+    return record
+
+
+@router.get("/metrics/outbound-queue")
+async def get_outbound_queue_metrics():
+    """Outbound email queue depth by status and sends in the last 24h"""
+    queue = getattr(orchestrator, "outbound_queue", None)
+    if queue is None:
+        return {"enabled": False}
+    return {"enabled": True, **(await asyncio.to_thread(queue.stats))}
+
+
+@router.get("/metrics/log-stream")
+async def get_log_stream_metrics():
+    """Live action log stream: subscribers, messages published, queued and dropped"""
+    broker = getattr(orchestrator, "log_broker", None)
+    if broker is None:
+        return {"enabled": False}
+    return {"enabled": True, **broker.stats()}
+
+
+@router.get("/metrics/mailbox-mirror")
+async def get_mailbox_mirror_metrics():
+    """
+    Local mailbox mirror status.
+
+    Reports mirrored message/thread counts, the Gmail historyId the mirror
+    is synced to and a summary of the last sync.
+    """
+    adapter = getattr(orchestrator, "email_adapter", None)
+    if not hasattr(adapter, "get_mirror_stats"):
+        return {"enabled": False}
+    return {"enabled": True, **adapter.get_mirror_stats()}
+
+
+@router.get("/metrics/calendar-cache")
+async def get_calendar_cache_metrics():
+    """
+    Local calendar event store status.
+
+    Reports cached event counts, the sync token each calendar is synced to
+    and a summary of its last sync.
+    """
+    adapter = getattr(orchestrator, "calendar_adapter", None)
+    if not hasattr(adapter, "get_cache_stats"):
+        return {"enabled": False}
+    return {"enabled": True, "calendars": adapter.get_cache_stats()}
+
+
 @router.get("/config")
 async def get_config():
     """
@@ -347,67 +651,108 @@ async def get_config():
 @router.post("/tts")
 async def text_to_speech(request: dict):
     """
-    Convert text to speech using ElevenLabs API.
+    Convert text to speech with the configured TTS provider.
 
     Args:
         text: The text to convert to speech
+        voice_id: Optional provider voice (configured default otherwise)
+        model_id: Optional provider model
 
     Returns:
-        Audio file as bytes (MP3 format)
+        Audio streamed as it is synthesized (MP3 format). Phrases already
+        in the audio cache are served from disk; X-TTS-Cache says which.
     """
-    import os
-    from elevenlabs.client import ElevenLabs
-    from fastapi.responses import Response
+    from fastapi.responses import StreamingResponse
 
-    try:
-        text = request.get("text", "")
-        if not text:
-            raise HTTPException(status_code=400, detail="No text provided")
-
-        # Get API key and voice ID from environment
-        api_key = os.getenv("ELEVENLABS_API_KEY")
-        voice_id = os.getenv("ELEVENLABS_VOICE_ID", "21m00Tcm4TlvDq8ikWAM")
-
-        if not api_key:
-            raise HTTPException(
-                status_code=500,
-                detail="ElevenLabs API key not configured"
-            )
+    text = request.get("text", "")
+    if not text:
+        raise HTTPException(status_code=400, detail="No text provided")
 
-        # Initialize ElevenLabs client
-        client = ElevenLabs(api_key=api_key)
+    adapter = _tts_adapter()
+    if adapter is None:
+        raise HTTPException(status_code=500, detail="Text-to-speech is not configured")
 
-        # Generate speech using the new API
-        audio_generator = client.text_to_speech.convert(
-            text=text,
-            voice_id=voice_id,
-            model_id="eleven_monolingual_v1"
-        )
-
-        # Convert generator to bytes
-        audio_bytes = b"".join(audio_generator)
-
-        # Return audio as MP3
-        return Response(
-            content=audio_bytes,
-            media_type="audio/mpeg",
-            headers={
-                "Content-Disposition": "inline; filename=speech.mp3"
-            }
-        )
+    voice_id, model_id = request.get("voice_id"), request.get("model_id")
+    is_cached = getattr(adapter, "is_cached", None)
+    cache_status = None if is_cached is None else ("hit" if is_cached(text, voice_id, model_id) else "miss")
+    audio = adapter.stream(text, voice_id=voice_id, model_id=model_id)
 
+    # Wait for the first chunk so provider errors still surface as a 500
+    try:
+        first_chunk = await anext(audio, b"")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"TTS error: {str(e)}")
 
+    async def body():
+        try:
+            if first_chunk:
+                yield first_chunk
+            async for chunk in audio:
+                yield chunk
+        finally:
+            await audio.aclose()
+
+    headers = {"Content-Disposition": "inline; filename=speech.mp3"}
+    if cache_status:
+        headers["X-TTS-Cache"] = cache_status
+    return StreamingResponse(body(), media_type=adapter.media_type, headers=headers)
+
+
+@router.get("/metrics/tts-cache")
+async def get_tts_cache_metrics():
+    """TTS audio cache size, hit rate and evictions"""
+    cache = getattr(_tts_adapter(), "cache", None)
+    if cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **cache.stats()}
+
 
 @router.websocket("/ws")
 async def voice_websocket(websocket: WebSocket):
     """
     WebSocket endpoint for real-time voice interactions.
 
-    Supports streaming audio input/output for hands-free voice control.
+    Each ``{"type": "query", "request_id": ..., "query": ...}`` runs as its
+    own task and streams events tagged with its request_id as the pipeline
+    progresses: ``started``, ``intent``, ``context``, ``reasoning``,
+    ``drafts``, ``authorization``, ``execution``, ``response``, ``token``
+    (response text as it is generated), ``logged`` and finally ``final``
+    (the full result) or ``error``. A new query cancels runs still in
+    flight on the socket (barge-in) unless it sets ``"barge_in": false``;
+    ``{"type": "cancel", "request_id": ...}`` cancels one run. Cancelled
+    runs end with a ``cancelled`` event. Pings are answered while runs stream.
     """
     await websocket.accept()
+    runs: dict[str, asyncio.Task] = {}
+
+    async def run_query(request_id: str, message: dict):
+        try:
+            async for event in orchestrator.stream_query(
+                query=message["query"],
+                mode=message.get("mode", "voice"),
+                user_id=message.get("user_id"),
+                session_id=message.get("session_id"),
+                authorization_code=message.get("authorization_code")
+            ):
+                await websocket.send_json({"request_id": request_id, **event})
+        except asyncio.CancelledError:
+            # Barge-in or explicit cancel; nothing to report once the client is gone
+            if websocket.client_state == WebSocketState.CONNECTED:
+                await websocket.send_json({"type": "cancelled", "request_id": request_id})
+        except Exception as e:
+            # A bad message (e.g. no "query") ends this run, not the socket
+            if websocket.client_state == WebSocketState.CONNECTED:
+                error = f"Missing field {e}" if isinstance(e, KeyError) else str(e)
+                await websocket.send_json({"type": "error", "request_id": request_id, "error": error})
+        finally:
+            # A reused request_id may already belong to a newer run
+            if runs.get(request_id) is asyncio.current_task():
+                del runs[request_id]
+
+    def cancel(request_id: str | None = None):
+        for rid, task in list(runs.items()):
+            if request_id is None or rid == request_id:
+                task.cancel()
 
     try:
         while True:
@@ -417,16 +762,13 @@ async def voice_websocket(websocket: WebSocket):
 
             # Process based on message type
             if message["type"] == "query":
-                result = await orchestrator.process_query(
-                    query=message["query"],
-                    mode="voice",
-                    user_id=message.get("user_id"),
-                    session_id=message.get("session_id"),
-                    authorization_code=message.get("authorization_code")
-                )
+                request_id = message.get("request_id") or f"req_{uuid.uuid4().hex[:8]}"
+                if message.get("barge_in", True):
+                    cancel()
+                runs[request_id] = asyncio.create_task(run_query(request_id, message))
 
-                # Send response back
-                await websocket.send_json(result)
+            elif message["type"] == "cancel":
+                cancel(message.get("request_id"))
 
             elif message["type"] == "ping":
                 await websocket.send_json({"type": "pong"})
@@ -436,3 +778,64 @@ async def voice_websocket(websocket: WebSocket):
     except Exception as e:
         await websocket.send_json({"error": str(e)})
         await websocket.close()
+    finally:
+        cancel()
+
+
+@router.websocket("/ws/logs")
+async def action_log_websocket(
+    websocket: WebSocket,
+    user_id: str | None = None,
+    object_type: str | None = None,
+    resume_from: str | None = None
+):
+    """
+    Live action log stream for the dashboard.
+
+    Sends ``{"type": "log", "entry": {...}}`` for each action log, optionally
+    filtered by user_id and a comma-separated object_type list. A client
+    that falls behind loses the oldest queued messages and is told with
+    ``{"type": "dropped", "count": n}``; reconnect with resume_from=<last
+    log_id> to receive what was missed while disconnected.
+    """
+    broker = getattr(orchestrator, "log_broker", None)
+    await websocket.accept()
+    if broker is None:
+        await websocket.send_json({"type": "error", "error": "Real-time logs are disabled"})
+        await websocket.close()
+        return
+
+    object_types = [t.strip() for t in object_type.split(",") if t.strip()] if object_type else None
+    subscription = broker.subscribe(user_id=user_id, object_types=object_types, resume_from=resume_from)
+
+    async def forward():
+        while (message := await subscription.get()) is not None:
+            await websocket.send_text(message)
+
+    async def receive():
+        # Only pings are expected and anything else is ignored; returns when
+        # the client disconnects
+        try:
+            while True:
+                try:
+                    message = json.loads(await websocket.receive_text())
+                except (ValueError, KeyError):
+                    continue  # not JSON, or a binary frame
+                if isinstance(message, dict) and message.get("type") == "ping":
+                    await websocket.send_json({"type": "pong"})
+        except WebSocketDisconnect:
+            pass
+
+    tasks = [asyncio.create_task(forward()), asyncio.create_task(receive())]
+    try:
+        await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        broker.unsubscribe(subscription)
+        for task in tasks:
+            task.cancel()
+        # Let both finish; unlike gather, wait takes a cancellation of this
+        # handler (server shutdown) without passing it on to the tasks
+        await asyncio.wait(tasks)
+        for task in tasks:
+            if not task.cancelled():
+                task.exception()  # a send to a closed socket is expected here
@@ -15,7 +15,16 @@ from ..agents.response_agent import ResponseGenerationAgent
 from ..agents.logging_agent import LoggingAgent
 
 
-def create_voice_agent_graph(email_adapter=None, calendar_adapter=None) -> StateGraph:
+def create_voice_agent_graph(
+    email_adapter=None,
+    calendar_adapter=None,
+    context_agent=None,
+    outbound_queue=None,
+    conflict_detector=None,
+    auth_code_store=None,
+    audit_log=None,
+    log_broker=None
+) -> StateGraph:
     """
     Creates the LangGraph for the voice-enabled email & calendar automation system.
 
@@ -28,7 +37,21 @@ def create_voice_agent_graph(email_adapter=None, calendar_adapter=None) -> State
     6. Execution → Perform actions (send email, update calendar)
     7. Logging → Record all actions for audit trail
 
+    Read-only intents (triage_inbox, check_calendar, summarize) are answered by
+    the reasoning step in a single structured call; when nothing needs
+    authorization the graph skips response generation and goes to logging.
+
     This follows the gotoHuman-style human-in-the-loop pattern.
+
+    Pass context_agent to share a ContextRetrievalAgent with the caller
+    (the orchestrator uses this to hand it speculative prefetches).
+    With outbound_queue set, authorized emails are queued for background
+    delivery instead of being sent inside the request. conflict_detector
+    configures how calendar proposals are checked (travel buffer, longest
+    back-to-back run). auth_code_store holds the authorization codes
+    (in-process by default). audit_log is the AuditLogWriter the logging
+    node queues entries on; without it logs are only kept in memory.
+    log_broker streams each entry to live dashboard subscribers.
     """
 
     # Initialize the graph
@@ -36,7 +59,10 @@ def create_voice_agent_graph(email_adapter=None, calendar_adapter=None) -> State
 
     # Initialize agents with adapters
     intent_agent = IntentClassificationAgent()
-    context_agent = ContextRetrievalAgent(email_adapter=email_adapter, calendar_adapter=calendar_adapter)
+    context_agent = context_agent or ContextRetrievalAgent(
+        email_adapter=email_adapter,
+        calendar_adapter=calendar_adapter
+    )
 
     # Get model configuration from environment
     # ReasoningAgent will automatically load FALLBACK_MODELS from .env
@@ -47,11 +73,19 @@ def create_voice_agent_graph(email_adapter=None, calendar_adapter=None) -> State
     # It will automatically parse FALLBACK_MODELS env var (e.g., "deepseek-chat,grok-2,gpt-4o-mini,gemini-1.5-pro")
     reasoning_agent = ReasoningAgent(model_name=model_name)
 
-    draft_agent = DraftGenerationAgent()
-    auth_agent = AuthorizationAgent()
-    execution_agent = ExecutionAgent(email_adapter=email_adapter, calendar_adapter=calendar_adapter)
+    draft_agent = DraftGenerationAgent(
+        email_adapter=email_adapter,
+        calendar_adapter=calendar_adapter,
+        conflict_detector=conflict_detector
+    )
+    auth_agent = AuthorizationAgent(code_store=auth_code_store)
+    execution_agent = ExecutionAgent(
+        email_adapter=email_adapter,
+        calendar_adapter=calendar_adapter,
+        outbound_queue=outbound_queue
+    )
     response_agent = ResponseGenerationAgent()
-    logging_agent = LoggingAgent()
+    logging_agent = LoggingAgent(log_storage=audit_log, log_broker=log_broker)
 
     # Add nodes to the graph
     workflow.add_node("classify_intent", intent_agent.run)
@@ -80,6 +114,9 @@ def create_voice_agent_graph(email_adapter=None, calendar_adapter=None) -> State
                 return "execute_actions"
             # Otherwise, ask for authorization
             return "check_authorization"
+        # Read-only intents answered in single-pass mode skip the response LLM call
+        if state.get("response_ready", False):
+            return "log_actions"
         # No authorization needed (e.g., just generating drafts, reading inbox)
         return "generate_response"
 
@@ -89,7 +126,8 @@ def create_voice_agent_graph(email_adapter=None, calendar_adapter=None) -> State
         {
             "check_authorization": "check_authorization",
             "execute_actions": "execute_actions",
-            "generate_response": "generate_response"
+            "generate_response": "generate_response",
+            "log_actions": "log_actions"
         }
     )
 
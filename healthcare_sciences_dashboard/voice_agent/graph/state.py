@@ -18,6 +18,7 @@ class VoiceAgentState(TypedDict):
     interaction_mode: Literal["voice", "text", "automated"]
     session_id: str
     user_id: str | None
+    prefetch_key: str | None  # Key of speculative context fetches for this run
 
     # Intent Classification
     intent: Literal[
@@ -31,13 +32,16 @@ class VoiceAgentState(TypedDict):
         "unknown"
     ]
     confidence: float
+    intent_source: str  # "cache", "rules", "model" (local fast path) or "llm"
 
     # Context Retrieval
     email_threads: list[dict]
     calendar_events: list[dict]
     sender_history: dict
     availability_slots: list[dict]
+    calendar_conflicts: dict  # overlaps, back-to-back chains and travel violations in calendar_events
     follow_up_tasks: list[dict]
+    context_status: dict  # source -> {"status": "ok"|"timeout"|"error", "elapsed_ms": ...}
 
     # Reasoning & Decision
     priority_assessment: dict
@@ -47,6 +51,7 @@ class VoiceAgentState(TypedDict):
     # Draft Generation
     email_drafts: Annotated[list[dict], add]
     calendar_actions: Annotated[list[dict], add]
+    bulk_actions: Annotated[list[dict], add]  # mailbox-wide archive / mark-read proposals
     follow_ups: Annotated[list[dict], add]
 
     # Authorization
@@ -65,6 +70,7 @@ class VoiceAgentState(TypedDict):
     voice_response: str
     text_response: str
     final_response: dict
+    response_ready: bool  # Set when reasoning already produced the final response
 
     # Error Handling
     error: str | None
@@ -56,6 +56,10 @@ class CalendarAction(BaseModel):
         default=False,
         description="Whether this conflicts with existing events"
     )
+    conflicts: dict | None = Field(
+        default=None,
+        description="Conflict report for the event's slot (overlaps, back-to-back run, travel gaps)"
+    )
     proposed_status: Literal["accept", "decline", "tentative", "propose_alternative"]
     alternative_times: list[AvailabilitySlot] = Field(
         default_factory=list,
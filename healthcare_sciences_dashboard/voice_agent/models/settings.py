@@ -3,8 +3,27 @@ System Settings and Configuration
 All behavior is configurable and environment-agnostic
 """
 
+import os
+from pathlib import Path
 from typing import Literal
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
+
+
+# Storage locations resolved against data_dir when given as relative paths
+DATA_PATH_FIELDS = (
+    "auth_code_store_path",
+    "session_store_path",
+    "audit_log_path",
+    "audit_log_archive_dir",
+    "mailbox_mirror_path",
+    "outbound_queue_path",
+    "tts_cache_dir",
+)
+
+
+def default_data_dir() -> str:
+    """VOICE_AGENT_DATA_DIR, else ~/.voice_agent (never the working directory)"""
+    return os.getenv("VOICE_AGENT_DATA_DIR") or str(Path.home() / ".voice_agent")
 
 
 class SystemSettings(BaseModel):
@@ -28,6 +47,11 @@ class SystemSettings(BaseModel):
     # Authorization & Security
     auth_code_length: int = Field(default=4, ge=4, le=8)
     auth_code_expiry_minutes: int = Field(default=10, ge=5, le=60)
+    auth_code_store_backend: Literal["memory", "sqlite"] = Field(
+        default="memory",
+        description="Where pending authorization codes are kept; sqlite survives restarts and is shared by workers"
+    )
+    auth_code_store_path: str = Field(default="auth_codes.sqlite3")
 
     # Tone & Communication
     tone_default: Literal["formal", "warm", "concise", "friendly"] = Field(
@@ -46,35 +70,101 @@ class SystemSettings(BaseModel):
     )
 
     # Storage & Database
+    data_dir: str = Field(
+        default_factory=default_data_dir,
+        description="Directory that relative store paths (queues, mirrors, logs, caches) live in"
+    )
     storage_backend: Literal["postgres", "sqlite", "firestore", "bigquery"] = Field(
         default="postgres"
     )
+    session_store_backend: Literal["memory", "sqlite"] = Field(
+        default="memory",
+        description="Where conversation sessions are kept; sqlite survives restarts and is shared by workers"
+    )
+    session_store_path: str = Field(default="sessions.sqlite3")
+    session_max_entries: int = Field(default=10000, ge=1)
+    session_ttl_seconds: float = Field(default=86400.0, gt=0.0, description="Idle time after which a session expires")
+    audit_log_enabled: bool = Field(
+        default=True,
+        description="Write action logs to an append-only SQLite audit log (queried by the activity feed)"
+    )
+    audit_log_path: str = Field(default="audit_log.sqlite3")
+    audit_log_archive_dir: str = Field(default="audit_archive")
+    audit_log_max_rows: int = Field(
+        default=500000, ge=1000,
+        description="Rows kept queryable; older ones are rotated into compressed JSONL archives"
+    )
+    audit_log_batch_size: int = Field(default=200, ge=1)
+    audit_log_flush_seconds: float = Field(default=2.0, gt=0.0)
     realtime_logs: bool = Field(
         default=True,
         description="Enable real-time log streaming to dashboard"
     )
+    realtime_log_queue_size: int = Field(
+        default=256, ge=1,
+        description="Messages buffered per log stream subscriber before the oldest are dropped"
+    )
+    realtime_log_history: int = Field(
+        default=1000, ge=0,
+        description="Recent log messages kept so reconnecting clients can resume from a log_id"
+    )
 
     # Email Integration
     email_provider: Literal["gmail_api", "imap_smtp", "outlook_graph"] = Field(
         default="gmail_api"
     )
     gmail_credentials_path: str = Field(default="./config/gmail_credentials.json")
+    mailbox_mirror_enabled: bool = Field(
+        default=False,
+        description="Serve inbox listings, search and sender history from a local SQLite mirror"
+    )
+    mailbox_mirror_path: str = Field(default="mailbox_mirror.sqlite3")
+    outbound_queue_enabled: bool = Field(
+        default=True,
+        description="Queue outgoing email in SQLite and deliver it in the background with retries"
+    )
+    outbound_queue_path: str = Field(default="outbound_queue.sqlite3")
+    outbound_sends_per_second: float = Field(default=2.0, gt=0.0, le=2.5)  # Gmail: 250 units/s, send = 100
+    outbound_daily_send_limit: int = Field(default=2000, ge=1)  # 500 for consumer Gmail accounts
 
     # Calendar Integration
     calendar_provider: Literal["google_calendar", "caldav", "outlook_calendar"] = Field(
         default="google_calendar"
     )
     calendar_credentials_path: str = Field(default="./config/calendar_credentials.json")
+    calendar_cache_enabled: bool = Field(
+        default=True,
+        description="Serve calendar views from a local event store synced with Calendar sync tokens"
+    )
+    calendar_cache_max_staleness_seconds: float = Field(default=60.0, ge=0.0)
+    calendar_time_zone: str = Field(
+        default="UTC",
+        description="IANA zone that working hours and calendar_block_rules are expressed in"
+    )
+    calendar_working_hours: str = Field(default="09:00-18:00", pattern=r"^\d{1,2}:\d{2}-\d{1,2}:\d{2}$")
+    calendar_travel_buffer_minutes: int = Field(
+        default=30, ge=0,
+        description="Minimum gap between meetings at different physical locations"
+    )
+    calendar_max_back_to_back: int = Field(default=3, ge=2, description="Longest acceptable run of back-to-back meetings")
 
     # Voice I/O
-    tts_provider: Literal["elevenlabs", "google_tts", "azure_tts"] = Field(
-        default="elevenlabs"
+    tts_provider: Literal["elevenlabs", "google_tts", "azure_tts", "fake"] = Field(
+        default="elevenlabs",
+        description="fake synthesizes deterministic pseudo-audio locally (tests, offline development)"
     )
     stt_provider: Literal["whisper", "google_stt", "azure_stt"] = Field(
         default="whisper"
     )
     elevenlabs_api_key: str | None = Field(default=None)
     elevenlabs_voice_id: str = Field(default="21m00Tcm4TlvDq8ikWAM")  # Default voice
+    elevenlabs_model_id: str = Field(default="eleven_monolingual_v1")
+    tts_cache_enabled: bool = Field(
+        default=True,
+        description="Keep synthesized clips on disk so repeated phrases play without a provider call"
+    )
+    tts_cache_dir: str = Field(default="tts_cache")
+    tts_cache_max_mb: int = Field(default=256, ge=1)
 
     # LLM Configuration
     llm_provider: Literal["openai", "anthropic", "azure_openai"] = Field(
@@ -88,6 +178,15 @@ class SystemSettings(BaseModel):
     api_port: int = Field(default=8000, ge=1000, le=65535)
     websocket_enabled: bool = Field(default=True)
 
+    @model_validator(mode="after")
+    def _resolve_data_paths(self) -> "SystemSettings":
+        """Anchor relative store paths to data_dir; absolute paths and :memory: are kept"""
+        for name in DATA_PATH_FIELDS:
+            value = getattr(self, name)
+            if value != ":memory:" and not os.path.isabs(value):
+                object.__setattr__(self, name, os.path.join(self.data_dir, value))
+        return self
+
     class Config:
         env_file = ".env"
         env_prefix = "VOICE_AGENT_"
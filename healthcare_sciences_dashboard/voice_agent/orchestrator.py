@@ -3,14 +3,43 @@ Voice Agent Orchestrator
 Main service that coordinates the voice-enabled email & calendar automation system
 """
 
-from typing import Dict, Any
+from typing import Dict, Any, AsyncIterator
 from .graph.graph_builder import create_voice_agent_graph
 from .graph.state import VoiceAgentState
 from .models.settings import SystemSettings
 from .adapters.email.factory import EmailAdapterFactory
+from .adapters.email.outbound_queue import OutboundEmailQueue
 from .adapters.calendar.google_calendar_adapter import GoogleCalendarAdapter
+from .adapters.calendar.cached_adapter import CachedCalendarAdapter
+from .adapters.calendar.availability import AvailabilityEngine
+from .adapters.calendar.conflicts import ConflictDetector
+from .adapters.tts import BaseTTSAdapter, create_tts_adapter
+from .agents.context_agent import ContextRetrievalAgent
+from .storage.session_store import InMemorySessionStore, SessionStore, SQLiteSessionStore, session_record
+from .storage.auth_code_store import AuthCodeStore, InMemoryAuthCodeStore, SQLiteAuthCodeStore
+from .storage.audit_log import AuditLogWriter, SQLiteAuditLog
+from .utils.log_broker import LogBroker
+import re
+import time
 import uuid
-from datetime import datetime
+
+
+# Cheap keyword signals used to pick speculative context prefetches
+_EMAIL_SIGNAL_RE = re.compile(r"\b(inbox|e-?mails?|mail|messages?|repl(y|ies)|unread|sender|thread|draft)\b")
+_CALENDAR_SIGNAL_RE = re.compile(r"\b(calendar|meetings?|schedule|agenda|invite|free|busy|today|tomorrow|week)\b")
+_NO_CONTEXT_SIGNAL_RE = re.compile(r"\b(settings?|configure|change your)\b")
+
+# Graph node -> event type yielded by stream_query when it finishes
+STREAM_EVENTS = {
+    "classify_intent": "intent",
+    "retrieve_context": "context",
+    "reason": "reasoning",
+    "generate_drafts": "drafts",
+    "check_authorization": "authorization",
+    "execute_actions": "execution",
+    "generate_response": "response",
+    "log_actions": "logged"
+}
 
 
 class VoiceAgentOrchestrator:
@@ -25,15 +54,45 @@ class VoiceAgentOrchestrator:
         # Initialize adapters FIRST (before creating graph)
         self.email_adapter = self._create_email_adapter()
         self.calendar_adapter = self._create_calendar_adapter()
+        self.outbound_queue = self._create_outbound_queue()
+
+        # Context agent is shared with the graph so process_query can hand it
+        # speculative prefetches started alongside intent classification
+        self.availability_engine = self._create_availability_engine()
+        self.conflict_detector = ConflictDetector(
+            travel_buffer_minutes=self.settings.calendar_travel_buffer_minutes,
+            max_back_to_back=self.settings.calendar_max_back_to_back
+        )
+        self.auth_code_store = self._create_auth_code_store()
+        self.audit_log = self._create_audit_log()
+        self.log_broker = LogBroker(
+            queue_size=self.settings.realtime_log_queue_size,
+            history_size=self.settings.realtime_log_history
+        ) if self.settings.realtime_logs else None
+        self.context_agent = ContextRetrievalAgent(
+            email_adapter=self.email_adapter,
+            calendar_adapter=self.calendar_adapter,
+            availability_engine=self.availability_engine,
+            conflict_detector=self.conflict_detector
+        )
 
         # Create graph WITH adapters so they're passed to Context and Execution agents
         self.graph = create_voice_agent_graph(
             email_adapter=self.email_adapter,
-            calendar_adapter=self.calendar_adapter
+            calendar_adapter=self.calendar_adapter,
+            context_agent=self.context_agent,
+            outbound_queue=self.outbound_queue,
+            conflict_detector=self.conflict_detector,
+            auth_code_store=self.auth_code_store,
+            audit_log=self.audit_log,
+            log_broker=self.log_broker
         )
 
-        # Session management (in production, use Redis or database)
-        self.sessions: Dict[str, Dict[str, Any]] = {}
+        # Bounded session records (compact state projections, not whole states)
+        self.session_store = self._create_session_store()
+
+        # Speech synthesis for /tts, behind the on-disk audio cache
+        self.tts_adapter = self._create_tts_adapter()
 
     def _create_email_adapter(self):
         """Create email adapter based on settings using factory pattern"""
@@ -41,7 +100,8 @@ class VoiceAgentOrchestrator:
             return EmailAdapterFactory.create(
                 provider=self.settings.email_provider,
                 credentials_path=self.settings.gmail_credentials_path,
-                use_mock=False  # Set to True for testing without real email
+                use_mock=False,  # Set to True for testing without real email
+                mirror_path=self.settings.mailbox_mirror_path if self.settings.mailbox_mirror_enabled else None
             )
         except Exception as e:
             print(f"⚠️  Failed to create email adapter: {e}")
@@ -51,58 +111,169 @@ class VoiceAgentOrchestrator:
                 use_mock=True  # Fall back to mock mode
             )
 
+    def _create_outbound_queue(self) -> OutboundEmailQueue | None:
+        """Durable send queue in front of the email adapter (None sends inline)"""
+        if not self.settings.outbound_queue_enabled:
+            return None
+        try:
+            return OutboundEmailQueue(
+                self.email_adapter,
+                db_path=self.settings.outbound_queue_path,
+                sends_per_second=self.settings.outbound_sends_per_second,
+                daily_send_limit=self.settings.outbound_daily_send_limit
+            )
+        except Exception as e:
+            print(f"⚠️  Failed to open outbound email queue, sending inline: {e}")
+            return None
+
+    def _create_session_store(self) -> SessionStore:
+        """Session store from settings (SQLite when configured, else in-memory LRU)"""
+        if self.settings.session_store_backend == "sqlite":
+            try:
+                return SQLiteSessionStore(
+                    self.settings.session_store_path,
+                    max_sessions=self.settings.session_max_entries,
+                    ttl_seconds=self.settings.session_ttl_seconds
+                )
+            except Exception as e:
+                print(f"⚠️  Failed to open session store, keeping sessions in memory: {e}")
+        return InMemorySessionStore(
+            max_sessions=self.settings.session_max_entries,
+            ttl_seconds=self.settings.session_ttl_seconds
+        )
+
+    def _create_auth_code_store(self) -> AuthCodeStore:
+        """Authorization code store from settings (SQLite when configured, else in-memory)"""
+        options = {
+            "code_length": self.settings.auth_code_length,
+            "expiry_minutes": self.settings.auth_code_expiry_minutes
+        }
+        if self.settings.auth_code_store_backend == "sqlite":
+            try:
+                return SQLiteAuthCodeStore(self.settings.auth_code_store_path, **options)
+            except Exception as e:
+                print(f"⚠️  Failed to open authorization code store, keeping codes in memory: {e}")
+        return InMemoryAuthCodeStore(**options)
+
+    def _create_audit_log(self) -> AuditLogWriter | None:
+        """Batched audit log writer (None keeps logs in the logging agent's buffer)"""
+        if not self.settings.audit_log_enabled:
+            return None
+        try:
+            store = SQLiteAuditLog(
+                self.settings.audit_log_path,
+                archive_dir=self.settings.audit_log_archive_dir,
+                max_rows=self.settings.audit_log_max_rows
+            )
+        except Exception as e:
+            print(f"⚠️  Failed to open audit log, keeping logs in memory: {e}")
+            return None
+        return AuditLogWriter(
+            store,
+            batch_size=self.settings.audit_log_batch_size,
+            flush_interval_seconds=self.settings.audit_log_flush_seconds
+        )
+
+    def _create_tts_adapter(self) -> BaseTTSAdapter | None:
+        """TTS provider from settings, wrapped in the audio cache (None when not configured)"""
+        return create_tts_adapter(self.settings)
+
     def _create_calendar_adapter(self):
         """Create calendar adapter based on settings"""
         provider = self.settings.calendar_provider
         if provider == "google_calendar":
-            return GoogleCalendarAdapter(credentials_path=self.settings.calendar_credentials_path)
+            adapter = GoogleCalendarAdapter(credentials_path=self.settings.calendar_credentials_path)
+            if self.settings.calendar_cache_enabled:
+                # Serve day/week views from a local, incrementally synced store
+                return CachedCalendarAdapter(
+                    adapter,
+                    max_staleness_seconds=self.settings.calendar_cache_max_staleness_seconds
+                )
+            return adapter
         # TODO: Add other providers (CalDAV, Outlook)
         return None
 
-    async def process_query(
-        self,
-        query: str,
-        mode: str = "text",
-        user_id: str | None = None,
-        session_id: str | None = None,
-        authorization_code: str | None = None
-    ) -> Dict[str, Any]:
-        """
-        Process a user query through the voice agent system.
+    def _create_availability_engine(self) -> AvailabilityEngine:
+        """Slot finder applying calendar_block_rules and working hours"""
+        working_hours = tuple(self.settings.calendar_working_hours.split("-"))
+        try:
+            return AvailabilityEngine(
+                block_rules=self.settings.calendar_block_rules,
+                time_zone=self.settings.calendar_time_zone,
+                working_hours=working_hours
+            )
+        except Exception as e:
+            print(f"⚠️  Invalid calendar availability settings, ignoring block rules: {e}")
+            return AvailabilityEngine(working_hours=working_hours)
 
-        Args:
-            query: User's natural language query or command
-            mode: Interaction mode ("voice" or "text")
-            user_id: Optional user identifier
-            session_id: Optional session identifier (for continuing conversations)
-            authorization_code: Optional authorization code for executing actions
+    def _predict_prefetch_sources(self, query: str) -> list[str]:
+        """
+        Guess which context sources the query will need, from keywords only.
 
-        Returns:
-            Response dictionary with results, drafts, logs, etc.
+        Almost every intent reads the inbox or today's calendar, so a query
+        with no clear signal prefetches both; configuration requests
+        prefetch nothing.
         """
+        text = query.lower()
+        if _NO_CONTEXT_SIGNAL_RE.search(text):
+            return []
 
-        # Create or retrieve session
-        if not session_id:
-            session_id = f"session_{uuid.uuid4().hex[:12]}"
+        wants_email = bool(_EMAIL_SIGNAL_RE.search(text))
+        wants_calendar = bool(_CALENDAR_SIGNAL_RE.search(text))
+        if not wants_email and not wants_calendar:
+            return ["email_threads", "calendar_events"]
+
+        sources = []
+        if wants_email:
+            sources.append("email_threads")
+        if wants_calendar:
+            sources.append("calendar_events")
+        return sources
+
+    def get_prefetch_stats(self) -> Dict[str, Any]:
+        """Speculative prefetch counters and hit rates per context source"""
+        return self.context_agent.get_prefetch_stats()
+
+    def _start_run(
+        self,
+        query: str,
+        mode: str,
+        user_id: str | None,
+        session_id: str,
+        authorization_code: str | None
+    ) -> VoiceAgentState:
+        """Initial pipeline state for one query, with its context prefetches started"""
+        # Start likely context fetches now so they overlap intent classification
+        prefetch_key = f"{session_id}:{uuid.uuid4().hex[:8]}"
+        self.context_agent.start_prefetch(
+            prefetch_key,
+            query,
+            self._predict_prefetch_sources(query)
+        )
 
         # Initialize state
-        initial_state: VoiceAgentState = {
+        return {
             "user_query": query,
             "interaction_mode": mode,
             "session_id": session_id,
             "user_id": user_id,
+            "prefetch_key": prefetch_key,
             "intent": "unknown",
             "confidence": 0.0,
+            "intent_source": "",
             "email_threads": [],
             "calendar_events": [],
             "sender_history": {},
             "availability_slots": [],
+            "calendar_conflicts": {},
             "follow_up_tasks": [],
+            "context_status": {},
             "priority_assessment": {},
             "recommended_action": "",
             "reasoning": "",
             "email_drafts": [],
             "calendar_actions": [],
+            "bulk_actions": [],
             "follow_ups": [],
             "requires_authorization": False,
             "authorization_code": authorization_code,
@@ -113,20 +284,45 @@ class VoiceAgentOrchestrator:
             "voice_response": "",
             "text_response": "",
             "final_response": {},
+            "response_ready": False,
             "error": None,
             "retry_count": 0
         }
 
+    async def process_query(
+        self,
+        query: str,
+        mode: str = "text",
+        user_id: str | None = None,
+        session_id: str | None = None,
+        authorization_code: str | None = None
+    ) -> Dict[str, Any]:
+        """
+        Process a user query through the voice agent system.
+
+        Args:
+            query: User's natural language query or command
+            mode: Interaction mode ("voice" or "text")
+            user_id: Optional user identifier
+            session_id: Optional session identifier (for continuing conversations)
+            authorization_code: Optional authorization code for executing actions
+
+        Returns:
+            Response dictionary with results, drafts, logs, etc.
+        """
+
+        # Create or retrieve session
+        if not session_id:
+            session_id = f"session_{uuid.uuid4().hex[:12]}"
+        initial_state = self._start_run(query, mode, user_id, session_id, authorization_code)
+        prefetch_key = initial_state["prefetch_key"]
+
         # Execute the LangGraph workflow
         try:
             result_state = await self.graph.ainvoke(initial_state)
 
             # Store session for continuity
-            self.sessions[session_id] = {
-                "last_activity": datetime.utcnow().isoformat(),
-                "state": result_state,
-                "user_id": user_id
-            }
+            self.session_store.put(session_id, session_record(result_state, user_id))
 
             return result_state["final_response"]
 
@@ -141,9 +337,125 @@ class VoiceAgentOrchestrator:
                 "logs": []
             }
 
+        finally:
+            # Cancel prefetches the run never consumed (e.g. config intents or errors)
+            self.context_agent.discard_prefetch(prefetch_key)
+
+    async def stream_query(
+        self,
+        query: str,
+        mode: str = "voice",
+        user_id: str | None = None,
+        session_id: str | None = None,
+        authorization_code: str | None = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Process a query, yielding events as each pipeline step finishes.
+
+        Yields ``started``, then one event per graph node (``intent``,
+        ``context``, ``reasoning``, ``drafts``, ``authorization``,
+        ``execution``, ``response``, ``logged``), ``token`` events while the
+        response model is generating, and finally ``final`` with the same
+        response process_query returns (or ``error``). Every event carries
+        elapsed_ms since the query started. Closing or cancelling the
+        iterator stops the run and its prefetches.
+        """
+        if not session_id:
+            session_id = f"session_{uuid.uuid4().hex[:12]}"
+        initial_state = self._start_run(query, mode, user_id, session_id, authorization_code)
+        started = time.perf_counter()
+
+        def event(event_type: str, **fields: Any) -> Dict[str, Any]:
+            return {"type": event_type, "elapsed_ms": round((time.perf_counter() - started) * 1000, 1), **fields}
+
+        yield event("started", session_id=session_id)
+        result_state = initial_state
+        try:
+            async for stream_mode, payload in self.graph.astream(
+                initial_state, stream_mode=["updates", "messages", "values"]
+            ):
+                if stream_mode == "values":
+                    result_state = payload
+                elif stream_mode == "messages":
+                    chunk, metadata = payload
+                    # Only the user-facing response is worth speaking early
+                    if metadata.get("langgraph_node") == "generate_response" and chunk.content:
+                        yield event("token", text=chunk.content)
+                else:
+                    for node, update in payload.items():
+                        if node in STREAM_EVENTS and update:
+                            yield event(STREAM_EVENTS[node], **self._stream_fields(node, update))
+
+            self.session_store.put(session_id, session_record(result_state, user_id))
+            yield event("final", response=result_state["final_response"])
+
+        except Exception as e:
+            yield event("error", error=str(e), text=f"I encountered an error processing your request: {str(e)}")
+
+        finally:
+            self.context_agent.discard_prefetch(initial_state["prefetch_key"])
+
+    def _stream_fields(self, node: str, update: Dict[str, Any]) -> Dict[str, Any]:
+        """Compact payload for a node's stream event (counts and ids, not fetched bodies)"""
+        if node == "classify_intent":
+            return {key: update.get(key) for key in ("intent", "confidence", "intent_source")}
+        if node == "retrieve_context":
+            return {
+                "email_count": len(update.get("email_threads", [])),
+                "event_count": len(update.get("calendar_events", [])),
+                "has_conflicts": bool(update.get("calendar_conflicts", {}).get("has_conflicts")),
+                "context_status": update.get("context_status", {})
+            }
+        if node == "reason":
+            fields = {"recommended_action": update.get("recommended_action", "")}
+            # Read-only intents are answered here; this is the reply to speak
+            if update.get("response_ready"):
+                fields["text"] = update.get("text_response", "")
+            return fields
+        if node == "generate_drafts":
+            return {key: update.get(key, []) for key in ("email_drafts", "calendar_actions", "bulk_actions")}
+        if node == "check_authorization":
+            return {
+                "requires_authorization": update.get("requires_authorization", False),
+                "pending_actions": update.get("pending_actions", []),
+                "error": update.get("error")
+            }
+        if node == "execute_actions":
+            return {"executed": update.get("executed_actions", [])}
+        if node == "generate_response":
+            return {"text": update.get("text_response", "")}
+        return {"log_count": len(update.get("action_logs", []))}
+
     async def get_session(self, session_id: str) -> Dict[str, Any] | None:
         """Retrieve a session by ID"""
-        return self.sessions.get(session_id)
+        return self.session_store.get(session_id)
+
+    def get_session_stats(self) -> Dict[str, Any]:
+        """Session store size and eviction counters"""
+        return self.session_store.stats()
+
+    def get_auth_code_stats(self) -> Dict[str, Any]:
+        """Live authorization codes and issue/verify/expiry counters"""
+        return self.auth_code_store.stats()
+
+    def query_activity(self, **filters: Any) -> list[Dict[str, Any]]:
+        """Audit log entries for the activity feed (see SQLiteAuditLog.query)"""
+        if self.audit_log is None:
+            return []
+        return self.audit_log.store.query(**filters)
+
+    def get_audit_log_stats(self) -> Dict[str, Any]:
+        """Audit log queue depth, write counters and rotation state"""
+        if self.audit_log is None:
+            return {"enabled": False}
+        return {"enabled": True, **self.audit_log.stats()}
+
+    async def shutdown(self) -> None:
+        """Flush queued audit log entries and stop background workers"""
+        if self.audit_log is not None:
+            await self.audit_log.stop()
+        if self.outbound_queue is not None:
+            await self.outbound_queue.stop()
 
     async def summarize_inbox(self, user_id: str | None = None) -> Dict[str, Any]:
         """
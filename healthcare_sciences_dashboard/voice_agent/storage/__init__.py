@@ -0,0 +1,20 @@
+"""
+Storage Package
+Bounded, optionally persistent stores for pipeline state shared across requests
+"""
+
+from .session_store import SessionStore, InMemorySessionStore, SQLiteSessionStore, session_record
+from .auth_code_store import AuthCodeStore, InMemoryAuthCodeStore, SQLiteAuthCodeStore
+from .audit_log import SQLiteAuditLog, AuditLogWriter
+
+__all__ = [
+    "SessionStore",
+    "InMemorySessionStore",
+    "SQLiteSessionStore",
+    "session_record",
+    "AuthCodeStore",
+    "InMemoryAuthCodeStore",
+    "SQLiteAuthCodeStore",
+    "SQLiteAuditLog",
+    "AuditLogWriter"
+]
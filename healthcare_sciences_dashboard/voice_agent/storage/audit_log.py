@@ -0,0 +1,357 @@
+"""
+Audit log
+Append-only record of every action the pipeline logs. Entries are queued
+by the logging node without blocking, written to SQLite in batches by a
+background task, and queried by the dashboard activity feed.
+
+Usage:
+    store = SQLiteAuditLog("./data/audit_log.sqlite3", archive_dir="./data/audit_archive")
+    writer = AuditLogWriter(store, batch_size=200, flush_interval_seconds=2.0)
+    writer.enqueue(state["action_logs"])    # returns immediately
+    store.query(user_id="u1", object_type="email", since="2025-01-01T00:00:00", limit=50)
+    await writer.stop()                      # flushes whatever is still queued
+"""
+
+from __future__ import annotations
+
+import asyncio
+import gzip
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Iterable, Iterator
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS audit_logs (
+    seq INTEGER PRIMARY KEY,
+    log_id TEXT NOT NULL UNIQUE,
+    ts REAL NOT NULL,
+    user_id TEXT,
+    object_type TEXT NOT NULL,
+    action TEXT NOT NULL,
+    status TEXT,
+    payload TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_audit_user_ts ON audit_logs(user_id, ts);
+CREATE INDEX IF NOT EXISTS idx_audit_object_ts ON audit_logs(object_type, ts);
+CREATE INDEX IF NOT EXISTS idx_audit_ts ON audit_logs(ts);
+CREATE TRIGGER IF NOT EXISTS audit_logs_append_only BEFORE UPDATE ON audit_logs
+BEGIN
+    SELECT RAISE(ABORT, 'audit log is append-only');
+END;
+"""
+
+# Largest page the activity feed may request
+MAX_QUERY_LIMIT = 500
+
+
+def _timestamp(value: datetime | str | float | None) -> float | None:
+    """Epoch seconds for a datetime, ISO string or number; naive values are UTC"""
+    if value is None or isinstance(value, (int, float)):
+        return value
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+def _entry_timestamp(entry: dict[str, Any]) -> float:
+    try:
+        return _timestamp(entry.get("timestamp")) or time.time()
+    except (TypeError, ValueError):
+        return time.time()
+
+
+class SQLiteAuditLog:
+    """
+    Append-only audit log in SQLite, indexed for the activity feed.
+
+    Rows are never updated (a trigger rejects it) and appends are
+    idempotent on log_id, so a batch retried after a failed flush is not
+    written twice. When max_rows is set and archive_dir is given, the
+    oldest rows are rotated out in chunks into gzip-compressed JSONL
+    archives (audit-<first_seq>-<last_seq>.jsonl.gz) before being removed
+    from the table; queries only cover the live table.
+    """
+
+    def __init__(
+        self,
+        db_path: str = ":memory:",
+        archive_dir: str | None = None,
+        max_rows: int | None = 500000,
+        rotate_fraction: float = 0.1
+    ):
+        self.db_path = db_path
+        self.archive_dir = Path(archive_dir) if archive_dir else None
+        self.max_rows = max_rows if archive_dir else None
+        # Rotating a tenth of the table at a time keeps rotations rare
+        self.rotate_rows = max(1, int((max_rows or 0) * rotate_fraction))
+        self.rotations = 0
+        self.archived_rows = 0
+
+        if db_path != ":memory:":
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        if self.archive_dir:
+            self.archive_dir.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            if db_path != ":memory:":
+                self._conn.execute("PRAGMA journal_mode=WAL")
+                self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(SCHEMA)
+            self._rows = self._conn.execute("SELECT COUNT(*) FROM audit_logs").fetchone()[0]
+
+    def append(self, entries: Iterable[dict[str, Any]]) -> int:
+        """Write a batch in one transaction; returns how many were new"""
+        rows = [
+            (
+                entry["log_id"],
+                _entry_timestamp(entry),
+                entry.get("user_id"),
+                entry.get("object_type", "summary"),
+                entry.get("action", ""),
+                (entry.get("status") or {}).get("status"),
+                json.dumps(entry, default=str)
+            )
+            for entry in entries
+        ]
+        with self._lock:
+            with self._conn:
+                before = self._conn.total_changes
+                self._conn.executemany(
+                    "INSERT INTO audit_logs (log_id, ts, user_id, object_type, action, status, payload) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?) ON CONFLICT(log_id) DO NOTHING",
+                    rows
+                )
+                written = self._conn.total_changes - before
+            self._rows += written
+            if self.max_rows is not None and self._rows > self.max_rows:
+                self._rotate(self._rows - self.max_rows + self.rotate_rows)
+        return written
+
+    def query(
+        self,
+        user_id: str | None = None,
+        object_type: str | None = None,
+        since: datetime | str | float | None = None,
+        until: datetime | str | float | None = None,
+        before_seq: int | None = None,
+        limit: int = 50
+    ) -> list[dict[str, Any]]:
+        """
+        Newest-first (in write order) entries matching every given filter.
+
+        Each entry carries its ``seq``; pass the last one as before_seq to
+        fetch the next page.
+        """
+        clauses, params = [], []
+        for column, value in (("user_id", user_id), ("object_type", object_type)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if since is not None:
+            clauses.append("ts >= ?")
+            params.append(_timestamp(since))
+        if until is not None:
+            clauses.append("ts < ?")
+            params.append(_timestamp(until))
+        if before_seq is not None:
+            clauses.append("seq < ?")
+            params.append(before_seq)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        params.append(max(1, min(limit, MAX_QUERY_LIMIT)))
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT seq, payload FROM audit_logs {where} ORDER BY seq DESC LIMIT ?", params
+            ).fetchall()
+        return [{**json.loads(payload), "seq": seq} for seq, payload in rows]
+
+    def archives(self) -> list[Path]:
+        """Rotated archive files, oldest first"""
+        if not self.archive_dir:
+            return []
+        return sorted(
+            self.archive_dir.glob("audit-*.jsonl.gz"),
+            key=lambda path: int(path.name.split("-")[1])
+        )
+
+    @staticmethod
+    def read_archive(path: str | Path) -> Iterator[dict[str, Any]]:
+        """Entries of one rotated archive, in write order"""
+        with gzip.open(path, "rt", encoding="utf-8") as archive:
+            for line in archive:
+                yield json.loads(line)
+
+    def stats(self) -> dict[str, Any]:
+        archives = self.archives()
+        return {
+            "backend": "sqlite",
+            "rows": self._rows,
+            "max_rows": self.max_rows,
+            "rotations": self.rotations,
+            "archived_rows": self.archived_rows,
+            "archives": len(archives),
+            "archive_bytes": sum(path.stat().st_size for path in archives)
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _rotate(self, count: int) -> None:
+        """Move the oldest ``count`` rows into a compressed archive (lock held)"""
+        rows = self._conn.execute(
+            "SELECT seq, payload FROM audit_logs ORDER BY seq LIMIT ?", (count,)
+        ).fetchall()
+        if not rows:
+            return
+        first_seq, last_seq = rows[0][0], rows[-1][0]
+        path = self.archive_dir / f"audit-{first_seq}-{last_seq}.jsonl.gz"
+        partial = path.with_name(path.name + ".partial")
+        with gzip.open(partial, "wt", encoding="utf-8") as archive:
+            for _, payload in rows:
+                archive.write(payload + "\n")
+        # The archive is in place before its rows leave the table; a crash
+        # in between leaves them in both rather than in neither
+        os.replace(partial, path)
+        with self._conn:
+            removed = self._conn.execute("DELETE FROM audit_logs WHERE seq <= ?", (last_seq,)).rowcount
+        self._rows -= removed
+        self.archived_rows += removed
+        self.rotations += 1
+
+
+class AuditLogWriter:
+    """
+    Non-blocking front end to an audit log store.
+
+    enqueue() only appends to an in-memory queue. A background task
+    (started on first use on the running loop) writes the queue in
+    batches off the event loop, as soon as batch_size entries are waiting
+    or flush_interval_seconds after the last flush. A failed write keeps
+    the batch queued for the next attempt; past max_pending the oldest
+    queued entries are dropped and counted. stop() (or close() outside a
+    loop) writes everything still queued.
+    """
+
+    def __init__(
+        self,
+        store: SQLiteAuditLog,
+        batch_size: int = 200,
+        flush_interval_seconds: float = 2.0,
+        max_pending: int = 50000
+    ):
+        self.store = store
+        self.batch_size = batch_size
+        self.flush_interval_seconds = flush_interval_seconds
+        self.max_pending = max_pending
+        self.enqueued = 0
+        self.written = 0
+        self.dropped = 0
+        self.flushes = 0
+        self.failures = 0
+        self.last_error: str | None = None
+
+        self._pending: deque[dict[str, Any]] = deque()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._task: asyncio.Task | None = None
+        self._wakeup: asyncio.Event | None = None
+        self._flush_lock: asyncio.Lock | None = None
+
+    def enqueue(self, entries: Iterable[dict[str, Any]]) -> None:
+        """Queue entries for the next batch; never waits on storage"""
+        before = len(self._pending)
+        self._pending.extend(entries)
+        self.enqueued += len(self._pending) - before
+        overflow = len(self._pending) - self.max_pending
+        for _ in range(max(0, overflow)):
+            self._pending.popleft()
+        self.dropped += max(0, overflow)
+
+        try:
+            self.ensure_started()
+        except RuntimeError:
+            # No running loop: entries wait for close()
+            return
+        if len(self._pending) >= self.batch_size:
+            self._wakeup.set()
+
+    def ensure_started(self) -> None:
+        """Start the writer task on the running event loop (idempotent)"""
+        loop = asyncio.get_running_loop()
+        if loop is self._loop and self._task is not None and not self._task.done():
+            return
+        self._loop = loop
+        self._wakeup = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._task = loop.create_task(self._run())
+
+    async def flush(self) -> None:
+        """Write everything queued so far"""
+        if self._flush_lock is None:
+            self._flush_lock = asyncio.Lock()
+        async with self._flush_lock:
+            while self._pending:
+                batch = [self._pending.popleft() for _ in range(min(self.batch_size, len(self._pending)))]
+                try:
+                    self.written += await asyncio.to_thread(self.store.append, batch)
+                    self.flushes += 1
+                except Exception as e:
+                    # Keep the batch, in order, for the next attempt
+                    self._pending.extendleft(reversed(batch))
+                    self.failures += 1
+                    self.last_error = str(e)
+                    print(f"Audit log flush failed, {len(self._pending)} entries still queued: {e}")
+                    return
+
+    async def stop(self) -> None:
+        """Stop the writer task and flush what is still queued"""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        await self.flush()
+
+    def close(self) -> None:
+        """Synchronous shutdown: write what is queued and close the store"""
+        if self._pending:
+            batch = list(self._pending)
+            self._pending.clear()
+            self.written += self.store.append(batch)
+            self.flushes += 1
+        self.store.close()
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "pending": len(self._pending),
+            "enqueued": self.enqueued,
+            "written": self.written,
+            "dropped": self.dropped,
+            "flushes": self.flushes,
+            "failures": self.failures,
+            "last_error": self.last_error,
+            "batch_size": self.batch_size,
+            "flush_interval_seconds": self.flush_interval_seconds,
+            "writer_running": self._task is not None and not self._task.done(),
+            **self.store.stats()
+        }
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval_seconds)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+
+
+__all__ = ["SQLiteAuditLog", "AuditLogWriter"]
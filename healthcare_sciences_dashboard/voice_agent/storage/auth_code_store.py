@@ -0,0 +1,373 @@
+"""
+Authorization code stores
+Hold the one-time codes that confirm drafted actions, indexed by action id
+and by session. Used codes are removed at once and expired ones are swept
+by expiry order, so memory stays flat however many actions are proposed.
+InMemoryAuthCodeStore sweeps with a min-heap on expires_at;
+SQLiteAuthCodeStore keeps codes across restarts and shares them between
+workers, sweeping through an index on expires_at.
+
+Usage:
+    store = InMemoryAuthCodeStore(code_length=4, expiry_minutes=10)
+    code = store.issue("draft_1a2b", "send_email", session_id="session_x")
+    store.verify("1234", ["draft_1a2b"])   # -> "draft_1a2b" once, then None
+"""
+
+from __future__ import annotations
+
+import heapq
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable
+
+from ..models.auth_models import AuthorizationCode
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS auth_codes (
+    action_id TEXT PRIMARY KEY,
+    session_id TEXT,
+    action_type TEXT NOT NULL,
+    code TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    expires_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_auth_codes_session ON auth_codes(session_id);
+CREATE INDEX IF NOT EXISTS idx_auth_codes_expiry ON auth_codes(expires_at);
+"""
+
+
+def _utc(timestamp: float) -> datetime:
+    """Naive UTC datetime, as AuthorizationCode stores times"""
+    return datetime.fromtimestamp(timestamp, timezone.utc).replace(tzinfo=None)
+
+
+def _timestamp(value: datetime) -> float:
+    return value.replace(tzinfo=timezone.utc).timestamp()
+
+
+class AuthCodeStore(ABC):
+    """
+    Issued authorization codes by action id.
+
+    Codes are single use: a successful verify() removes the code. A wrong
+    code counts as an attempt against every candidate action; a code that
+    reaches max_attempts is revoked.
+    """
+
+    def __init__(
+        self,
+        code_length: int = 4,
+        expiry_minutes: int = 10,
+        max_attempts: int = 3,
+        clock: Callable[[], float] = time.time
+    ):
+        self.code_length = code_length
+        self.expiry_seconds = expiry_minutes * 60
+        self.max_attempts = max_attempts
+        self._clock = clock
+        self.issued = 0
+        self.verified = 0
+        self.rejected = 0
+        self.expired = 0
+        self.revoked = 0
+
+    def _new_code(self, action_id: str, action_type: str) -> AuthorizationCode:
+        now = self._clock()
+        code = AuthorizationCode.generate(action_id=action_id, action_type=action_type, code_length=self.code_length)
+        code.created_at = _utc(now)
+        code.expires_at = _utc(now + self.expiry_seconds)
+        code.max_attempts = self.max_attempts
+        return code
+
+    @abstractmethod
+    def issue(self, action_id: str, action_type: str, session_id: str | None = None) -> AuthorizationCode:
+        """The live code for an action, generating one if there is none"""
+        pass
+
+    @abstractmethod
+    def get(self, action_id: str) -> AuthorizationCode | None:
+        """The live (unused, unexpired) code for an action"""
+        pass
+
+    @abstractmethod
+    def verify(self, input_code: str, action_ids: list[str]) -> str | None:
+        """Consume the code of whichever candidate action it matches; returns that action id"""
+        pass
+
+    @abstractmethod
+    def revoke(self, action_id: str) -> None:
+        pass
+
+    @abstractmethod
+    def pending_for_session(self, session_id: str) -> list[str]:
+        """Action ids with live codes issued in a session"""
+        pass
+
+    @abstractmethod
+    def sweep(self) -> int:
+        """Remove expired codes; returns how many were removed"""
+        pass
+
+    @abstractmethod
+    def __len__(self) -> int:
+        pass
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "active_codes": len(self),
+            "issued": self.issued,
+            "verified": self.verified,
+            "rejected": self.rejected,
+            "expired": self.expired,
+            "revoked": self.revoked
+        }
+
+    def close(self) -> None:
+        pass
+
+
+class InMemoryAuthCodeStore(AuthCodeStore):
+    """
+    Per-process code store.
+
+    A min-heap of (expires_at, action_id) drives sweeps: each one pops
+    only codes that have expired, O(log n) apiece. Heap entries of codes
+    already used or revoked are skipped when popped, and the heap is
+    rebuilt if such stale entries come to outnumber live codes.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self._codes: dict[str, AuthorizationCode] = {}
+        self._expiry: dict[str, float] = {}
+        self._session_of: dict[str, str] = {}
+        self._by_session: dict[str, set[str]] = {}
+        self._heap: list[tuple[float, str]] = []
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._codes)
+
+    def _remove(self, action_id: str) -> None:
+        self._codes.pop(action_id, None)
+        self._expiry.pop(action_id, None)
+        session_id = self._session_of.pop(action_id, None)
+        if session_id is not None:
+            actions = self._by_session[session_id]
+            actions.discard(action_id)
+            if not actions:
+                del self._by_session[session_id]
+
+    def _sweep(self, now: float) -> int:
+        removed = 0
+        while self._heap and self._heap[0][0] <= now:
+            expires_at, action_id = heapq.heappop(self._heap)
+            if self._expiry.get(action_id) == expires_at:
+                self._remove(action_id)
+                removed += 1
+        if len(self._heap) > 2 * len(self._codes) + 64:
+            self._heap = [(expires_at, action_id) for action_id, expires_at in self._expiry.items()]
+            heapq.heapify(self._heap)
+        self.expired += removed
+        return removed
+
+    def sweep(self) -> int:
+        with self._lock:
+            return self._sweep(self._clock())
+
+    def issue(self, action_id: str, action_type: str, session_id: str | None = None) -> AuthorizationCode:
+        with self._lock:
+            self._sweep(self._clock())
+            if action_id in self._codes:
+                return self._codes[action_id]
+            code = self._new_code(action_id, action_type)
+            expires_at = _timestamp(code.expires_at)
+            self._codes[action_id] = code
+            self._expiry[action_id] = expires_at
+            heapq.heappush(self._heap, (expires_at, action_id))
+            if session_id is not None:
+                self._session_of[action_id] = session_id
+                self._by_session.setdefault(session_id, set()).add(action_id)
+            self.issued += 1
+            return code
+
+    def get(self, action_id: str) -> AuthorizationCode | None:
+        with self._lock:
+            self._sweep(self._clock())
+            return self._codes.get(action_id)
+
+    def verify(self, input_code: str, action_ids: list[str]) -> str | None:
+        with self._lock:
+            self._sweep(self._clock())
+            candidates = [self._codes[a] for a in dict.fromkeys(action_ids) if a in self._codes]
+            for code in candidates:
+                if code.code == input_code:
+                    code.is_used = True
+                    code.used_at = _utc(self._clock())
+                    self._remove(code.action_id)
+                    self.verified += 1
+                    return code.action_id
+            for code in candidates:
+                code.attempts += 1
+                if code.attempts >= code.max_attempts:
+                    self._remove(code.action_id)
+                    self.revoked += 1
+            self.rejected += 1
+            return None
+
+    def revoke(self, action_id: str) -> None:
+        with self._lock:
+            if action_id in self._codes:
+                self._remove(action_id)
+                self.revoked += 1
+
+    def pending_for_session(self, session_id: str) -> list[str]:
+        with self._lock:
+            self._sweep(self._clock())
+            return sorted(self._by_session.get(session_id, ()))
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {**super().stats(), "backend": "memory", "heap_entries": len(self._heap)}
+
+
+class SQLiteAuthCodeStore(AuthCodeStore):
+    """
+    Code store in SQLite, shared by every worker using the same file.
+
+    Verification consumes a code with a conditional DELETE, so a code can
+    authorize an action once even when two workers race on it. Expired
+    rows are removed through the expires_at index, at most every
+    sweep_interval_seconds.
+    """
+
+    def __init__(self, db_path: str = ":memory:", *args: Any, sweep_interval_seconds: float = 30.0, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.db_path = db_path
+        self.sweep_interval_seconds = sweep_interval_seconds
+        self._last_sweep = 0.0
+
+        if db_path != ":memory:":
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            if db_path != ":memory:":
+                self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(SCHEMA)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM auth_codes WHERE expires_at > ?", (self._clock(),)
+            ).fetchone()[0]
+
+    def _maybe_sweep(self, now: float) -> None:
+        if now - self._last_sweep >= self.sweep_interval_seconds:
+            self._last_sweep = now
+            self.expired += self._conn.execute("DELETE FROM auth_codes WHERE expires_at <= ?", (now,)).rowcount
+
+    def sweep(self) -> int:
+        now = self._clock()
+        with self._lock, self._conn:
+            removed = self._conn.execute("DELETE FROM auth_codes WHERE expires_at <= ?", (now,)).rowcount
+            self.expired += removed
+            self._last_sweep = now
+            return removed
+
+    @staticmethod
+    def _from_row(row: sqlite3.Row) -> AuthorizationCode:
+        return AuthorizationCode(
+            code=row["code"],
+            action_id=row["action_id"],
+            action_type=row["action_type"],
+            created_at=_utc(row["created_at"]),
+            expires_at=_utc(row["expires_at"]),
+            attempts=row["attempts"],
+            max_attempts=row["max_attempts"]
+        )
+
+    def issue(self, action_id: str, action_type: str, session_id: str | None = None) -> AuthorizationCode:
+        code = self._new_code(action_id, action_type)
+        now = self._clock()
+        with self._lock, self._conn:
+            self._maybe_sweep(now)
+            # Replace only a code that has expired; a live one is returned as is
+            inserted = self._conn.execute(
+                "INSERT INTO auth_codes (action_id, session_id, action_type, code, max_attempts, created_at, expires_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(action_id) DO UPDATE SET session_id = excluded.session_id, code = excluded.code, "
+                "attempts = 0, created_at = excluded.created_at, expires_at = excluded.expires_at "
+                "WHERE auth_codes.expires_at <= ?",
+                (action_id, session_id, action_type, code.code, code.max_attempts,
+                 _timestamp(code.created_at), _timestamp(code.expires_at), now)
+            ).rowcount
+            if inserted:
+                self.issued += 1
+                return code
+            row = self._conn.execute("SELECT * FROM auth_codes WHERE action_id = ?", (action_id,)).fetchone()
+            return self._from_row(row)
+
+    def get(self, action_id: str) -> AuthorizationCode | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM auth_codes WHERE action_id = ? AND expires_at > ?", (action_id, self._clock())
+            ).fetchone()
+        return self._from_row(row) if row else None
+
+    def verify(self, input_code: str, action_ids: list[str]) -> str | None:
+        action_ids = list(dict.fromkeys(action_ids))
+        if not action_ids:
+            self.rejected += 1
+            return None
+        now = self._clock()
+        placeholders = ",".join("?" * len(action_ids))
+        with self._lock, self._conn:
+            self._maybe_sweep(now)
+            row = self._conn.execute(
+                f"DELETE FROM auth_codes WHERE action_id = ("
+                f"SELECT action_id FROM auth_codes WHERE action_id IN ({placeholders}) "
+                f"AND code = ? AND expires_at > ? LIMIT 1) RETURNING action_id",
+                (*action_ids, input_code, now)
+            ).fetchone()
+            if row is not None:
+                self.verified += 1
+                return row[0]
+            self._conn.execute(
+                f"UPDATE auth_codes SET attempts = attempts + 1 WHERE action_id IN ({placeholders})", action_ids
+            )
+            self.revoked += self._conn.execute(
+                f"DELETE FROM auth_codes WHERE action_id IN ({placeholders}) AND attempts >= max_attempts", action_ids
+            ).rowcount
+            self.rejected += 1
+            return None
+
+    def revoke(self, action_id: str) -> None:
+        with self._lock, self._conn:
+            self.revoked += self._conn.execute("DELETE FROM auth_codes WHERE action_id = ?", (action_id,)).rowcount
+
+    def pending_for_session(self, session_id: str) -> list[str]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT action_id FROM auth_codes WHERE session_id = ? AND expires_at > ? ORDER BY action_id",
+                (session_id, self._clock())
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def stats(self) -> dict[str, Any]:
+        return {**super().stats(), "backend": "sqlite"}
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+__all__ = ["AuthCodeStore", "InMemoryAuthCodeStore", "SQLiteAuthCodeStore"]
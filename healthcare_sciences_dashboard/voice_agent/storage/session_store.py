@@ -0,0 +1,284 @@
+"""
+Session stores
+Keep a compact record of each conversation's last pipeline run so sessions
+can be resumed, bounded in size and age. InMemorySessionStore is a per-process
+LRU with an idle timeout; SQLiteSessionStore survives restarts and is shared
+by workers pointing at the same file.
+
+Usage:
+    store = SQLiteSessionStore("./data/sessions.sqlite3", max_sessions=10000, ttl_seconds=86400)
+    store.put(session_id, session_record(result_state, user_id))
+    store.get(session_id)   # None once evicted or idle past the TTL
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable
+
+from ..utils.ttl_cache import TTLCache
+
+
+# Longest reasoning text kept per session
+MAX_REASONING_CHARS = 2000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    session_id TEXT PRIMARY KEY,
+    user_id TEXT,
+    payload TEXT NOT NULL,
+    size_bytes INTEGER NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_sessions_updated ON sessions(updated_at);
+"""
+
+
+def _email_ref(thread: dict[str, Any]) -> dict[str, Any]:
+    return {key: thread.get(key) for key in ("thread_id", "from", "subject")}
+
+
+def _event_ref(event: dict[str, Any]) -> dict[str, Any]:
+    return {key: event.get(key) for key in ("event_id", "title", "start", "end")}
+
+
+def session_record(state: dict[str, Any], user_id: str | None = None) -> dict[str, Any]:
+    """
+    Compact projection of a finished pipeline state.
+
+    Keeps what a follow-up turn or the authorization step needs (the
+    request, intent, recommendation, pending drafts and actions, final
+    response) and replaces fetched context with references: thread and
+    event ids instead of message bodies and full event lists.
+    """
+    final_response = state.get("final_response") or {}
+    return {
+        "last_activity": datetime.utcnow().isoformat(),
+        "user_id": user_id if user_id is not None else state.get("user_id"),
+        "state": {
+            "user_query": state.get("user_query", ""),
+            "interaction_mode": state.get("interaction_mode"),
+            "intent": state.get("intent"),
+            "confidence": state.get("confidence"),
+            "recommended_action": state.get("recommended_action", ""),
+            "reasoning": (state.get("reasoning") or "")[:MAX_REASONING_CHARS],
+            "priority_assessment": state.get("priority_assessment", {}),
+            "email_threads": [_email_ref(t) for t in state.get("email_threads", [])],
+            "calendar_events": [_event_ref(e) for e in state.get("calendar_events", [])],
+            "email_drafts": state.get("email_drafts", []),
+            "calendar_actions": state.get("calendar_actions", []),
+            "bulk_actions": state.get("bulk_actions", []),
+            "requires_authorization": state.get("requires_authorization", False),
+            "pending_actions": state.get("pending_actions", []),
+            "executed_actions": state.get("executed_actions", []),
+            "final_response": {
+                key: final_response.get(key)
+                for key in ("text", "intent", "requires_authorization", "pending", "executed", "error")
+                if key in final_response
+            },
+            "error": state.get("error")
+        }
+    }
+
+
+class SessionStore(ABC):
+    """Bounded store of session records keyed by session id"""
+
+    @abstractmethod
+    def get(self, session_id: str) -> dict[str, Any] | None:
+        """The session record, or None if unknown, evicted or expired"""
+        pass
+
+    @abstractmethod
+    def put(self, session_id: str, record: dict[str, Any]) -> None:
+        """Store (replace) a session record and refresh its idle timer"""
+        pass
+
+    @abstractmethod
+    def delete(self, session_id: str) -> None:
+        pass
+
+    @abstractmethod
+    def stats(self) -> dict[str, Any]:
+        """Size and eviction metrics"""
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+class InMemorySessionStore(SessionStore):
+    """
+    Per-process session store: LRU-bounded with an idle timeout.
+
+    At most max_sessions records are kept (least recently used evicted
+    first); a record not written or read for ttl_seconds is dropped.
+    """
+
+    def __init__(
+        self,
+        max_sessions: int = 10000,
+        ttl_seconds: float = 86400.0,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        # session_id -> (record, serialized size)
+        self._cache = TTLCache(ttl_seconds=ttl_seconds, max_entries=max_sessions, clock=clock)
+        self._lock = threading.Lock()
+
+    def get(self, session_id: str) -> dict[str, Any] | None:
+        with self._lock:
+            entry = self._cache.get(session_id)
+            if entry is None:
+                return None
+            # Reading a session keeps it alive
+            self._cache.set(session_id, entry)
+            return entry[0]
+
+    def put(self, session_id: str, record: dict[str, Any]) -> None:
+        size = len(json.dumps(record, default=str))
+        with self._lock:
+            self._cache.set(session_id, (record, size))
+
+    def delete(self, session_id: str) -> None:
+        with self._lock:
+            self._cache.invalidate(session_id)
+
+    def purge_expired(self) -> int:
+        """Drop idle sessions now; returns how many were removed"""
+        with self._lock:
+            return self._cache.purge_expired()
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            cache = self._cache.stats()
+            size = sum(size for _, size in self._cache.values())
+        return {
+            "backend": "memory",
+            "sessions": cache["entries"],
+            "max_sessions": cache["max_entries"],
+            "ttl_seconds": cache["ttl_seconds"],
+            "bytes": size,
+            "evictions": cache["evictions"],
+            "expirations": cache["expirations"],
+            "hits": cache["hits"],
+            "misses": cache["misses"]
+        }
+
+
+class SQLiteSessionStore(SessionStore):
+    """
+    Session store in SQLite, shared by every worker using the same file.
+
+    Records are JSON rows stamped with their last write/read time. Writes
+    prune idle rows at most every sweep_interval_seconds and trim the table
+    back to max_sessions by evicting the least recently used rows.
+    """
+
+    def __init__(
+        self,
+        db_path: str = ":memory:",
+        max_sessions: int = 10000,
+        ttl_seconds: float = 86400.0,
+        sweep_interval_seconds: float = 60.0,
+        clock: Callable[[], float] = time.time
+    ):
+        self.db_path = db_path
+        self.max_sessions = max_sessions
+        self.ttl_seconds = ttl_seconds
+        self.sweep_interval_seconds = sweep_interval_seconds
+        self._clock = clock
+        self._last_sweep = 0.0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+        if db_path != ":memory:":
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            if db_path != ":memory:":
+                self._conn.execute("PRAGMA journal_mode=WAL")
+                self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(SCHEMA)
+
+    def get(self, session_id: str) -> dict[str, Any] | None:
+        now = self._clock()
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT payload, updated_at FROM sessions WHERE session_id = ?", (session_id,)
+            ).fetchone()
+            if row is None or now - row[1] > self.ttl_seconds:
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE sessions SET updated_at = ? WHERE session_id = ?", (now, session_id))
+            self.hits += 1
+            return json.loads(row[0])
+
+    def put(self, session_id: str, record: dict[str, Any]) -> None:
+        payload = json.dumps(record, default=str)
+        now = self._clock()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO sessions (session_id, user_id, payload, size_bytes, updated_at) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT(session_id) DO UPDATE SET user_id = excluded.user_id, payload = excluded.payload, "
+                "size_bytes = excluded.size_bytes, updated_at = excluded.updated_at",
+                (session_id, record.get("user_id"), payload, len(payload), now)
+            )
+            if now - self._last_sweep >= self.sweep_interval_seconds:
+                self._last_sweep = now
+                self.expirations += self._conn.execute(
+                    "DELETE FROM sessions WHERE updated_at < ?", (now - self.ttl_seconds,)
+                ).rowcount
+            excess = self._conn.execute("SELECT COUNT(*) FROM sessions").fetchone()[0] - self.max_sessions
+            if excess > 0:
+                self.evictions += self._conn.execute(
+                    "DELETE FROM sessions WHERE session_id IN "
+                    "(SELECT session_id FROM sessions ORDER BY updated_at LIMIT ?)", (excess,)
+                ).rowcount
+
+    def delete(self, session_id: str) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM sessions WHERE session_id = ?", (session_id,))
+
+    def purge_expired(self) -> int:
+        """Drop idle sessions now; returns how many were removed"""
+        now = self._clock()
+        with self._lock, self._conn:
+            removed = self._conn.execute(
+                "DELETE FROM sessions WHERE updated_at < ?", (now - self.ttl_seconds,)
+            ).rowcount
+            self.expirations += removed
+            self._last_sweep = now
+            return removed
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            count, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size_bytes), 0) FROM sessions"
+            ).fetchone()
+        return {
+            "backend": "sqlite",
+            "sessions": count,
+            "max_sessions": self.max_sessions,
+            "ttl_seconds": self.ttl_seconds,
+            "bytes": size,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "hits": self.hits,
+            "misses": self.misses
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+__all__ = ["SessionStore", "InMemorySessionStore", "SQLiteSessionStore", "session_record"]
@@ -0,0 +1,124 @@
+"""
+Bounded executor for blocking client libraries
+Runs synchronous calls (e.g. googleapiclient ``request.execute()``) on a
+dedicated thread pool so they never stall the event loop.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+
+
+class BlockingCallExecutor:
+    """
+    Dedicated, bounded thread pool with per-call timeouts and queue metrics.
+
+    Calls beyond ``max_workers`` wait in the pool's queue. A call that times
+    out or is cancelled while still queued is abandoned and never runs; one that times out
+    while running keeps its worker until the library returns (threads can't
+    be interrupted), but the awaiting coroutine is released immediately.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 8,
+        default_timeout: float | None = 30.0,
+        name: str = "blocking"
+    ):
+        self.name = name
+        self.max_workers = max_workers
+        self.default_timeout = default_timeout
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name)
+        self._lock = threading.Lock()
+
+        self.queued = 0
+        self.running = 0
+        self.max_queue_depth = 0
+        self.completed = 0
+        self.failed = 0
+        self.timed_out = 0
+
+    async def run(
+        self,
+        fn: Callable[..., Any],
+        *args: Any,
+        timeout: float | None = None,
+        **kwargs: Any
+    ) -> Any:
+        """
+        Run ``fn(*args, **kwargs)`` on the pool and await its result.
+
+        Raises:
+            asyncio.TimeoutError: If the call does not finish within timeout
+                (default_timeout when not given)
+        """
+        timeout = self.default_timeout if timeout is None else timeout
+        phase = {"value": "queued"}
+
+        with self._lock:
+            self.queued += 1
+            self.max_queue_depth = max(self.max_queue_depth, self.queued)
+
+        def call() -> Any:
+            with self._lock:
+                if phase["value"] == "abandoned":
+                    # Caller already gave up while this was queued
+                    return None
+                phase["value"] = "running"
+                self.queued -= 1
+                self.running += 1
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                with self._lock:
+                    self.running -= 1
+
+        loop = asyncio.get_running_loop()
+        try:
+            result = await asyncio.wait_for(loop.run_in_executor(self._pool, call), timeout=timeout)
+        except asyncio.TimeoutError:
+            with self._lock:
+                self.timed_out += 1
+                if phase["value"] == "queued":
+                    phase["value"] = "abandoned"
+                    self.queued -= 1
+            raise
+        except asyncio.CancelledError:
+            # The pool future is cancelled too, so a queued call never runs
+            with self._lock:
+                if phase["value"] == "queued":
+                    phase["value"] = "abandoned"
+                    self.queued -= 1
+            raise
+        except Exception:
+            with self._lock:
+                self.failed += 1
+            raise
+
+        with self._lock:
+            self.completed += 1
+        return result
+
+    def stats(self) -> dict[str, Any]:
+        """Queue depth and outcome counters"""
+        with self._lock:
+            return {
+                "name": self.name,
+                "max_workers": self.max_workers,
+                "queue_depth": self.queued,
+                "running": self.running,
+                "max_queue_depth": self.max_queue_depth,
+                "completed": self.completed,
+                "failed": self.failed,
+                "timed_out": self.timed_out,
+            }
+
+    def shutdown(self, wait: bool = False) -> None:
+        """Stop accepting work and release idle threads"""
+        self._pool.shutdown(wait=wait, cancel_futures=True)
+
+
+__all__ = ["BlockingCallExecutor"]
@@ -0,0 +1,57 @@
+"""
+Calendar view windows
+Maps "today" / "tomorrow" / "week" views (and the user's wording) to the
+time range the calendar adapter is queried for.
+"""
+
+from __future__ import annotations
+
+import re
+from datetime import datetime, timedelta, timezone
+
+
+_TOMORROW_RE = re.compile(r"\btomorrow\b")
+_WEEK_RE = re.compile(r"\b(this week|next week|week|upcoming|next few days)\b")
+_DURATION_RE = re.compile(r"\b(\d+(?:\.\d+)?)\s*-?\s*(hours?|hrs?|h|minutes?|mins?|m)\b")
+_HOUR_WORDS_RE = re.compile(r"\b(half an|an) hour\b")
+
+
+def timeframe_window(timeframe: str, now: datetime | None = None) -> tuple[datetime, datetime]:
+    """
+    (start, end) of a view: "today"/"day", "tomorrow", or "week" (default,
+    Monday to Monday).
+    """
+    now = now or datetime.now(timezone.utc)
+    midnight = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    if timeframe in ("today", "day"):
+        return midnight, midnight + timedelta(days=1)
+    if timeframe == "tomorrow":
+        return midnight + timedelta(days=1), midnight + timedelta(days=2)
+    start = midnight - timedelta(days=now.weekday())
+    return start, start + timedelta(days=7)
+
+
+def timeframe_from_query(query: str) -> str:
+    """Calendar view a user query refers to ("today" when unspecified)"""
+    text = query.lower()
+    if _TOMORROW_RE.search(text):
+        return "tomorrow"
+    if _WEEK_RE.search(text):
+        return "week"
+    return "today"
+
+
+def duration_from_query(query: str, default_minutes: int = 30) -> int:
+    """Meeting length in minutes mentioned in a query ("45 min", "an hour", "1.5 hours")"""
+    text = query.lower()
+    match = _DURATION_RE.search(text)
+    if match:
+        amount, unit = float(match[1]), match[2]
+        return max(5, int(round(amount * 60 if unit.startswith("h") else amount)))
+    words = _HOUR_WORDS_RE.search(text)
+    if words:
+        return 30 if words[1] == "half an" else 60
+    return default_minutes
+
+
+__all__ = ["timeframe_window", "timeframe_from_query", "duration_from_query"]
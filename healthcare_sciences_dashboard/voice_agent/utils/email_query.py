@@ -13,6 +13,7 @@ changes are preferred.
 from __future__ import annotations
 
 import re
+from dataclasses import dataclass, field
 from typing import Optional
 
 
@@ -80,5 +81,136 @@ def parse_email_nl_to_gmail_query(nl: str) -> str:
     return f"{unread} {text}".strip()
 
 
-__all__ = ["parse_email_nl_to_gmail_query"]
 
+# --- Local index queries ------------------------------------------------------
+
+# Filler words the NL fallback leaves in the query ("show me emails about x")
+_INDEX_STOPWORDS = {
+    "a", "about", "all", "an", "and", "any", "are", "emails", "email", "find",
+    "for", "from", "get", "in", "is", "mail", "me", "messages", "my", "new",
+    "of", "on", "show", "the", "to", "unread", "what", "with",
+}
+
+# from:(a OR b), subject:"a b", "a b", or a bare token
+_GMAIL_TOKEN_RE = re.compile(r'-?\w+:\([^)]*\)|-?\w+:"[^"]*"|"[^"]*"|\S+')
+_WORD_RE = re.compile(r"[\w']+")
+_EMAIL_RE = re.compile(r"^[a-z0-9._%+-]+@[a-z0-9.-]+$")
+
+# in:/label: values the mirror can answer, as Gmail system label ids. The
+# mirror stores user labels by id (Label_N), never by name, and only holds
+# what the full sync listed (no spam or trash), so anything else - including
+# in:anywhere / in:all - goes to Gmail.
+_INDEXED_LABELS = {
+    "inbox": "INBOX",
+    "sent": "SENT",
+    "draft": "DRAFT",
+    "drafts": "DRAFT",
+    "starred": "STARRED",
+    "important": "IMPORTANT",
+    "unread": "UNREAD",
+}
+
+# FTS columns searched by the index (see MailboxMirror)
+INDEX_COLUMNS = ("subject", "sender", "snippet", "body")
+
+
+@dataclass
+class EmailIndexQuery:
+    """
+    A Gmail-style query compiled for the local full-text index.
+
+    match is an FTS5 MATCH expression (None lists everything passing the
+    structured filters, newest first).
+    """
+    match: str | None = None
+    labels: list[str] = field(default_factory=list)
+    unread_only: bool = False
+    sender_email: str | None = None
+
+
+def _fts_phrase(text: str, prefix: bool = False) -> str | None:
+    """Quote text as an FTS5 phrase; None if it has no searchable words"""
+    words = _WORD_RE.findall(text.lower())
+    if not words:
+        return None
+    phrase = '"' + " ".join(words).replace('"', '""') + '"'
+    return phrase + "*" if prefix else phrase
+
+
+def _fts_alternatives(value: str) -> str | None:
+    """'(recruiter OR hiring)' -> '("recruiter"* OR "hiring"*)'"""
+    options = [part for part in value.strip("()").split() if part.upper() != "OR"]
+    phrases = [p for p in (_fts_phrase(o, prefix=True) for o in options) if p]
+    if not phrases:
+        return None
+    return phrases[0] if len(phrases) == 1 else "(" + " OR ".join(phrases) + ")"
+
+
+def compile_gmail_query(query: str | None) -> EmailIndexQuery | None:
+    """
+    Compile a Gmail search string (as produced by parse_email_nl_to_gmail_query)
+    into an EmailIndexQuery.
+
+    Handles in:/label: for system labels, is:unread, from: (address, domain or OR-group),
+    subject:, quoted phrases, -negation and free words. Free words are
+    prefix-matched across subject, sender, snippet and body and ANDed, as
+    Gmail does. Returns None for operators the index cannot answer
+    (dates, attachments, user labels, in:anywhere, top-level OR, ...) so
+    the caller can fall back to Gmail.
+    """
+    compiled = EmailIndexQuery()
+    clauses: list[str] = []
+    negated: list[str] = []
+
+    for token in _GMAIL_TOKEN_RE.findall(query or ""):
+        negate = token.startswith("-") and len(token) > 1
+        body = token[1:] if negate else token
+        operator, _, value = body.partition(":") if ":" in body and not body.startswith('"') else ("", "", body)
+        operator = operator.lower()
+        value = value.strip('"')
+        clause = None
+
+        if operator == "in" or operator == "label":
+            label = _INDEXED_LABELS.get(value.lower())
+            if negate or label is None:
+                return None
+            compiled.labels.append(label)
+            continue
+        elif operator == "is":
+            if value.lower() != "unread" or negate:
+                return None
+            compiled.unread_only = True
+            continue
+        elif operator == "from":
+            address = value.strip("()").lower()
+            if _EMAIL_RE.match(address) and not negate:
+                compiled.sender_email = address
+                continue
+            alternatives = _fts_alternatives(value) if value.startswith("(") else _fts_phrase(value, prefix=True)
+            clause = f"sender : {alternatives}" if alternatives else None
+        elif operator == "subject":
+            alternatives = _fts_alternatives(value) if value.startswith("(") else _fts_phrase(value, prefix=True)
+            clause = f"subject : {alternatives}" if alternatives else None
+        elif operator:
+            # newer_than:, has:, after: ... are not indexed
+            return None
+        elif body.startswith('"'):
+            clause = _fts_phrase(value)
+        elif body.upper() == "OR":
+            # Gmail's top-level OR is rare in generated queries; let Gmail handle it
+            return None
+        elif negate or body.lower() not in _INDEX_STOPWORDS:
+            clause = _fts_phrase(value, prefix=True)
+
+        if clause:
+            (negated if negate else clauses).append(clause)
+
+    if negated and not clauses:
+        # FTS5 cannot evaluate a purely negative query
+        return None
+    if clauses:
+        compiled.match = " AND ".join(clauses) + "".join(f" NOT {c}" for c in negated)
+    return compiled
+
+
+__all__ = ["parse_email_nl_to_gmail_query", "compile_gmail_query", "EmailIndexQuery"]
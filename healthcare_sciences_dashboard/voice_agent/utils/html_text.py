@@ -0,0 +1,160 @@
+"""
+Streaming HTML-to-text conversion
+Turns email HTML into readable plain text chunk by chunk, so conversion
+stops as soon as enough text has been produced and never builds a DOM.
+Each chunk is tokenized with a few compiled regex passes (comments,
+script/style blocks, block tags, remaining tags, entities, whitespace);
+markup cut off at a chunk boundary is carried over to the next chunk.
+"""
+
+from __future__ import annotations
+
+import html
+import re
+from typing import Iterable
+
+
+# Elements whose content is never visible text
+SKIP_TAGS = ("script", "style", "title", "noscript", "template", "xml")
+
+# Elements that start / end a line of text
+BLOCK_TAGS = (
+    "address", "article", "aside", "blockquote", "br", "dd", "div", "dl", "dt",
+    "footer", "h1", "h2", "h3", "h4", "h5", "h6", "header", "hr", "ol",
+    "p", "pre", "section", "table", "td", "th", "tr", "ul",
+)
+
+# Characters fed to the tokenizer per step
+FEED_CHUNK_CHARS = 16 * 1024
+
+# Attribute text of a tag; quoted values may contain '>' (unrolled so the
+# regex engine scans runs of plain characters without backtracking)
+_ATTRS = r"""[^>"']*(?:(?:"[^"]*"|'[^']*')[^>"']*)*"""
+
+_COMMENT_RE = re.compile(r"<!--.*?-->", re.DOTALL)
+_SKIP_BLOCK_RE = re.compile(
+    rf"<({'|'.join(SKIP_TAGS)})\b{_ATTRS}>.*?</\1\s*>", re.DOTALL | re.IGNORECASE
+)
+_SKIP_OPEN_RE = re.compile(rf"<({'|'.join(SKIP_TAGS)})\b{_ATTRS}>", re.IGNORECASE)
+_LI_RE = re.compile(rf"<li\b{_ATTRS}>", re.IGNORECASE)
+_BLOCK_RE = re.compile(rf"</?(?:{'|'.join(BLOCK_TAGS)}|li)\b{_ATTRS}>", re.IGNORECASE)
+_TAG_RE = re.compile(rf"<[a-zA-Z/!?]{_ATTRS}>")
+# A tag still open at the end of the input: '<', '<di', '<a href="x>y'
+_PARTIAL_TAG_RE = re.compile(rf"""<(?:[a-zA-Z/!?]{_ATTRS}(?:"[^"]*|'[^']*)?)?\Z""")
+_WHITESPACE_RE = re.compile(r"\s+")
+_INLINE_WHITESPACE_RE = re.compile(r"[^\S\n]+")
+_LINE_BREAKS_RE = re.compile(r" ?\n[\n ]*")
+_SPACES_RE = re.compile(r" {2,}")
+
+# Longest entity reference held back at a chunk boundary (&thetasym;)
+_MAX_ENTITY_CHARS = 10
+
+
+class HTMLTextExtractor:
+    """
+    Incremental HTML-to-text tokenizer.
+
+    feed() accepts arbitrary chunks; a tag, comment, script block or
+    entity split across chunks is held back until the next one. Script and
+    style content is dropped, block elements become line breaks, list
+    items get a "- " bullet and whitespace is collapsed. Once
+    ``max_chars`` characters are collected ``done`` is set and further
+    input is ignored.
+    """
+
+    def __init__(self, max_chars: int | None = None):
+        self.max_chars = max_chars
+        self.done = False
+        self._buffer = ""
+        self._skip_until: re.Pattern | None = None
+        self._pieces: list[str] = []
+        self._length = 0
+
+    def feed(self, data: str) -> None:
+        if self.done:
+            return
+        buffer = self._buffer + data
+
+        if self._skip_until is not None:
+            match = self._skip_until.search(buffer)
+            if match is None:
+                # Keep enough of the tail to match a split closing tag
+                self._buffer = buffer[-16:]
+                return
+            buffer = buffer[match.end():]
+            self._skip_until = None
+
+        cut = self._complete_prefix(buffer)
+        self._buffer = buffer[cut:]
+        self._convert(buffer[:cut])
+
+    def close(self) -> None:
+        """Convert input held back at the end of the last chunk"""
+        if self._buffer and self._skip_until is None and not self.done:
+            self._convert(self._buffer)
+        self._buffer = ""
+
+    @staticmethod
+    def _complete_prefix(buffer: str) -> int:
+        """Length of the prefix that contains no cut-off comment, tag or entity"""
+        cut = len(buffer)
+        comment = buffer.rfind("<!--")
+        if comment != -1 and buffer.find("-->", comment + 4) == -1:
+            cut = comment
+        lt = buffer.rfind("<", 0, cut)
+        if lt != -1 and _PARTIAL_TAG_RE.match(buffer[:cut], lt):
+            cut = lt
+        amp = buffer.rfind("&", max(0, cut - _MAX_ENTITY_CHARS), cut)
+        if amp != -1 and ";" not in buffer[amp:cut]:
+            cut = amp
+        return cut
+
+    def _convert(self, markup: str) -> None:
+        markup = _COMMENT_RE.sub("", markup)
+        markup = _SKIP_BLOCK_RE.sub(" ", markup)
+        unterminated = _SKIP_OPEN_RE.search(markup)
+        if unterminated:
+            # The rest of this input is script/style content
+            self._skip_until = re.compile(rf"</{unterminated.group(1)}\s*>", re.IGNORECASE)
+            markup = markup[:unterminated.start()]
+
+        markup = _WHITESPACE_RE.sub(" ", markup)
+        markup = _LI_RE.sub("\n- ", markup)
+        markup = _BLOCK_RE.sub("\n", markup)
+        text = _TAG_RE.sub("", markup)
+        if "&" in text:
+            text = _INLINE_WHITESPACE_RE.sub(" ", html.unescape(text))
+        if text:
+            self._pieces.append(text)
+            self._length += len(text)
+            if self.max_chars is not None and self._length >= self.max_chars:
+                self.done = True
+
+    def text(self) -> str:
+        # Chunks are collapsed separately; join their boundary whitespace
+        text = _SPACES_RE.sub(" ", "".join(self._pieces))
+        text = _LINE_BREAKS_RE.sub("\n", text).strip()
+        if self.max_chars is not None:
+            text = text[:self.max_chars].rstrip()
+        return text
+
+
+def html_to_text(markup: str | Iterable[str], max_chars: int | None = None) -> str:
+    """
+    Convert HTML to plain text, stopping once max_chars characters are produced.
+
+    markup may be a string or an iterable of string chunks (e.g. an
+    incremental decoder), so large documents are never tokenized past the
+    cap.
+    """
+    parser = HTMLTextExtractor(max_chars=max_chars)
+    for block in ([markup] if isinstance(markup, str) else markup):
+        for start in range(0, len(block), FEED_CHUNK_CHARS):
+            parser.feed(block[start:start + FEED_CHUNK_CHARS])
+            if parser.done:
+                return parser.text()
+    parser.close()
+    return parser.text()
+
+
+__all__ = ["HTMLTextExtractor", "html_to_text"]
@@ -0,0 +1,295 @@
+"""
+Local fast-path intent classifier
+Resolves common voice commands ("what's in my inbox", "what's on my calendar
+tomorrow") without an LLM round-trip.
+
+Three stages, cheapest first:
+1. LRU of recently seen normalized queries -> intent
+2. Keyword rules that fire only when exactly one intent matches
+3. TF-IDF + multinomial logistic regression (NumPy) trained on seed examples
+   and on queries previously classified by the LLM
+
+Anything below the confidence threshold is left to the LLM classifier.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from collections import OrderedDict
+from pathlib import Path
+from typing import NamedTuple
+
+import numpy as np
+
+
+# Wake words and fillers that carry no intent signal
+_FILLER_RE = re.compile(r"^(?:(?:hey|hi|ok|okay)\s+)?(?:vinegar\s*)?(?:,\s*)?(?:please\s+|can you\s+|could you\s+)*")
+_PUNCT_RE = re.compile(r"[^\w\s@.'-]")
+_SPACE_RE = re.compile(r"\s+")
+
+
+def normalize_query(query: str) -> str:
+    """Lowercase, strip punctuation, wake words and extra whitespace"""
+    text = _PUNCT_RE.sub(" ", (query or "").lower())
+    text = _SPACE_RE.sub(" ", text).strip()
+    text = _FILLER_RE.sub("", text)
+    return text.strip(" .'-")
+
+
+# (intent, pattern) - a rule only decides when it is the sole match
+INTENT_RULES: list[tuple[str, re.Pattern]] = [
+    ("triage_inbox", re.compile(r"\b(what'?s|anything|check|show)\b.*\b(inbox|emails?|mail)\b|\bunread\b|\bneeds? my attention\b")),
+    ("check_calendar", re.compile(r"\b(calendar|schedule|agenda)\b.*\b(today|tomorrow|this week|next week|on)\b|\bam i free\b|\bmy (day|meetings)\b|\bwhat'?s on my\b")),
+    ("draft_reply", re.compile(r"\b(draft|write|compose)\b.*\b(reply|response)\b|\breply to\b|\brespond to\b")),
+    ("schedule_meeting", re.compile(r"\b(schedule|set up|book|arrange)\b.*\b(meeting|call|time)\b|\b(accept|decline)\b.*\b(invite|meeting)\b")),
+    ("follow_up", re.compile(r"\bfollow[ -]?ups?\b|\bremind me\b")),
+    ("summarize", re.compile(r"\b(summari[sz]e|summary|recap|brief me)\b")),
+    # Drafting never sends; "draft an email to ..." is left to the model/LLM
+    ("send_email", re.compile(r"^(?!.*\b(draft|write)\b).*\b(send|email)\b.*\b(to|an email)\b")),
+    # Only when the object is mail - "delete my 3pm meeting" is a calendar change
+    ("archive_email", re.compile(r"\b(archive|delete|clean up|trash)\b(?:\s+\S+){0,3}?\s+(e-?mails?|mail|inbox|threads?|messages?|newsletters?)\b")),
+    ("prioritize_inbox", re.compile(r"\b(prioriti[sz]e|most important|what matters)\b")),
+    ("config", re.compile(r"\b(settings?|configure|change your (name|voice))\b")),
+]
+
+# Small built-in corpus so the model is useful before any queries are logged
+SEED_EXAMPLES: list[tuple[str, str]] = [
+    ("what's in my inbox", "triage_inbox"),
+    ("anything new in my email", "triage_inbox"),
+    ("do i have any unread emails", "triage_inbox"),
+    ("check my mail", "triage_inbox"),
+    ("what emails need my attention", "triage_inbox"),
+    ("what's on my calendar tomorrow", "check_calendar"),
+    ("what meetings do i have today", "check_calendar"),
+    ("am i free on friday afternoon", "check_calendar"),
+    ("show me my schedule for this week", "check_calendar"),
+    ("how busy is my day", "check_calendar"),
+    ("draft a reply to john's email", "draft_reply"),
+    ("write a response to sarah", "draft_reply"),
+    ("reply to the board email", "draft_reply"),
+    ("respond to the investor thread", "draft_reply"),
+    ("schedule a meeting with the cfo", "schedule_meeting"),
+    ("set up a call with lisa next week", "schedule_meeting"),
+    ("accept the board meeting invite", "schedule_meeting"),
+    ("decline the partner call", "schedule_meeting"),
+    ("book time with the product team", "schedule_meeting"),
+    ("remind me to follow up with john", "follow_up"),
+    ("what follow ups are pending", "follow_up"),
+    ("set a follow up for the fda thread", "follow_up"),
+    ("summarize my day", "summarize"),
+    ("give me a summary of my emails and meetings", "summarize"),
+    ("brief me on what happened today", "summarize"),
+    ("recap this week", "summarize"),
+    ("send an email to the leadership team", "send_email"),
+    ("email sarah about the slides", "send_email"),
+    ("compose a new email to finance", "send_email"),
+    ("archive the newsletters", "archive_email"),
+    ("delete the marketing emails", "archive_email"),
+    ("clean up my inbox", "archive_email"),
+    ("prioritize my inbox", "prioritize_inbox"),
+    ("what are my most important emails", "prioritize_inbox"),
+    ("help me decide what matters in my email", "prioritize_inbox"),
+    ("open the communications tab", "manage_communications"),
+    ("organize my communications", "manage_communications"),
+    ("change your name", "config"),
+    ("update my settings", "config"),
+    ("configure the voice", "config"),
+]
+
+
+class LocalPrediction(NamedTuple):
+    """Result of the local classifier"""
+    intent: str
+    confidence: float
+    source: str  # "cache", "rules" or "model"
+
+
+class TfidfLogisticModel:
+    """
+    Multinomial logistic regression over TF-IDF unigram+bigram features.
+    Trained with full-batch gradient descent; small enough to refit on startup.
+    """
+
+    def __init__(self, l2: float = 1e-3, learning_rate: float = 2.0, epochs: int = 300):
+        self.l2 = l2
+        self.learning_rate = learning_rate
+        self.epochs = epochs
+        self.vocabulary: dict[str, int] = {}
+        self.idf: np.ndarray | None = None
+        self.weights: np.ndarray | None = None
+        self.bias: np.ndarray | None = None
+        self.labels: list[str] = []
+
+    @staticmethod
+    def _terms(text: str) -> list[str]:
+        tokens = text.split()
+        return tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+
+    def _vectorize(self, texts: list[str]) -> np.ndarray:
+        matrix = np.zeros((len(texts), len(self.vocabulary)), dtype=np.float64)
+        for row, text in enumerate(texts):
+            for term in self._terms(text):
+                col = self.vocabulary.get(term)
+                if col is not None:
+                    matrix[row, col] += 1.0
+        matrix *= self.idf
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        return matrix / np.where(norms == 0, 1.0, norms)
+
+    def fit(self, texts: list[str], labels: list[str]) -> "TfidfLogisticModel":
+        """Fit vocabulary, IDF weights and regression coefficients"""
+        self.labels = sorted(set(labels))
+        label_index = {label: i for i, label in enumerate(self.labels)}
+
+        doc_freq: dict[str, int] = {}
+        for text in texts:
+            for term in set(self._terms(text)):
+                doc_freq[term] = doc_freq.get(term, 0) + 1
+        self.vocabulary = {term: i for i, term in enumerate(sorted(doc_freq))}
+        n_docs = len(texts)
+        self.idf = np.array(
+            [np.log((1 + n_docs) / (1 + doc_freq[term])) + 1.0 for term in self.vocabulary]
+        )
+
+        x = self._vectorize(texts)
+        y = np.zeros((n_docs, len(self.labels)))
+        y[np.arange(n_docs), [label_index[label] for label in labels]] = 1.0
+
+        self.weights = np.zeros((x.shape[1], len(self.labels)))
+        self.bias = np.zeros(len(self.labels))
+        for _ in range(self.epochs):
+            probs = self._softmax(x @ self.weights + self.bias)
+            error = (probs - y) / n_docs
+            self.weights -= self.learning_rate * (x.T @ error + self.l2 * self.weights)
+            self.bias -= self.learning_rate * error.sum(axis=0)
+
+        return self
+
+    @staticmethod
+    def _softmax(logits: np.ndarray) -> np.ndarray:
+        shifted = np.exp(logits - logits.max(axis=1, keepdims=True))
+        return shifted / shifted.sum(axis=1, keepdims=True)
+
+    def predict(self, text: str) -> tuple[str, float]:
+        """Return (label, probability) for a normalized query"""
+        if self.weights is None:
+            return "unknown", 0.0
+        x = self._vectorize([text])
+        if not x.any():
+            # No known terms - nothing to base a prediction on
+            return "unknown", 0.0
+        probs = self._softmax(x @ self.weights + self.bias)[0]
+        best = int(probs.argmax())
+        return self.labels[best], float(probs[best])
+
+
+class LocalIntentClassifier:
+    """
+    Fast local intent classifier placed in front of the LLM classifier.
+
+    Usage:
+        classifier = LocalIntentClassifier()
+        prediction = classifier.classify("what's on my calendar tomorrow")
+        if prediction is None:
+            ...  # ask the LLM, then classifier.record(query, intent)
+    """
+
+    def __init__(
+        self,
+        confidence_threshold: float = 0.6,
+        cache_size: int = 512,
+        training_log_path: str | None = None
+    ):
+        self.confidence_threshold = confidence_threshold
+        self.cache_size = cache_size
+        self.training_log_path = Path(training_log_path) if training_log_path else None
+        self._cache: OrderedDict[str, str] = OrderedDict()
+        self.model = TfidfLogisticModel()
+        self.stats = {"cache": 0, "rules": 0, "model": 0, "deferred": 0}
+        self.retrain()
+
+    def _load_logged_examples(self) -> list[tuple[str, str]]:
+        """Read (query, intent) pairs previously recorded from the LLM"""
+        if not self.training_log_path or not self.training_log_path.exists():
+            return []
+
+        examples = []
+        with open(self.training_log_path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                    examples.append((normalize_query(record["query"]), record["intent"]))
+                except (ValueError, KeyError):
+                    continue
+        return examples
+
+    def retrain(self) -> None:
+        """Refit the model on seed examples plus any logged queries"""
+        examples = [(normalize_query(q), i) for q, i in SEED_EXAMPLES] + self._load_logged_examples()
+        examples = [(q, i) for q, i in examples if q and i != "unknown"]
+        texts, labels = zip(*examples)
+        self.model.fit(list(texts), list(labels))
+
+    def classify(self, query: str) -> LocalPrediction | None:
+        """
+        Classify a query locally.
+
+        Returns:
+            LocalPrediction when confident, otherwise None (defer to the LLM)
+        """
+        text = normalize_query(query)
+        if not text:
+            return None
+
+        cached = self._cache.get(text)
+        if cached is not None:
+            self._cache.move_to_end(text)
+            self.stats["cache"] += 1
+            return LocalPrediction(cached, 1.0, "cache")
+
+        matched = {intent for intent, pattern in INTENT_RULES if pattern.search(text)}
+        model_intent, model_confidence = self.model.predict(text)
+
+        if len(matched) == 1:
+            rule_intent = matched.pop()
+            # Rules and model agreeing is the strongest local signal
+            confidence = 0.99 if rule_intent == model_intent else 0.9
+            self._remember(text, rule_intent)
+            self.stats["rules"] += 1
+            return LocalPrediction(rule_intent, confidence, "rules")
+
+        # Several rules firing means the query is ambiguous; only trust the
+        # model if it picks one of the matched intents
+        if model_confidence >= self.confidence_threshold and (not matched or model_intent in matched):
+            self._remember(text, model_intent)
+            self.stats["model"] += 1
+            return LocalPrediction(model_intent, model_confidence, "model")
+
+        self.stats["deferred"] += 1
+        return None
+
+    def record(self, query: str, intent: str) -> None:
+        """
+        Record an intent decided elsewhere (normally by the LLM).
+        The query is cached and appended to the training log for the next retrain.
+        """
+        text = normalize_query(query)
+        if not text or intent == "unknown":
+            return
+
+        self._remember(text, intent)
+
+        if self.training_log_path:
+            self.training_log_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.training_log_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps({"query": query, "intent": intent}) + "\n")
+
+    def _remember(self, text: str, intent: str) -> None:
+        self._cache[text] = intent
+        self._cache.move_to_end(text)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+
+__all__ = ["LocalIntentClassifier", "LocalPrediction", "normalize_query"]
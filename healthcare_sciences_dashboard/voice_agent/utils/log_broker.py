@@ -0,0 +1,135 @@
+"""
+Action log broker
+In-process pub/sub that fans action logs out to live dashboard
+subscribers (the /voice-agent/ws/logs WebSocket) without ever blocking
+the pipeline.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from collections import deque
+from typing import Any, Iterable
+
+
+class LogSubscription:
+    """
+    One subscriber's filtered, bounded message queue.
+
+    push() never waits: when the queue is full the oldest message is
+    dropped and counted, and the next get() reports the gap as a
+    ``{"type": "dropped", "count": n}`` message before resuming.
+    """
+
+    def __init__(
+        self,
+        user_id: str | None = None,
+        object_types: Iterable[str] | None = None,
+        queue_size: int = 256
+    ):
+        self.user_id = user_id
+        self.object_types = frozenset(object_types) if object_types else None
+        self.dropped = 0
+        self.delivered = 0
+        self._unreported_drops = 0
+        self._queue: deque[str] = deque(maxlen=queue_size)
+        self._ready = asyncio.Event()
+        self._closed = False
+
+    def matches(self, user_id: str | None, object_type: str | None) -> bool:
+        if self.user_id is not None and user_id != self.user_id:
+            return False
+        return self.object_types is None or object_type in self.object_types
+
+    def push(self, message: str) -> None:
+        if len(self._queue) == self._queue.maxlen:
+            self.dropped += 1
+            self._unreported_drops += 1
+        self._queue.append(message)
+        self._ready.set()
+
+    async def get(self) -> str | None:
+        """Next encoded message; None once the subscription is closed"""
+        while not self._queue and not self._unreported_drops:
+            if self._closed:
+                return None
+            self._ready.clear()
+            await self._ready.wait()
+        if self._unreported_drops:
+            count, self._unreported_drops = self._unreported_drops, 0
+            return json.dumps({"type": "dropped", "count": count})
+        self.delivered += 1
+        return self._queue.popleft()
+
+    def close(self) -> None:
+        self._closed = True
+        self._ready.set()
+
+    @property
+    def pending(self) -> int:
+        return len(self._queue)
+
+
+class LogBroker:
+    """
+    Publishes action log entries to every matching subscriber.
+
+    Each entry is JSON-encoded once and the same string is queued for all
+    subscribers. The last ``history_size`` messages are kept so a client
+    reconnecting with ``resume_from=<log_id>`` first receives what it
+    missed; if that id has already left the history it gets a
+    ``{"type": "resume_gap", "log_id": ...}`` message and should reload
+    from the activity feed. Not thread-safe - publish and subscribe from
+    the event loop.
+    """
+
+    def __init__(self, queue_size: int = 256, history_size: int = 1000):
+        self.queue_size = queue_size
+        # (log_id, user_id, object_type, encoded message)
+        self._history: deque[tuple[str | None, str | None, str | None, str]] = deque(maxlen=history_size)
+        self._subscribers: set[LogSubscription] = set()
+        self.published = 0
+
+    def publish(self, entries: Iterable[dict[str, Any]]) -> None:
+        for entry in entries:
+            message = json.dumps({"type": "log", "entry": entry}, default=str)
+            user_id, object_type = entry.get("user_id"), entry.get("object_type")
+            self._history.append((entry.get("log_id"), user_id, object_type, message))
+            self.published += 1
+            for subscriber in self._subscribers:
+                if subscriber.matches(user_id, object_type):
+                    subscriber.push(message)
+
+    def subscribe(
+        self,
+        user_id: str | None = None,
+        object_types: Iterable[str] | None = None,
+        resume_from: str | None = None
+    ) -> LogSubscription:
+        """Register a subscriber, replaying history after ``resume_from`` if given"""
+        subscription = LogSubscription(user_id, object_types, self.queue_size)
+        if resume_from is not None:
+            log_ids = [log_id for log_id, _, _, _ in self._history]
+            if resume_from in log_ids:
+                for _, entry_user, object_type, message in list(self._history)[log_ids.index(resume_from) + 1:]:
+                    if subscription.matches(entry_user, object_type):
+                        subscription.push(message)
+            else:
+                subscription.push(json.dumps({"type": "resume_gap", "log_id": resume_from}))
+        self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: LogSubscription) -> None:
+        self._subscribers.discard(subscription)
+        subscription.close()
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "subscribers": len(self._subscribers),
+            "published": self.published,
+            "history": len(self._history),
+            "queue_size": self.queue_size,
+            "pending": sum(s.pending for s in self._subscribers),
+            "dropped": sum(s.dropped for s in self._subscribers)
+        }
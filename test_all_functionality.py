@@ -15,13 +15,22 @@ Test Results will be written to DRY_TEST_RESULTS.md
 
 import sys
 import os
+import atexit
 import importlib
+import shutil
+import tempfile
 import traceback
 from datetime import datetime
 
 # Add project to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'healthcare_sciences_dashboard'))
 
+# Stores created with default settings (e.g. on importing the API routes) go to a
+# scratch directory instead of the user's data dir
+_dry_test_data_dir = tempfile.mkdtemp(prefix="voice_agent_dry_test_")
+atexit.register(shutil.rmtree, _dry_test_data_dir, ignore_errors=True)
+os.environ.setdefault("VOICE_AGENT_DATA_DIR", _dry_test_data_dir)
+
 # Test Results Storage
 test_results = {
     'timestamp': datetime.now().isoformat(),
@@ -52,6 +61,28 @@ def log_test(category, test_name, status, message="", details=""):
 
     print(f"[{status}] {category} - {test_name}: {message}")
 
+def fake_gmail(message_count=0, latency=0.0, **adapter_kwargs):
+    """
+    In-memory Gmail service seeded with message_count messages ("Update {i}"
+    from sender{i}@partner.com) and a GmailAdapter over it
+    """
+    from voice_agent.adapters.email.gmail_adapter import GmailAdapter
+    from voice_agent.adapters.email.fake_gmail_service import FakeGmailService
+
+    service = FakeGmailService(latency=latency)
+    for i in range(message_count):
+        service.add_message(sender=f"sender{i}@partner.com", subject=f"Update {i}")
+    return service, GmailAdapter(service=service, **adapter_kwargs)
+
+def fake_calendar(**cache_kwargs):
+    """In-memory Calendar service and a CachedCalendarAdapter over it (live adapter: .calendar)"""
+    from voice_agent.adapters.calendar.cached_adapter import CachedCalendarAdapter
+    from voice_agent.adapters.calendar.fake_calendar_service import FakeCalendarService
+    from voice_agent.adapters.calendar.google_calendar_adapter import GoogleCalendarAdapter
+
+    service = FakeCalendarService()
+    return service, CachedCalendarAdapter(GoogleCalendarAdapter(service=service), **cache_kwargs)
+
 def test_config_system():
     """Test 1: Configuration System"""
     print("\n" + "="*70)
@@ -337,6 +368,1963 @@ def test_dependencies():
         except ImportError:
             log_test("Dependencies", dep, "WARN", f"Package not installed (may be optional)")
 
+def test_gmail_nonblocking():
+    """Test 8: Gmail API calls run off the event loop"""
+    print("\n" + "="*70)
+    print("TEST 8: GMAIL CALLS OFF THE EVENT LOOP")
+    print("="*70)
+
+    import asyncio
+    import threading
+    import time
+
+    try:
+        import httpx
+        from api import server
+        from voice_agent.utils.blocking_executor import BlockingCallExecutor
+
+        executor = BlockingCallExecutor(max_workers=2, default_timeout=10, name="gmail-test")
+        service, adapter = fake_gmail(executor=executor)
+        service.add_message(sender="john.doe@partner.com", subject="Q4 Financial Review")
+        service.gate = threading.Event()  # every Gmail call blocks until set
+
+        async def scenario():
+            stalled = asyncio.create_task(adapter.fetch_threads(max_results=5))
+            await asyncio.sleep(0.05)  # let the call reach the fake service
+
+            transport = httpx.ASGITransport(app=server.app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                started = time.perf_counter()
+                responses = [await client.get("/health") for _ in range(20)]
+                elapsed = time.perf_counter() - started
+
+            was_stalled = not stalled.done()
+            service.gate.set()
+            threads = await stalled
+            return responses, elapsed, was_stalled, threads
+
+        responses, elapsed, was_stalled, threads = asyncio.run(scenario())
+        assert was_stalled, "Gmail call finished before the gate was released"
+        assert all(r.status_code == 200 for r in responses)
+        assert elapsed < 1.0, f"dashboard requests took {elapsed:.2f}s"
+        assert threads[0]["subject"] == "Q4 Financial Review"
+        log_test("VoiceAgent", "Dashboard requests during stalled Gmail call", "PASS",
+                f"20 requests served in {elapsed * 1000:.0f} ms while Gmail was stalled")
+    except Exception as e:
+        log_test("VoiceAgent", "Dashboard requests during stalled Gmail call", "FAIL", str(e), traceback.format_exc())
+
+    try:
+        from voice_agent.utils.blocking_executor import BlockingCallExecutor
+
+        executor = BlockingCallExecutor(max_workers=1, default_timeout=0.2, name="gmail-timeout-test")
+        service, adapter = fake_gmail(executor=executor)
+        service.gate = threading.Event()
+
+        started = time.perf_counter()
+        asyncio.run(adapter.mark_read("thr000001"))
+        elapsed = time.perf_counter() - started
+        service.gate.set()
+
+        assert elapsed < 1.0, f"timed out call blocked for {elapsed:.2f}s"
+        assert executor.stats()["timed_out"] == 1
+        log_test("VoiceAgent", "Gmail per-call timeout", "PASS", f"Released caller after {elapsed * 1000:.0f} ms")
+    except Exception as e:
+        log_test("VoiceAgent", "Gmail per-call timeout", "FAIL", str(e), traceback.format_exc())
+
+    try:
+        from voice_agent.utils.blocking_executor import BlockingCallExecutor
+
+        gate = threading.Event()
+        executor = BlockingCallExecutor(max_workers=1, default_timeout=10, name="cancel-test")
+
+        async def scenario():
+            # The second call waits in the queue behind the first and is cancelled there
+            running = asyncio.create_task(executor.run(gate.wait))
+            queued = asyncio.create_task(executor.run(lambda: "never"))
+            await asyncio.sleep(0.05)
+            depth_before = executor.stats()["queue_depth"]
+            queued.cancel()
+            await asyncio.gather(queued, return_exceptions=True)
+            gate.set()
+            await running
+            return depth_before
+
+        depth_before = asyncio.run(scenario())
+        stats = executor.stats()
+        assert depth_before == 1 and stats["queue_depth"] == 0 and stats["running"] == 0, stats
+        log_test("VoiceAgent", "Cancelled queued executor call", "PASS", "Queue depth returns to 0 after cancellation")
+    except Exception as e:
+        log_test("VoiceAgent", "Cancelled queued executor call", "FAIL", str(e), traceback.format_exc())
+
+
+def test_mailbox_mirror():
+    """Test 9: Local mailbox mirror with incremental sync"""
+    print("\n" + "="*70)
+    print("TEST 9: LOCAL MAILBOX MIRROR")
+    print("="*70)
+
+    import asyncio
+
+    try:
+        from voice_agent.adapters.email.mirrored_adapter import MirroredEmailAdapter
+
+        service, gmail = fake_gmail(30)
+        adapter = MirroredEmailAdapter(gmail, max_staleness_seconds=0)
+
+        async def scenario():
+            first = await adapter.sync()
+            service.add_message(sender="jane@partner.com", subject="Board deck")
+            read_thread = service.messages["msg000001"]["threadId"]
+            service.users().threads().modify(userId="me", id=read_thread, body={"removeLabelIds": ["UNREAD"]}).execute()
+            service.delete_message("msg000002")
+            second = await adapter.sync()
+
+            calls_before = service.calls
+            threads = await adapter.fetch_threads(max_results=50)
+            unread = await adapter.fetch_threads(max_results=50, unread_only=True)
+            history = await adapter.get_sender_history("jane@partner.com")
+            # max_staleness_seconds=0: each query above ran one history.list
+            # and nothing else against Gmail
+            live_calls = service.calls - calls_before
+
+            # The change is recorded, then Gmail drops that history
+            service.add_message(sender="late@partner.com", subject="Before expiry")
+            service.expire_history()
+            third = await adapter.sync()
+            return first, second, third, threads, unread, history, live_calls
+
+        first, second, third, threads, unread, history, live_calls = asyncio.run(scenario())
+        assert first["mode"] == "full" and first["added"] == 30
+        assert second["mode"] == "incremental" and second["added"] == 1 and second["deleted"] == 1
+        assert len(threads) == 30 and threads[0]["subject"] == "Board deck"
+        assert len(unread) == 29
+        assert history["interaction_count"] == 1
+        assert live_calls == 3, f"expected 3 history.list calls, saw {live_calls}"
+        assert third["mode"] == "full" and third["reason"] == "history_expired" and third["added"] == 31
+        log_test("VoiceAgent", "Mailbox mirror sync", "PASS",
+                f"Full sync {first['elapsed_ms']} ms, incremental {second['elapsed_ms']} ms, resync after history expiry")
+    except Exception as e:
+        log_test("VoiceAgent", "Mailbox mirror sync", "FAIL", str(e), traceback.format_exc())
+
+    try:
+        from voice_agent.adapters.email.mirrored_adapter import MirroredEmailAdapter
+        from voice_agent.utils.email_query import compile_gmail_query
+
+        service, gmail = fake_gmail(300, latency=0.02)
+        adapter = MirroredEmailAdapter(gmail, max_staleness_seconds=0)
+
+        async def scenario():
+            # The first query is answered by Gmail; the full sync runs behind it
+            first = await adapter.search_page("from:sender7@partner.com", limit=5)
+            running = adapter.get_mirror_stats()["initial_sync_running"]
+            await adapter._initial_sync_task
+            second = await adapter.search_page("from:sender7@partner.com", limit=5)
+            service.latency = 0
+
+            # A sub-request that keeps failing abandons the sync without
+            # moving the historyId past the message it lost
+            adapter.engine.fetch_retry_backoff = 0.01
+            synced_to = adapter.mirror.history_id
+            service.add_message(sender="jane@partner.com", subject="Board deck")
+            service.get_failures = [503] * (adapter.engine.fetch_retries + 1)
+            try:
+                await adapter.sync()
+                failed_sync = False
+            except Exception:
+                failed_sync = True
+            kept = adapter.mirror.history_id == synced_to
+            retried = await adapter.sync()
+
+            # A transient failure is retried within the same sync
+            service.add_message(sender="lee@partner.com", subject="Offsite")
+            service.get_failures = [429, 503]
+            recovered = await adapter.sync()
+            return first, running, second, failed_sync, kept, retried, recovered
+
+        first, running, second, failed_sync, kept, retried, recovered = asyncio.run(scenario())
+        assert first["source"] == "gmail" and running, (first["source"], running)
+        assert second["source"] == "index" and second["threads"][0]["subject"] == "Update 7"
+        assert failed_sync and kept, "history_id advanced past a failed fetch"
+        assert retried["mode"] == "incremental" and retried["added"] == 1
+        assert adapter.mirror.search_threads(compile_gmail_query("from:jane@partner.com"))[0], \
+            "retried sync did not mirror the message"
+        assert recovered["added"] == 1 and not service.get_failures, recovered
+        log_test("VoiceAgent", "Mailbox mirror background sync and batch failures", "PASS",
+                "First query served by Gmail during the initial sync; transient failures retried, persistent ones abort")
+    except Exception as e:
+        log_test("VoiceAgent", "Mailbox mirror background sync and batch failures", "FAIL", str(e), traceback.format_exc())
+
+    try:
+        import threading
+        from voice_agent.adapters.email.mailbox_mirror import FULL_SYNC_PAGE_SIZE, MailboxMirror, MailboxSyncEngine
+
+        service, gmail = fake_gmail(2 * FULL_SYNC_PAGE_SIZE + 10)
+        mirror = MailboxMirror()
+        engine = MailboxSyncEngine(gmail, mirror)
+
+        # Each page is written on a worker thread before the historyId is set
+        pages = []
+        upsert_messages = mirror.upsert_messages
+
+        def record_page(messages):
+            pages.append((len(messages), mirror.history_id, threading.current_thread() is threading.main_thread()))
+            upsert_messages(messages)
+        mirror.upsert_messages = record_page
+
+        async def scenario():
+            first = await engine.full_sync()
+            service.delete_message("msg000003")
+            service.expire_history()
+            return first, await engine.sync()
+
+        first, resync = asyncio.run(scenario())
+        assert [size for size, _, _ in pages[:3]] == [FULL_SYNC_PAGE_SIZE, FULL_SYNC_PAGE_SIZE, 10], pages
+        assert all(history_id is None for _, history_id, _ in pages[:3]), "historyId stored before the last page"
+        assert not any(on_loop for _, _, on_loop in pages), "page written on the event loop thread"
+        assert first["added"] == 2 * FULL_SYNC_PAGE_SIZE + 10 and mirror.history_id is not None
+        assert resync["reason"] == "history_expired" and resync["deleted"] == 1
+        assert not mirror.has_message("msg000003")
+        log_test("VoiceAgent", "Mailbox mirror paged full sync", "PASS",
+                f"{len(pages[:3])} pages written off the event loop, historyId stored after the last one")
+    except Exception as e:
+        log_test("VoiceAgent", "Mailbox mirror paged full sync", "FAIL", str(e), traceback.format_exc())
+
+
+def test_email_search_index():
+    """Test 10: Full-text email search over the local mirror"""
+    print("\n" + "="*70)
+    print("TEST 10: EMAIL SEARCH INDEX")
+    print("="*70)
+
+    import asyncio
+    import time
+
+    try:
+        from voice_agent.adapters.email.mirrored_adapter import MirroredEmailAdapter
+        from voice_agent.utils.email_query import parse_email_nl_to_gmail_query
+
+        service, gmail = fake_gmail()
+        for i in range(2000):
+            service.add_message(sender=f"colleague{i}@company.com", subject=f"Weekly sync {i}", body="Notes from the weekly sync")
+        for i in range(12):
+            service.add_message(sender=f"Talent Team <talent{i}@acme.com>", subject="Opportunity", body="We are hiring a VP")
+        service.add_message(sender="cfo@company.com", subject="Q4 budget", body="The revised budget forecast is attached")
+        adapter = MirroredEmailAdapter(gmail, max_staleness_seconds=3600)
+
+        async def scenario():
+            await adapter.sync()
+
+            query = parse_email_nl_to_gmail_query("show me emails from recruiters")
+            started = time.perf_counter()
+            first = await adapter.search_page(query, limit=10)
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            second = await adapter.search_page(query, limit=10, offset=first["next_offset"])
+
+            # Gmail unreachable: searches keep working from the index
+            def offline(*args, **kwargs):
+                raise ConnectionError("network down")
+            service.users = offline
+            adapter.max_staleness_seconds = 0
+            body_hit = await adapter.search_page(parse_email_nl_to_gmail_query("forecast"), limit=10)
+            return first, second, body_hit, elapsed_ms
+
+        first, second, body_hit, elapsed_ms = asyncio.run(scenario())
+        assert first["source"] == "index" and len(first["threads"]) == 10
+        assert all("Talent" in t["from"] for t in first["threads"])
+        assert len(second["threads"]) == 2 and second["next_offset"] is None
+        assert [t["subject"] for t in body_hit["threads"]] == ["Q4 budget"]
+        assert elapsed_ms < 50, f"search took {elapsed_ms:.1f} ms"
+        log_test("VoiceAgent", "Email search index", "PASS",
+                f"Ranked, paginated search over 2013 messages in {elapsed_ms:.1f} ms, offline body search works")
+    except Exception as e:
+        log_test("VoiceAgent", "Email search index", "FAIL", str(e), traceback.format_exc())
+
+    try:
+        from voice_agent.utils.email_query import compile_gmail_query
+
+        compiled = compile_gmail_query("in:inbox is:unread from:(recruiter or hiring)")
+        assert compiled.labels == ["INBOX"] and compiled.unread_only
+        assert compiled.match == 'sender : ("recruiter"* OR "hiring"*)', compiled.match
+        assert compile_gmail_query("label:starred budget").labels == ["STARRED"]
+        # Not answerable from the mirror: fall back to Gmail
+        for query in ("in:anywhere budget", "in:all budget", "in:trash", "label:Clients",
+                      "label:Label_12", "budget or forecast", "budget OR forecast", "newer_than:7d"):
+            assert compile_gmail_query(query) is None, query
+        log_test("VoiceAgent", "Gmail query compiler", "PASS",
+                "System labels and OR-groups compiled; user labels, in:anywhere and top-level OR fall back to Gmail")
+    except Exception as e:
+        log_test("VoiceAgent", "Gmail query compiler", "FAIL", str(e), traceback.format_exc())
+
+
+def test_bulk_email_operations():
+    """Test 11: Bulk archive / mark-read through messages.batchModify"""
+    print("\n" + "="*70)
+    print("TEST 11: BULK EMAIL OPERATIONS")
+    print("="*70)
+
+    import asyncio
+
+    try:
+        from voice_agent.adapters.email.mirrored_adapter import MirroredEmailAdapter
+
+        service, gmail = fake_gmail()
+        for i in range(200):
+            service.add_message(sender="news@acme.com", subject=f"Newsletter {i}", body="This week at Acme")
+        service.add_message(sender="cfo@company.com", subject="Q4 budget", body="Please review")
+
+        mirrored = MirroredEmailAdapter(gmail, max_staleness_seconds=3600)
+
+        async def scenario():
+            await mirrored.sync()
+            newsletters = await mirrored.search_emails("from:news@acme.com", max_results=500)
+            thread_ids = [t["thread_id"] for t in newsletters]
+
+            calls_before = service.calls
+            archived = await mirrored.bulk_archive(thread_ids)
+            mirrored_calls = service.calls - calls_before
+            inbox = await mirrored.fetch_threads(max_results=500)
+
+            # Without the mirror: message ids come from batched threads.get
+            calls_before = service.calls
+            marked = await gmail.bulk_mark_read(thread_ids)
+            live_calls = service.calls - calls_before
+            return archived, mirrored_calls, inbox, marked, live_calls
+
+        archived, mirrored_calls, inbox, marked, live_calls = asyncio.run(scenario())
+        assert archived["success"] and archived["modified_threads"] == 200
+        assert mirrored_calls == 1, f"{mirrored_calls} Gmail calls for a mirrored bulk archive"
+        assert [t["subject"] for t in inbox] == ["Q4 budget"]
+        assert marked["success"] and live_calls == 3, f"{live_calls} Gmail calls without the mirror"
+        newsletter_labels = [m["labelIds"] for m in service.messages.values()
+                             if m["payload"]["headers"][0]["value"] == "news@acme.com"]
+        assert newsletter_labels and not any("INBOX" in l or "UNREAD" in l for l in newsletter_labels)
+        log_test("VoiceAgent", "Bulk email operations", "PASS",
+                f"Archived 200 threads in {mirrored_calls} batchModify call; mark-read without mirror took {live_calls} calls")
+    except Exception as e:
+        log_test("VoiceAgent", "Bulk email operations", "FAIL", str(e), traceback.format_exc())
+
+    try:
+        import voice_agent.graph  # noqa: F401  (import order avoids a circular import)
+        from voice_agent.agents.draft_agent import DraftGenerationAgent
+
+        searched = []
+
+        class Email:
+            async def search_emails(self, query, max_results=50):
+                searched.append(query)
+                return [{"thread_id": f"t{i}", "subject": "Newsletter"} for i in range(3)]
+
+        agent = DraftGenerationAgent(email_adapter=Email(), llm=object())
+
+        def proposals(query):
+            state = asyncio.run(agent.run({"intent": "archive_email", "user_query": query, "recommended_action": ""}))
+            return [action["query"] for action in state.get("bulk_actions", [])]
+
+        assert proposals("Archive all newsletters from acme.com") == ["in:inbox from:(acme.com)"]
+        assert proposals("mark all unread newsletters as read") == ["is:unread newsletters"]
+        # No bulk wording, or nothing left to filter by: never sweep the inbox
+        for query in ("archive the newsletters", "archive all my emails", "archive everything in my inbox",
+                      "delete my 3pm meeting tomorrow"):
+            assert proposals(query) == [], query
+        assert len(searched) == 2, searched
+        log_test("VoiceAgent", "Bulk action proposals", "PASS",
+                "Proposed only for explicit bulk requests with a non-empty filter")
+    except Exception as e:
+        log_test("VoiceAgent", "Bulk action proposals", "FAIL", str(e), traceback.format_exc())
+
+
+def test_outbound_email_queue():
+    """Test 12: Durable outbound queue with retries, idempotency and rate limiting"""
+    print("\n" + "="*70)
+    print("TEST 12: OUTBOUND EMAIL QUEUE")
+    print("="*70)
+
+    import asyncio
+    import tempfile
+    import time
+
+    try:
+        from voice_agent.adapters.email.outbound_queue import OutboundEmailQueue
+
+        service, gmail = fake_gmail(latency=0.3)
+        db_path = os.path.join(tempfile.mkdtemp(), "outbound.sqlite3")
+
+        async def scenario():
+            queue = OutboundEmailQueue(gmail, db_path=db_path, base_backoff_seconds=0.02)
+
+            # Enqueue returns before the (slow) Gmail send happens
+            service.send_failures = [503, 429]
+            started = time.perf_counter()
+            record = await queue.enqueue(["a@b.com"], "Q4", "Numbers attached", idempotency_key="draft_1")
+            enqueue_ms = (time.perf_counter() - started) * 1000
+            duplicate = await queue.enqueue(["a@b.com"], "Q4", "Numbers attached", idempotency_key="draft_1")
+            sent = await queue.wait_for(record["outbox_id"], timeout=10)
+
+            # Permanent errors are not retried
+            service.send_failures = [400]
+            rejected = await queue.enqueue(["bad"], "Hi", "x", idempotency_key="draft_2")
+            failed = await queue.wait_for(rejected["outbox_id"], timeout=10)
+            await queue.stop()
+
+            # Rate limiting: 2 sends/s with no burst spaces sends 0.5s apart
+            service.latency = 0
+            limited = OutboundEmailQueue(gmail, sends_per_second=2.0, burst=1, workers=4)
+            started = time.perf_counter()
+            records = [await limited.enqueue(["a@b.com"], f"Update {i}", "x") for i in range(4)]
+            for r in records:
+                await limited.wait_for(r["outbox_id"], timeout=10)
+            rate_limited_s = time.perf_counter() - started
+            await limited.stop()
+
+            # Queued mail survives a restart
+            queue = OutboundEmailQueue(gmail, db_path=db_path)
+            await queue.stop()
+            queue._conn.execute("INSERT INTO outbound_emails (id, idempotency_key, payload, status, next_attempt_at, "
+                                "created_at, updated_at) VALUES ('out_x', 'draft_3', ?, 'sending', 0, 0, 0)",
+                                ('{"to": ["c@d.com"], "subject": "s", "body": "b"}',))
+            queue._conn.commit()
+            queue.close()
+            restarted = OutboundEmailQueue(gmail, db_path=db_path)
+            recovered = await restarted.wait_for("draft_3", timeout=10)
+            await restarted.stop()
+            return enqueue_ms, record, duplicate, sent, failed, rate_limited_s, recovered
+
+        enqueue_ms, record, duplicate, sent, failed, rate_limited_s, recovered = asyncio.run(scenario())
+        assert enqueue_ms < 100, f"enqueue took {enqueue_ms:.0f} ms"
+        assert record["status"] == "queued" and duplicate["duplicate"] and duplicate["outbox_id"] == record["outbox_id"]
+        assert sent["status"] == "sent" and sent["attempts"] == 3 and sent["message_id"]
+        assert failed["status"] == "failed" and failed["attempts"] == 1
+        assert rate_limited_s >= 1.4, f"4 sends took {rate_limited_s:.2f}s"
+        assert recovered["status"] == "sent"
+        log_test("VoiceAgent", "Outbound email queue", "PASS",
+                f"Enqueue {enqueue_ms:.1f} ms, sent after 2 transient failures, permanent failure not retried, "
+                f"rate limit held, queued mail survives restart")
+    except Exception as e:
+        log_test("VoiceAgent", "Outbound email queue", "FAIL", str(e), traceback.format_exc())
+
+    try:
+        from voice_agent.adapters.email.outbound_queue import OutboundEmailQueue
+        from voice_agent.models.settings import SystemSettings
+
+        async def scenario():
+            queue = OutboundEmailQueue(fake_gmail()[1], base_backoff_seconds=0.4, workers=1)
+            deliver = queue._deliver
+            crashes = []
+
+            async def flaky_deliver(job):
+                # The first delivery fails outside send_email
+                if not crashes:
+                    crashes.append(job["id"])
+                    raise RuntimeError("disk I/O error")
+                await deliver(job)
+
+            queue._deliver = flaky_deliver
+            record = await queue.enqueue(["a@b.com"], "Hi", "x")
+            await asyncio.sleep(0.1)
+            crashed = queue.get_status(record["outbox_id"])
+            sent = await queue.wait_for(record["outbox_id"], timeout=10)
+            workers = queue.stats()["workers_running"]
+            await queue.stop()
+            return crashed, sent, workers
+
+        crashed, sent, workers = asyncio.run(scenario())
+        assert crashed["status"] == "retrying" and crashed["last_error"] == "disk I/O error"
+        assert sent["status"] == "sent" and sent["attempts"] == 2 and workers == 1
+
+        data_dir = tempfile.mkdtemp()
+        settings = SystemSettings(data_dir=data_dir, mailbox_mirror_path=":memory:")
+        assert settings.outbound_queue_path == os.path.join(data_dir, "outbound_queue.sqlite3")
+        assert settings.mailbox_mirror_path == ":memory:"
+        assert SystemSettings(outbound_queue_path="/srv/q.sqlite3").outbound_queue_path == "/srv/q.sqlite3"
+        log_test("VoiceAgent", "Outbound queue worker errors and data dir", "PASS",
+                "Worker survives a delivery error and retries the job; relative store paths resolve under data_dir")
+    except Exception as e:
+        log_test("VoiceAgent", "Outbound queue worker errors and data dir", "FAIL", str(e), traceback.format_exc())
+
+    try:
+        import threading
+        from voice_agent.adapters.email.outbound_queue import OutboundEmailQueue
+
+        # SQLite calls from enqueue and the workers run off the event loop thread
+        db_calls = []
+        queue = OutboundEmailQueue(fake_gmail()[1], workers=1)
+        for name in ("_insert", "_claim_next", "_update"):
+            def recorded(*args, _name=name, _method=getattr(queue, name), **kwargs):
+                db_calls.append((_name, threading.current_thread() is threading.main_thread()))
+                return _method(*args, **kwargs)
+            setattr(queue, name, recorded)
+
+        async def scenario():
+            record = await queue.enqueue(["a@b.com"], "Hi", "x")
+            sent = await queue.wait_for(record["outbox_id"], timeout=10)
+            await queue.stop()
+            # A worker cancelled after the send was recorded keeps it 'sent'
+            queue._release(record["outbox_id"])
+            return sent, queue.get_status(record["outbox_id"])
+
+        sent, after_release = asyncio.run(scenario())
+        assert {name for name, _ in db_calls} == {"_insert", "_claim_next", "_update"}, db_calls
+        assert not any(on_loop for _, on_loop in db_calls), f"SQLite call on the event loop: {db_calls}"
+        assert sent["status"] == "sent" and after_release["status"] == "sent"
+        log_test("VoiceAgent", "Outbound queue writes off the event loop", "PASS",
+                f"{len(db_calls)} SQLite calls ran on worker threads; cancellation never un-sends a message")
+    except Exception as e:
+        log_test("VoiceAgent", "Outbound queue writes off the event loop", "FAIL", str(e), traceback.format_exc())
+
+
+def test_streaming_attachments():
+    """Test 13: Attachments streamed into a resumable upload with bounded memory"""
+    print("\n" + "="*70)
+    print("TEST 13: STREAMING ATTACHMENTS")
+    print("="*70)
+
+    import asyncio
+    import email
+    import io
+    import resource
+    import shutil
+    import tempfile
+
+    tmp_dir = tempfile.mkdtemp()
+    try:
+
+        service, adapter = fake_gmail()
+        adapter.upload_retry_backoff = 0
+
+        # 300 MB synthetic file, written 1 MB at a time
+        big_path = os.path.join(tmp_dir, "scan_archive.bin")
+        block = os.urandom(1024 * 1024)
+        with open(big_path, "wb") as f:
+            for _ in range(300):
+                f.write(block)
+        payload = os.urandom(3 * 1024 * 1024 + 7)
+
+        async def scenario():
+            # Oversized messages are rejected up front, before spooling
+            too_big = await adapter.send_email(["cfo@company.com"], "Archive", "Attached", attachments=[{"path": big_path}])
+
+            adapter.max_upload_bytes = None
+            service.upload_failures = [503]  # one chunk fails and is resumed
+            rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            big = await adapter.send_email(["cfo@company.com"], "Archive", "Attached", attachments=[{"path": big_path}])
+            rss_growth_mb = (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - rss_before) / 1024
+            big_upload = service.uploads[-1]
+
+            small = await adapter.send_email(
+                ["cfo@company.com"], "Figures", "See attached",
+                attachments=[{"stream": io.BufferedReader(io.BytesIO(payload), buffer_size=1000), "filename": "figures.xlsx"}]
+            )
+            return too_big, big, rss_growth_mb, big_upload, small, service.uploads[-1]
+
+        too_big, big, rss_growth_mb, big_upload, small, small_upload = asyncio.run(scenario())
+        assert not too_big["success"] and too_big["retryable"] is False
+        assert big["success"] and big_upload["bytes"] > 400 * 1024 * 1024 and big_upload["chunks"] > 50
+        assert rss_growth_mb < 100, f"peak RSS grew {rss_growth_mb:.0f} MB"
+        parts = list(email.message_from_bytes(small_upload["raw"]).walk())
+        assert small["success"] and parts[2].get_filename() == "figures.xlsx"
+        assert parts[2].get_payload(decode=True) == payload
+        assert not any(name.startswith("gmail_send_") for name in os.listdir(tempfile.gettempdir()))
+        log_test("VoiceAgent", "Streaming attachments", "PASS",
+                f"300 MB attachment sent in {big_upload['chunks']} resumable chunks, "
+                f"peak RSS grew {rss_growth_mb:.0f} MB")
+    except Exception as e:
+        log_test("VoiceAgent", "Streaming attachments", "FAIL", str(e), traceback.format_exc())
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    try:
+
+        # A chunk still running when the executor times out is not retried
+        service, adapter = fake_gmail(latency=0.3)
+        adapter.upload_timeout = 0.1
+        adapter.upload_retry_backoff = 0
+
+        async def scenario():
+            result = await adapter.send_email(
+                ["cfo@company.com"], "Figures", "See attached",
+                attachments=[{"stream": io.BytesIO(b"x" * 1024), "filename": "figures.xlsx"}]
+            )
+            await asyncio.sleep(0.4)
+            return result
+
+        timed_out = asyncio.run(scenario())
+        assert not timed_out["success"] and "timed out" in timed_out["error"]
+        assert service.calls == 1, f"{service.calls} chunk calls"
+        log_test("VoiceAgent", "Upload chunk timeout", "PASS",
+                "Timed-out chunk ends the upload without a concurrent retry")
+    except Exception as e:
+        log_test("VoiceAgent", "Upload chunk timeout", "FAIL", str(e), traceback.format_exc())
+
+
+
+def test_email_body_extraction():
+    """Test 14: Body extraction from nested MIME with a capped HTML-to-text pass"""
+    print("\n" + "="*70)
+    print("TEST 14: EMAIL BODY EXTRACTION")
+    print("="*70)
+
+    import base64
+
+    def part(mime_type, text, filename=""):
+        data = base64.urlsafe_b64encode(text.encode()).decode()
+        return {"mimeType": mime_type, "filename": filename, "body": {"data": data}}
+
+    try:
+        from voice_agent.adapters.email.gmail_adapter_helpers import get_message_body
+        from voice_agent.utils.html_text import html_to_text
+
+        # multipart/mixed > multipart/related > multipart/alternative (html only) + attachment
+        html_body = (
+            "<html><head><style>p { color: red }</style></head><body>"
+            "<p>Quarterly&nbsp;results</p><ul><li>Revenue up</li><li>Costs down</li></ul>"
+            "<!-- tracking --><script>track()</script></body></html>"
+        )
+        nested = {
+            "mimeType": "multipart/mixed",
+            "parts": [
+                {"mimeType": "multipart/related", "parts": [
+                    {"mimeType": "multipart/alternative", "parts": [part("text/html", html_body)]},
+                    part("image/png", "png-bytes", filename="logo.png"),
+                ]},
+                part("text/plain", "attachment text", filename="notes.txt"),
+            ]
+        }
+        text = get_message_body(nested)
+        assert text == "Quarterly results\n- Revenue up\n- Costs down", repr(text)
+
+        # text/plain wins over text/html in the same alternative
+        alternative = {"mimeType": "multipart/alternative",
+                       "parts": [part("text/html", "<p>html</p>"), part("text/plain", "plain")]}
+        assert get_message_body(alternative) == "plain"
+
+        # Output is capped, and chunked input converts the same as one string
+        long_html = "<tr><td>row</td></tr>" * 50000
+        capped = get_message_body(part("text/html", long_html), max_chars=1000)
+        assert len(capped) <= 1000
+        chunks = [html_body[i:i + 7] for i in range(0, len(html_body), 7)]
+        assert html_to_text(chunks) == html_to_text(html_body)
+        log_test("VoiceAgent", "Email body extraction", "PASS",
+                f"Nested HTML part found and converted; {len(long_html)} chars of HTML capped at {len(capped)}")
+    except Exception as e:
+        log_test("VoiceAgent", "Email body extraction", "FAIL", str(e), traceback.format_exc())
+
+def test_calendar_event_cache():
+    """Test 15: Calendar views served from a synced interval-indexed event store"""
+    print("\n" + "="*70)
+    print("TEST 15: CALENDAR EVENT CACHE")
+    print("="*70)
+
+    import asyncio
+    import random
+    from datetime import datetime, timedelta, timezone
+
+    try:
+
+        service, adapter = fake_calendar(max_staleness_seconds=3600)
+        base = datetime(2025, 1, 1, tzinfo=timezone.utc)
+        rng = random.Random(7)
+        for i in range(3000):
+            start = base + timedelta(minutes=15 * rng.randrange(365 * 96))
+            service.add_event(f"Meeting {i}", start, start + timedelta(minutes=rng.choice([15, 30, 60, 240])))
+        # Multi-day offsite spanning the queried week
+        service.add_event("Offsite", base + timedelta(days=40), base + timedelta(days=50), all_day=True)
+
+        def brute_force(start, end):
+            ids = []
+            for r in service.calendars["primary"].values():
+                s, e = service._bounds(r)
+                if r["status"] != "cancelled" and s < end and e > start:
+                    ids.append(r["id"])
+            return sorted(ids)
+
+        async def scenario():
+            week = (base + timedelta(days=42), base + timedelta(days=49))
+            events = await adapter.get_events(*week)
+            after_full_sync = service.calls
+            assert sorted(e["event_id"] for e in events) == brute_force(*week)
+
+            # Day views are local lookups: no further API calls
+            for day in range(30):
+                start = base + timedelta(days=day)
+                day_events = await adapter.get_events(start, start + timedelta(days=1))
+                assert sorted(e["event_id"] for e in day_events) == brute_force(start, start + timedelta(days=1))
+            assert service.calls == after_full_sync
+
+            # Changes arrive through one incremental events.list call
+            added = service.add_event("Board prep", week[0] + timedelta(hours=10), week[0] + timedelta(hours=11))
+            cancelled = events[0]["event_id"]
+            service.cancel_event(cancelled)
+            summary = await adapter.sync()
+            refreshed = {e["event_id"] for e in await adapter.get_events(*week)}
+
+            service.expire_sync_tokens()
+            expired = await adapter.sync()
+            return events, after_full_sync, summary, refreshed, added, cancelled, expired, week
+
+        events, full_calls, summary, refreshed, added, cancelled, expired, week = asyncio.run(scenario())
+        assert any(e["title"] == "Offsite" for e in events)
+        assert summary["mode"] == "incremental" and summary["pages"] == 1
+        assert summary["updated"] == 1 and summary["deleted"] == 1
+        assert added["id"] in refreshed and cancelled not in refreshed
+        assert expired["mode"] == "full" and expired["reason"] == "sync_token_expired"
+        log_test("VoiceAgent", "Calendar event cache", "PASS",
+                f"{full_calls} list pages for the initial sync, 30 day views served locally, "
+                f"incremental sync in {summary['pages']} call")
+    except Exception as e:
+        log_test("VoiceAgent", "Calendar event cache", "FAIL", str(e), traceback.format_exc())
+
+def test_calendar_availability():
+    """Test 16: Multi-attendee slot finder over free/busy bitmaps with block rules"""
+    print("\n" + "="*70)
+    print("TEST 16: CALENDAR AVAILABILITY")
+    print("="*70)
+
+    import asyncio
+    import random
+    import time
+    from datetime import datetime, timedelta, timezone
+
+    try:
+        from voice_agent.adapters.calendar.availability import AvailabilityEngine
+
+        service, adapter = fake_calendar()
+        start = datetime(2025, 3, 3, tzinfo=timezone.utc)  # a Monday
+        end = start + timedelta(days=30)
+        rng = random.Random(3)
+        attendees = [f"exec{i}@company.com" for i in range(20)]
+        for calendar_id in ["primary", *attendees]:
+            for _ in range(60):
+                begin = start + timedelta(minutes=30 * rng.randrange(30 * 48))
+                service.add_event("Busy", begin, begin + timedelta(minutes=rng.choice([30, 60, 90])), calendar_id=calendar_id)
+
+        engine = AvailabilityEngine(["Friday 14:00-18:00 avoid", "Weekdays 12:00-13:00 block"])
+
+        busy = asyncio.run(adapter.get_free_busy(["primary", *attendees], start, end))
+        started = time.perf_counter()
+        slots = engine.find_slots(busy, start, end, duration_minutes=60, max_results=5)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+
+        assert len(slots) == 5 and slots == sorted(slots, key=lambda s: -s["score"])
+        for slot in slots:
+            slot_start, slot_end = datetime.fromisoformat(slot["start"]), datetime.fromisoformat(slot["end"])
+            assert 9 <= slot_start.hour and slot_end.hour <= 18 and slot_start.weekday() < 5
+            assert not (slot_start.hour < 13 and slot_end.hour > 12 or slot_end.hour == 13 and slot_end.minute)
+            for intervals in busy.values():
+                for b_start, b_end in intervals:
+                    assert not (datetime.fromisoformat(b_start) < slot_end and datetime.fromisoformat(b_end) > slot_start)
+
+        # Free Friday afternoon is offered only after the free morning
+        friday = start + timedelta(days=4)
+        ranked = engine.find_slots({}, friday + timedelta(hours=9), friday + timedelta(hours=18), duration_minutes=60, max_results=8)
+        assert [s["avoided_rules"] for s in ranked[:3]] == [[], [], []]
+        assert ranked[-1]["avoided_rules"] == ["Friday 14:00-18:00 avoid"]
+
+        # check_availability reports the conflicting event
+        first = busy["primary"][0]
+        conflict = asyncio.run(adapter.check_availability(datetime.fromisoformat(first[0]), datetime.fromisoformat(first[1])))
+        assert conflict["available"] is False and conflict["conflicting_events"]
+        assert elapsed_ms < 250, f"slot search took {elapsed_ms:.0f} ms"
+
+        # Working hours follow the wall clock on a DST day (US clocks go forward on Sunday 2025-03-09)
+        new_york = AvailabilityEngine(time_zone="America/New_York", working_days=range(7))
+        sunday = datetime(2025, 3, 9, 5, tzinfo=timezone.utc)  # local midnight
+        dst_slot = new_york.find_slots({}, sunday, sunday + timedelta(hours=23), max_results=1)[0]
+        assert dst_slot["start"] == "2025-03-09T09:00:00-04:00", dst_slot["start"]
+        log_test("VoiceAgent", "Calendar availability", "PASS",
+                f"30 days x 21 calendars searched in {elapsed_ms:.1f} ms; best slot {slots[0]['start']}")
+    except Exception as e:
+        log_test("VoiceAgent", "Calendar availability", "FAIL", str(e), traceback.format_exc())
+
+def test_recurring_events():
+    """Test 17: Local expansion of recurring series with exceptions and window memoization"""
+    print("\n" + "="*70)
+    print("TEST 17: RECURRING EVENTS")
+    print("="*70)
+
+    import asyncio
+    import time
+    from datetime import datetime, timedelta
+    from zoneinfo import ZoneInfo
+
+    try:
+
+        new_york = ZoneInfo("America/New_York")
+        service, adapter = fake_calendar()
+        google = adapter.calendar
+        first = datetime(2026, 1, 5, 9, tzinfo=new_york)  # a Monday
+        rules = ["RRULE:FREQ=DAILY;BYDAY=MO,TU,WE,TH,FR", "RRULE:FREQ=WEEKLY;BYDAY=TU", "RRULE:FREQ=MONTHLY;BYMONTHDAY=15"]
+        for i in range(300):
+            begin = first + timedelta(minutes=30 * (i % 16))
+            service.add_recurring_event(f"Series {i}", begin, begin + timedelta(minutes=30),
+                                        [rules[i % 3]], time_zone="America/New_York")
+        standup = service.add_recurring_event(
+            "Standup", first, first + timedelta(minutes=15),
+            ["RRULE:FREQ=WEEKLY;BYDAY=MO,WE;UNTIL=20260630T000000Z", "EXDATE;TZID=America/New_York:20260107T090000"],
+            time_zone="America/New_York"
+        )
+        moved = service.override_instance(standup["id"], datetime(2026, 3, 9, 9, tzinfo=new_york),
+                                          new_start=datetime(2026, 3, 9, 14, tzinfo=new_york))
+        service.override_instance(standup["id"], datetime(2026, 3, 11, 9, tzinfo=new_york), cancel=True)
+
+        window = (first, first + timedelta(days=182))
+        summary = asyncio.run(adapter.sync())
+        assert summary["added"] == 303, summary
+
+        started = time.perf_counter()
+        cold = asyncio.run(adapter.get_events(*window))
+        cold_ms = (time.perf_counter() - started) * 1000
+        started = time.perf_counter()
+        warm = asyncio.run(adapter.get_events(*window))
+        warm_ms = (time.perf_counter() - started) * 1000
+        assert cold == warm and len(cold) > 15000, len(cold)
+
+        standups = [e for e in cold if e["recurring_event_id"] == standup["id"]]
+        starts = [datetime.fromisoformat(e["start"]) for e in standups]
+        # 09:00 local on both sides of the March DST change
+        assert all(s.hour == 9 for s in starts if s.date() != datetime(2026, 3, 9).date())
+        assert {s.utcoffset() for s in starts} == {timedelta(hours=-5), timedelta(hours=-4)}
+        dates = {s.date().isoformat() for s in starts}
+        assert "2026-01-07" not in dates and "2026-03-11" not in dates and max(dates) <= "2026-06-29"
+        assert [e["event_id"] for e in standups if e["start"].startswith("2026-03-09")] == [moved["id"]]
+        assert starts[[e["event_id"] for e in standups].index(moved["id"])].hour == 14
+
+        # The live API expansion agrees for a month
+        month = (datetime(2026, 3, 1, tzinfo=new_york), datetime(2026, 4, 1, tzinfo=new_york))
+        live = asyncio.run(google.get_events(*month))
+        local = asyncio.run(adapter.get_events(*month))
+        assert sorted((e["event_id"], e["start"]) for e in live) == sorted((e["event_id"], e["start"]) for e in local)
+
+        # A changed series is re-expanded, not served from the memo
+        service.update_event(standup["id"], summary="Team standup")
+        adapter.max_staleness_seconds = 0
+        renamed = [e for e in asyncio.run(adapter.get_events(*month)) if e["recurring_event_id"] == standup["id"]]
+        assert {e["title"] for e in renamed if e["event_id"] != moved["id"]} == {"Team standup"}
+
+        # Callers get copies; editing one doesn't change the cached expansion
+        renamed[0]["title"] = "Edited"
+        renamed[0]["attendees"].append("intruder@example.com")
+        again = [e for e in asyncio.run(adapter.get_events(*month)) if e["event_id"] == renamed[0]["event_id"]]
+        assert again[0]["title"] == "Team standup" and "intruder@example.com" not in again[0]["attendees"]
+
+        assert warm_ms < cold_ms, f"warm {warm_ms:.0f} ms vs cold {cold_ms:.0f} ms"
+        log_test("VoiceAgent", "Recurring events", "PASS",
+                f"{len(cold):,} instances of 301 series over 6 months; cold {cold_ms:.0f} ms, warm {warm_ms:.0f} ms")
+    except Exception as e:
+        log_test("VoiceAgent", "Recurring events", "FAIL", str(e), traceback.format_exc())
+
+def test_calendar_conflicts():
+    """Test 18: Sweep-line conflict detection for calendars and proposed slots"""
+    print("\n" + "="*70)
+    print("TEST 18: CALENDAR CONFLICT DETECTION")
+    print("="*70)
+
+    import asyncio
+    import random
+    import time
+    from datetime import datetime, timedelta, timezone
+
+    try:
+        from voice_agent.adapters.calendar.conflicts import ConflictDetector
+        import voice_agent.graph  # noqa: F401  (import order avoids a circular import)
+        from voice_agent.agents.draft_agent import DraftGenerationAgent
+
+        day = datetime(2025, 6, 2, tzinfo=timezone.utc)
+
+        def event(event_id, start_hour, minutes, location=""):
+            start = day + timedelta(hours=start_hour)
+            return {"event_id": event_id, "title": event_id, "start": start.isoformat(),
+                    "end": (start + timedelta(minutes=minutes)).isoformat(), "location": location}
+
+        events = [
+            event("board", 9, 60, "HQ Boardroom"),
+            event("ops", 10, 30, "Zoom https://zoom.us/j/1"),
+            event("sync", 10.5, 30),
+            event("lunch", 11.25, 60, "Downtown Bistro"),
+            event("clash", 11.5, 30, "Downtown Bistro"),
+        ]
+        detector = ConflictDetector(travel_buffer_minutes=30, max_back_to_back=3)
+        scan = detector.scan(events)
+        assert [o["event_ids"] for o in scan["overlaps"]] == [["lunch", "clash"]], scan["overlaps"]
+        assert scan["back_to_back_chains"][0]["event_ids"][:3] == ["board", "ops", "sync"]
+        assert scan["travel_violations"] == []  # video call between the two places
+
+        reports = detector.check(events, [
+            {"start": event("x", 10.25, 30)["start"], "end": event("x", 10.25, 30)["end"]},
+            {"start": event("x", 12.5, 30)["start"], "end": event("x", 12.5, 30)["end"], "location": "HQ Boardroom"},
+            {"start": event("x", 15, 60)["start"], "end": event("x", 15, 60)["end"]},
+            {"event_id": "clash", "start": event("x", 11.5, 30)["start"], "end": event("x", 11.5, 30)["end"]},
+        ])
+        assert [e["event_id"] for e in reports[0]["overlapping_events"]] == ["ops", "sync"]
+        assert reports[1]["travel_violations"][0]["from_event"] == "lunch" and not reports[1]["conflict"]
+        assert reports[2]["ok"] and reports[2]["back_to_back"]["chain_length"] == 1
+        # An invite is not in conflict with itself
+        assert [e["event_id"] for e in reports[3]["overlapping_events"]] == ["lunch"]
+
+        # One sweep agrees with pairwise checks on a busy month
+        rng = random.Random(11)
+        month = []
+        for i in range(3000):
+            start = day + timedelta(minutes=15 * rng.randrange(30 * 96))
+            month.append({"event_id": f"e{i}", "start": start.isoformat(),
+                          "end": (start + timedelta(minutes=rng.choice([15, 30, 60]))).isoformat()})
+        proposals = []
+        for _ in range(500):
+            start = day + timedelta(minutes=15 * rng.randrange(30 * 96))
+            proposals.append({"start": start.isoformat(), "end": (start + timedelta(minutes=45)).isoformat()})
+        started = time.perf_counter()
+        batch = detector.check(month, proposals)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        for proposal, report in zip(proposals, batch):
+            expected = {e["event_id"] for e in month if e["start"] < proposal["end"] and e["end"] > proposal["start"]}
+            assert {e["event_id"] for e in report["overlapping_events"]} == expected
+
+        # Draft agent flags the conflict and keeps only clear alternatives
+        service, adapter = fake_calendar()
+        for item in events:
+            service.add_event(item["event_id"], datetime.fromisoformat(item["start"]),
+                              datetime.fromisoformat(item["end"]), location=item["location"] or None)
+        invite = {**event("invite", 10, 60), "attendees": ["cfo@company.com"]}
+
+        class _Reply:
+            content = "Proposing another time."
+
+        class _LLM:
+            async def ainvoke(self, messages):
+                return _Reply()
+
+        agent = DraftGenerationAgent(calendar_adapter=adapter, conflict_detector=detector, llm=_LLM())
+        action = asyncio.run(agent._generate_calendar_action({
+            "calendar_events": [invite],
+            "recommended_action": "propose alternative",
+            "availability_slots": [
+                {"start": event("a", 11, 30)["start"], "end": event("a", 11, 30)["end"]},
+                {"start": event("b", 14, 60)["start"], "end": event("b", 14, 60)["end"]},
+            ]
+        }))
+        assert action["availability_conflict"] is True
+        assert [e["title"] for e in action["conflicts"]["overlapping_events"]] == ["ops", "sync"]
+        assert [slot["start"] for slot in action["alternative_times"]] == [event("b", 14, 60)["start"]]
+
+        log_test("VoiceAgent", "Calendar conflict detection", "PASS",
+                f"500 proposals vs 3,000 events in one sweep: {elapsed_ms:.1f} ms")
+    except Exception as e:
+        log_test("VoiceAgent", "Calendar conflict detection", "FAIL", str(e), traceback.format_exc())
+
+def test_session_store():
+    """Test 19: Bounded session stores with compact state projections"""
+    print("\n" + "="*70)
+    print("TEST 19: SESSION STORE")
+    print("="*70)
+
+    import asyncio
+    import json
+    import os
+    import tempfile
+
+    try:
+        from voice_agent.api import routes
+        from voice_agent.models.settings import SystemSettings
+        from voice_agent.storage.session_store import InMemorySessionStore, SQLiteSessionStore, session_record
+
+        state = {
+            "user_query": "Summarize my inbox",
+            "intent": "summarize",
+            "reasoning": "r" * 10000,
+            "email_threads": [
+                {"thread_id": f"t{i}", "from": "a@b.com", "subject": "Hi", "preview": "p",
+                 "messages": [{"body": "x" * 20000}]}
+                for i in range(20)
+            ],
+            "calendar_events": [{"event_id": "e1", "title": "Board", "start": "s", "end": "e", "description": "d" * 5000}],
+            "email_drafts": [{"draft_id": "d1", "body": "Thanks!"}],
+            "final_response": {"text": "Done", "intent": "summarize", "logs": [{"x": "y" * 5000}]},
+        }
+        record = session_record(state, user_id="ceo")
+        full_size, compact_size = len(json.dumps(state)), len(json.dumps(record))
+        assert compact_size < full_size / 50, (compact_size, full_size)
+        assert record["state"]["email_threads"][0] == {"thread_id": "t0", "from": "a@b.com", "subject": "Hi"}
+        assert record["state"]["email_drafts"] == state["email_drafts"]
+
+        now = [0.0]
+        memory = InMemorySessionStore(max_sessions=100, ttl_seconds=60, clock=lambda: now[0])
+        with tempfile.TemporaryDirectory() as tmp:
+            sqlite_store = SQLiteSessionStore(os.path.join(tmp, "sessions.sqlite3"), max_sessions=100,
+                                              ttl_seconds=60, sweep_interval_seconds=0, clock=lambda: now[0])
+            for store in (memory, sqlite_store):
+                now[0] = 0.0
+                for i in range(250):
+                    store.put(f"s{i}", record)
+                stats = store.stats()
+                assert stats["sessions"] == 100 and stats["evictions"] == 150, stats
+                assert store.get("s0") is None and store.get("s249")["user_id"] == "ceo"
+
+                now[0] = 30.0
+                store.get("s150")  # reading keeps a session alive
+                now[0] = 70.0
+                store.put("fresh", record)
+                assert store.get("s150") is not None and store.get("s151") is None
+                store.delete("fresh")
+                assert store.get("fresh") is None
+
+            # SQLite sessions survive a restart
+            sqlite_store.close()
+            reopened = SQLiteSessionStore(os.path.join(tmp, "sessions.sqlite3"), ttl_seconds=60, clock=lambda: now[0])
+            assert reopened.get("s150")["state"]["intent"] == "summarize"
+            reopened.close()
+
+        # The default SQLite path is under the data dir, not the working directory
+        settings = SystemSettings(data_dir=tmp)
+        assert settings.session_store_path == os.path.join(tmp, "sessions.sqlite3")
+
+        # The metrics route works with or without a real orchestrator
+        real = routes.orchestrator
+        try:
+            routes.orchestrator = routes._StubOrchestrator()
+            assert asyncio.run(routes.get_session_metrics()) == {"enabled": False}
+        finally:
+            routes.orchestrator = real
+
+        log_test("VoiceAgent", "Session store", "PASS",
+                f"session record {compact_size:,} bytes vs {full_size:,} for the full state; LRU + TTL bounds hold")
+    except Exception as e:
+        log_test("VoiceAgent", "Session store", "FAIL", str(e), traceback.format_exc())
+
+def test_auth_code_store():
+    """Test 20: Expiring authorization code stores (heap sweeps, SQLite sharing)"""
+    print("\n" + "="*70)
+    print("TEST 20: AUTHORIZATION CODE STORE")
+    print("="*70)
+
+    import asyncio
+    import os
+    import tempfile
+    import tracemalloc
+
+    try:
+        import voice_agent.graph  # noqa: F401  (import order avoids a circular import)
+        from voice_agent.agents.authorization_agent import AuthorizationAgent
+        from voice_agent.api import routes
+        from voice_agent.models.settings import SystemSettings
+        from voice_agent.storage.auth_code_store import InMemoryAuthCodeStore, SQLiteAuthCodeStore
+
+        now = [1_000_000.0]
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "auth_codes.sqlite3")
+            stores = [
+                InMemoryAuthCodeStore(expiry_minutes=10, clock=lambda: now[0]),
+                SQLiteAuthCodeStore(path, expiry_minutes=10, sweep_interval_seconds=0, clock=lambda: now[0]),
+            ]
+            for store in stores:
+                now[0] = 1_000_000.0
+                code = store.issue("draft_a", "send_email", session_id="s1")
+                assert store.issue("draft_a", "send_email", session_id="s1").code == code.code
+                store.issue("cal_b", "calendar_action", session_id="s1")
+                assert store.pending_for_session("s1") == ["cal_b", "draft_a"]
+
+                # Single use
+                assert store.verify(code.code, ["cal_b", "draft_a"]) == "draft_a"
+                assert store.verify(code.code, ["draft_a"]) is None
+
+                # Too many wrong attempts revoke the code
+                wrong = "9" * 4 if store.get("cal_b").code != "9999" else "0000"
+                for _ in range(3):
+                    assert store.verify(wrong, ["cal_b"]) is None
+                assert store.get("cal_b") is None
+
+                # Expired codes are swept
+                store.issue("bulk_c", "bulk_action", session_id="s2")
+                now[0] += 601
+                assert store.get("bulk_c") is None and len(store) == 0
+
+            # Codes issued by one worker verify in another
+            other = SQLiteAuthCodeStore(path, expiry_minutes=10, clock=lambda: now[0])
+            shared = stores[1].issue("draft_d", "send_email")
+            assert other.verify(shared.code, ["draft_d"]) == "draft_d"
+            assert stores[1].verify(shared.code, ["draft_d"]) is None
+            other.close()
+            stores[1].close()
+
+        # Memory stays flat under sustained traffic
+        store = InMemoryAuthCodeStore(expiry_minutes=10, clock=lambda: now[0])
+        tracemalloc.start()
+        peaks = []
+        for round_number in range(6):
+            for i in range(5000):
+                action_id = f"r{round_number}_{i}"
+                code = store.issue(action_id, "send_email", session_id=f"s{i % 50}")
+                if i % 2:
+                    store.verify(code.code, [action_id])
+                now[0] += 1
+            peaks.append(tracemalloc.get_traced_memory()[0])
+        tracemalloc.stop()
+        stats = store.stats()
+        assert len(store) <= 600 and stats["heap_entries"] <= 2 * 600 + 64, stats
+        assert peaks[-1] < peaks[1] * 1.2, peaks
+
+        # The agent issues codes per pending action and consumes the one entered
+        agent = AuthorizationAgent()
+        state = {"requires_authorization": True, "session_id": "s9",
+                 "email_drafts": [{"draft_id": "draft_x"}], "calendar_actions": [], "bulk_actions": []}
+        asyncio.run(agent.run(state))
+        entered = agent.get_code_for_action("draft_x")
+        result = asyncio.run(agent.run({**state, "authorization_code": entered}))
+        assert result.get("error") is None and agent.get_code_for_action("draft_x") is None
+
+        # The default SQLite path is under the data dir; metrics work without an orchestrator
+        data_dir = tempfile.mkdtemp()
+        assert SystemSettings(data_dir=data_dir).auth_code_store_path == os.path.join(data_dir, "auth_codes.sqlite3")
+        real = routes.orchestrator
+        try:
+            routes.orchestrator = routes._StubOrchestrator()
+            assert asyncio.run(routes.get_auth_code_metrics()) == {"enabled": False}
+        finally:
+            routes.orchestrator = real
+
+        log_test("VoiceAgent", "Authorization code store", "PASS",
+                f"30,000 codes issued, {len(store)} live; memory {peaks[1] // 1024} KB -> {peaks[-1] // 1024} KB")
+    except Exception as e:
+        log_test("VoiceAgent", "Authorization code store", "FAIL", str(e), traceback.format_exc())
+
+def test_audit_log():
+    """Test 21: Batched append-only audit log (rotation, activity queries)"""
+    print("\n" + "="*70)
+    print("TEST 21: AUDIT LOG")
+    print("="*70)
+
+    import asyncio
+    import os
+    import sqlite3
+    import tempfile
+    import time as _time
+    from datetime import datetime, timedelta
+
+    try:
+        import voice_agent.graph  # noqa: F401  (import order avoids a circular import)
+        from voice_agent.agents.logging_agent import LoggingAgent
+        from voice_agent.storage.audit_log import AuditLogWriter, SQLiteAuditLog
+
+        base = datetime(2025, 3, 1, 9, 0)
+
+        def entry(i):
+            return {
+                "log_id": f"log_{i}",
+                "timestamp": (base + timedelta(minutes=i)).isoformat(),
+                "object_type": ("email", "calendar", "summary")[i % 3],
+                "action": "drafted_reply",
+                "status": {"status": "draft_only"},
+                "user_id": f"user{i % 4}"
+            }
+
+        with tempfile.TemporaryDirectory() as tmp:
+            store = SQLiteAuditLog(os.path.join(tmp, "audit.sqlite3"),
+                                   archive_dir=os.path.join(tmp, "archive"), max_rows=1000)
+            writer = AuditLogWriter(store, batch_size=100, flush_interval_seconds=0.05)
+
+            async def produce():
+                started = _time.perf_counter()
+                for i in range(0, 3000, 10):
+                    writer.enqueue(entry(j) for j in range(i, i + 10))
+                enqueue_ms = (_time.perf_counter() - started) * 1000
+                await asyncio.sleep(0.2)
+                flushed_in_background = writer.written
+                writer.enqueue([entry(3000)])
+                await writer.stop()
+                return enqueue_ms, flushed_in_background
+
+            enqueue_ms, flushed_in_background = asyncio.run(produce())
+            assert flushed_in_background > 0, "writer did not flush on its own"
+            stats = writer.stats()
+            assert stats["written"] == 3001 and stats["pending"] == 0, stats
+            assert stats["rows"] <= 1000 and stats["rotations"] >= 2, stats
+
+            # Rotated rows are in compressed archives, in order, nothing lost
+            archived = [e["log_id"] for path in store.archives() for e in store.read_archive(path)]
+            assert all(path.suffix == ".gz" for path in store.archives())
+            assert len(archived) == stats["archived_rows"] and archived[0] == "log_0"
+            assert len(archived) + stats["rows"] == 3001
+
+            # Activity feed queries
+            page = store.query(user_id="user1", object_type="email", limit=5)
+            assert [e["log_id"] for e in page] == ["log_2997", "log_2985", "log_2973", "log_2961", "log_2949"], page
+            next_page = store.query(user_id="user1", object_type="email", limit=5, before_seq=page[-1]["seq"])
+            assert next_page[0]["log_id"] == "log_2937"
+            window = store.query(since=base + timedelta(minutes=2500), until=base + timedelta(minutes=2510), limit=100)
+            assert sorted(int(e["log_id"][4:]) for e in window) == list(range(2500, 2510))
+
+            # Append-only and idempotent
+            assert store.append([entry(3000)]) == 0
+            try:
+                store._conn.execute("UPDATE audit_logs SET action = 'x'")
+                raise AssertionError("update was allowed")
+            except sqlite3.DatabaseError:
+                pass
+
+            # Synchronous shutdown writes what is still queued
+            writer.enqueue([entry(3001)])
+            writer.close()
+            reopened = SQLiteAuditLog(os.path.join(tmp, "audit.sqlite3"))
+            assert reopened.query(limit=1)[0]["log_id"] == "log_3001"
+            reopened.close()
+
+        # The logging node queues entries instead of writing them inline
+        memory_store = SQLiteAuditLog()
+        agent = LoggingAgent(log_storage=AuditLogWriter(memory_store))
+
+        async def run_agent():
+            state = await agent.run({"intent": "summarize", "interaction_mode": "text", "user_id": "ceo"})
+            queued = agent.log_storage.stats()["pending"]
+            await agent.log_storage.stop()
+            return state, queued
+
+        state, queued = asyncio.run(run_agent())
+        assert queued == len(state["action_logs"]) == 1
+        assert memory_store.query(user_id="ceo", object_type="summary")[0]["action"] == "classified_intent"
+
+        log_test("VoiceAgent", "Audit log", "PASS",
+                f"3,001 entries enqueued in {enqueue_ms:.1f} ms; {stats['flushes']} batches, "
+                f"{stats['rotations']} rotations, {stats['rows']} live rows")
+    except Exception as e:
+        log_test("VoiceAgent", "Audit log", "FAIL", str(e), traceback.format_exc())
+
+    try:
+        from fastapi import FastAPI
+        from fastapi.testclient import TestClient
+        from voice_agent.api import routes
+        from voice_agent.models.settings import SystemSettings
+
+        class _ActivityOrchestrator(routes._StubOrchestrator):
+            def query_activity(self, limit, **filters):
+                # Same clamp as SQLiteAuditLog.query
+                return [{"seq": 1000 - i} for i in range(min(limit, 500))]
+
+        app = FastAPI()
+        app.include_router(routes.router)
+        real = routes.orchestrator
+        try:
+            routes.orchestrator = _ActivityOrchestrator()
+            with TestClient(app) as client:
+                full_page = client.get("/voice-agent/activity", params={"limit": 500}).json()
+                too_large = client.get("/voice-agent/activity", params={"limit": 1000})
+            routes.orchestrator = routes._StubOrchestrator()
+            disabled = asyncio.run(routes.get_audit_log_metrics())
+        finally:
+            routes.orchestrator = real
+        assert full_page["next_cursor"] == 501 and too_large.status_code == 422
+        assert disabled == {"enabled": False}
+
+        data_dir = tempfile.mkdtemp()
+        settings = SystemSettings(data_dir=data_dir)
+        assert settings.audit_log_path == os.path.join(data_dir, "audit_log.sqlite3")
+        assert settings.audit_log_archive_dir == os.path.join(data_dir, "audit_archive")
+        log_test("VoiceAgent", "Activity feed paging", "PASS",
+                "Full pages return a cursor, limits above 500 are rejected, store paths under data_dir")
+    except Exception as e:
+        log_test("VoiceAgent", "Activity feed paging", "FAIL", str(e), traceback.format_exc())
+
+def test_log_broker():
+    """Test 22: Live action log broker (filters, bounded queues, resume)"""
+    print("\n" + "="*70)
+    print("TEST 22: ACTION LOG BROKER")
+    print("="*70)
+
+    import asyncio
+    import json
+
+    try:
+        import voice_agent.graph  # noqa: F401  (import order avoids a circular import)
+        from voice_agent.agents.logging_agent import LoggingAgent
+        from voice_agent.utils.log_broker import LogBroker
+
+        def entry(i, user_id="ceo", object_type="email"):
+            return {"log_id": f"log_{i}", "user_id": user_id, "object_type": object_type, "action": "drafted_reply"}
+
+        async def scenario():
+            broker = LogBroker(queue_size=5, history_size=50)
+            everything = broker.subscribe()
+            ceo_email = broker.subscribe(user_id="ceo", object_types=["email"])
+            calendar = broker.subscribe(object_types=["calendar"])
+
+            broker.publish([entry(0), entry(1, object_type="calendar"), entry(2, user_id="cfo")])
+            first = [await everything.get() for _ in range(3)]
+            assert [json.loads(m)["entry"]["log_id"] for m in first] == ["log_0", "log_1", "log_2"]
+            assert json.loads(await ceo_email.get())["entry"]["log_id"] == "log_0" and ceo_email.pending == 0
+            # Encoded once: every subscriber gets the same string object
+            assert await calendar.get() is first[1]
+
+            # A slow subscriber loses the oldest messages and is told how many
+            broker.publish(entry(i) for i in range(3, 12))
+            assert json.loads(await ceo_email.get()) == {"type": "dropped", "count": 4}
+            assert [json.loads(await ceo_email.get())["entry"]["log_id"] for _ in range(5)] == \
+                [f"log_{i}" for i in range(7, 12)]
+            assert broker.stats()["dropped"] == 8  # ceo_email and everything
+
+            # Reconnect and resume after the last id seen
+            broker.unsubscribe(ceo_email)
+            assert await ceo_email.get() is None
+            broker.publish([entry(12), entry(13, user_id="cfo")])
+            resumed = broker.subscribe(user_id="ceo", resume_from="log_10")
+            assert [json.loads(await resumed.get())["entry"]["log_id"] for _ in range(2)] == ["log_11", "log_12"]
+            gap = broker.subscribe(resume_from="log_unknown")
+            assert json.loads(await gap.get())["type"] == "resume_gap"
+
+            # The logging node publishes what it logs
+            agent = LoggingAgent(log_broker=broker)
+            await agent.run({"intent": "summarize", "interaction_mode": "text", "user_id": "ceo"})
+            live = json.loads(await resumed.get())["entry"]
+            assert live["action"] == "classified_intent" and live["object_type"] == "summary"
+            return broker.stats()
+
+        stats = asyncio.run(scenario())
+        log_test("VoiceAgent", "Action log broker", "PASS",
+                f"{stats['published']} published to {stats['subscribers']} subscribers, {stats['dropped']} dropped")
+    except Exception as e:
+        log_test("VoiceAgent", "Action log broker", "FAIL", str(e), traceback.format_exc())
+
+    try:
+        from fastapi import FastAPI
+        from fastapi.testclient import TestClient
+        from voice_agent.api import routes
+        from voice_agent.utils.log_broker import LogBroker
+
+        class _BrokerOrchestrator(routes._StubOrchestrator):
+            log_broker = LogBroker()
+
+        app = FastAPI()
+        app.include_router(routes.router)
+        real = routes.orchestrator
+        try:
+            routes.orchestrator = stub = _BrokerOrchestrator()
+            with TestClient(app) as client:
+                with client.websocket_connect("/voice-agent/ws/logs?user_id=ceo") as ws:
+                    # Malformed frames are ignored, not fatal
+                    ws.send_text("not json")
+                    ws.send_text("[1, 2]")
+                    ws.send_bytes(b"\x00")
+                    ws.send_json({"type": "ping"})
+                    pong = ws.receive_json()
+                    stub.log_broker.publish([{"log_id": "log_1", "user_id": "ceo", "object_type": "email"}])
+                    live = ws.receive_json()
+        finally:
+            routes.orchestrator = real
+        assert pong == {"type": "pong"} and live["entry"]["log_id"] == "log_1"
+        assert stub.log_broker.stats()["subscribers"] == 0
+        log_test("VoiceAgent", "Log stream WebSocket", "PASS",
+                "Malformed frames ignored; subscription released on disconnect")
+    except Exception as e:
+        log_test("VoiceAgent", "Log stream WebSocket", "FAIL", str(e), traceback.format_exc())
+
+def test_streaming_query():
+    """Test 23: Node-by-node streaming with response tokens and cancellation"""
+    print("\n" + "="*70)
+    print("TEST 23: STREAMING QUERY")
+    print("="*70)
+
+    import asyncio
+
+    try:
+        import voice_agent.graph  # noqa: F401  (import order avoids a circular import)
+        from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+        from langchain_core.messages import AIMessage
+        from langgraph.graph import END, StateGraph
+        from voice_agent import orchestrator as orchestrator_module
+        from voice_agent.agents.logging_agent import LoggingAgent
+        from voice_agent.graph.state import VoiceAgentState
+        from voice_agent.models.settings import SystemSettings
+        from voice_agent.orchestrator import VoiceAgentOrchestrator
+
+        reply = "You have three meetings today and the board call moved to 4pm."
+        context_delay = [0.05]
+
+        async def classify(state):
+            return {"intent": "check_calendar", "confidence": 0.9, "intent_source": "rules"}
+
+        async def retrieve(state):
+            await asyncio.sleep(context_delay[0])
+            return {"calendar_events": [{"event_id": "e1"}, {"event_id": "e2"}, {"event_id": "e3"}]}
+
+        async def reason(state):
+            return {"recommended_action": "summarize_calendar"}
+
+        async def respond(state):
+            llm = GenericFakeChatModel(messages=iter([AIMessage(content=reply)]))
+            text = (await llm.ainvoke("summarize")).content
+            return {"text_response": text, "final_response": {"text": text, "intent": state["intent"]}}
+
+        def build_graph(audit_log=None, log_broker=None, **adapters):
+            # LLM-backed nodes are stubbed (no API key needed); logging is the real node
+            logging_agent = LoggingAgent(log_storage=audit_log, log_broker=log_broker)
+            workflow = StateGraph(VoiceAgentState)
+            for name, node in (("classify_intent", classify), ("retrieve_context", retrieve), ("reason", reason),
+                               ("generate_response", respond), ("log_actions", logging_agent.run)):
+                workflow.add_node(name, node)
+            workflow.set_entry_point("classify_intent")
+            for source, target in (("classify_intent", "retrieve_context"), ("retrieve_context", "reason"),
+                                   ("reason", "generate_response"), ("generate_response", "log_actions")):
+                workflow.add_edge(source, target)
+            workflow.add_edge("log_actions", END)
+            return workflow.compile()
+
+        real_builder = orchestrator_module.create_voice_agent_graph
+        orchestrator_module.create_voice_agent_graph = build_graph
+        try:
+            orchestrator = VoiceAgentOrchestrator(SystemSettings(
+                outbound_queue_enabled=False, audit_log_enabled=False, tts_cache_enabled=False
+            ))
+        finally:
+            orchestrator_module.create_voice_agent_graph = real_builder
+        live_logs = orchestrator.log_broker.subscribe()
+
+        async def collect():
+            return [e async for e in orchestrator.stream_query("what's on my calendar today", session_id="s_stream")]
+
+        events = asyncio.run(collect())
+        types = [e["type"] for e in events]
+        assert types[:4] == ["started", "intent", "context", "reasoning"], types
+        assert types[-3:] == ["response", "logged", "final"], types
+        tokens = [e["text"] for e in events if e["type"] == "token"]
+        assert len(tokens) > 5 and "".join(tokens) == reply, tokens
+        intent_event = events[1]
+        assert intent_event["intent"] == "check_calendar" and events[2]["event_count"] == 3
+        assert intent_event["elapsed_ms"] < events[2]["elapsed_ms"] <= events[-1]["elapsed_ms"]
+        assert events[-1]["response"]["text"] == reply
+        assert [log["action"] for log in events[-1]["response"]["logs"]] == ["classified_intent"]
+        assert orchestrator.session_store.get("s_stream")["state"]["intent"] == "check_calendar"
+        assert live_logs.pending == 1
+
+        # Barge-in: cancelling mid-run stops the pipeline and its prefetches
+        context_delay[0] = 30.0
+
+        async def barge_in():
+            seen = []
+
+            async def consume():
+                async for event in orchestrator.stream_query("what's on my calendar this week"):
+                    seen.append(event["type"])
+
+            task = asyncio.create_task(consume())
+            while "intent" not in seen:
+                await asyncio.sleep(0.01)
+            loop = asyncio.get_running_loop()
+            started = loop.time()
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+            return seen, (loop.time() - started) * 1000
+
+        seen, cancel_ms = asyncio.run(barge_in())
+        assert seen == ["started", "intent"] and cancel_ms < 1000, (seen, cancel_ms)
+        assert not orchestrator.context_agent._prefetches
+
+        log_test("VoiceAgent", "Streaming query", "PASS",
+                f"{len(events)} events, first intent event at {intent_event['elapsed_ms']} ms of "
+                f"{events[-1]['elapsed_ms']} ms; cancelled in {cancel_ms:.1f} ms")
+    except Exception as e:
+        log_test("VoiceAgent", "Streaming query", "FAIL", str(e), traceback.format_exc())
+
+    try:
+        from fastapi import FastAPI
+        from fastapi.testclient import TestClient
+        from voice_agent.api import routes
+
+        class _SlowOrchestrator(routes._StubOrchestrator):
+            async def stream_query(self, query, **kwargs):
+                yield {"type": "started", "query": query}
+                await asyncio.sleep(30)
+
+        app = FastAPI()
+        app.include_router(routes.router)
+        real = routes.orchestrator
+        try:
+            routes.orchestrator = _SlowOrchestrator()
+            with TestClient(app) as client:
+                with client.websocket_connect("/voice-agent/ws") as ws:
+                    # A query without "query" fails on its own
+                    ws.send_json({"type": "query", "request_id": "r0"})
+                    missing = ws.receive_json()
+                    # A reused request_id: the barged-in run must not drop the new one
+                    ws.send_json({"type": "query", "request_id": "r1", "query": "first"})
+                    first = ws.receive_json()
+                    ws.send_json({"type": "query", "request_id": "r1", "query": "second"})
+                    replaced = [ws.receive_json(), ws.receive_json()]
+                    ws.send_json({"type": "cancel", "request_id": "r1"})
+                    cancelled = ws.receive_json()
+                    ws.send_json({"type": "ping"})
+                    pong = ws.receive_json()
+        finally:
+            routes.orchestrator = real
+        assert missing["type"] == "error" and missing["request_id"] == "r0" and "query" in missing["error"]
+        assert first["query"] == "first"
+        assert sorted(e["type"] for e in replaced) == ["cancelled", "started"]
+        assert cancelled == {"type": "cancelled", "request_id": "r1"} and pong == {"type": "pong"}
+        log_test("VoiceAgent", "Query WebSocket errors", "PASS",
+                "Bad query reported per request; reused request_id stays cancellable")
+    except Exception as e:
+        log_test("VoiceAgent", "Query WebSocket errors", "FAIL", str(e), traceback.format_exc())
+
+def test_tts_cache():
+    """Test 24: Streaming TTS with the on-disk audio cache (fake provider)"""
+    print("\n" + "="*70)
+    print("TEST 24: TTS STREAMING AND AUDIO CACHE")
+    print("="*70)
+
+    import asyncio
+    import tempfile
+    import time as _time
+    from pathlib import Path
+
+    try:
+        import voice_agent.graph  # noqa: F401  (import order avoids a circular import)
+        from voice_agent.adapters.tts import CachedTTSAdapter, FakeTTSAdapter, TTSAudioCache
+
+        with tempfile.TemporaryDirectory() as tmp:
+            fake = FakeTTSAdapter(chunk_size=1024, chunk_delay_seconds=0.01, bytes_per_char=256)
+            greeting = "Good morning! Here's your day."          # 30 chars -> 7,680 bytes
+            clip_size = len(greeting) * 256
+            tts = CachedTTSAdapter(fake, TTSAudioCache(tmp, max_bytes=clip_size * 2 + 100), chunk_size=4096)
+
+            async def timed(text, voice_id=None):
+                started = _time.perf_counter()
+                first, chunks = None, []
+                async for chunk in tts.stream(text, voice_id=voice_id):
+                    first = first if first is not None else (_time.perf_counter() - started) * 1000
+                    chunks.append(chunk)
+                return b"".join(chunks), first, (_time.perf_counter() - started) * 1000, len(chunks)
+
+            # Miss: chunks are passed through as the provider produces them
+            audio, miss_first_ms, miss_total_ms, chunk_count = asyncio.run(timed(greeting))
+            assert audio == fake.audio_for(greeting) and chunk_count == 8
+            assert miss_first_ms < miss_total_ms / 3, (miss_first_ms, miss_total_ms)
+
+            # Hit: same bytes from disk, provider not called again
+            assert tts.is_cached(greeting)
+            audio_again, hit_first_ms, hit_total_ms, _ = asyncio.run(timed(greeting))
+            assert audio_again == audio and len(fake.requests) == 1
+            assert hit_total_ms < miss_first_ms * 5 and hit_total_ms < miss_total_ms / 4, (hit_total_ms, miss_total_ms)
+
+            # Voice is part of the key
+            other_voice, _, _, _ = asyncio.run(timed(greeting, voice_id="narrator"))
+            assert other_voice != audio and len(fake.requests) == 2
+
+            # An abandoned stream is never cached and leaves no partial file
+            async def abandon():
+                stream = tts.stream("Sorry, let me stop there.")
+                await anext(stream)
+                await stream.aclose()
+            asyncio.run(abandon())
+            assert not tts.is_cached("Sorry, let me stop there.")
+            assert not list(Path(tmp).glob("*/*.partial"))
+
+            # Size bound: least recently used clip is evicted
+            asyncio.run(timed(greeting))                       # touch the greeting
+            asyncio.run(timed("Done. The email has been sent."))  # third clip of the same size
+            stats = tts.cache.stats()
+            assert stats["evictions"] == 1 and stats["bytes"] <= stats["max_bytes"], stats
+            assert tts.is_cached(greeting) and not tts.is_cached(greeting, voice_id="narrator")
+
+            # Survives a restart
+            reopened = TTSAudioCache(tmp, max_bytes=clip_size * 2 + 100)
+            assert reopened.lookup(tts.cache_key(greeting)) is not None and reopened.stats()["entries"] == 2
+
+        log_test("VoiceAgent", "TTS streaming and audio cache", "PASS",
+                f"miss: first chunk {miss_first_ms:.1f} ms of {miss_total_ms:.1f} ms; "
+                f"hit: {hit_total_ms:.2f} ms; hit rate {stats['hit_rate']}")
+    except Exception as e:
+        log_test("VoiceAgent", "TTS streaming and audio cache", "FAIL", str(e), traceback.format_exc())
+
+    try:
+        from fastapi import FastAPI
+        from fastapi.testclient import TestClient
+        from voice_agent.adapters.tts import CachedTTSAdapter, FakeTTSAdapter, create_tts_adapter
+        from voice_agent.adapters.tts import factory as tts_factory
+        from voice_agent.api import routes
+        from voice_agent.models.settings import SystemSettings
+
+        data_dir = tempfile.mkdtemp()
+        built = create_tts_adapter(SystemSettings(tts_provider="fake", data_dir=data_dir))
+        assert isinstance(built, CachedTTSAdapter) and str(built.cache.cache_dir) == os.path.join(data_dir, "tts_cache")
+
+        # Without an orchestrator the routes use the shared adapter from settings
+        app = FastAPI()
+        app.include_router(routes.router)
+        real, shared = routes.orchestrator, tts_factory._shared_adapter
+        try:
+            routes.orchestrator = routes._StubOrchestrator()
+            tts_factory._shared_adapter = built
+            with TestClient(app) as client:
+                first = client.post("/voice-agent/tts", json={"text": "Good morning!"})
+                second = client.post("/voice-agent/tts", json={"text": "Good morning!"})
+                metrics = client.get("/voice-agent/metrics/tts-cache").json()
+        finally:
+            routes.orchestrator, tts_factory._shared_adapter = real, shared
+        assert first.status_code == 200 and first.content == FakeTTSAdapter().audio_for("Good morning!")
+        assert first.headers["x-tts-cache"] == "miss" and second.headers["x-tts-cache"] == "hit"
+        assert second.content == first.content and metrics["enabled"] and metrics["hits"] == 1
+        log_test("VoiceAgent", "TTS without an orchestrator", "PASS",
+                "/tts and its cache metrics served by the shared adapter; cache under data_dir")
+    except Exception as e:
+        log_test("VoiceAgent", "TTS without an orchestrator", "FAIL", str(e), traceback.format_exc())
+
+def test_concurrent_context_fetch():
+    """Test 25: Context sources fetched concurrently under per-source timeouts"""
+    print("\n" + "="*70)
+    print("TEST 25: CONCURRENT CONTEXT FETCH")
+    print("="*70)
+
+    import asyncio
+    import time
+
+    try:
+        import voice_agent.graph  # noqa: F401  (import order avoids a circular import)
+        from voice_agent.agents.context_agent import ContextRetrievalAgent
+
+        class SlowEmail:
+            async def fetch_threads(self, max_results=20):
+                await asyncio.sleep(0.2)
+                return [{"thread_id": "t1", "from": "jane@partner.com"}]
+
+            async def get_sender_histories(self, senders):
+                await asyncio.sleep(0.1)
+                return {sender: {"interaction_count": 3} for sender in senders}
+
+        class StalledCalendar:
+            async def get_events(self, start_time=None, end_time=None):
+                await asyncio.sleep(30)
+
+            async def get_free_busy(self, calendars, start, end):
+                await asyncio.sleep(0.2)
+                return {calendar: [] for calendar in calendars}
+
+        agent = ContextRetrievalAgent(
+            email_adapter=SlowEmail(),
+            calendar_adapter=StalledCalendar(),
+            source_timeouts={"calendar_events": 0.3}
+        )
+
+        started = time.perf_counter()
+        state = asyncio.run(agent.run({"intent": "summarize", "user_query": "summarize my day"}))
+        elapsed = time.perf_counter() - started
+        status = state["context_status"]
+
+        # email (0.2) -> sender history (0.1) runs alongside availability (0.2)
+        # and the calendar timeout (0.3), so the run takes ~0.3s, not the sum
+        assert elapsed < 0.6, f"sources ran sequentially ({elapsed:.2f}s)"
+        assert status["calendar_events"]["status"] == "timeout", status
+        assert all(status[s]["status"] == "ok" for s in
+                   ("email_threads", "sender_history", "availability_slots", "follow_up_tasks")), status
+        assert state["calendar_events"] == [] and state["email_threads"][0]["thread_id"] == "t1"
+        assert state["sender_history"]["jane@partner.com"]["interaction_count"] == 3
+        assert "error" not in state
+
+        # Every source failing is surfaced as a pipeline error
+        agent = ContextRetrievalAgent(calendar_adapter=StalledCalendar(),
+                                      source_timeouts={"calendar_events": 0.05, "availability_slots": 0.05})
+        failed = asyncio.run(agent.run({"intent": "check_calendar", "user_query": "what's on today"}))
+        assert failed["error"].startswith("Context retrieval error: all sources failed"), failed.get("error")
+
+        log_test("VoiceAgent", "Concurrent context fetch", "PASS",
+                f"5 sources in {elapsed * 1000:.0f} ms with calendar_events timed out")
+    except Exception as e:
+        log_test("VoiceAgent", "Concurrent context fetch", "FAIL", str(e), traceback.format_exc())
+
+def test_sender_history_batching():
+    """Test 26: Sender history threads loaded in one batch request, then cached"""
+    print("\n" + "="*70)
+    print("TEST 26: BATCHED SENDER HISTORY")
+    print("="*70)
+
+    import asyncio
+
+    try:
+
+        service, adapter = fake_gmail()
+        hour_ms = 3_600_000
+        base_ms = 1_700_000_000_000
+        for i in range(6):
+            thread_id = f"jane{i}"
+            service.add_message(sender="Jane Doe <jane@partner.com>", subject=f"Deal {i}",
+                                thread_id=thread_id, internal_date_ms=base_ms + i * 10 * hour_ms)
+            if i % 2 == 0:
+                # The user replied two hours later
+                service.add_message(sender="me@company.com", subject=f"Re: Deal {i}", thread_id=thread_id,
+                                    labels=["SENT"], internal_date_ms=base_ms + (i * 10 + 2) * hour_ms)
+        service.add_message(sender="bob@vendor.com", subject="Invoice")
+
+        async def scenario():
+            first = await adapter.get_sender_histories(
+                ["jane@partner.com", "bob@vendor.com", "jane@partner.com"]
+            )
+            calls, batches = service.calls, service.batch_calls
+            again = await adapter.get_sender_histories(["jane@partner.com", "bob@vendor.com"])
+            return first, again, calls, batches
+
+        first, again, calls, batches = asyncio.run(scenario())
+        jane = first["jane@partner.com"]
+        assert jane["interaction_count"] == 6 and jane["replied_count"] == 3, jane
+        assert jane["avg_response_time_hours"] == 2.0, jane
+        assert first["bob@vendor.com"]["interaction_count"] == 1
+        # One messages.list and one batched threads.get per sender
+        assert (calls, batches) == (4, 2), (calls, batches)
+        assert again == first and service.calls == calls, "second lookup should be served from the cache"
+
+        log_test("VoiceAgent", "Batched sender history", "PASS",
+                f"2 senders resolved in {calls} Gmail calls ({batches} batch requests); repeat lookup cached")
+    except Exception as e:
+        log_test("VoiceAgent", "Batched sender history", "FAIL", str(e), traceback.format_exc())
+
+def test_local_intent_classifier():
+    """Test 27: Local fast-path intent classifier (rules, model, deferral)"""
+    print("\n" + "="*70)
+    print("TEST 27: LOCAL INTENT CLASSIFIER")
+    print("="*70)
+
+    try:
+        from voice_agent.utils.intent_classifier import LocalIntentClassifier
+
+        classifier = LocalIntentClassifier()
+        decided = {
+            "Hey Vinegar, what's in my inbox?": "triage_inbox",
+            "what's on my calendar tomorrow": "check_calendar",
+            "delete the marketing emails": "archive_email",
+            "archive this thread": "archive_email",
+            "clean up my inbox": "archive_email",
+            "send an email to the leadership team": "send_email",
+            "reply to the board email": "draft_reply",
+        }
+        for query, intent in decided.items():
+            prediction = classifier.classify(query)
+            assert prediction is not None and prediction.intent == intent, (query, prediction)
+
+        # Calendar deletes and drafts must not be routed to email actions locally
+        for query, wrong in (("delete my 3pm meeting tomorrow", "archive_email"),
+                             ("draft an email to the board", "send_email")):
+            prediction = classifier.classify(query)
+            assert prediction is None or prediction.intent != wrong, (query, prediction)
+
+        # LLM decisions are cached for the next identical query
+        classifier.record("delete my 3pm meeting tomorrow", "schedule_meeting")
+        assert classifier.classify("Delete my 3pm meeting tomorrow.").source == "cache"
+
+        log_test("VoiceAgent", "Local intent classifier", "PASS",
+                f"{len(decided)} commands decided locally; calendar delete and draft deferred ({classifier.stats})")
+    except Exception as e:
+        log_test("VoiceAgent", "Local intent classifier", "FAIL", str(e), traceback.format_exc())
+
+def test_single_pass_response_logging():
+    """Test 28: The logging node keeps a single-pass response and attaches logs"""
+    print("\n" + "="*70)
+    print("TEST 28: SINGLE-PASS RESPONSE THROUGH THE LOGGING NODE")
+    print("="*70)
+
+    import asyncio
+
+    try:
+        import voice_agent.graph  # noqa: F401  (import order avoids a circular import)
+        from voice_agent.agents.logging_agent import LoggingAgent
+        from voice_agent.agents.response_agent import build_final_response
+
+        reply = "Three meetings today; the board call moved to 4pm."
+        state = {
+            "intent": "check_calendar", "confidence": 0.9, "interaction_mode": "voice",
+            "user_id": "ceo", "reasoning": "Read-only calendar summary", "session_id": "s1",
+            "text_response": reply, "voice_response": reply, "response_ready": True
+        }
+        state["final_response"] = build_final_response(state, reply)
+
+        agent = LoggingAgent()
+        state = asyncio.run(agent.run(state))
+        assert state["text_response"] == state["voice_response"] == reply
+        final = state["final_response"]
+        assert final["text"] == reply and final["session_id"] == "s1", final
+        assert final["logs"] == state["action_logs"] and final["logs"][0]["action"] == "classified_intent"
+        assert len(agent.logs_buffer) == 1
+
+        # Without an upstream response the node still writes one
+        fallback = asyncio.run(LoggingAgent().run({"intent": "follow_up", "final_response": {}}))
+        assert "No actions were required" in fallback["final_response"]["text"]
+
+        log_test("VoiceAgent", "Single-pass response through logging", "PASS",
+                f"Response kept, {len(final['logs'])} log attached")
+    except Exception as e:
+        log_test("VoiceAgent", "Single-pass response through logging", "FAIL", str(e), traceback.format_exc())
+
+def test_context_prefetch():
+    """Test 29: Speculative context prefetch consumed or cancelled by the context node"""
+    print("\n" + "="*70)
+    print("TEST 29: SPECULATIVE CONTEXT PREFETCH")
+    print("="*70)
+
+    import asyncio
+
+    try:
+        import voice_agent.graph  # noqa: F401  (import order avoids a circular import)
+        from voice_agent.agents.context_agent import ContextRetrievalAgent
+        from voice_agent.api import routes
+
+        calls = {"fetch_threads": 0, "get_events": 0}
+
+        class Email:
+            async def fetch_threads(self, max_results=20):
+                calls["fetch_threads"] += 1
+                await asyncio.sleep(0.1)
+                return [{"thread_id": "t1", "from": "jane@partner.com"}]
+
+            async def get_sender_histories(self, senders):
+                return {}
+
+        class Calendar:
+            async def get_events(self, start_time=None, end_time=None):
+                calls["get_events"] += 1
+                await asyncio.sleep(30)
+
+        agent = ContextRetrievalAgent(email_adapter=Email(), calendar_adapter=Calendar())
+
+        async def scenario():
+            agent.start_prefetch("s1:a", "what's in my inbox", ["email_threads", "calendar_events"])
+            await asyncio.sleep(0.05)  # classification would be running here
+            state = await agent.run({"intent": "triage_inbox", "prefetch_key": "s1:a"})
+            # A run that never reaches the context node discards its prefetch
+            agent.start_prefetch("s1:b", "change your voice", ["email_threads"])
+            agent.discard_prefetch("s1:b")
+            return state
+
+        state = asyncio.run(scenario())
+        status = state["context_status"]["email_threads"]
+        assert status["status"] == "ok" and status["prefetched"], status
+        assert state["email_threads"][0]["thread_id"] == "t1"
+        # The prefetched inbox was reused rather than fetched again
+        assert calls == {"fetch_threads": 1, "get_events": 1}, calls
+        stats = agent.get_prefetch_stats()
+        assert stats["email_threads"] == {"started": 2, "hits": 1, "wasted": 1, "hit_rate": 0.5}, stats
+        assert stats["calendar_events"]["wasted"] == 1 and not agent._prefetches
+
+        # The metrics route works with or without a real orchestrator
+        real = routes.orchestrator
+        try:
+            routes.orchestrator = routes._StubOrchestrator()
+            assert asyncio.run(routes.get_prefetch_metrics()) == {"enabled": False}
+        finally:
+            routes.orchestrator = real
+
+        log_test("VoiceAgent", "Speculative context prefetch", "PASS",
+                f"email hit rate {stats['email_threads']['hit_rate']}, unused calendar fetch cancelled")
+    except Exception as e:
+        log_test("VoiceAgent", "Speculative context prefetch", "FAIL", str(e), traceback.format_exc())
+
+def test_batch_thread_hydration():
+    """Test 30: Thread listings hydrated through Gmail batch requests"""
+    print("\n" + "="*70)
+    print("TEST 30: BATCHED THREAD HYDRATION")
+    print("="*70)
+
+    import asyncio
+
+    try:
+
+        service, adapter = fake_gmail(150)
+
+        threads = asyncio.run(adapter.fetch_threads(max_results=150))
+        # One threads.list plus two batch round-trips (100 + 50 threads.get)
+        assert (service.calls, service.batch_calls) == (3, 2), (service.calls, service.batch_calls)
+        assert len(threads) == 150, "max_results is honoured"
+        assert [t["subject"] for t in threads[:3]] == ["Update 149", "Update 148", "Update 147"]
+
+        service.calls = service.batch_calls = 0
+        results = asyncio.run(adapter.search_emails("subject:update", max_results=20))
+        assert len(results) == 20 and (service.calls, service.batch_calls) == (2, 1)
+
+        log_test("VoiceAgent", "Batched thread hydration", "PASS",
+                "150 threads hydrated in 2 batch requests, list order kept")
+    except Exception as e:
+        log_test("VoiceAgent", "Batched thread hydration", "FAIL", str(e), traceback.format_exc())
+
+def test_metadata_thread_listing():
+    """Test 31: Listings use metadata and snippets; bodies are decoded on demand"""
+    print("\n" + "="*70)
+    print("TEST 31: METADATA LISTINGS AND LAZY BODIES")
+    print("="*70)
+
+    import asyncio
+
+    try:
+
+        service, adapter = fake_gmail()
+        body = "Q4 numbers & the board deck are attached. " + "Details follow. " * 200
+        message = service.add_message(sender="cfo@company.com", subject="Q4 review", body=body)
+        service.messages[message["id"]]["snippet"] = "Q4 numbers &amp; the board deck are attached."
+
+        listed = asyncio.run(adapter.fetch_threads(max_results=10))[0]
+        assert listed["preview"] == "Q4 numbers & the board deck are attached.", listed["preview"]
+        assert all("body" not in m for m in listed["messages"]), "listing decoded a body"
+
+        hydrated = asyncio.run(adapter.fetch_threads(max_results=10, include_bodies=True))[0]
+        assert hydrated["messages"][0]["body"].strip() == body.strip()
+        assert hydrated["preview"].startswith("Q4 numbers & the board deck")
+
+        full = asyncio.run(adapter.get_thread(listed["thread_id"]))
+        assert full["messages"][0]["body"].strip() == body.strip(), "get_thread still loads full bodies"
+
+        log_test("VoiceAgent", "Metadata listings and lazy bodies", "PASS",
+                f"Listing preview from snippet; {len(body):,}-char body only decoded on demand")
+    except Exception as e:
+        log_test("VoiceAgent", "Metadata listings and lazy bodies", "FAIL", str(e), traceback.format_exc())
+
+def test_shared_gmail_credentials():
+    """Test 32: One Gmail adapter per process with cached, single-flight token refresh"""
+    print("\n" + "="*70)
+    print("TEST 32: SHARED GMAIL ADAPTER AND CACHED CREDENTIALS")
+    print("="*70)
+
+    import threading
+    from datetime import datetime, timedelta
+
+    try:
+        from google.oauth2.credentials import Credentials
+        from voice_agent.adapters.email import gmail_oauth_env
+        from voice_agent.adapters.email.gmail_adapter import get_shared_gmail_adapter
+        from voice_agent.adapters.email.gmail_oauth_env import GmailOAuthEnvHandler
+
+        assert get_shared_gmail_adapter() is get_shared_gmail_adapter()
+
+        refreshes = []
+        original_refresh = Credentials.refresh
+        saved_env = {k: os.environ.get(k) for k in ("GMAIL_CLIENT_ID", "GMAIL_CLIENT_SECRET", "GMAIL_REFRESH_TOKEN")}
+
+        def refresh(self, request):
+            refreshes.append(threading.get_ident())
+            self.token = f"access-{len(refreshes)}"
+            self.expiry = datetime.utcnow() + timedelta(hours=1)
+
+        try:
+            Credentials.refresh = refresh
+            os.environ.update(GMAIL_CLIENT_ID="dry-test-client", GMAIL_CLIENT_SECRET="dry-test-secret",
+                              GMAIL_REFRESH_TOKEN="dry-test-refresh")
+            gmail_oauth_env.clear_credentials_cache()
+
+            first, second = GmailOAuthEnvHandler(), GmailOAuthEnvHandler()
+            assert first.get_gmail_service() is second.get_gmail_service()
+            assert first.creds is second.creds and len(refreshes) == 1, refreshes
+
+            # A token about to expire is refreshed once for all concurrent callers
+            first.creds.expiry = datetime.utcnow() + timedelta(minutes=1)
+            workers = [threading.Thread(target=GmailOAuthEnvHandler().get_credentials) for _ in range(8)]
+            for worker in workers:
+                worker.start()
+            for worker in workers:
+                worker.join()
+            assert len(refreshes) == 2 and second.creds.token == "access-2", refreshes
+        finally:
+            Credentials.refresh = original_refresh
+            for key, value in saved_env.items():
+                if value is None:
+                    os.environ.pop(key, None)
+                else:
+                    os.environ[key] = value
+            gmail_oauth_env.clear_credentials_cache()
+
+        log_test("VoiceAgent", "Shared Gmail adapter and cached credentials", "PASS",
+                "Handlers share credentials and service; 8 concurrent callers caused 1 refresh")
+    except Exception as e:
+        log_test("VoiceAgent", "Shared Gmail adapter and cached credentials", "FAIL", str(e), traceback.format_exc())
+
 def generate_report():
     """Generate markdown report"""
     print("\n" + "="*70)
@@ -502,6 +2490,31 @@ def main():
     test_api_structure()
     test_dashboard_files()
     test_dependencies()
+    test_gmail_nonblocking()
+    test_mailbox_mirror()
+    test_email_search_index()
+    test_bulk_email_operations()
+    test_outbound_email_queue()
+    test_streaming_attachments()
+    test_email_body_extraction()
+    test_calendar_event_cache()
+    test_calendar_availability()
+    test_recurring_events()
+    test_calendar_conflicts()
+    test_session_store()
+    test_auth_code_store()
+    test_audit_log()
+    test_log_broker()
+    test_streaming_query()
+    test_tts_cache()
+    test_concurrent_context_fetch()
+    test_sender_history_batching()
+    test_local_intent_classifier()
+    test_single_pass_response_logging()
+    test_context_prefetch()
+    test_batch_thread_hydration()
+    test_metadata_thread_listing()
+    test_shared_gmail_credentials()
 
     # Generate report
     generate_report()